@@ -1,11 +1,13 @@
 from odoo import http
-import requests
 import logging
 import time
 import hashlib
 import json
 from datetime import datetime 
 from odoo.http import request
+
+from ..models.http_session import http_request
+
 _logger = logging.getLogger(__name__)
 
 
@@ -54,7 +56,7 @@ class JSTCallbackController(http.Controller):
         }
 
         # Gửi đúng chuỗi đã dùng để ký (không dùng json=..., dùng data=...)
-        resp = requests.post(JST_GET_TOKEN_URL, data=body_str.encode("utf-8"), headers=headers)
+        resp = http_request('POST', JST_GET_TOKEN_URL, data=body_str.encode("utf-8"), headers=headers)
         resp_data = resp.json()
         _logger.info("JST API response: %s", resp_data)
 
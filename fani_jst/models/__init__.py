@@ -1,4 +1,5 @@
 from . import res_config_settings
+from . import jst_sync_mixin
 from . import jst_shop
 from . import jst_shop_product
 from . import jst_product_template
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Pooled HTTP sessions (keep-alive) dùng chung trong 1 worker process.
+
+Mỗi host (scheme://netloc) có 1 requests.Session riêng với connection pool,
+retry ở tầng transport và timeout mặc định, nên các request liên tiếp tới
+cùng 1 API không phải bắt tay TCP/TLS lại. configure_host() đặt timeout,
+pool size và số lần retry riêng cho từng host.
+"""
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+_sessions = {}
+# {host: {'timeout', 'pool_connections', 'pool_maxsize', 'max_retries'}} do configure_host() đặt
+_host_options = {}
+_lock = threading.Lock()
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def configure_host(url, timeout=None, pool_connections=None, pool_maxsize=None, max_retries=None):
+    """
+    Đặt cấu hình riêng cho host của url (None = giá trị mặc định). Session của host được
+    tạo lại ở request kế tiếp nếu cấu hình thay đổi; gọi lại với cùng cấu hình không tốn gì.
+    """
+    key = _host_key(url)
+    options = {
+        name: value for name, value in (
+            ('timeout', timeout),
+            ('pool_connections', pool_connections),
+            ('pool_maxsize', pool_maxsize),
+            ('max_retries', max_retries),
+        ) if value is not None
+    }
+    if _host_options.get(key, {}) == options:
+        return
+    with _lock:
+        _host_options[key] = options
+        # Request đang chạy vẫn dùng session cũ, session cũ được đóng khi không còn tham chiếu
+        _sessions.pop(key, None)
+
+
+def _build_session(options):
+    session = requests.Session()
+    # Không giữ cookie giữa các shop/thread dùng chung session
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    # Chỉ retry request idempotent khi server lỗi; lỗi connect thì retry mọi method
+    retry = Retry(
+        total=options.get('max_retries', DEFAULT_MAX_RETRIES),
+        read=0,
+        backoff_factor=DEFAULT_BACKOFF_FACTOR,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=options.get('pool_connections', DEFAULT_POOL_CONNECTIONS),
+        pool_maxsize=options.get('pool_maxsize', DEFAULT_POOL_MAXSIZE),
+        max_retries=retry,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session(url):
+    """Trả về session dùng chung cho host của url (thread-safe)."""
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _sessions[key] = _build_session(_host_options.get(key, {}))
+    return session
+
+
+def http_request(method, url, **kwargs):
+    """Thay thế requests.request(): đi qua session pool của host, có timeout mặc định của host."""
+    if kwargs.get('timeout') is None:
+        kwargs['timeout'] = _host_options.get(_host_key(url), {}).get('timeout', DEFAULT_TIMEOUT)
+    return get_session(url).request(method, url, **kwargs)
@@ -17,6 +17,7 @@ JST_PURCHASE_ORDER_CONVERT_TO_STRING = ['purchaseId', 'originalPurchaseId']
 
 class JstPurchaseOrder(models.Model):
     _name = 'jst.purchase.order'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Purchase Order'
     _rec_name = 'purchaseId'
     _order = 'created desc,purchaseId desc'
@@ -172,12 +173,15 @@ class JstPurchaseOrder(models.Model):
         # Tìm trong DB các order đã tồn tại (chỉ load id + orderId)
         existing_orders = self.sudo().search_read(
             domain=[('purchaseId', 'in', purchase_ids_incoming)],
-            fields=['id', 'purchaseId']
+            fields=['id', 'purchaseId', 'sync_hash']
         )
         existing_orders_map = {o['purchaseId']: o['id'] for o in existing_orders}
+        existing_hash_map = {o['purchaseId']: o['sync_hash'] for o in existing_orders}
 
         new_vals_list = []
         update_vals_list = []
+        lines_by_order = {}
+        process_by_order = {}
         map_fields = self._map_fields()
         pol_map_fields = self.env['jst.purchase.order.line']._map_fields()
         pop_map_fields = self.env['jst.purchase.order.process']._map_fields()
@@ -244,38 +248,47 @@ class JstPurchaseOrder(models.Model):
                     jst_purchase_order_process['purchaseId'] = purchase_order_id_str
                     process_lines_data.append(jst_purchase_order_process)
 
-            if order_lines_data:
-                # order lines (các order lines cũ đã bị xóa)
-                jst_purchase_order['jst_purchase_order_line_ids'] = [(0, 0, pol) for pol in order_lines_data]
-            if process_lines_data:
-                # process lines (các process lines cũ đã bị xóa)
-                jst_purchase_order['jst_purchase_process_ids'] = [(0, 0, pop) for pop in process_lines_data]
+            payload_hash = self._jst_payload_hash(jst_purchase_order)
 
             # Update order đã tồn tại
             if purchase_order_id_str in existing_orders_map:
+                # Payload không đổi so với lần đồng bộ trước: bỏ qua
+                if existing_hash_map[purchase_order_id_str] == payload_hash:
+                    continue
+                jst_purchase_order['sync_hash'] = payload_hash
+                # order lines, process lines: chỉ tạo/sửa/xóa các line thay đổi
+                lines_by_order[purchase_order_id_str] = order_lines_data
+                process_by_order[purchase_order_id_str] = process_lines_data
                 # Add tuple to list
                 update_vals_list.append((existing_orders_map[purchase_order_id_str], jst_purchase_order))
             # Chưa đồng bộ: tạo mới
             else:
+                jst_purchase_order['sync_hash'] = payload_hash
+                if order_lines_data:
+                    jst_purchase_order['jst_purchase_order_line_ids'] = self._jst_line_commands(order_lines_data)
+                if process_lines_data:
+                    jst_purchase_order['jst_purchase_process_ids'] = self._jst_line_commands(process_lines_data)
                 # Add dict to list
                 new_vals_list.append(jst_purchase_order)
 
-        # search tất cả order lines, process lines và cho chim cook thay vì dùng lệnh (5, 0, 0), giúp giảm update 200 orders từ 50s xuống còn khoảng dưới 5s
-        jst_PO_lines_remove = self.env['jst.purchase.order.line'].search([('purchaseId', 'in', purchase_ids_incoming)])
-        if jst_PO_lines_remove:
-            jst_PO_lines_remove.unlink()
-        jst_PO_process_remove = self.env['jst.purchase.order.process'].search([('purchaseId', 'in', purchase_ids_incoming)])
-        if jst_PO_process_remove:
-            jst_PO_process_remove.unlink()
-
         with self.env.cr.savepoint():
             # Create new orders
             if new_vals_list:
                 self.sudo().create(new_vals_list)
-            # Update orders
+            # Update orders (chỉ các order có thay đổi)
             for order_id, vals in update_vals_list:
                 order = self.browse(order_id)
                 order.sudo().write(vals)
+            # Lines, process của các order được cập nhật: diff theo purchaseDetailId / processId
+            parent_ids = {purchase_id: existing_orders_map[purchase_id] for purchase_id in lines_by_order}
+            self._reconcile_jst_lines(
+                'jst.purchase.order.line', 'purchaseId', 'purchaseDetailId', lines_by_order,
+                parent_field='jst_purchase_order_id', parent_ids=parent_ids,
+            )
+            self._reconcile_jst_lines(
+                'jst.purchase.order.process', 'purchaseId', 'processId', process_by_order,
+                parent_field='jst_purchase_order_id', parent_ids=parent_ids,
+            )
 
     def _map_fields(self):
         # key: JST API key, value: Odoo field name
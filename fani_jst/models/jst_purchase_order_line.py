@@ -3,6 +3,7 @@ from odoo import models, fields
 
 class JstPurchaseOrderLine(models.Model):
     _name = 'jst.purchase.order.line'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Purchase Order Line'
     _rec_name = 'skuName'
     _order = 'purchaseDetailId desc'
@@ -3,6 +3,7 @@ from odoo import models, fields
 
 class JstPurchaseOrderProcess(models.Model):
     _name = 'jst.purchase.order.process'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Purchase Process'
     _rec_name = 'title'
     _order = 'processId desc'
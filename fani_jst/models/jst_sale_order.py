@@ -4,8 +4,10 @@ import hashlib
 import requests
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from .res_config_settings import _send_api_jst_request
 _logger = logging.getLogger(__name__)
 
 JST_API_URL = "https://asiaopenapi.jsterp.com"
@@ -15,8 +17,13 @@ ORDER_LIST_OBJECT_FIELDS = ['labelStr'] # -> "[X, Y, X]"
 
 ORDER_LINE_DATETIME_FIELDS = ['created', 'itemSendDate'] # -> DATETIME OBJECT
 
+ORDER_LIST_PAGE_SIZE = 500
+ORDER_DETAIL_BATCH_SIZE = 200 # GetOrderDetailByIds nhận tối đa 200 đơn
+ORDER_SYNC_CHECKPOINT_PARAM = 'jst.sync_order_checkpoint.%s'
+
 class JstSaleOrder(models.Model):
     _name = 'jst.sale.order'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Sale Order'
     _rec_name = 'orderId'
     _order = 'orderId desc'
@@ -170,11 +177,14 @@ class JstSaleOrder(models.Model):
         """
         return ['status']
 
-    def action_sync_jst_orders(self, date_from, date_end, field='modify_time', pageIndex=1, only_create=False):
+    def action_sync_jst_orders(self, date_from, date_end, field='modify_time', pageIndex=1, only_create=False, checkpoint=False):
         """
         Đồng bộ Order theo thời gian
-        
+
         * Lưu ý: date_end phải > date_from
+        * checkpoint=True (dùng cho cron): commit sau mỗi batch 200 đơn và lưu vị trí
+          (page, số đơn đã xử lý trong page) vào ir.config_parameter, lần chạy sau
+          với cùng khoảng thời gian sẽ tiếp tục từ vị trí đó.
         """
         key_dt_start = 'modifiedBegin'
         key_dt_end = 'modifiedEnd'
@@ -186,55 +196,93 @@ class JstSaleOrder(models.Model):
             key_dt_end = 'sendTimeEnd'
         start_dt = datetime.now()
         _logger.info("Sync JST Order: Bắt đầu đồng bộ đơn hàng JST ...")
-        all_orderId = [] # Gom tất cả ourder cần update
-        while True:
-            body_data = {
+
+        window = [int(date_from), int(date_end), field]
+        resume_offset = 0
+        if checkpoint:
+            saved = self._get_sync_checkpoint(field)
+            if saved.get('window') == window:
+                pageIndex = saved.get('page_index', pageIndex)
+                resume_offset = saved.get('done', 0)
+                _logger.info("Sync JST Order: Tiếp tục từ page %s, đã xử lý %s đơn", pageIndex, resume_offset)
+
+        def build_body(page_index):
+            return {
                 "requestModel": {
                   key_dt_start: int(date_from),
                   key_dt_end: int(date_end),
                 },
                 "dataPage": {
-                  "pageSize": 500,
-                  "pageIndex": pageIndex
+                  "pageSize": ORDER_LIST_PAGE_SIZE,
+                  "pageIndex": page_index
                 }
             }
-            # Get Orders
-            resp_data = self.env['res.config.settings']._call_api_jst("/api/Order/GetOrders", body_data)
-
-            # Call API không thành công
-            if not resp_data.get('success'):
-                _logger.error("Sync JST Order: Error (Get Orders): %s", resp_data.get('message'))
-                break
-
-            data = resp_data.get('data') or []
-            if data:
-                # Lấy danh sách orders
-                orderId_list = [item.get("orderId", 0) for item in data]
-                all_orderId += orderId_list
 
-                # Check dataPage
-                dp = resp_data.get('dataPage') or {}
-                if dp.get('isLast', True):
-                    break
-                pageIndex = dp.get('pageIndex', pageIndex) + 1
-            else:
-                break
-        
-        total_orders = len(all_orderId)
-        _logger.info("Sync JST Order: Cần đồng bộ %s orders ...", total_orders)
-        
-        # Đồng bộ chi tiết 200 đơn 1 lần đến khi kết thúc
-        if all_orderId:
-            while all_orderId:
+        # Đồng bộ chi tiết 200 đơn 1 lần ngay khi nhận được page (page kế tiếp được tải song song)
+        total_orders = 0
+        for page_index, orderId_list in self._iter_jst_order_pages(build_body, pageIndex):
+            for offset in range(resume_offset, len(orderId_list), ORDER_DETAIL_BATCH_SIZE):
+                batch = orderId_list[offset:offset + ORDER_DETAIL_BATCH_SIZE]
                 check_dt_start = datetime.now()
-                self._sync_jst_orders_detail(all_orderId[:200], only_create)
+                self._sync_jst_orders_detail(batch, only_create)
+                total_orders += len(batch)
+                if checkpoint:
+                    self._set_sync_checkpoint(field, {
+                        'window': window,
+                        'page_index': page_index,
+                        'done': offset + len(batch),
+                    })
+                    self.env.cr.commit()
                 check_dt_end = datetime.now()
-                _logger.info("Sync JST Order: Đã đồng bộ %s orders -> %s (s)", len(all_orderId[:200]), (check_dt_end-check_dt_start).total_seconds())
-                all_orderId = all_orderId[200:] # Bỏ 200 phần tử đầu tiên
+                _logger.info("Sync JST Order: Đã đồng bộ %s orders (page %s) -> %s (s)", len(batch), page_index, (check_dt_end-check_dt_start).total_seconds())
+            resume_offset = 0
+
+        if checkpoint:
+            self._set_sync_checkpoint(field, False)
 
         end_dt = datetime.now()
         _logger.info("Sync JST Order: Kết thúc đồng bộ đơn hàng JST -> %s orders-> %s (s)", total_orders, (end_dt - start_dt).total_seconds())
 
+    def _iter_jst_order_pages(self, build_body, pageIndex=1):
+        """
+        Generator trả về (pageIndex, danh sách orderId) của từng page GetOrders.
+        Request page kế tiếp được gửi ở background trong lúc page hiện tại đang được xử lý.
+        """
+        Settings = self.env['res.config.settings']
+        path_url = "/api/Order/GetOrders"
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(_send_api_jst_request, path_url, *Settings._prepare_api_jst_request(path_url, build_body(pageIndex)))
+            while future:
+                # Get Orders
+                resp_data = future.result()
+                future = None
+
+                # Call API không thành công
+                if not resp_data.get('success'):
+                    _logger.error("Sync JST Order: Error (Get Orders): %s", resp_data.get('message'))
+                    return
+
+                data = resp_data.get('data') or []
+                if not data:
+                    return
+
+                # Check dataPage, gửi trước request page tiếp theo
+                dp = resp_data.get('dataPage') or {}
+                next_page_index = dp.get('pageIndex', pageIndex) + 1
+                if not dp.get('isLast', True):
+                    future = executor.submit(_send_api_jst_request, path_url, *Settings._prepare_api_jst_request(path_url, build_body(next_page_index)))
+
+                yield pageIndex, [item.get("orderId", 0) for item in data]
+                pageIndex = next_page_index
+
+    def _get_sync_checkpoint(self, field):
+        value = self.env['ir.config_parameter'].sudo().get_param(ORDER_SYNC_CHECKPOINT_PARAM % field)
+        return json.loads(value) if value else {}
+
+    def _set_sync_checkpoint(self, field, checkpoint):
+        value = json.dumps(checkpoint) if checkpoint else False
+        self.env['ir.config_parameter'].sudo().set_param(ORDER_SYNC_CHECKPOINT_PARAM % field, value)
+
     def _sync_jst_orders_detail(self, orderId_list, only_create=False):
         # Tối đa 200 đơn hàng
         body_data = {
@@ -255,22 +303,18 @@ class JstSaleOrder(models.Model):
         # Lấy danh sách orderId từ data sync
         order_ids_incoming = [line.get('orderId') for line in data if line.get('orderId')]
 
-        # Tìm trong DB các order đã tồn tại (chỉ load id + orderId)
-        existing_orders = self.sudo().search_read(
-            domain=[('orderId', 'in', order_ids_incoming)],
-            fields=['id', 'orderId']
-        )
-        existing_orders_map = {o['orderId']: o['id'] for o in existing_orders}
-
-        # Tìm trong DB các order đã tồn tại, lấy các trường cần tracking
+        # Tìm trong DB các order đã tồn tại, lấy các trường cần tracking và hash lần đồng bộ trước
         existing_orders_tracking = self.sudo().search_read(
             domain=[('orderId', 'in', order_ids_incoming)],
-            fields=['id', 'orderId'] + self._fields_tracking()
+            fields=['id', 'orderId', 'sync_hash'] + self._fields_tracking()
         )
+        existing_orders_map = {o['orderId']: o['id'] for o in existing_orders_tracking}
         existing_orders_tracking_map = {o['orderId']: o for o in existing_orders_tracking}
 
         new_vals_list = []
         update_vals_list = []
+        lines_by_order = {}
+        line_parent_ids = {}
         map_fields = self._map_fields()
         sol_map_fields = self.env['jst.sale.order.line']._map_fields()
 
@@ -321,8 +365,15 @@ class JstSaleOrder(models.Model):
 
             # Update order đã tồn tại
             if order_id in existing_orders_map:
-                # order lines (các order lines cũ đã bị xóa)
-                jst_order['jst_sale_order_line_ids'] = [(0, 0, ol) for ol in order_lines_data]
+                # Payload không đổi so với lần đồng bộ trước: bỏ qua
+                payload_hash = self._jst_payload_hash(jst_order)
+                if existing_orders_tracking_map[order_id]['sync_hash'] == payload_hash:
+                    continue
+                jst_order['sync_hash'] = payload_hash
+
+                # order lines: chỉ tạo/sửa/xóa các line thay đổi
+                lines_by_order[str(order_id)] = order_lines_data
+                line_parent_ids[str(order_id)] = existing_orders_map[order_id]
 
                 # Tracking khi có thay đổi vào trường cần check
                 jst_order_tracking_data = []
@@ -339,26 +390,27 @@ class JstSaleOrder(models.Model):
 
             # Chưa đồng bộ: tạo mới
             else:
+                jst_order['sync_hash'] = self._jst_payload_hash(jst_order)
                 # tạo order lines
-                jst_order['jst_sale_order_line_ids'] = [(0, 0, ol) for ol in order_lines_data]
+                jst_order['jst_sale_order_line_ids'] = self._jst_line_commands(order_lines_data)
                 # tạo tracking theo từng field làm giá trị ban đầu
                 jst_order['jst_order_tracking_ids'] = [(0, 0, self._prepare_tracking_vals(line, field_check)) for field_check in self._fields_tracking()]
 
                 new_vals_list.append(jst_order)
 
-        # search tất cả order lines và cho chim cook thay vì dùng lệnh (5, 0, 0), giúp giảm update 200 orders từ 50s xuống còn khoảng dưới 5s
-        jst_order_lines_remove = self.env['jst.sale.order.line'].search([('orderId', 'in', order_ids_incoming)])
-        if jst_order_lines_remove:
-            jst_order_lines_remove.unlink()
-
         with self.env.cr.savepoint():
             # Create new orders
             if new_vals_list:
                 self.sudo().create(new_vals_list)
-            # Update orders
+            # Update orders (chỉ các order có thay đổi)
             for order_id, vals in update_vals_list:
                 order = self.browse(order_id)
                 order.sudo().write(vals)
+            # Order lines của các order được cập nhật: diff theo orderItemId
+            self._reconcile_jst_lines(
+                'jst.sale.order.line', 'orderId', 'orderItemId', lines_by_order,
+                parent_field='jst_sale_order_id', parent_ids=line_parent_ids,
+            )
 
     def _prepare_tracking_vals(self, data, field_check, existing_data=False):
         if existing_data:
@@ -525,8 +577,12 @@ class JstSaleOrder(models.Model):
         ts_end = ts_start + duration_minutes*60
         if ts_end > ts_now:
             ts_end = ts_now
+        # Lần chạy trước bị dừng giữa chừng: tiếp tục đúng khoảng thời gian đó
+        saved = self._get_sync_checkpoint('modify_time')
+        if saved.get('window') and saved['window'][0] == ts_start:
+            ts_end = saved['window'][1]
         print(ts_start, ts_end)
-        self.env['jst.sale.order'].action_sync_jst_orders(ts_start, ts_end)
+        self.env['jst.sale.order'].action_sync_jst_orders(ts_start, ts_end, checkpoint=True)
         # Sau khi đồng bộ xong cần update thời gian lần tiếp theo gọi
         next_ts_sync_order = str(ts_end + 1)
         ConfigParamater.set_param('jst.next_ts_sync_order', next_ts_sync_order)
@@ -546,7 +602,7 @@ class JstSaleOrder(models.Model):
         new_ts_start = ts_end - duration*3600
         if new_ts_start < ts_start:
             new_ts_start = ts_start
-        self.env['jst.sale.order'].action_sync_jst_orders(new_ts_start, ts_end, field='order_time', only_create=True)
+        self.env['jst.sale.order'].action_sync_jst_orders(new_ts_start, ts_end, field='order_time', only_create=True, checkpoint=True)
         
         # Sau khi đồng bộ xong cần update thời gian ts_end cho lần gọi tiếp theo
         new_ts_end = str(new_ts_start - 1)
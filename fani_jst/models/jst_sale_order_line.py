@@ -11,6 +11,7 @@ _logger = logging.getLogger(__name__)
 
 class JstSaleOrderLine(models.Model):
     _name = 'jst.sale.order.line'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Sale Order Line'
     _rec_name = 'orderItemId'
 
@@ -16,6 +16,7 @@ JST_STOCK_TRANFER_DETAIL_CONVERT_TO_STRING = ['allocationItemId', 'allocationId'
 class JstStockTranfer(models.Model):
     # docs: https://www.showdoc.com.cn/jsterp/7258080998815838
     _name = 'jst.stock.tranfer'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Stock Transfer'
 
     jst_stock_tranfer_detail_ids = fields.One2many('jst.stock.tranfer.detail', 'jst_stock_tranfer_id', string='JST Stock Transfer Details')
@@ -115,9 +116,10 @@ class JstStockTranfer(models.Model):
         # Tìm trong DB các allocationId đã tồn tại (chỉ load id + allocationId)
         existing_allocations = self.sudo().search_read(
             domain=[('allocationId', 'in', allocationId_list)],
-            fields=['id', 'allocationId']
+            fields=['id', 'allocationId', 'sync_hash']
         )
         existing_allocation_map = {o['allocationId']: o['id'] for o in existing_allocations}
+        existing_hash_map = {o['allocationId']: o['sync_hash'] for o in existing_allocations}
         
         new_vals_list = []
         update_vals_list = []
@@ -149,8 +151,12 @@ class JstStockTranfer(models.Model):
                     else:
                         jst_allocation[field_key] = value
 
+            payload_hash = self._jst_payload_hash(jst_allocation)
+            jst_allocation['sync_hash'] = payload_hash
             if allocationId_str in existing_allocation_map:
-                update_vals_list.append((existing_allocation_map[allocationId_str], jst_allocation))
+                # Payload không đổi so với lần đồng bộ trước: không cần ghi lại
+                if existing_hash_map[allocationId_str] != payload_hash:
+                    update_vals_list.append((existing_allocation_map[allocationId_str], jst_allocation))
             else:
                 new_vals_list.append(jst_allocation)
         
@@ -189,7 +195,7 @@ class JstStockTranfer(models.Model):
             )
             existing_allocation_map = {o['allocationId']: o['id'] for o in existing_allocations}
 
-            new_vals_list = []
+            details_by_allocation = {allocationId_str: [] for allocationId_str in allocationId_list_incoming}
             map_fields = self.env['jst.stock.tranfer.detail']._map_fields()
             # Duyệt qua data của từng Allocation details
             for line in data:
@@ -220,17 +226,10 @@ class JstStockTranfer(models.Model):
                             vals_line[field_key] = str(value)
                         else:
                             vals_line[field_key] = value
-                new_vals_list.append(vals_line)
-            
-            # Xóa các tranfer detail đã được update để tạo lại
-            jst_stock_tranfer_detail_remove = self.env['jst.stock.tranfer.detail'].search([('allocationId', 'in', allocationId_list_incoming)])
-            if jst_stock_tranfer_detail_remove:
-                jst_stock_tranfer_detail_remove.unlink()
+                details_by_allocation[allocationId_str].append(vals_line)
 
-            # Tạo/Tạo lại các tranfer detail
-            if new_vals_list:
-                with self.env.cr.savepoint():
-                    self.env['jst.stock.tranfer.detail'].sudo().create(new_vals_list)
+            # Tạo/sửa/xóa các tranfer detail thay đổi (theo allocationItemId)
+            self._reconcile_jst_lines('jst.stock.tranfer.detail', 'allocationId', 'allocationItemId', details_by_allocation)
 
     def _map_fields(self):
         # key: JST API key, value: Odoo field name
@@ -306,6 +305,7 @@ class JstStockTranfer(models.Model):
 class JstStockTranferDetail(models.Model):
     # docs: https://www.showdoc.com.cn/jsterp/7258085271720274
     _name = 'jst.stock.tranfer.detail'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Stock Transfer Detail'
 
     jst_stock_tranfer_id = fields.Many2one('jst.stock.tranfer', string='JST Stock Transfer', ondelete='cascade', index=True)
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from odoo import models, fields, api
+_logger = logging.getLogger(__name__)
+
+
+class JstSyncMixin(models.AbstractModel):
+    _name = 'jst.sync.mixin'
+    _description = 'JST Sync Mixin'
+
+    # Hash của payload lần đồng bộ gần nhất, dùng để bỏ qua record không thay đổi
+    sync_hash = fields.Char("Sync Hash", copy=False)
+
+    @api.model
+    def _jst_payload_hash(self, vals):
+        """
+        Hash ổn định của dict values (bỏ qua các lệnh one2many và sync_hash)
+        """
+        payload = {
+            key: value for key, value in vals.items()
+            if key != 'sync_hash' and not (isinstance(value, list) and value and isinstance(value[0], tuple))
+        }
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    @api.model
+    def _reconcile_jst_lines(self, line_model, link_field, key_field, lines_by_link, parent_field=None, parent_ids=None):
+        """
+        Đồng bộ lines theo kiểu diff thay vì xóa hết rồi tạo lại:
+            - line_model: model của lines (phải kế thừa jst.sync.mixin)
+            - link_field: field lưu mã JST của record cha trên line (vd: orderId)
+            - key_field: mã JST của line (vd: orderItemId), trùng key thì so theo thứ tự xuất hiện
+            - lines_by_link: {mã JST record cha: [vals line, ...]}
+            - parent_field/parent_ids: field Many2one tới record cha và {mã JST record cha: id} để gán cho line mới
+        Chỉ tạo mới / cập nhật / xóa các line có payload thay đổi.
+        """
+        if not lines_by_link:
+            return
+        Line = self.env[line_model].sudo()
+        existing_lines = Line.search_read(
+            domain=[(link_field, 'in', list(lines_by_link))],
+            fields=['id', link_field, key_field, 'sync_hash'],
+            order='id',
+        )
+        existing_map = {}
+        occurrences = defaultdict(int)
+        for line in existing_lines:
+            key = (str(line[link_field]), str(line[key_field] or ''))
+            existing_map[key + (occurrences[key],)] = line
+            occurrences[key] += 1
+
+        create_vals_list = []
+        update_vals_list = []
+        for link, vals_list in lines_by_link.items():
+            occurrences = defaultdict(int)
+            for vals in vals_list:
+                key = (str(link), str(vals.get(key_field) or ''))
+                existing = existing_map.pop(key + (occurrences[key],), None)
+                occurrences[key] += 1
+
+                payload_hash = self._jst_payload_hash(vals)
+                if existing and existing['sync_hash'] == payload_hash:
+                    continue
+                vals = dict(vals, sync_hash=payload_hash)
+                if parent_field and parent_ids:
+                    vals[parent_field] = parent_ids.get(link, False)
+                if existing:
+                    update_vals_list.append((existing['id'], vals))
+                else:
+                    create_vals_list.append(vals)
+
+        unlink_ids = [line['id'] for line in existing_map.values()]
+        with self.env.cr.savepoint():
+            if unlink_ids:
+                Line.browse(unlink_ids).unlink()
+            for line_id, vals in update_vals_list:
+                Line.browse(line_id).write(vals)
+            if create_vals_list:
+                Line.create(create_vals_list)
+        _logger.info("Reconcile %s: +%s ~%s -%s", line_model, len(create_vals_list), len(update_vals_list), len(unlink_ids))
+
+    @api.model
+    def _jst_line_commands(self, vals_list):
+        """
+        Lệnh (0, 0, vals) cho record cha mới, kèm sync_hash của từng line
+        """
+        return [(0, 0, dict(vals, sync_hash=self._jst_payload_hash(vals))) for vals in vals_list]
@@ -18,6 +18,7 @@ WAVE_SHIPPING_TO_STRING_FIELDS = ['companyId', 'waveId']
 
 class JstWaveShipping(models.Model):
     _name = 'jst.wave.shipping'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Wave Shipping'
     _rec_name = 'waveId'
     _order = 'created desc, waveId desc'
@@ -164,12 +165,15 @@ class JstWaveShipping(models.Model):
         # Tìm trong DB các wave đã tồn tại (chỉ load id + waveId)
         existing_waves = self.sudo().search_read(
             domain=[('waveId', 'in', wave_ids_incoming)],
-            fields=['id', 'waveId']
+            fields=['id', 'waveId', 'sync_hash']
         )
         existing_waves_map = {o['waveId']: o['id'] for o in existing_waves}
+        existing_hash_map = {o['waveId']: o['sync_hash'] for o in existing_waves}
 
         new_vals_list = []
         update_vals_list = []
+        items_by_wave = {}
+        inouts_by_wave = {}
         map_fields = self._map_fields()
         item_map_fields = self.env['jst.wave.shipping.item']._map_fields()
 
@@ -240,40 +244,45 @@ class JstWaveShipping(models.Model):
                         'orderId': str(inout.get('orderId')) if inout.get('orderId') else False
                     })
 
+            # Hash gồm cả odoo_inout_id đã map để wave được cập nhật khi phiếu inout xuất hiện
+            payload_hash = self._jst_payload_hash(dict(jst_wave, wave_inouts=wave_inouts_data))
+
             # Update wave đã tồn tại
             if wave_id_str in existing_waves_map:
-                # wave items (các wave items cũ đã bị xóa)
-                jst_wave['odoo_wave_shipping_item_ids'] = [(0, 0, wi) for wi in wave_items_data]
-                # wave inouts (các wave inouts cũ đã bị xóa)
-                jst_wave['odoo_wave_inout_ids'] = [(0, 0, wi) for wi in wave_inouts_data]
+                # Payload không đổi so với lần đồng bộ trước: bỏ qua
+                if existing_hash_map[wave_id_str] == payload_hash:
+                    continue
+                jst_wave['sync_hash'] = payload_hash
+                # wave items, wave inouts: chỉ tạo/sửa/xóa các line thay đổi
+                items_by_wave[wave_id_str] = wave_items_data
+                inouts_by_wave[wave_id_str] = wave_inouts_data
                 update_vals_list.append((existing_waves_map[wave_id_str], jst_wave))
             
             # Chưa đồng bộ: tạo mới
             else:
-                # wave items (các wave items cũ đã bị xóa)
-                jst_wave['odoo_wave_shipping_item_ids'] = [(0, 0, wi) for wi in wave_items_data]
-                # wave inouts (các wave inouts cũ đã bị xóa)
-                jst_wave['odoo_wave_inout_ids'] = [(0, 0, wi) for wi in wave_inouts_data]
+                jst_wave['sync_hash'] = payload_hash
+                jst_wave['odoo_wave_shipping_item_ids'] = self._jst_line_commands(wave_items_data)
+                jst_wave['odoo_wave_inout_ids'] = self._jst_line_commands(wave_inouts_data)
                 new_vals_list.append(jst_wave)
         
-        # search tất cả wave items và xóa thay vì dùng lệnh (5, 0, 0), giúp giảm update 200 waves từ 50s xuống còn khoảng dưới 5s
-        jst_wave_items_remove = self.env['jst.wave.shipping.item'].search([('waveId', 'in', wave_ids_incoming)])
-        if jst_wave_items_remove:
-            jst_wave_items_remove.unlink()
-        
-        # search tất cả wave inouts và xóa thay vì dùng lệnh (5, 0, 0), giúp giảm update 200 waves từ 50s xuống còn khoảng dưới 5s
-        jst_wave_inouts_remove = self.env['jst.wave.inout'].search([('waveId', 'in', wave_ids_incoming)])
-        if jst_wave_inouts_remove:
-            jst_wave_inouts_remove.unlink()
-        
         with self.env.cr.savepoint():
             # Create new waves
             if new_vals_list:
                 self.sudo().create(new_vals_list)
-            # Update waves
+            # Update waves (chỉ các wave có thay đổi)
             for wave_id, vals in update_vals_list:
                 wave = self.browse(wave_id)
                 wave.sudo().write(vals)
+            # Wave items (theo skuId), wave inouts (theo inoutId) của các wave được cập nhật
+            parent_ids = {wave_id: existing_waves_map[wave_id] for wave_id in items_by_wave}
+            self._reconcile_jst_lines(
+                'jst.wave.shipping.item', 'waveId', 'skuId', items_by_wave,
+                parent_field='odoo_wave_shipping_id', parent_ids=parent_ids,
+            )
+            self._reconcile_jst_lines(
+                'jst.wave.inout', 'waveId', 'inoutId', inouts_by_wave,
+                parent_field='odoo_wave_shipping_id', parent_ids=parent_ids,
+            )
 
 
     def _map_fields(self):
@@ -298,6 +307,7 @@ class JstWaveShipping(models.Model):
 
 class JstWaveInout(models.Model):
     _name = 'jst.wave.inout'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Wave Inout'
 
     # fields link to odoo
@@ -325,6 +335,7 @@ class JstWaveInout(models.Model):
 
 class JstWaveShippingItem(models.Model):
     _name = 'jst.wave.shipping.item'
+    _inherit = ['jst.sync.mixin']
     _description = 'JST Wave Shipping Item'
 
     odoo_wave_shipping_id = fields.Many2one(
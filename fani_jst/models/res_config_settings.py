@@ -5,12 +5,39 @@ import json
 import logging
 from odoo import fields, models, _
 from odoo.exceptions import UserError
+
+from .http_session import http_request
+
 _logger = logging.getLogger(__name__)
 
 
 JST_AUTH_URL = "https://asia.jsterp.com/account/companyauth/auth"
 JST_API_URL = "https://asiaopenapi.jsterp.com"
 
+
+def _send_api_jst_request(path_url, url, data, headers):
+    """Gửi request JST đã được ký sẵn (an toàn khi gọi từ thread khác)."""
+    # Call api
+    try:
+        resp = http_request('POST', url, data=data, headers=headers)
+
+    except requests.RequestException as e:
+        _logger.exception("Call JST '%s' failed: %s", path_url, e)
+        raise UserError(_("Cannot connect to JST: %s") % (e,))
+
+    if resp.status_code != 200:
+        body_preview = (resp.text or "")[:800]
+        raise UserError(_(
+            "JST API error (%(url)s): HTTP %(code)s\n%(body)s"
+        ) % {"url": resp.url, "code": resp.status_code, "body": body_preview})
+
+    try:
+        return resp.json()
+    except Exception:
+        _logger.error("Invalid JSON from JST (%s): %s", resp.url, resp.text[:800])
+        raise UserError(_("Invalid JSON response from JST"))
+
+
 class ResConfigSettings(models.TransientModel):
 
     _inherit = 'res.config.settings'
@@ -56,6 +83,14 @@ class ResConfigSettings(models.TransientModel):
         return jst_auth_url
 
     def _call_api_jst(self, path_url, body_data, headers_data=False):
+        url, data, headers = self._prepare_api_jst_request(path_url, body_data, headers_data)
+        return _send_api_jst_request(path_url, url, data, headers)
+
+    def _prepare_api_jst_request(self, path_url, body_data, headers_data=False):
+        """
+        Chuẩn bị url, body đã ký và headers cho request JST.
+        Tách riêng để có thể gửi request ở thread khác (không dùng env).
+        """
         url = JST_API_URL + path_url
         ConfigParamater = self.env['ir.config_parameter'].sudo()
         appkey = ConfigParamater.get_param('jst.appkey')
@@ -79,22 +114,4 @@ class ResConfigSettings(models.TransientModel):
             "Content-Type": "application/json",
         }
 
-        # Call api
-        try:
-            resp = requests.post(url, data=body_str.encode("utf-8"), headers=headers)
-
-        except requests.RequestException as e:
-            _logger.exception("Call JST '%s' failed: %s", path_url, e)
-            raise UserError(_("Cannot connect to JST: %s") % (e,))
-
-        if resp.status_code != 200:
-            body_preview = (resp.text or "")[:800]
-            raise UserError(_(
-                "JST API error (%(url)s): HTTP %(code)s\n%(body)s"
-            ) % {"url": resp.url, "code": resp.status_code, "body": body_preview})
-
-        try:
-            return resp.json()
-        except Exception:
-            _logger.error("Invalid JSON from JST (%s): %s", resp.url, resp.text[:800])
-            raise UserError(_("Invalid JSON response from JST"))
+        return url, body_str.encode("utf-8"), headers
@@ -1,7 +1,7 @@
 {
     'name': 'Lark Integration',
     "summary": "Lark Integration",
-    'version': "1.0.0",
+    'version': "1.0.1",
     "license": "LGPL-3",
     "category": "Sales",
     'depends': ['base_setup'],
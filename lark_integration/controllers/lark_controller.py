@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 from odoo import http
 from odoo.http import request
 
+from ..models.http_session import http_request
+
 
 class LarkController(http.Controller):
 
@@ -36,7 +38,7 @@ class LarkController(http.Controller):
             'redirect_uri': request.env['lark.api']._lark_get_redirect_uri()
         }
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = http_request('POST', url, json=payload, headers=headers)
             response.raise_for_status()
             data = response.json()
             if data.get('code') == 0:
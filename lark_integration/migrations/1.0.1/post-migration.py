@@ -0,0 +1,21 @@
+def _fill_record_views(cr):
+    """
+    Gán view cho record từ bảng tạm của pre-migration, sau đó bỏ cột lark_view_id cũ
+    """
+    cr.execute("SELECT to_regclass('lark_app_table_record_view_migration')")
+    if not cr.fetchone()[0]:
+        return
+    cr.execute("""
+        INSERT INTO lark_app_table_record_view_rel (lark_record_id, lark_view_id)
+        SELECT DISTINCT m.lark_record_id, m.lark_view_id
+        FROM lark_app_table_record_view_migration m
+        JOIN lark_app_table_record r ON r.id = m.lark_record_id
+        JOIN lark_file_bitable_table_view v ON v.id = m.lark_view_id
+        ON CONFLICT DO NOTHING
+    """)
+    cr.execute("DROP TABLE lark_app_table_record_view_migration")
+    cr.execute("ALTER TABLE lark_app_table_record DROP COLUMN IF EXISTS lark_view_id")
+
+
+def migrate(cr, version):
+    _fill_record_views(cr)
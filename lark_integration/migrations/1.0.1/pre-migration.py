@@ -0,0 +1,48 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def _merge_records_per_view(cr):
+    """
+    lark.app.table.record trước đây lưu 1 bản ghi cho mỗi (view, record): giữ lại 1 bản ghi
+    mới nhất cho mỗi (table, record_id), lưu tạm view của các bản ghi bị gộp để post-migration gán lại
+    """
+    cr.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'lark_app_table_record' AND column_name = 'lark_view_id'
+    """)
+    if not cr.fetchone():
+        return
+
+    # Gộp trên mọi bản ghi (kể cả bản ghi không có view) để unique(lark_table_id, record_id) cài được;
+    # chỉ lưu lại view của các bản ghi có view
+    cr.execute("""
+        CREATE TABLE IF NOT EXISTS lark_app_table_record_view_migration AS
+        SELECT lark_record_id, lark_view_id
+        FROM (
+            SELECT first_value(id) OVER (
+                       PARTITION BY lark_table_id, record_id
+                       ORDER BY last_modified_time DESC NULLS LAST, id DESC
+                   ) AS lark_record_id,
+                   lark_view_id
+            FROM lark_app_table_record
+        ) ranked
+        WHERE lark_view_id IS NOT NULL
+    """)
+    cr.execute("""
+        DELETE FROM lark_app_table_record r
+        USING (
+            SELECT id, row_number() OVER (
+                       PARTITION BY lark_table_id, record_id
+                       ORDER BY last_modified_time DESC NULLS LAST, id DESC
+                   ) AS position
+            FROM lark_app_table_record
+        ) ranked
+        WHERE ranked.id = r.id AND ranked.position > 1
+    """)
+    _logger.info(f"Merged {cr.rowcount} duplicated lark.app.table.record rows")
+
+
+def migrate(cr, version):
+    _merge_records_per_view(cr)
@@ -16,6 +16,8 @@ from lark_oapi.api.drive.v1 import *
 from odoo import models, fields, api
 from odoo.exceptions import UserError
 
+from .http_session import http_request
+
 _logger = logging.getLogger(__name__)
 
 
@@ -38,7 +40,7 @@ class LarkAPI(models.TransientModel):
             'app_secret': app_secret
         }
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = http_request('POST', url, json=payload, headers=headers)
             response.raise_for_status()
             data = response.json()
             if data.get('code') == 0:
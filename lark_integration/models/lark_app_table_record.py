@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import models, fields, api
 
 
 class LarkAppTableRecord(models.Model):
@@ -7,6 +7,8 @@ class LarkAppTableRecord(models.Model):
     _rec_name = 'record_id'
 
     fields_json = fields.Json(string='Fields')
+    # Giá trị từng ô đã chuyển sẵn sang text để hiển thị / lọc / sort phía server
+    flat_row = fields.Json(string='Flattened Row', compute='_compute_flat_row', store=True)
     record_id = fields.Char(string='Record Id', required=True)
     created_by = fields.Many2one('lark.person', "Create By")
     created_time = fields.Datetime("Create Time")
@@ -15,6 +17,31 @@ class LarkAppTableRecord(models.Model):
     shared_url = fields.Char("Shared Url")
     record_url = fields.Char("Record Url")
 
-    lark_table_id = fields.Many2one('lark.file.bitable.table', "Lark Table")
-    lark_view_id = fields.Many2one('lark.file.bitable.table.view', "Lark View")
+    lark_table_id = fields.Many2one('lark.file.bitable.table', "Lark Table", index=True)
+    lark_view_ids = fields.Many2many(
+        'lark.file.bitable.table.view', 'lark_app_table_record_view_rel', 'lark_record_id', 'lark_view_id',
+        string="Lark Views")
 
+    _sql_constraints = [
+        ('record_id_table_unique', 'unique(lark_table_id, record_id)', 'Record Id must be unique per table!'),
+    ]
+
+
+    @api.model
+    def _flatten_value(self, value):
+        if value is None or value is False:
+            return ""
+        if isinstance(value, list):
+            return ", ".join(self._flatten_value(v) for v in value)
+        if isinstance(value, dict):
+            for key in ('text', 'name', 'link', 'value'):
+                if key in value:
+                    return self._flatten_value(value[key])
+            return ""
+        return str(value)
+
+    @api.depends('fields_json')
+    def _compute_flat_row(self):
+        for record in self:
+            data = record.fields_json or {}
+            record.flat_row = {key: self._flatten_value(value) for key, value in data.items()}
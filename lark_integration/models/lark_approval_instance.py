@@ -2,6 +2,8 @@ from odoo import models, fields, api
 import requests
 import logging
 
+from .http_session import http_request
+
 _logger = logging.getLogger(__name__)
 
 
@@ -28,7 +30,7 @@ class LarkApprovalInstance(models.Model):
             'Content-Type': 'application/json'
         }
         try:
-            response = requests.get(url, headers=headers)
+            response = http_request('GET', url, headers=headers)
             response.raise_for_status()
             data = response.json()
             _logger.info(f"Approval Instance details response: {data}")
@@ -70,7 +72,7 @@ class LarkApprovalInstance(models.Model):
             'form': form_data
         }
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = http_request('POST', url, json=payload, headers=headers)
             response.raise_for_status()
             data = response.json()
             _logger.info(f"Create Approval Instance response: {data}")
@@ -108,7 +110,7 @@ class LarkApprovalInstance(models.Model):
             'Content-Type': 'application/json'
         }
         try:
-            response = requests.post(url, headers=headers)
+            response = http_request('POST', url, headers=headers)
             response.raise_for_status()
             data = response.json()
             _logger.info(f"Cancel Approval Instance response: {data}")
@@ -142,7 +144,7 @@ class LarkApprovalInstance(models.Model):
             'Content-Type': 'application/json'
         }
         try:
-            response = requests.get(url, headers=headers)
+            response = http_request('GET', url, headers=headers)
             response.raise_for_status()
             data = response.json()
             _logger.info(f"Approval Instances response: {data}")
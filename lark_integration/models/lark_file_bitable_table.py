@@ -1,16 +1,33 @@
 import logging
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import lark_oapi as lark
 from lark_oapi.api.bitable.v1 import *
 from lark_oapi.api.drive.v1 import *
 
-from odoo import models, fields, api
+from odoo import models, fields, api, Command
 from odoo.exceptions import UserError
+from odoo.tools.sql import escape_psql
 
 _logger = logging.getLogger(__name__)
 
+# Page size tối đa của API list records
+RECORD_PAGE_SIZE = 500
+# Lùi mốc watermark một chút để không sót record sửa cùng thời điểm lần sync trước
+RECORD_SYNC_OVERLAP = timedelta(minutes=5)
+# Field type "Last Modified Time" của Bitable
+LARK_MODIFIED_TIME_FIELD_TYPE = 1002
+# Loại field Lark có giá trị số (Number, DateTime, CreatedTime, ModifiedTime, Progress, Currency, Rating):
+# sort theo giá trị số thay vì text
+LARK_NUMERIC_FIELD_TYPES = (2, 5, 1001, 1002, 99002, 99003, 99004)
+# Số dòng mặc định / tối đa mỗi lần client lark_table_view tải dữ liệu
+TABLE_DATA_PAGE_SIZE = 200
+TABLE_DATA_MAX_LIMIT = 1000
+# Số record tối đa mỗi lần gọi batch_get
+BATCH_GET_SIZE = 100
+RETRY_MESSAGES = ('Gateway timeout. Please try again later.', 'Internal Server Error', 'Internal Error')
+
 
 class LarkFile(models.Model):
     _name = 'lark.file.bitable.table'
@@ -27,6 +44,11 @@ class LarkFile(models.Model):
     lark_field_ids = fields.One2many('lark.file.bitable.table.field', 'lark_table_id', string="Lark Fields")
     lark_record_ids = fields.One2many('lark.app.table.record', 'lark_table_id', string="Lark Records")
 
+    # Mốc last_modified_time của lần đồng bộ records gần nhất
+    sync_modified_watermark = fields.Datetime("Sync Modified Watermark", copy=False)
+    # Page token của lần đồng bộ records đang dở, dùng để chạy tiếp
+    sync_page_token = fields.Char("Sync Page Token", copy=False)
+
     def fetch_data(self):
         self.ensure_one()
         self._fetch_views()
@@ -188,6 +210,14 @@ class LarkFile(models.Model):
         self.env.cr.commit()
 
     def _fetch_records(self):
+        """
+        Đồng bộ records theo kiểu incremental:
+            - Data pass: nếu bảng có field Last Modified Time thì sort giảm dần theo field đó
+              và dừng khi gặp record cũ hơn mốc sync_modified_watermark, ngược lại quét toàn bộ
+            - Membership pass: chỉ lấy record_id của từng grid view để cập nhật view của record,
+              record có trong view nhưng chưa có ở local được lấy bổ sung bằng batch_get
+            - Deletion pass: xóa record local không còn nằm trong grid view nào
+        """
         self.ensure_one()
         if not self.user_id.lark_user_access_token:
             raise UserError("No App Access Token available.")
@@ -195,116 +225,243 @@ class LarkFile(models.Model):
         client = self.user_id._get_client()
         option = lark.RequestOption.builder().user_access_token(self.user_id.lark_user_access_token).build()
 
-        # Only fech Grid view
-        for lark_view in self.lark_view_ids.filtered(lambda v: v.view_type == 'grid'):
-            request = ListAppTableRecordRequest.builder() \
+        lark_person = self.env['lark.person'].search_read([], ['lark_person_id'])
+        person_map = {p['lark_person_id']: p['id'] for p in lark_person}
+
+        self._fetch_modified_records(client, option, person_map)
+        self._sync_record_views(client, option, person_map)
+
+        # Mốc cho lần sau = last_modified_time lớn nhất đã lưu (kể cả khi lần chạy này resume từ page token)
+        self.env.cr.execute("SELECT MAX(last_modified_time) FROM lark_app_table_record WHERE lark_table_id = %s", (self.id,))
+        self.sync_modified_watermark = self.env.cr.fetchone()[0] or False
+        self.env.cr.commit()
+
+    def _get_modified_time_field_name(self):
+        self.ensure_one()
+        modified_field = self.lark_field_ids.filtered(lambda f: f.type == LARK_MODIFIED_TIME_FIELD_TYPE)[:1]
+        return modified_field.field_name if modified_field else False
+
+    def _list_records_page(self, client, option, page_token=False, view_id=False, sort=False,
+                           field_names=False, automatic_fields=True):
+        """
+        Gọi API list records cho 1 page (retry khi Lark lỗi tạm thời), trả về response.data
+        """
+        builder = ListAppTableRecordRequest.builder() \
+            .app_token(self.lark_file_id.token) \
+            .table_id(self.table_id) \
+            .page_size(RECORD_PAGE_SIZE) \
+            .user_id_type("open_id") \
+            .automatic_fields(automatic_fields)
+        if view_id:
+            builder = builder.view_id(view_id)
+        if sort:
+            builder = builder.sort(json.dumps(sort, ensure_ascii=False))
+        if field_names:
+            builder = builder.field_names(json.dumps(field_names, ensure_ascii=False))
+        if page_token:
+            builder = builder.page_token(page_token)
+        request = builder.build()
+
+        time_retry = 0
+        while True:
+            response = client.bitable.v1.app_table_record.list(request, option)
+            if response.success():
+                return response.data
+            _logger.error(f"Failed to fetch Records: {response.code} - {response.msg}")
+            if response.msg in RETRY_MESSAGES and time_retry <= 10:
+                time_retry += 1
+                continue
+            raise UserError(f"Failed to fetch Records: {response.msg}")
+
+    def _fetch_modified_records(self, client, option, person_map):
+        """
+        Data pass: stream các record đã thay đổi từ sau mốc watermark, upsert và commit theo page.
+        Page token được lưu trên bảng để lần chạy sau tiếp tục nếu bị ngắt giữa chừng.
+        """
+        modified_field = self._get_modified_time_field_name()
+        watermark = False
+        sort = False
+        if modified_field:
+            sort = [f"{modified_field} DESC"]
+            if self.sync_modified_watermark:
+                watermark = self.sync_modified_watermark - RECORD_SYNC_OVERLAP
+
+        page_token = resume_token = self.sync_page_token or False
+        total = 0
+        while True:
+            try:
+                data = self._list_records_page(client, option, page_token=page_token, sort=sort)
+            except UserError:
+                if resume_token and page_token == resume_token:
+                    # Page token lưu từ lần trước có thể đã hết hạn: bỏ checkpoint, lần chạy sau đồng bộ lại từ đầu
+                    self.sync_page_token = False
+                    self.env.cr.commit()
+                raise
+
+            items = data.items or []
+            reached_watermark = False
+            if watermark:
+                newer_items = [
+                    item for item in items
+                    if not item.last_modified_time or self._lark_timestamp_to_datetime(item.last_modified_time) >= watermark
+                ]
+                reached_watermark = len(newer_items) < len(items)
+                items = newer_items
+            if items:
+                self._upsert_records_page(items, person_map)
+                total += len(items)
+
+            page_token = data.page_token if data.has_more and not reached_watermark else False
+            self.sync_page_token = page_token
+            self.env.cr.commit()
+            if not page_token:
+                break
+        _logger.info(f"Fetched {total} modified records of table {self.name} ({self.table_id})")
+
+    def _list_record_ids(self, client, option, view_id=False):
+        """
+        Lấy tập record_id (chỉ kèm primary field, không có automatic fields) của bảng hoặc 1 view
+        """
+        primary_field = self.lark_field_ids.filtered('is_primary')[:1]
+        field_names = [primary_field.field_name] if primary_field else False
+        record_ids = set()
+        page_token = False
+        while True:
+            data = self._list_records_page(
+                client, option, page_token=page_token, view_id=view_id,
+                field_names=field_names, automatic_fields=False,
+            )
+            record_ids.update(item.record_id for item in data.items or [])
+            if not data.has_more:
+                break
+            page_token = data.page_token
+        return record_ids
+
+    def _fetch_records_by_ids(self, client, option, record_ids, person_map):
+        """
+        Lấy chi tiết các record chưa có ở local (vd: record cũ vừa được đưa vào view) bằng batch_get
+        """
+        record_ids = list(record_ids)
+        for i in range(0, len(record_ids), BATCH_GET_SIZE):
+            request = BatchGetAppTableRecordRequest.builder() \
                 .app_token(self.lark_file_id.token) \
                 .table_id(self.table_id) \
-                .page_size(50) \
-                .view_id(lark_view.view_id)\
+                .request_body(BatchGetAppTableRecordRequestBody.builder()
+                              .record_ids(record_ids[i:i + BATCH_GET_SIZE])
+                              .user_id_type("open_id")
+                              .with_shared_url(True)
+                              .automatic_fields(True)
+                              .build()) \
                 .build()
             time_retry = 0
-            lark_records = []
             while True:
-                lark_record_ids = []
-                response = client.bitable.v1.app_table_record.list(request, option)
-
-                if not response.success():
-                    _logger.error(f"Failed to fetch Records: {response.code} - {response.msg}")
-                    if response.msg in ('Gateway timeout. Please try again later.', 'Internal Server Error', 'Internal Error'):
-                        if time_retry <= 10:
-                            time_retry += 1
-                            continue
-                    raise UserError(f"Failed to fetch Records: {response.msg}")
-
-                if response.data.items is not None:
-                    for item in response.data.items:
-                        lark_record_ids.append(item.record_id)
-
-                    batch_request = BatchGetAppTableRecordRequest.builder() \
-                        .app_token(self.lark_file_id.token) \
-                        .table_id(self.table_id) \
-                        .request_body(BatchGetAppTableRecordRequestBody.builder()
-                                      .record_ids(lark_record_ids)
-                                      .user_id_type("open_id")
-                                      .with_shared_url(True)
-                                      .automatic_fields(True)
-                                      .build()) \
-                        .build()
-
-                    batch_response = client.bitable.v1.app_table_record.batch_get(batch_request, option)
-                    if not batch_response.success():
-                        _logger.error(f"Failed to fetch Records: {batch_response.code} - {batch_response.msg}")
-                        if batch_response.msg in ('Gateway timeout. Please try again later.', 'Internal Server Error', 'Internal Error'):
-                            if time_retry <= 10:
-                                time_retry += 1
-                                continue
-                        raise UserError(f"Failed to fetch Records: {batch_response.msg}")
-                    if batch_response.data.records is not None:
-                        lark_records.extend(batch_response.data.records)
-                time_retry = 0
-
-                if not response.data.has_more:
+                response = client.bitable.v1.app_table_record.batch_get(request, option)
+                if response.success():
                     break
-                request = ListAppTableRecordRequest.builder() \
-                    .app_token(self.lark_file_id.token) \
-                    .table_id(self.table_id) \
-                    .view_id(lark_view.view_id)\
-                    .page_size(50) \
-                    .page_token(response.data.page_token) \
-                    .build()
-
-            record_vals = []
-            exists_records = self.env['lark.app.table.record'].search([
-                ('lark_table_id', '=', self.id),
-                ('lark_view_id', '=', lark_view.id),
-            ])
-            exists_records_ids = {r.record_id: r for r in exists_records}
-            lark_person = self.env['lark.person'].search_read([], ['lark_person_id'])
-            lark_person_id = {p['lark_person_id']: p['id'] for p in lark_person}
-
-            for lark_record in lark_records:
-                person_create_id = lark_person_id.get(lark_record.created_by.id, False)
-                if not person_create_id:
-                    person_create_id = self.env['lark.person'].create({
-                        'lark_person_id': lark_record.created_by.id,
-                        'avatar_url': lark_record.created_by.avatar_url,
-                        'email': lark_record.created_by.email,
-                        'en_name': lark_record.created_by.en_name,
-                        'name': lark_record.created_by.name,
-                    }).id
-                    lark_person_id[lark_record.created_by.id] = person_create_id
-                person_modifile_id = lark_person_id.get(lark_record.last_modified_by.id, False)
-                if not person_modifile_id:
-                    person_modifile_id = self.env['lark.person'].create({
-                        'lark_person_id': lark_record.last_modified_by.id,
-                        'avatar_url': lark_record.last_modified_by.avatar_url,
-                        'email': lark_record.last_modified_by.email,
-                        'en_name': lark_record.last_modified_by.en_name,
-                        'name': lark_record.last_modified_by.name,
-                    }).id
-                    lark_person_id[lark_record.last_modified_by.id] = person_modifile_id
-
-                val = {
-                    'fields_json': lark_record.fields,
-                    'record_id': lark_record.record_id,
-                    'created_by': person_create_id,
-                    'created_time': datetime.fromtimestamp(int(lark_record.created_time/1000)),
-                    'last_modified_by': person_modifile_id,
-                    'last_modified_time': datetime.fromtimestamp(int(lark_record.last_modified_time/1000)),
-                    'shared_url': lark_record.shared_url,
-                    'lark_table_id': self.id,
-                    'lark_view_id': lark_view.id,
-                }
-                exists_record = exists_records_ids.get(lark_record.record_id, False)
-                if exists_record:
-                    if exists_record.last_modified_time != val['last_modified_time']:
-                        exists_record.write(val)
-                else:
-                    record_vals.append(val)
-            if record_vals:
-                self.env['lark.app.table.record'].create(record_vals)
+                _logger.error(f"Failed to fetch Records: {response.code} - {response.msg}")
+                if response.msg in RETRY_MESSAGES and time_retry <= 10:
+                    time_retry += 1
+                    continue
+                raise UserError(f"Failed to fetch Records: {response.msg}")
+            if response.data.records:
+                self._upsert_records_page(response.data.records, person_map)
+            self.env.cr.commit()
+
+    def _sync_record_views(self, client, option, person_map):
+        """
+        Membership pass + deletion pass: so sánh tập record_id của từng grid view với dữ liệu local
+        """
+        # Only fech Grid view
+        grid_views = self.lark_view_ids.filtered(lambda v: v.view_type == 'grid')
+        view_record_ids = {}
+        for lark_view in grid_views:
+            view_record_ids[lark_view] = self._list_record_ids(client, option, view_id=lark_view.view_id)
+        if grid_views:
+            remote_ids = set().union(*view_record_ids.values())
+        else:
+            remote_ids = self._list_record_ids(client, option)
+
+        Record = self.env['lark.app.table.record']
+        local_records = Record.search_read([('lark_table_id', '=', self.id)], ['record_id'])
+        local_map = {r['record_id']: r['id'] for r in local_records}
+        missing_ids = remote_ids - set(local_map)
+        if missing_ids:
+            self._fetch_records_by_ids(client, option, missing_ids, person_map)
+            local_records = Record.search_read([('lark_table_id', '=', self.id), ('record_id', 'in', list(missing_ids))], ['record_id'])
+            local_map.update({r['record_id']: r['id'] for r in local_records})
+
+        for lark_view, record_ids in view_record_ids.items():
+            lark_view.lark_record_ids = [Command.set([local_map[r] for r in record_ids if r in local_map])]
+
+        deleted_ids = [record_id for key, record_id in local_map.items() if key not in remote_ids]
+        if deleted_ids:
+            Record.browse(deleted_ids).unlink()
         self.env.cr.commit()
+        _logger.info(f"Synced views of table {self.name} ({self.table_id}): {len(remote_ids)} records, "
+                     f"{len(missing_ids)} fetched, {len(deleted_ids)} deleted")
+
+    def _get_person_ids(self, persons, person_map):
+        """
+        Map danh sách lark Person -> id lark.person, tạo 1 lần các person chưa có
+        """
+        person_vals = {}
+        for person in persons:
+            if person and person.id and person.id not in person_map and person.id not in person_vals:
+                person_vals[person.id] = {
+                    'lark_person_id': person.id,
+                    'avatar_url': person.avatar_url,
+                    'email': person.email,
+                    'en_name': person.en_name,
+                    'name': person.name,
+                }
+        if person_vals:
+            new_persons = self.env['lark.person'].create(list(person_vals.values()))
+            for person in new_persons:
+                person_map[person.lark_person_id] = person.id
+        return person_map
+
+    @api.model
+    def _lark_timestamp_to_datetime(self, timestamp):
+        return datetime.fromtimestamp(int(timestamp / 1000)) if timestamp else False
+
+    def _upsert_records_page(self, lark_records, person_map):
+        """
+        Upsert 1 page records: prefetch record đã có theo record_id, create theo batch,
+        chỉ write record có last_modified_time thay đổi
+        """
+        Record = self.env['lark.app.table.record']
+        exists_records = Record.search_read([
+            ('lark_table_id', '=', self.id),
+            ('record_id', 'in', [r.record_id for r in lark_records]),
+        ], ['record_id', 'last_modified_time'])
+        exists_records_map = {r['record_id']: r for r in exists_records}
+
+        persons = []
+        for lark_record in lark_records:
+            persons.extend([lark_record.created_by, lark_record.last_modified_by])
+        self._get_person_ids(persons, person_map)
+
+        record_vals = []
+        for lark_record in lark_records:
+            val = {
+                'fields_json': lark_record.fields,
+                'record_id': lark_record.record_id,
+                'created_by': person_map.get(lark_record.created_by.id, False) if lark_record.created_by else False,
+                'created_time': self._lark_timestamp_to_datetime(lark_record.created_time),
+                'last_modified_by': person_map.get(lark_record.last_modified_by.id, False) if lark_record.last_modified_by else False,
+                'last_modified_time': self._lark_timestamp_to_datetime(lark_record.last_modified_time),
+                'lark_table_id': self.id,
+            }
+            if lark_record.shared_url:
+                val['shared_url'] = lark_record.shared_url
+            exists_record = exists_records_map.get(lark_record.record_id)
+            if exists_record:
+                if exists_record['last_modified_time'] != val['last_modified_time']:
+                    Record.browse(exists_record['id']).write(val)
+            else:
+                record_vals.append(val)
+        if record_vals:
+            Record.create(record_vals)
 
     def action_view_table(self):
         self.ensure_one()
@@ -317,36 +474,77 @@ class LarkFile(models.Model):
             },
         }
 
-    def get_table_data(self):
+    def get_table_data(self, offset=0, limit=TABLE_DATA_PAGE_SIZE, sort_field=False, sort_desc=False, filters=None, view_id=False):
+        """
+        Trả về 1 page dữ liệu bảng cho client action lark_table_view:
+            - offset/limit: phân trang, client tải thêm khi cuộn
+            - sort_field/sort_desc: sort theo 1 cột (tên field Lark hoặc 'Name'); cột số / ngày giờ
+              (LARK_NUMERIC_FIELD_TYPES) sort theo giá trị số, các cột khác sort theo text đã flatten
+            - filters: {tên cột: text} lọc ILIKE (chứa chuỗi, % và _ được escape) trên giá trị đã flatten
+            - view_id: chỉ lấy record thuộc view (id lark.file.bitable.table.view)
+        Dữ liệu đọc trực tiếp từ flat_row nên không phải flatten fields_json mỗi lần gọi.
+        """
         self.ensure_one()
+        self.check_access('read')
+        self.env['lark.app.table.record'].check_access('read')
+        self.env['lark.app.table.record'].flush_model(['flat_row', 'record_id', 'lark_table_id'])
+
         # Determine primary field to display as Name
-        primary_field = False
-        for f in self.lark_field_ids:
-            if f.is_primary:
-                primary_field = f.field_name
-                break
-        fields = [f.field_name for f in self.lark_field_ids]
-        fields_no_primary = [f for f in fields if f != primary_field] if primary_field else fields
-        out_fields = (['Name'] + fields_no_primary) if primary_field else fields
+        primary_field = self.lark_field_ids.filtered('is_primary')[:1].field_name
+        field_names = [f.field_name for f in self.lark_field_ids]
+        fields_no_primary = [f for f in field_names if f != primary_field] if primary_field else field_names
+        out_fields = (['Name'] + fields_no_primary) if primary_field else field_names
+
+        def column_key(column):
+            return primary_field if primary_field and column == 'Name' else column
+
+        joins = ""
+        where = ["r.lark_table_id = %s"]
+        params = [self.id]
+        if view_id:
+            joins = "JOIN lark_app_table_record_view_rel rel ON rel.lark_record_id = r.id AND rel.lark_view_id = %s"
+            params.insert(0, int(view_id))
+        for column, value in (filters or {}).items():
+            if column in out_fields and value not in (None, ''):
+                where.append("r.flat_row->>%s ILIKE %s")
+                params.extend([column_key(column), f"%{escape_psql(str(value))}%"])
+
+        self.env.cr.execute(
+            f"SELECT COUNT(*) FROM lark_app_table_record r {joins} WHERE {' AND '.join(where)}",
+            params,
+        )
+        total = self.env.cr.fetchone()[0]
+
+        order_params = []
+        order = "r.id"
+        if sort_field in out_fields:
+            sort_key = column_key(sort_field)
+            direction = 'DESC' if sort_desc else 'ASC'
+            sort_lark_field = self.lark_field_ids.filtered(lambda f: f.field_name == sort_key)[:1]
+            if sort_lark_field.type in LARK_NUMERIC_FIELD_TYPES:
+                # Giá trị không phải số (rỗng, text) xếp cuối
+                order = (f"CASE WHEN r.flat_row->>%s ~ '^-?[0-9]+(\\.[0-9]+)?$' "
+                         f"THEN (r.flat_row->>%s)::numeric END {direction} NULLS LAST, r.id")
+                order_params.extend([sort_key, sort_key])
+            else:
+                order = f"r.flat_row->>%s {direction} NULLS LAST, r.id"
+                order_params.append(sort_key)
+        self.env.cr.execute(
+            f"""SELECT r.record_id, r.flat_row FROM lark_app_table_record r {joins}
+                WHERE {' AND '.join(where)} ORDER BY {order} OFFSET %s LIMIT %s""",
+            params + order_params + [max(int(offset or 0), 0), min(int(limit or TABLE_DATA_PAGE_SIZE), TABLE_DATA_MAX_LIMIT)],
+        )
         rows = []
-        for rec in self.lark_record_ids:
-            row = {}
-            data = rec.fields_json or {}
+        for record_id, flat_row in self.env.cr.fetchall():
+            data = flat_row or {}
+            row = {field: data.get(field, "") for field in fields_no_primary}
             # Compute Name from primary field if available
             if primary_field:
-                name_val = data.get(primary_field, "")
-                if isinstance(name_val, list):
-                    name_val = ", ".join([v.get("text", "") for v in name_val])
-                row['Name'] = name_val or rec.record_id
-            # Fill remaining fields
-            for field in fields_no_primary if primary_field else fields:
-                val = data.get(field, "")
-                if isinstance(val, list):
-                    val = ", ".join([v.get("text", "") for v in val])
-                row[field] = val
-            row['record_id'] = rec.record_id
+                row['Name'] = data.get(primary_field) or record_id
+            row['record_id'] = record_id
             rows.append(row)
         return {
             "fields": out_fields,
             "rows": rows,
+            "total": total,
         }
@@ -18,3 +18,6 @@ class LarkFileBitableTableView(models.Model):
     ], string='View Type')
 
     lark_table_id = fields.Many2one('lark.file.bitable.table', "Lark Table")
+    lark_record_ids = fields.Many2many(
+        'lark.app.table.record', 'lark_app_table_record_view_rel', 'lark_view_id', 'lark_record_id',
+        string="Lark Records")
@@ -7,6 +7,8 @@ from urllib.parse import urlencode
 
 from odoo import models, fields, api
 
+from .http_session import http_request
+
 
 _logger = logging.getLogger(__name__)
 
@@ -41,7 +43,7 @@ class ResUsers(models.Model):
             'refresh_token': self.lark_user_refresh_token
         }
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = http_request('POST', url, json=payload, headers=headers)
             response.raise_for_status()
             data = response.json()
             if data.get('code') == 0:
@@ -102,7 +104,7 @@ class ResUsers(models.Model):
             'Content-Type': 'application/json'
         }
         try:
-            response = requests.get(url, headers=headers)
+            response = http_request('GET', url, headers=headers)
             response.raise_for_status()
             data = response.json()
             _logger.info(f"User Info response: {data}")
@@ -6,6 +6,10 @@ import { useService } from "@web/core/utils/hooks";
 import { standardActionServiceProps } from "@web/webclient/actions/action_service";
 import { ControlPanel } from "@web/search/control_panel/control_panel";
 
+// Số dòng mỗi lần tải, khoảng cách (px) tới cuối bảng thì tải page tiếp theo
+const PAGE_SIZE = 200;
+const SCROLL_THRESHOLD = 300;
+
 class LarkTableView extends Component {
     static components = { ControlPanel };
     static props = { ...standardActionServiceProps };
@@ -14,31 +18,92 @@ class LarkTableView extends Component {
     setup() {
         this.action = useService("action");
         this.orm = useService("orm");
-        this.state = useState({ fields: [], rows: [] });
+        this.state = useState({
+            fields: [],
+            rows: [],
+            total: 0,
+            loading: false,
+            sortField: false,
+            sortDesc: false,
+            filters: {},
+        });
         this.display = useState({ title: this.props.action && this.props.action.name ? this.props.action.name : "" });
+        this.tableId = this.props.action.params.table_id;
+        // Bỏ qua kết quả của request cũ khi sort/filter thay đổi giữa chừng
+        this.requestId = 0;
 
         onWillStart(async () => {
-            const tableId = this.props.action.params.table_id;
-            // Load table data
-            const data = await this.orm.call(
-                "lark.file.bitable.table",
-                "get_table_data",
-                [[tableId]]
-            );
-            this.state.fields = data.fields;
-            this.state.rows = data.rows;
+            await this.loadRows(true);
 
             // Prefer action name from backend; fallback to record read if empty
             if (!this.display.title) {
                 const records = await this.orm.read(
                     "lark.file.bitable.table",
-                    [tableId],
+                    [this.tableId],
                     ["name"]
                 );
                 this.display.title = records && records[0] ? records[0].name : this.display.title;
             }
         });
     }
+
+    get hasMore() {
+        return this.state.rows.length < this.state.total;
+    }
+
+    async loadRows(reset = false) {
+        if (!reset && (this.state.loading || !this.hasMore)) {
+            return;
+        }
+        const requestId = ++this.requestId;
+        this.state.loading = true;
+        try {
+            const data = await this.orm.call(
+                "lark.file.bitable.table",
+                "get_table_data",
+                [[this.tableId]],
+                {
+                    offset: reset ? 0 : this.state.rows.length,
+                    limit: PAGE_SIZE,
+                    sort_field: this.state.sortField,
+                    sort_desc: this.state.sortDesc,
+                    filters: this.state.filters,
+                }
+            );
+            if (requestId !== this.requestId) {
+                return;
+            }
+            this.state.fields = data.fields;
+            this.state.rows = reset ? data.rows : [...this.state.rows, ...data.rows];
+            this.state.total = data.total;
+        } finally {
+            if (requestId === this.requestId) {
+                this.state.loading = false;
+            }
+        }
+    }
+
+    onScroll(ev) {
+        const el = ev.target;
+        if (el.scrollHeight - el.scrollTop - el.clientHeight < SCROLL_THRESHOLD) {
+            this.loadRows();
+        }
+    }
+
+    onSort(field) {
+        if (this.state.sortField === field) {
+            this.state.sortDesc = !this.state.sortDesc;
+        } else {
+            this.state.sortField = field;
+            this.state.sortDesc = false;
+        }
+        this.loadRows(true);
+    }
+
+    onFilterChange(field, ev) {
+        this.state.filters = { ...this.state.filters, [field]: ev.target.value };
+        this.loadRows(true);
+    }
 }
 
 registry.category("actions").add("lark_table_view", LarkTableView);
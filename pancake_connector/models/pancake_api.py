@@ -1,13 +1,53 @@
 # -*- coding: utf-8 -*-
+import json
 import logging
 import requests
 from dateutil import parser
-from odoo import models, _
+from odoo import fields, models, _
 from odoo.exceptions import UserError
 
+from .http_session import http_request
+
 _logger = logging.getLogger(__name__)
 
 
+def pancake_send(method, url, api_key, params=None, json=None, headers=None, timeout=30):
+    """
+    Gửi 1 request tới Pancake và trả về JSON đã parse.
+    Không dùng env nên gọi được từ worker thread (vd: fetch geo song song).
+    """
+    if not api_key:
+        raise UserError(_("Missing API key for Pancake"))
+
+    q = dict(params or {})
+    q["api_key"] = api_key
+
+    req_headers = {"Accept": "application/json"}
+    if headers:
+        req_headers.update(headers)
+
+    try:
+        if method in ("GET", "DELETE"):
+            resp = http_request(method, url, params=q, headers=req_headers, timeout=timeout)
+        else:
+            resp = http_request(method, url, params=q, json=json, headers=req_headers, timeout=timeout)
+    except requests.RequestException as e:
+        _logger.exception("Pancake %s %s failed: %s", method, url, e)
+        raise UserError(_("Cannot connect to Pancake: %s") % (e,))
+
+    if resp.status_code != 200:
+        body_preview = (resp.text or "")[:800]
+        raise UserError(_(
+            "Pancake API error (%(method)s %(url)s): HTTP %(code)s\n%(body)s"
+        ) % {"method": method, "url": resp.url, "code": resp.status_code, "body": body_preview})
+
+    try:
+        return resp.json()
+    except Exception:
+        _logger.error("Invalid JSON from Pancake (%s %s): %s", method, resp.url, resp.text[:800])
+        raise UserError(_("Invalid JSON response from Pancake"))
+
+
 class PancakeApiMixin(models.AbstractModel):
     _name = "pancake.api.mixin"
     _description = "Reusable Pancake API client"
@@ -38,52 +78,13 @@ class PancakeApiMixin(models.AbstractModel):
         - Supports GET/POST/PUT/PATCH/DELETE.
         - Returns parsed JSON (dict/list).
         """
-        if not api_key:
-            raise UserError(_("Missing API key for Pancake"))
         method = self._normalize_method(method)
 
         # Base URL ưu tiên: đối tượng (vd: shop.base_url) > system parameter
         base = self._pancake_base_url()
         if not path.startswith("/"):
             path = "/" + path
-        url = f"{base}{path}"
-
-        q = dict(params or {})
-        q["api_key"] = api_key
-
-        req_headers = {"Accept": "application/json"}
-        if headers:
-            req_headers.update(headers)
-
-        try:
-            if method == "GET":
-                resp = requests.get(url, params=q, headers=req_headers, timeout=timeout)
-            elif method == "POST":
-                resp = requests.post(url, params=q, json=json, headers=req_headers, timeout=timeout)
-            elif method == "PUT":
-                resp = requests.put(url, params=q, json=json, headers=req_headers, timeout=timeout)
-            elif method == "PATCH":
-                resp = requests.patch(url, params=q, json=json, headers=req_headers, timeout=timeout)
-            elif method == "DELETE":
-                resp = requests.delete(url, params=q, headers=req_headers, timeout=timeout)
-            else:
-                # Should never reach here due to _normalize_method
-                raise UserError(_("Unsupported HTTP method: %s") % method)
-        except requests.RequestException as e:
-            _logger.exception("Pancake %s %s failed: %s", method, url, e)
-            raise UserError(_("Cannot connect to Pancake: %s") % (e,))
-
-        if resp.status_code != 200:
-            body_preview = (resp.text or "")[:800]
-            raise UserError(_(
-                "Pancake API error (%(method)s %(url)s): HTTP %(code)s\n%(body)s"
-            ) % {"method": method, "url": resp.url, "code": resp.status_code, "body": body_preview})
-
-        try:
-            return resp.json()
-        except Exception:
-            _logger.error("Invalid JSON from Pancake (%s %s): %s", method, resp.url, resp.text[:800])
-            raise UserError(_("Invalid JSON response from Pancake"))
+        return pancake_send(method, f"{base}{path}", api_key, params=params, json=json, headers=headers, timeout=timeout)
 
     def _pancake_get(self, api_key, path, params=None, timeout=30):
         """Wrapper GET để dùng nhanh ở các tác vụ đọc."""
@@ -104,6 +105,65 @@ class PancakeApiMixin(models.AbstractModel):
             return rec
         return self.env[model].create(values)
 
+    def _bulk_upsert(self, model, key_field, values_list, domain=None, compare_fields=()):
+        """
+        Upsert nhiều records cùng lúc theo key_field (set-based):
+        - 1 query `key_field IN (...)` (kèm domain, vd: shop_id) để tìm records đã có
+        - record đã có mà mọi field trong compare_fields bằng giá trị mới thì bỏ qua,
+          còn lại `write` gom nhóm theo values giống nhau
+        - 1 lệnh `create` cho tất cả records mới
+
+        Returns:
+            tuple: ({key: record_id}, set key đã create, set key đã write)
+        """
+        Model = self.env[model]
+
+        def normalize(field_name, value):
+            if Model._fields[field_name].type == "datetime" and value:
+                value = fields.Datetime.to_datetime(value)
+                return value.replace(tzinfo=None) if value.tzinfo else value
+            return value or False
+
+        # Gộp trùng theo key, bản ghi sau cùng thắng
+        values_by_key = {values[key_field]: values for values in values_list if values.get(key_field)}
+        if not values_by_key:
+            return {}, set(), set()
+
+        existing = Model.search_read(
+            list(domain or []) + [(key_field, "in", list(values_by_key))],
+            [key_field] + list(compare_fields),
+            load=None,
+        )
+
+        id_map = {}
+        updated_keys = set()
+        write_groups = {}
+        for row in existing:
+            key = row[key_field]
+            if key in id_map:
+                continue
+            id_map[key] = row["id"]
+            values = values_by_key[key]
+            if compare_fields and all(
+                normalize(name, row[name]) == normalize(name, values.get(name)) for name in compare_fields
+            ):
+                continue
+            write_values = {k: v for k, v in values.items() if k != key_field}
+            group_key = json.dumps(write_values, sort_keys=True, default=str)
+            write_groups.setdefault(group_key, (write_values, []))[1].append(row["id"])
+            updated_keys.add(key)
+
+        for write_values, record_ids in write_groups.values():
+            Model.browse(record_ids).write(write_values)
+
+        created_keys = [key for key in values_by_key if key not in id_map]
+        if created_keys:
+            new_records = Model.create([values_by_key[key] for key in created_keys])
+            for key, record in zip(created_keys, new_records):
+                id_map[key] = record.id
+
+        return id_map, set(created_keys), updated_keys
+
     def _parse_dt(self, s):
         """Parse ISO-8601 datetime strings (e.g., 2020-04-01T10:18:41, with/without Z/ms)."""
         if not s:
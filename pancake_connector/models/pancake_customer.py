@@ -1,6 +1,6 @@
 import logging
 from datetime import datetime
-from odoo import fields, models
+from odoo import fields, models, tools
 
 _logger = logging.getLogger(__name__)
 
@@ -79,6 +79,22 @@ class PancakeCustomer(models.Model):
          "Customer must be unique by (Shop, Pancake ID)."),
     ]
 
+    def _get_geo_id_map(self, model_name):
+        """
+        Map pancake_id -> id của 1 model danh mục geo, cache trong process.
+        Key cache gồm (số record, id lớn nhất) của bảng nên map tự làm mới khi có geo được tạo / xóa
+        (pancake_id của 1 record không đổi), không cần xóa cache.
+        """
+        Model = self.env[model_name].sudo()
+        Model.flush_model(["pancake_id"])
+        self.env.cr.execute(f"SELECT COUNT(*), MAX(id) FROM {Model._table}")
+        return self._get_geo_id_map_cached(model_name, tuple(self.env.cr.fetchone()))
+
+    @tools.ormcache("model_name", "generation")
+    def _get_geo_id_map_cached(self, model_name, generation):
+        records = self.env[model_name].sudo().search_read([], ["pancake_id"])
+        return {r["pancake_id"]: r["id"] for r in records}
+
     def _fetch_from_pancake(self, shop, updated_since=None, page_size=30, max_pages=None):
         """
         Private method: Đồng bộ danh sách Customers từ Pancake.
@@ -86,6 +102,10 @@ class PancakeCustomer(models.Model):
         - page_size: số record mỗi lần gọi API (mặc định 30, tối đa 100).
         - max_pages: giới hạn số trang để tránh loop quá lớn (None = lấy hết).
         """
+        province_map = self._get_geo_id_map("pancake.geo.province")
+        district_map = self._get_geo_id_map("pancake.geo.district")
+        commune_map = self._get_geo_id_map("pancake.geo.commune")
+
         page_number = 1
         total_imported = 0
         customers = self.env["pancake.customer"].browse()
@@ -139,12 +159,9 @@ class PancakeCustomer(models.Model):
                         "address_line": addr.get("address"),
                         "full_address": addr.get("full_address"),
                         "country_code": addr.get("country_code"),
-                        "province_id": self.env["pancake.geo.province"]
-                            .search([("pancake_id", "=", str(addr.get("province_id")))], limit=1).id,
-                        "district_id": self.env["pancake.geo.district"]
-                            .search([("pancake_id", "=", str(addr.get("district_id")))], limit=1).id,
-                        "commune_id": self.env["pancake.geo.commune"]
-                            .search([("pancake_id", "=", str(addr.get("commune_id")))], limit=1).id,
+                        "province_id": province_map.get(str(addr.get("province_id")), False),
+                        "district_id": district_map.get(str(addr.get("district_id")), False),
+                        "commune_id": commune_map.get(str(addr.get("commune_id")), False),
                         "raw_payload": addr,
                     }
                     dom_addr = [("customer_id", "=", customer.id), ("pancake_id", "=", addr_vals["pancake_id"])]
@@ -1,6 +1,18 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from odoo import fields, models
 
+from .pancake_api import pancake_send
+
+_logger = logging.getLogger(__name__)
+
+# Số request /geo/communes chạy song song
+GEO_FETCH_WORKERS = 8
+
 
 class PancakeGeoCommune(models.Model):
     _name = "pancake.geo.commune"
@@ -63,40 +75,64 @@ class PancakeGeoCommune(models.Model):
         Private method: Tải danh mục phường/xã từ /geo/communes cho từng district truyền vào
         (hoặc toàn bộ districts đã có nếu không truyền).
         API yêu cầu cả province_id và district_id trong query.
+        - Gọi API song song (tối đa GEO_FETCH_WORKERS request cùng lúc), ghi DB ở thread chính
+        - Bỏ qua district có dữ liệu communes không đổi so với lần trước (so hash payload)
         """
         if district_records is None:
             district_records = self.env["pancake.geo.district"].sudo().search([])
 
-        communes = self.env["pancake.geo.commune"].browse()
-        for dist in district_records:
-            if not dist.province_id or not dist.province_id.pancake_id:
-                # Bảo đảm có province liên kết và có mã pancake_id
+        # Bảo đảm có province liên kết và có mã pancake_id
+        districts = district_records.filtered(lambda d: d.province_id and d.province_id.pancake_id)
+        url = f"{shop._pancake_base_url()}/geo/communes"
+        jobs = {
+            dist.id: {"province_id": dist.province_id.pancake_id, "district_id": dist.pancake_id}
+            for dist in districts
+        }
+        results = {}
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(len(jobs), GEO_FETCH_WORKERS)) as executor:
+                future_to_district = {
+                    executor.submit(pancake_send, "GET", url, shop.api_key, params=params): district_id
+                    for district_id, params in jobs.items()
+                }
+                for future in as_completed(future_to_district):
+                    # Lỗi của 1 district không làm mất kết quả các district khác
+                    try:
+                        results[future_to_district[future]] = future.result()
+                    except Exception as e:
+                        results[future_to_district[future]] = e
+
+        commune_ids = []
+        skipped = 0
+        failed = 0
+        for dist in districts:
+            result = results.get(dist.id)
+            if isinstance(result, Exception):
+                failed += 1
+                _logger.warning("Failed to fetch communes for district %s: %s", dist.pancake_id, result)
                 continue
-            params = {
-                "province_id": dist.province_id.pancake_id,
-                "district_id": dist.pancake_id,
-            }
-            payload = shop._pancake_get(
-                api_key=shop.api_key,
-                path="/geo/communes",
-                params=params,
-            )
-            items = (payload or {}).get("data") or []
+            items = (result or {}).get("data") or []
             if not items:
                 continue
+            communes_hash = hashlib.sha1(json.dumps(items, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            if dist.communes_hash == communes_hash:
+                skipped += 1
+                continue
 
-            for it in items:
-                vals = {
-                    "pancake_id": str(it.get("id")) if it.get("id") is not None else False,
-                    "name": it.get("name"),
-                    "name_en": it.get("name_en"),
-                    "new_id": it.get("new_id"),
-                    "postcode": it.get("postcode"),
-                    # link M2O tới district/province nội bộ (đã fetch ở bước trước)
-                    "district_id": dist.id,
-                    "province_id": dist.province_id.id,
-                    "raw_payload": it,
-                }
-                dom = [("pancake_id", "=", vals["pancake_id"])]
-                communes |= shop._upsert("pancake.geo.commune", dom, vals)
-        return communes
+            vals_list = [{
+                "pancake_id": str(it.get("id")) if it.get("id") is not None else False,
+                "name": it.get("name"),
+                "name_en": it.get("name_en"),
+                "new_id": it.get("new_id"),
+                "postcode": it.get("postcode"),
+                # link M2O tới district/province nội bộ (đã fetch ở bước trước)
+                "district_id": dist.id,
+                "province_id": dist.province_id.id,
+                "raw_payload": it,
+            } for it in items]
+            id_map, _created, _updated = shop._bulk_upsert("pancake.geo.commune", "pancake_id", vals_list)
+            commune_ids.extend(id_map.values())
+            dist.communes_hash = communes_hash
+
+        _logger.info("Fetched communes for %s districts (%s unchanged, %s failed)", len(districts), skipped, failed)
+        return self.env["pancake.geo.commune"].browse(commune_ids)
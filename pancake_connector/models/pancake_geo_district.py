@@ -35,6 +35,8 @@ class PancakeGeoDistrict(models.Model):
     )
 
     raw_payload = fields.Json(string="Raw Payload")
+    # Hash payload /geo/communes lần fetch gần nhất, để bỏ qua district không đổi
+    communes_hash = fields.Char(string="Communes Hash", copy=False)
 
     # Quan hệ ngược
     commune_ids = fields.One2many(
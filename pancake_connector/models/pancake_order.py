@@ -187,20 +187,22 @@ class PancakeOrder(models.Model):
         - Incremental nếu truyền updated_since (dùng start_time_updated_at).
         - Map customer/page nếu tìm được; nếu không thì để trống.
         - Các block phức tạp (shipping_address, promotion_advances, tags, payments...) để JSON theo thiết kế.
-        - Items: xóa hết items cũ của order rồi tạo lại theo payload mới (đơn giản & luôn đúng).
+        - Mỗi page được upsert theo lô (xem _import_orders_page) và commit ngay.
 
         extra_params: dict các filter bổ sung (vd: {"status": 20})
-        """
-        OrderItem = self.env["pancake.order.item"].sudo()
-        Page = self.env["pancake.page"].sudo()
-        Customer = self.env["pancake.customer"].sudo()
 
+        Returns:
+            dict: số đơn fetched / created / updated / skipped
+        """
         if not shop.pancake_id:
             raise ValueError(_("Shop %s missing pancake_id, fetch pages first.") % shop.display_name)
 
+        # Map page 1 lần cho cả lần chạy (số page của shop nhỏ)
+        pages = self.env["pancake.page"].sudo().search_read([("shop_id", "=", shop.id)], ["pancake_id"])
+        page_map = {p["pancake_id"]: p["id"] for p in pages}
+
         page_number = 1
-        total_imported = 0
-        orders = self.env["pancake.order"].browse()
+        counts = {"fetched": 0, "created": 0, "updated": 0, "skipped": 0}
         while True:
             params = {"page_number": page_number, "page_size": page_size}
             if updated_since:
@@ -220,160 +222,11 @@ class PancakeOrder(models.Model):
             if not data:
                 break
 
-            for it in data:
-                # Resolve page_id (Many2one) từ order.page_id (mã bên Pancake)
-                page_rec_id = False
-                if it.get("page_id"):
-                    page_rec = Page.search([
-                        ("shop_id", "=", shop.id),
-                        ("pancake_id", "=", str(it.get("page_id")))
-                    ], limit=1)
-                    page_rec_id = page_rec.id or False
-
-                # Resolve customer_id nếu payload có block customer và id
-                cust_rec_id = False
-                cust_block = it.get("customer") or {}
-                if cust_block.get("id"):
-                    cust_rec = Customer.search([
-                        ("shop_id", "=", shop.id),
-                        ("pancake_id", "=", str(cust_block.get("id")))
-                    ], limit=1)
-                    cust_rec_id = cust_rec.id or False
-
-                # Map các field đã định nghĩa trong model pancake.order
-                vals = {
-                    "pancake_id": str(it.get("id")),
-                    "system_id": it.get("system_id"),
-                    "shop_id": shop.id,
-                    "page_id": page_rec_id,
-                    "customer_id": cust_rec_id,
-
-                    "status": str(it.get("status")) if it.get("status") is not None else False,
-                    "sub_status": str(it.get("sub_status")) if it.get("sub_status") is not None else False,
-                    "is_livestream": it.get("is_livestream"),
-                    "is_live_shopping": it.get("is_live_shopping"),
-                    "is_smc": it.get("is_smc"),
-                    "is_from_ecommerce": it.get("is_from_ecommerce"),
-                    "is_linked_partner": it.get("is_linked_partner"),
-                    "received_at_shop": it.get("received_at_shop"),
-
-                    "account": it.get("account"),
-                    "account_name": it.get("account_name"),
-                    "order_sources": it.get("order_sources"),
-                    "ads_source": it.get("ads_source"),
-                    "post_id": it.get("post_id"),
-
-                    "warehouse_id": it.get("warehouse_id"),
-                    "warehouse_info": it.get("warehouse_info"),
-                    "shipping_fee": it.get("shipping_fee"),
-                    "partner_fee": it.get("partner_fee"),
-                    "cod": it.get("cod"),
-                    "customer_pay_fee": it.get("customer_pay_fee"),
-
-                    "total_discount": it.get("total_discount"),
-                    "discount": it.get("discount"),
-                    "discount_by_customer_level": it.get("discount_by_customer_level"),
-                    "surcharge": it.get("surcharge"),
-                    "cost_surcharge": it.get("cost_surcharge"),
-                    "tax": it.get("tax"),
-
-                    "cash": it.get("cash"),
-                    "transfer_money": it.get("transfer_money"),
-                    "charged_by_card": it.get("charged_by_card"),
-                    "charged_by_momo": it.get("charged_by_momo"),
-                    "charged_by_vnpay": it.get("charged_by_vnpay"),
-                    "charged_by_qrpay": it.get("charged_by_qrpay"),
-                    "charged_by_fundiin": it.get("charged_by_fundiin"),
-                    "charged_by_kredivo": it.get("charged_by_kredivo"),
-                    "bank_payments": it.get("bank_payments"),
-                    "bank_transfer_images": it.get("bank_transfer_images"),
-
-                    "bill_full_name": it.get("bill_full_name"),
-                    "bill_email": it.get("bill_email"),
-                    "duplicated_phone": it.get("duplicated_phone"),
-                    "duplicated_customer": it.get("duplicated_customer"),
-
-                    "creator_id": it.get("creator_id"),
-                    "creator": it.get("creator"),
-                    "last_editor_id": it.get("last_editor_id"),
-                    "last_editor": it.get("last_editor"),
-                    "assigning_seller_id": it.get("assigning_seller_id"),
-                    "assigning_seller": it.get("assigning_seller"),
-                    "assigning_care_id": it.get("assigning_care_id"),
-                    "assigning_care": it.get("assigning_care"),
-                    "marketer": it.get("marketer"),
-                    "pke_mkter": it.get("pke_mkter"),
-                    "viewing": it.get("viewing"),
-
-                    # JSON blocks theo yêu cầu
-                    "partner": it.get("partner"),
-                    "shipping_address_json": it.get("shipping_address"),
-                    "activated_combo_products": it.get("activated_combo_products"),
-                    "activated_promotion_advances_json": it.get("activated_promotion_advances"),
-                    "tags_json": it.get("tags"),
-                    "order_currency": it.get("order_currency"),
-                    "einvoices": it.get("einvoices"),
-
-                    # Times (parse bằng helper)
-                    "inserted_at": shop._parse_dt(it.get("inserted_at")),
-                    "updated_at": shop._parse_dt(it.get("updated_at")),
-                    "last_update_status_at": shop._parse_dt(it.get("last_update_status_at")),
-                    "time_assign_care": shop._parse_dt(it.get("time_assign_care")),
-                    "time_send_partner": shop._parse_dt(it.get("time_send_partner")),
-                    "estimate_delivery_date": shop._parse_dt(it.get("estimate_delivery_date")),
-                    "status_history": it.get("status_history"),
-                    "histories": it.get("histories"),
-
-                    "note": it.get("note"),
-                    "note_print": it.get("note_print"),
-                    "note_image": it.get("note_image"),
-                    "custom_id": it.get("custom_id"),
-                    "order_returned_ids": it.get("order_returned_ids"),
-                    "returned_reason": it.get("returned_reason"),
-                    "link_confirm_order": it.get("link_confirm_order"),
-
-                    # Toàn bộ payload để lần vết
-                    "raw_payload": it,
-                }
-
-                # Upsert Order theo (shop_id, pancake_id)
-                dom = [("shop_id", "=", shop.id), ("pancake_id", "=", vals["pancake_id"])]
-                order_rec = shop._upsert("pancake.order", dom, vals)
-                orders |= order_rec
-
-                # ---- Sync Items: xóa cũ, tạo mới ----
-                # (Đơn giản & luôn đúng với payload hiện tại)
-                order_rec.item_ids.unlink()
-                for item in (it.get("items") or []):
-                    item_vals = {
-                        "order_id": order_rec.id,
-                        "product_id_ext": str(item.get("product_id")) if item.get("product_id") is not None else False,
-                        "variation_id_ext": str(item.get("variation_id")) if item.get("variation_id") is not None else False,
-
-                        "name": item.get("name"),
-                        "sku": item.get("sku"),
-
-                        "quantity": item.get("quantity"),
-                        "price": item.get("price"),
-                        "discount_each_product": item.get("discount_each_product"),
-                        "is_discount_percent": item.get("is_discount_percent"),
-                        "subtotal": item.get("subtotal"),
-                        "total": item.get("total"),
-
-                        "measure_group_id": item.get("measure_group_id"),
-                        "is_bonus_product": item.get("is_bonus_product"),
-                        "is_composite": item.get("is_composite"),
-                        "is_wholesale": item.get("is_wholesale"),
-                        "note": item.get("note") or item.get("note_product"),
-
-                        "variation_info_json": item.get("variation_info"),
-                        "components_json": item.get("components"),
-
-                        "raw_payload": item,
-                    }
-                    OrderItem.create(item_vals)
-
-            total_imported += len(data)
+            page_counts = self._import_orders_page(shop, data, page_map)
+            for key, value in page_counts.items():
+                counts[key] += value
+            counts["fetched"] += len(data)
+            self.env.cr.commit()
 
             # Điều hướng phân trang
             meta = (payload or {}).get("meta") or {}
@@ -385,5 +238,189 @@ class PancakeOrder(models.Model):
             if max_pages and page_number > max_pages:
                 break
 
-        _logger.info("Fetched %s orders for shop %s", total_imported, shop.name)
-        return orders
+        _logger.info(
+            "Fetched %s orders for shop %s (created %s, updated %s, unchanged %s)",
+            counts["fetched"], shop.name, counts["created"], counts["updated"], counts["skipped"],
+        )
+        return counts
+
+    def _import_orders_page(self, shop, data, page_map):
+        """
+        Upsert 1 page orders theo lô:
+        - Map customer theo pancake_id của cả page (1 query)
+        - Diff orders theo pancake_id, bỏ qua đơn có updated_at, page và customer không đổi
+        - Items của đơn mới/đã thay đổi: xóa cũ rồi tạo lại bằng 1 lệnh create
+        """
+        OrderItem = self.env["pancake.order.item"].sudo()
+
+        customer_ids = list({
+            str((it.get("customer") or {}).get("id"))
+            for it in data if (it.get("customer") or {}).get("id")
+        })
+        customer_map = {}
+        if customer_ids:
+            customers = self.env["pancake.customer"].sudo().search_read(
+                [("shop_id", "=", shop.id), ("pancake_id", "in", customer_ids)], ["pancake_id"])
+            customer_map = {c["pancake_id"]: c["id"] for c in customers}
+
+        values_list = []
+        items_by_order = {}
+        for it in data:
+            if it.get("id") is None:
+                continue
+            vals = self._prepare_order_vals(shop, it, page_map, customer_map)
+            values_list.append(vals)
+            items_by_order[vals["pancake_id"]] = it.get("items") or []
+
+        # Đơn có updated_at không đổi vẫn được ghi nếu page/customer vừa resolve được (sync sau đơn)
+        id_map, created_keys, updated_keys = shop._bulk_upsert(
+            "pancake.order", "pancake_id", values_list,
+            domain=[("shop_id", "=", shop.id)],
+            compare_fields=("updated_at", "page_id", "customer_id"),
+        )
+
+        # ---- Sync Items: xóa cũ, tạo mới cho các đơn đã thay đổi ----
+        changed_keys = created_keys | updated_keys
+        changed_order_ids = [id_map[key] for key in changed_keys]
+        if changed_order_ids:
+            OrderItem.search([("order_id", "in", changed_order_ids)]).unlink()
+            item_vals_list = [
+                self._prepare_order_item_vals(item, id_map[key])
+                for key in changed_keys
+                for item in items_by_order[key]
+            ]
+            if item_vals_list:
+                OrderItem.create(item_vals_list)
+
+        return {
+            "created": len(created_keys),
+            "updated": len(updated_keys),
+            "skipped": len(id_map) - len(changed_keys),
+        }
+
+    def _prepare_order_vals(self, shop, it, page_map, customer_map):
+        """Map các field đã định nghĩa trong model pancake.order từ payload 1 đơn"""
+        cust_id = (it.get("customer") or {}).get("id")
+        return {
+            "pancake_id": str(it.get("id")),
+            "system_id": it.get("system_id"),
+            "shop_id": shop.id,
+            "page_id": page_map.get(str(it.get("page_id")), False) if it.get("page_id") else False,
+            "customer_id": customer_map.get(str(cust_id), False) if cust_id else False,
+
+            "status": str(it.get("status")) if it.get("status") is not None else False,
+            "sub_status": str(it.get("sub_status")) if it.get("sub_status") is not None else False,
+            "is_livestream": it.get("is_livestream"),
+            "is_live_shopping": it.get("is_live_shopping"),
+            "is_smc": it.get("is_smc"),
+            "is_from_ecommerce": it.get("is_from_ecommerce"),
+            "is_linked_partner": it.get("is_linked_partner"),
+            "received_at_shop": it.get("received_at_shop"),
+
+            "account": it.get("account"),
+            "account_name": it.get("account_name"),
+            "order_sources": it.get("order_sources"),
+            "ads_source": it.get("ads_source"),
+            "post_id": it.get("post_id"),
+
+            "warehouse_id": it.get("warehouse_id"),
+            "warehouse_info": it.get("warehouse_info"),
+            "shipping_fee": it.get("shipping_fee"),
+            "partner_fee": it.get("partner_fee"),
+            "cod": it.get("cod"),
+            "customer_pay_fee": it.get("customer_pay_fee"),
+
+            "total_discount": it.get("total_discount"),
+            "discount": it.get("discount"),
+            "discount_by_customer_level": it.get("discount_by_customer_level"),
+            "surcharge": it.get("surcharge"),
+            "cost_surcharge": it.get("cost_surcharge"),
+            "tax": it.get("tax"),
+
+            "cash": it.get("cash"),
+            "transfer_money": it.get("transfer_money"),
+            "charged_by_card": it.get("charged_by_card"),
+            "charged_by_momo": it.get("charged_by_momo"),
+            "charged_by_vnpay": it.get("charged_by_vnpay"),
+            "charged_by_qrpay": it.get("charged_by_qrpay"),
+            "charged_by_fundiin": it.get("charged_by_fundiin"),
+            "charged_by_kredivo": it.get("charged_by_kredivo"),
+            "bank_payments": it.get("bank_payments"),
+            "bank_transfer_images": it.get("bank_transfer_images"),
+
+            "bill_full_name": it.get("bill_full_name"),
+            "bill_email": it.get("bill_email"),
+            "duplicated_phone": it.get("duplicated_phone"),
+            "duplicated_customer": it.get("duplicated_customer"),
+
+            "creator_id": it.get("creator_id"),
+            "creator": it.get("creator"),
+            "last_editor_id": it.get("last_editor_id"),
+            "last_editor": it.get("last_editor"),
+            "assigning_seller_id": it.get("assigning_seller_id"),
+            "assigning_seller": it.get("assigning_seller"),
+            "assigning_care_id": it.get("assigning_care_id"),
+            "assigning_care": it.get("assigning_care"),
+            "marketer": it.get("marketer"),
+            "pke_mkter": it.get("pke_mkter"),
+            "viewing": it.get("viewing"),
+
+            # JSON blocks theo yêu cầu
+            "partner": it.get("partner"),
+            "shipping_address_json": it.get("shipping_address"),
+            "activated_combo_products": it.get("activated_combo_products"),
+            "activated_promotion_advances_json": it.get("activated_promotion_advances"),
+            "tags_json": it.get("tags"),
+            "order_currency": it.get("order_currency"),
+            "einvoices": it.get("einvoices"),
+
+            # Times (parse bằng helper)
+            "inserted_at": shop._parse_dt(it.get("inserted_at")),
+            "updated_at": shop._parse_dt(it.get("updated_at")),
+            "last_update_status_at": shop._parse_dt(it.get("last_update_status_at")),
+            "time_assign_care": shop._parse_dt(it.get("time_assign_care")),
+            "time_send_partner": shop._parse_dt(it.get("time_send_partner")),
+            "estimate_delivery_date": shop._parse_dt(it.get("estimate_delivery_date")),
+            "status_history": it.get("status_history"),
+            "histories": it.get("histories"),
+
+            "note": it.get("note"),
+            "note_print": it.get("note_print"),
+            "note_image": it.get("note_image"),
+            "custom_id": it.get("custom_id"),
+            "order_returned_ids": it.get("order_returned_ids"),
+            "returned_reason": it.get("returned_reason"),
+            "link_confirm_order": it.get("link_confirm_order"),
+
+            # Toàn bộ payload để lần vết
+            "raw_payload": it,
+        }
+
+    def _prepare_order_item_vals(self, item, order_id):
+        """Map 1 phần tử items[] của đơn sang values pancake.order.item"""
+        return {
+            "order_id": order_id,
+            "product_id_ext": str(item.get("product_id")) if item.get("product_id") is not None else False,
+            "variation_id_ext": str(item.get("variation_id")) if item.get("variation_id") is not None else False,
+
+            "name": item.get("name"),
+            "sku": item.get("sku"),
+
+            "quantity": item.get("quantity"),
+            "price": item.get("price"),
+            "discount_each_product": item.get("discount_each_product"),
+            "is_discount_percent": item.get("is_discount_percent"),
+            "subtotal": item.get("subtotal"),
+            "total": item.get("total"),
+
+            "measure_group_id": item.get("measure_group_id"),
+            "is_bonus_product": item.get("is_bonus_product"),
+            "is_composite": item.get("is_composite"),
+            "is_wholesale": item.get("is_wholesale"),
+            "note": item.get("note") or item.get("note_product"),
+
+            "variation_info_json": item.get("variation_info"),
+            "components_json": item.get("components"),
+
+            "raw_payload": item,
+        }
@@ -179,8 +179,9 @@ class PancakeShop(models.Model):
         - Multiple shops: chạy đa luồng
         """
         if len(self) == 1:
-            # Single shop - chạy trực tiếp
-            return self._fetch_orders(self)
+            # Single shop - chạy trực tiếp (kết quả là dict số lượng, không trả về cho button)
+            self._fetch_orders(self)
+            return True
         else:
             # Multiple shops - chạy đa luồng
             return self._run_multi_thread_tasks(
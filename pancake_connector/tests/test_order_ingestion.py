@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestOrderIngestion(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.shop = cls.env['pancake.shop'].create({
+            'pancake_id': 'SHOP1',
+            'name': 'Test Shop',
+            'api_key': 'key',
+        })
+        cls.Order = cls.env['pancake.order']
+
+    def _order_data(self, pancake_id, updated_at, **extra):
+        data = {
+            'id': pancake_id,
+            'status': 1,
+            'updated_at': updated_at,
+            'items': [],
+        }
+        data.update(extra)
+        return data
+
+    def _import(self, data):
+        pages = self.env['pancake.page'].search_read([('shop_id', '=', self.shop.id)], ['pancake_id'])
+        page_map = {page['pancake_id']: page['id'] for page in pages}
+        return self.Order._import_orders_page(self.shop, data, page_map)
+
+    def test_bulk_upsert_reports_created_and_updated(self):
+        vals = [
+            {'pancake_id': 'C1', 'shop_id': self.shop.id, 'name': 'First'},
+            {'pancake_id': 'C2', 'shop_id': self.shop.id, 'name': 'Second'},
+        ]
+        id_map, created, updated = self.shop._bulk_upsert('pancake.customer', 'pancake_id', vals)
+        self.assertEqual(created, {'C1', 'C2'})
+        self.assertFalse(updated)
+
+        vals[0]['name'] = 'First renamed'
+        id_map_2, created_2, updated_2 = self.shop._bulk_upsert(
+            'pancake.customer', 'pancake_id', vals, compare_fields=('name',))
+        self.assertEqual(id_map_2, id_map)
+        self.assertFalse(created_2)
+        self.assertEqual(updated_2, {'C1'}, "Only the customer whose compared field changed is written")
+
+    def test_import_counts(self):
+        counts = self._import([
+            self._order_data('O1', '2025-01-01T10:00:00'),
+            self._order_data('O2', '2025-01-01T10:00:00'),
+        ])
+        self.assertEqual(counts, {'created': 2, 'updated': 0, 'skipped': 0})
+
+        counts = self._import([
+            self._order_data('O1', '2025-01-01T10:00:00'),
+            self._order_data('O2', '2025-01-02T08:00:00'),
+        ])
+        self.assertEqual(counts, {'created': 0, 'updated': 1, 'skipped': 1})
+
+    def test_unchanged_order_picks_up_late_page_and_customer(self):
+        data = [self._order_data('O1', '2025-01-01T10:00:00', page_id='PAGE1', customer={'id': 'CUS1'})]
+        self._import(data)
+        order = self.Order.search([('shop_id', '=', self.shop.id), ('pancake_id', '=', 'O1')])
+        self.assertFalse(order.page_id)
+        self.assertFalse(order.customer_id)
+
+        page = self.env['pancake.page'].create({'pancake_id': 'PAGE1', 'shop_id': self.shop.id, 'name': 'Page'})
+        customer = self.env['pancake.customer'].create({'pancake_id': 'CUS1', 'shop_id': self.shop.id})
+        counts = self._import(data)
+        self.assertEqual(counts['updated'], 1)
+        self.assertEqual(order.page_id, page)
+        self.assertEqual(order.customer_id, customer)
+
+    def test_geo_id_map_sees_new_records(self):
+        Customer = self.env['pancake.customer']
+        Province = self.env['pancake.geo.province']
+        Province.create({'pancake_id': 'PRV1', 'name': 'Province 1'})
+        self.assertIn('PRV1', Customer._get_geo_id_map('pancake.geo.province'))
+
+        province = Province.create({'pancake_id': 'PRV2', 'name': 'Province 2'})
+        self.assertEqual(Customer._get_geo_id_map('pancake.geo.province').get('PRV2'), province.id,
+                         "Creating a province must change the cache generation")
@@ -6,6 +6,12 @@
     'author': 'Fani',
     'license': 'LGPL-3',
     'depends': ['base'],
+    'external_dependencies': {
+        'python': [
+            'pandas',
+            'openpyxl',
+        ],
+    },
     'data': [
         'security/ir.model.access.csv',
         'data/cron_data.xml',
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields
 
 
 class ShopeeAdsCpcReport(models.Model):
@@ -197,50 +197,36 @@ class ShopeeAdsCpcReport(models.Model):
         help='Tỷ lệ Click Sản phẩm (%)'
     )
 
-    # ==================== HELPER METHODS ====================
-    @api.model
-    def _import_row(self, shop_id, report_date, row_data):
-        """Tạo record từ dữ liệu CSV row"""
-        # Parse row data (row_data là dict từ CSV)
-        vals = {
-            'shop_id': shop_id,
-            'report_date': report_date,
-            'campaign_name': row_data.get('Tên Dịch vụ Hiển thị', ''),
-            'status': row_data.get('Trạng thái', ''),
-            'campaign_type': row_data.get('Loại Dịch vụ Hiển thị', ''),
-            'product_id': row_data.get('Mã sản phẩm', ''),
-            'target_setting': row_data.get('Cài đặt Đối tượng', ''),
-            'campaign_content': row_data.get('Nội dung Dịch vụ Hiển thị', ''),
-            'bidding_method': row_data.get('Phương thức đấu thầu', ''),
-            'position': row_data.get('Vị trí', ''),
-            'views': int(row_data.get('Số lượt xem', 0)),
-            'clicks': int(row_data.get('Số lượt click', 0)),
-            'click_rate': self._parse_percentage(row_data.get('Tỷ Lệ Click', '0%')),
-            'conversions': int(row_data.get('Lượt chuyển đổi', 0)),
-            'direct_conversions': int(row_data.get('Lượt chuyển đổi trực tiếp', 0)),
-            'conversion_rate': self._parse_percentage(row_data.get('Tỷ lệ chuyển đổi', '0%')),
-            'direct_conversion_rate': self._parse_percentage(row_data.get('Tỷ lệ chuyển đổi trực tiếp', '0%')),
-            'cost_per_conversion': float(row_data.get('Chi phí cho mỗi lượt chuyển đổi', 0)),
-            'cost_per_direct_conversion': float(row_data.get('Chi phí cho mỗi lượt chuyển đổi trực tiếp', 0)),
-            'products_sold': int(row_data.get('Sản phẩm đã bán', 0)),
-            'direct_products_sold': int(row_data.get('Sản phẩm đã bán trực tiếp', 0)),
-            'gmv': float(row_data.get('GMV', 0)),
-            'direct_gmv': float(row_data.get('GMV trực tiếp', 0)),
-            'cost': float(row_data.get('Chi phí', 0)),
-            'roas': float(row_data.get('ROAS', 0)),
-            'direct_roas': float(row_data.get('ROAS trực tiếp', 0)),
-            'acos': self._parse_percentage(row_data.get('ACOS', '0%')),
-            'direct_acos': self._parse_percentage(row_data.get('ACOS trực tiếp', '0%')),
-            'product_views': int(row_data.get('Lượt xem Sản phẩm', 0) or 0),
-            'product_clicks': int(row_data.get('Lượt clicks Sản phẩm', 0) or 0),
-            'product_click_rate': self._parse_percentage(row_data.get('Tỷ lệ Click Sản phẩm', '0%')),
-        }
-
-        return self._upsert(
-            [
-                ('shop_id', '=', shop_id),
-                ('report_date', '=', report_date),
-                ('campaign_name', '=', vals['campaign_name'])
-            ],
-            vals
-        )
+    # ==================== IMPORT MAPPING ====================
+    _import_key_fields = ['shop_id', 'report_date', 'campaign_name']
+    _import_column_map = {
+        'campaign_name': ('Tên Dịch vụ Hiển thị', 'char'),
+        'status': ('Trạng thái', 'char'),
+        'campaign_type': ('Loại Dịch vụ Hiển thị', 'char'),
+        'product_id': ('Mã sản phẩm', 'char'),
+        'target_setting': ('Cài đặt Đối tượng', 'char'),
+        'campaign_content': ('Nội dung Dịch vụ Hiển thị', 'char'),
+        'bidding_method': ('Phương thức đấu thầu', 'char'),
+        'position': ('Vị trí', 'char'),
+        'views': ('Số lượt xem', 'int'),
+        'clicks': ('Số lượt click', 'int'),
+        'click_rate': ('Tỷ Lệ Click', 'percentage'),
+        'conversions': ('Lượt chuyển đổi', 'int'),
+        'direct_conversions': ('Lượt chuyển đổi trực tiếp', 'int'),
+        'conversion_rate': ('Tỷ lệ chuyển đổi', 'percentage'),
+        'direct_conversion_rate': ('Tỷ lệ chuyển đổi trực tiếp', 'percentage'),
+        'cost_per_conversion': ('Chi phí cho mỗi lượt chuyển đổi', 'float'),
+        'cost_per_direct_conversion': ('Chi phí cho mỗi lượt chuyển đổi trực tiếp', 'float'),
+        'products_sold': ('Sản phẩm đã bán', 'int'),
+        'direct_products_sold': ('Sản phẩm đã bán trực tiếp', 'int'),
+        'gmv': ('GMV', 'float'),
+        'direct_gmv': ('GMV trực tiếp', 'float'),
+        'cost': ('Chi phí', 'float'),
+        'roas': ('ROAS', 'float'),
+        'direct_roas': ('ROAS trực tiếp', 'float'),
+        'acos': ('ACOS', 'percentage'),
+        'direct_acos': ('ACOS trực tiếp', 'percentage'),
+        'product_views': ('Lượt xem Sản phẩm', 'int'),
+        'product_clicks': ('Lượt clicks Sản phẩm', 'int'),
+        'product_click_rate': ('Tỷ lệ Click Sản phẩm', 'percentage'),
+    }
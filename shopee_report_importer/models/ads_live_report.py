@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields
 
 
 class ShopeeAdsLiveReport(models.Model):
@@ -111,36 +111,22 @@ class ShopeeAdsLiveReport(models.Model):
         help='ROAS'
     )
 
-    # ==================== HELPER METHODS ====================
-    @api.model
-    def _import_row(self, shop_id, report_date, row_data):
-        """Tạo record từ dữ liệu CSV row"""
-        # Parse row data (row_data là dict từ CSV)
-        vals = {
-            'shop_id': shop_id,
-            'report_date': report_date,
-            'campaign_name': row_data.get('Tên chiến dịch', ''),
-            'campaign_id': row_data.get('ID chiến dịch', ''),
-            'status': row_data.get('Trạng thái', ''),
-            'objective': row_data.get('Mục tiêu', ''),
-            'start_date': self._parse_date(row_data.get('Ngày bắt đầu', ''), '%d/%m/%Y'),
-            'end_date': self._parse_date(row_data.get('Ngày kết thúc', ''), '%d/%m/%Y'),
-            'daily_start_time': row_data.get('Giờ bắt đầu hàng ngày', ''),
-            'daily_end_time': row_data.get('Giờ kết thúc hàng ngày', ''),
-            'budget': float(row_data.get('Ngân sách', 0)),
-            'views': int(row_data.get('Lượt xem', 0)),
-            'orders': int(row_data.get('Số đơn hàng', 0)),
-            'conversion_rate': self._parse_percentage(row_data.get('Tỷ lệ chuyển đổi', '0%')),
-            'gmv': float(row_data.get('GMV', 0)),
-            'cost': float(row_data.get('Chi phí', 0)),
-            'roas': float(row_data.get('ROAS', 0)),
-        }
-
-        return self._upsert(
-            [
-                ('shop_id', '=', shop_id),
-                ('report_date', '=', report_date),
-                ('campaign_id', '=', vals['campaign_id'])
-            ],
-            vals
-        )
+    # ==================== IMPORT MAPPING ====================
+    _import_key_fields = ['shop_id', 'report_date', 'campaign_id']
+    _import_column_map = {
+        'campaign_name': ('Tên chiến dịch', 'char'),
+        'campaign_id': ('ID chiến dịch', 'char'),
+        'status': ('Trạng thái', 'char'),
+        'objective': ('Mục tiêu', 'char'),
+        'start_date': ('Ngày bắt đầu', 'date', '%d/%m/%Y'),
+        'end_date': ('Ngày kết thúc', 'date', '%d/%m/%Y'),
+        'daily_start_time': ('Giờ bắt đầu hàng ngày', 'char'),
+        'daily_end_time': ('Giờ kết thúc hàng ngày', 'char'),
+        'budget': ('Ngân sách', 'float'),
+        'views': ('Lượt xem', 'int'),
+        'orders': ('Số đơn hàng', 'int'),
+        'conversion_rate': ('Tỷ lệ chuyển đổi', 'percentage'),
+        'gmv': ('GMV', 'float'),
+        'cost': ('Chi phí', 'float'),
+        'roas': ('ROAS', 'float'),
+    }
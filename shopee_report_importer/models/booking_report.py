@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields
 
 
 class ShopeeBookingReport(models.Model):
@@ -92,32 +92,18 @@ class ShopeeBookingReport(models.Model):
         help='Người mua mới'
     )
 
-    # ==================== HELPER METHODS ====================
-    @api.model
-    def _import_row(self, shop_id, report_date, row_data):
-        """Tạo record từ dữ liệu CSV row"""
-        # Parse row data (row_data là dict từ CSV)
-        vals = {
-            'shop_id': shop_id,
-            'report_date': report_date,
-            'product_id': row_data.get('Mã sản phẩm', ''),
-            'product_name': row_data.get('Tên sản phẩm', ''),
-            'price': self._parse_float(row_data.get('Giá(₫)', '0')),
-            'revenue': self._parse_float(row_data.get('Doanh thu(₫)', '0')),
-            'products_sold': int(row_data.get('Sản phẩm đã bán', 0)),
-            'orders': int(row_data.get('Số đơn hàng', 0)),
-            'estimated_commission': self._parse_float(row_data.get('Hoa hồng ước tính(₫)', '0')),
-            'estimated_commission_rate': self._parse_float(row_data.get('Hoa hồng ước tính', '0')),
-            'roi': float(row_data.get('ROI', 0)),
-            'total_buyers': int(row_data.get('Tất cả người mua', 0)),
-            'new_buyers': int(row_data.get('Người mua mới', 0)),
-        }
-
-        return self._upsert(
-            [
-                ('shop_id', '=', shop_id),
-                ('report_date', '=', report_date),
-                ('product_id', '=', vals['product_id'])
-            ],
-            vals
-        )
+    # ==================== IMPORT MAPPING ====================
+    _import_key_fields = ['shop_id', 'report_date', 'product_id']
+    _import_column_map = {
+        'product_id': ('Mã sản phẩm', 'char'),
+        'product_name': ('Tên sản phẩm', 'char'),
+        'price': ('Giá(₫)', 'float'),
+        'revenue': ('Doanh thu(₫)', 'float'),
+        'products_sold': ('Sản phẩm đã bán', 'int'),
+        'orders': ('Số đơn hàng', 'int'),
+        'estimated_commission': ('Hoa hồng ước tính(₫)', 'float'),
+        'estimated_commission_rate': ('Hoa hồng ước tính', 'float'),
+        'roi': ('ROI', 'float'),
+        'total_buyers': ('Tất cả người mua', 'int'),
+        'new_buyers': ('Người mua mới', 'int'),
+    }
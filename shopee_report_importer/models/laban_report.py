@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import pandas as pd
 from odoo import models, fields, api
 
 
@@ -151,47 +152,53 @@ class ShopeeLabanReport(models.Model):
         help='Tỷ lệ chuyển đổi (Từ Đơn đã đặt thành Đơn đã xác nhận) (%)'
     )
 
-    # ==================== HELPER METHODS ====================
+    # ==================== IMPORT MAPPING ====================
+    _import_key_fields = ['shop_id', 'report_date', 'hour']
+    _import_column_map = {
+        'product_visits': ('Lượt truy cập sản phẩm', 'int'),
+        'product_page_views': ('Lượt xem trang sản phẩm', 'int'),
+        'products_accessed': ('Sản phẩm được truy cập', 'int'),
+        'bounce_count': ('Số lượng khách thoát trang sản phẩm', 'int'),
+        'bounce_rate': ('Tỷ lệ thoát Trang sản phẩm', 'percentage'),
+        'search_clicks': ('Lượt click từ Trang tìm kiếm', 'int'),
+        'likes': ('Lượt thích', 'int'),
+        'add_to_cart_visits': ('Lượt truy cập sản phẩm (Thêm vào giỏ hàng)', 'int'),
+        'products_added_to_cart': ('Sản phẩm (Thêm vào giỏ hàng)', 'int'),
+        'add_to_cart_conversion_rate': ('Tỷ lệ chuyển đổi (theo lượt thêm vào giỏ hàng)', 'percentage'),
+        'buyers_placed_orders': ('Người mua đã đặt hàng', 'int'),
+        'products_in_placed_orders': ('Sản phẩm (Đơn đã đặt)', 'int'),
+        'products_sold': ('Số sản phẩm đã bán', 'int'),
+        'placed_orders_revenue': ('Doanh số (Đơn đã đặt) (VND)', 'float'),
+        'order_conversion_rate': ('Tỷ lệ chuyển đổi (Đơn đã đặt)', 'percentage'),
+        'buyers_confirmed_orders': ('Người mua có đơn đã xác nhận', 'int'),
+        'products_in_confirmed_orders': ('Sản phẩm (Đơn đã xác nhận)', 'int'),
+        'approved_products': ('Sản phẩm được duyệt', 'int'),
+        'confirmed_orders_revenue': ('Doanh số (Đơn đã xác nhận) (VND)', 'float'),
+        'confirmed_order_conversion_rate': ('Tỷ lệ chuyển đổi (Đơn đã xác nhận)', 'percentage'),
+        'order_to_confirmed_conversion_rate': ('Tỷ lệ chuyển đổi (Từ Đơn đã đặt thành Đơn đã xác nhận)', 'percentage'),
+    }
+
+    @api.model
+    def _get_import_columns(self):
+        return super()._get_import_columns() | {'Ngày'}
+
     @api.model
-    def _import_row(self, shop_id, report_date, row_data):
-        """Create Laban report record from CSV row data"""
-        # Parse date and hour from "Ngày" field (format: "HH:MM DD-MM-YYYY")
-        date_str = row_data.get('Ngày', '')
-        parsed_date = self._parse_date(date_str.split(' ')[-1] if ' ' in date_str else date_str, '%d-%m-%Y')
-        parsed_hour = date_str.split(' ')[0] if ' ' in date_str else '00:00'
-
-        vals = {
-            'shop_id': shop_id,
-            'report_date': parsed_date,
-            'hour': self._parse_hour_to_float(parsed_hour),
-            'product_visits': int(row_data.get('Lượt truy cập sản phẩm', 0)),
-            'product_page_views': int(row_data.get('Lượt xem trang sản phẩm', 0)),
-            'products_accessed': int(row_data.get('Sản phẩm được truy cập', 0)),
-            'bounce_count': int(row_data.get('Số lượng khách thoát trang sản phẩm', 0)),
-            'bounce_rate': self._parse_percentage(row_data.get('Tỷ lệ thoát Trang sản phẩm', '0%')),
-            'search_clicks': int(row_data.get('Lượt click từ Trang tìm kiếm', 0)),
-            'likes': int(row_data.get('Lượt thích', 0)),
-            'add_to_cart_visits': int(row_data.get('Lượt truy cập sản phẩm (Thêm vào giỏ hàng)', 0)),
-            'products_added_to_cart': int(row_data.get('Sản phẩm (Thêm vào giỏ hàng)', 0)),
-            'add_to_cart_conversion_rate': self._parse_percentage(row_data.get('Tỷ lệ chuyển đổi (theo lượt thêm vào giỏ hàng)', '0%')),
-            'buyers_placed_orders': int(row_data.get('Người mua đã đặt hàng', 0)),
-            'products_in_placed_orders': int(row_data.get('Sản phẩm (Đơn đã đặt)', 0)),
-            'products_sold': int(row_data.get('Số sản phẩm đã bán', 0)),
-            'placed_orders_revenue': self._parse_float(row_data.get('Doanh số (Đơn đã đặt) (VND)', '0')),
-            'order_conversion_rate': self._parse_percentage(row_data.get('Tỷ lệ chuyển đổi (Đơn đã đặt)', '0%')),
-            'buyers_confirmed_orders': int(row_data.get('Người mua có đơn đã xác nhận', 0)),
-            'products_in_confirmed_orders': int(row_data.get('Sản phẩm (Đơn đã xác nhận)', 0)),
-            'approved_products': int(row_data.get('Sản phẩm được duyệt', 0)),
-            'confirmed_orders_revenue': self._parse_float(row_data.get('Doanh số (Đơn đã xác nhận) (VND)', '0')),
-            'confirmed_order_conversion_rate': self._parse_percentage(row_data.get('Tỷ lệ chuyển đổi (Đơn đã xác nhận)', '0%')),
-            'order_to_confirmed_conversion_rate': self._parse_percentage(row_data.get('Tỷ lệ chuyển đổi (Từ Đơn đã đặt thành Đơn đã xác nhận)', '0%')),
-        }
-
-        return self._upsert(
-            [
-                ('shop_id', '=', shop_id),
-                ('report_date', '=', report_date),
-                ('hour', '=', vals['hour'])
-            ],
-            vals
-        )
+    def _prepare_import_frame(self, df, shop_id, report_date):
+        """Tách ngày và giờ từ cột "Ngày" (format: "HH:MM DD-MM-YYYY")"""
+        frame = super()._prepare_import_frame(df, shop_id, report_date)
+        if 'Ngày' not in df.columns:
+            frame['report_date'] = False
+            frame['hour'] = 0.0
+            return frame
+
+        date_str = df['Ngày'].fillna('').astype(str).str.strip()
+        has_hour = date_str.str.contains(' ', regex=False)
+        parts = date_str.str.split(' ')
+        frame['report_date'] = self._vectorize_column(date_str.where(~has_hour, parts.str[-1]), 'date', '%d-%m-%Y')
+
+        hour_str = parts.str[0].where(has_hour, '00:00')
+        hour_parts = hour_str.str.extract(r'^(\d+)(?::(\d+))?')
+        hours = pd.to_numeric(hour_parts[0], errors='coerce').fillna(0)
+        minutes = pd.to_numeric(hour_parts[1], errors='coerce').fillna(0)
+        frame['hour'] = (hours + minutes / 60.0).round(2)
+        return frame
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields
 
 
 class ShopeeLiveProductReport(models.Model):
@@ -92,32 +92,19 @@ class ShopeeLiveProductReport(models.Model):
         help='Doanh số(Đơn hàng được xác nhận) (VND)'
     )
 
-    # ==================== HELPER METHODS ====================
-    @api.model
-    def _import_row(self, shop_id, report_date, row_data):
-        """Create Live Product report record from CSV row data"""
-        vals = {
-            'shop_id': shop_id,
-            'report_date': self._parse_date(row_data.get('Khung Thời Gian', ''), '%d-%m-%Y'),
-            'streamer_id': row_data.get('Streamer ID', ''),
-            'ranking': int(row_data.get('Xếp hạng', 0)),
-            'product_name': row_data.get('Các sản phẩm', ''),
-            'product_clicks': int(row_data.get('Lượt click vào sản phẩm', 0)),
-            'add_to_cart': int(row_data.get('Thêm vào Giỏ hàng', 0)),
-            'orders_placed': int(row_data.get('Đơn hàng(Đơn đã đặt)', 0)),
-            'orders_confirmed': int(row_data.get('Đơn hàng(Đơn hàng được xác nhận)', 0)),
-            'products_sold_placed': int(row_data.get('Sản phẩm đã bán(Đơn đã đặt)', 0)),
-            'products_sold_confirmed': int(row_data.get('Sản phẩm đã bán(Đơn hàng được xác nhận)', 0)),
-            'revenue_placed': self._parse_float(row_data.get('Doanh số(Đơn đã đặt)', '0')),
-            'revenue_confirmed': self._parse_float(row_data.get('Doanh số(Đơn hàng được xác nhận)', '0')),
-        }
-
-        return self._upsert(
-            [
-                ('shop_id', '=', shop_id),
-                ('report_date', '=', report_date),
-                ('streamer_id', '=', vals['streamer_id']),
-                ('product_name', '=', vals['product_name']),
-            ],
-            vals
-        )
+    # ==================== IMPORT MAPPING ====================
+    _import_key_fields = ['shop_id', 'report_date', 'streamer_id', 'product_name']
+    _import_column_map = {
+        'report_date': ('Khung Thời Gian', 'date', '%d-%m-%Y'),
+        'streamer_id': ('Streamer ID', 'char'),
+        'ranking': ('Xếp hạng', 'int'),
+        'product_name': ('Các sản phẩm', 'char'),
+        'product_clicks': ('Lượt click vào sản phẩm', 'int'),
+        'add_to_cart': ('Thêm vào Giỏ hàng', 'int'),
+        'orders_placed': ('Đơn hàng(Đơn đã đặt)', 'int'),
+        'orders_confirmed': ('Đơn hàng(Đơn hàng được xác nhận)', 'int'),
+        'products_sold_placed': ('Sản phẩm đã bán(Đơn đã đặt)', 'int'),
+        'products_sold_confirmed': ('Sản phẩm đã bán(Đơn hàng được xác nhận)', 'int'),
+        'revenue_placed': ('Doanh số(Đơn đã đặt)', 'float'),
+        'revenue_confirmed': ('Doanh số(Đơn hàng được xác nhận)', 'float'),
+    }
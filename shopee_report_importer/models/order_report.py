@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
-from odoo.tools.misc import str2bool
+from odoo import models, fields
 
 
 class ShopeeOrderReport(models.Model):
@@ -392,87 +391,74 @@ class ShopeeOrderReport(models.Model):
         help='Ghi chú'
     )
 
-    # ==================== HELPER METHODS ====================
-    @api.model
-    def _import_row(self, shop_id, order_date, row_data):
-        """Create Order report record from CSV row data"""
-
-        vals = {
-            'shop_id': shop_id,
-            'order_id': row_data.get('Mã đơn hàng', ''),
-            'package_id': row_data.get('Mã Kiện Hàng', ''),
-            'order_date': self._parse_datetime(row_data.get('Ngày đặt hàng', ''), '%Y-%m-%d %H:%M'),
-            'order_status': row_data.get('Trạng Thái Đơn Hàng', ''),
-            'hot_product': str2bool(row_data.get('Sản phẩm Bán Chạy', ''), default=False),
-            'cancel_reason': row_data.get('Lý do hủy', ''),
-            'customer_review': row_data.get('Nhận xét từ Người mua', ''),
-            'tracking_number': row_data.get('Mã vận đơn', ''),
-            'shipping_carrier': row_data.get('Đơn Vị Vận Chuyển', ''),
-            'delivery_method': row_data.get('Phương thức giao hàng', ''),
-            'order_type': row_data.get('Loại đơn hàng', ''),
-            'ship_date': self._parse_datetime(row_data.get('Ngày xuất hàng', ''), '%Y-%m-%d %H:%M'),
-            'expected_delivery_date': self._parse_datetime(row_data.get('Ngày giao hàng dự kiến', ''), '%Y-%m-%d %H:%M'),
-            'domestic_delivery_date': self._parse_date(row_data.get('Ngày giao hàng nội địa', '')),
-            'delivery_date': self._parse_datetime(row_data.get('Thời gian giao hàng', ''), '%Y-%m-%d %H:%M'),
-            'order_completion_date': self._parse_datetime(row_data.get('Thời gian hoàn thành đơn hàng', ''), '%Y-%m-%d %H:%M'),
-            'return_refund_status': row_data.get('Trạng thái Trả hàng/Hoàn tiền', ''),
-            'cancel_success_date': self._parse_date(row_data.get('Ngày hủy thành công', '')),
-            'processed_by_shopee': str2bool(row_data.get('Đơn hàng được xử lý bởi Shopee', ''), default=False),
-            'product_sku': row_data.get('SKU sản phẩm', ''),
-            'product_name': row_data.get('Tên sản phẩm', ''),
-            'product_weight': self._parse_float(row_data.get('Cân nặng sản phẩm', '0')),
-            'total_weight': self._parse_float(row_data.get('Tổng cân nặng', '0')),
-            'warehouse_name': row_data.get('Tên kho hàng', ''),
-            'category_sku': row_data.get('SKU phân loại hàng', ''),
-            'category_name': row_data.get('Tên phân loại hàng', ''),
-            'owned_by_shopee': str2bool(row_data.get('Sở hữu bởi Shopee', ''), default=False),
-            'original_price': self._parse_float(row_data.get('Giá gốc', '0')),
-            'seller_discount': self._parse_float(row_data.get('Người bán trợ giá', '0')),
-            'shopee_discount': self._parse_float(row_data.get('Được Shopee trợ giá', '0')),
-            'total_seller_discount': self._parse_float(row_data.get('Tổng số tiền được người bán trợ giá', '0')),
-            'discounted_price': self._parse_float(row_data.get('Giá ưu đãi', '0')),
-            'quantity': int(self._parse_float(row_data.get('Số lượng', '0'))),
-            'returned_quantity': int(self._parse_float(row_data.get('Số lượng sản phẩm được hoàn trả', '0'))),
-            'total_product_price': self._parse_float(row_data.get('Tổng giá bán (sản phẩm)', '0')),
-            'total_order_value': self._parse_float(row_data.get('Tổng giá trị đơn hàng (VND)', '0')),
-            'shop_discount_code': row_data.get('Mã giảm giá của Shop', ''),
-            'cashback': self._parse_float(row_data.get('Hoàn Xu', '0')),
-            'shopee_discount_code': row_data.get('Mã giảm giá của Shopee', ''),
-            'combo_promotion_target': row_data.get('Chỉ tiêu Combo Khuyến Mãi', ''),
-            'shopee_combo_discount': self._parse_float(row_data.get('Giảm giá từ combo Shopee', '0')),
-            'shop_combo_discount': self._parse_float(row_data.get('Giảm giá từ Combo của Shop', '0')),
-            'shopee_coin_refund': self._parse_float(row_data.get('Shopee Xu được hoàn', '0')),
-            'debit_card_discount': self._parse_float(row_data.get('Số tiền được giảm khi thanh toán bằng thẻ Ghi nợ', '0')),
-            'trade_in_discount': self._parse_float(row_data.get('Trade-in Discount', '0')),
-            'trade_in_bonus': self._parse_float(row_data.get('Trade-in Bonus', '0')),
-            'expected_shipping_fee': self._parse_float(row_data.get('Phí vận chuyển (dự kiến)', '0')),
-            'seller_trade_in_bonus': self._parse_float(row_data.get('Trade-in Bonus by Seller', '0')),
-            'customer_shipping_fee': self._parse_float(row_data.get('Phí vận chuyển mà người mua trả', '0')),
-            'return_fee': self._parse_float(row_data.get('Phí trả hàng', '0')),
-            'total_customer_payment': self._parse_float(row_data.get('Tổng số tiền người mua thanh toán', '0')),
-            'payment_date': self._parse_datetime(row_data.get('Thời gian đơn hàng được thanh toán', ''), '%Y-%m-%d %H:%M'),
-            'deposit_verification_date': self._parse_date(row_data.get('Ngày xác minh ký quỹ', '')),
-            'payment_method': row_data.get('Phương thức thanh toán', ''),
-            'fixed_fee': self._parse_float(row_data.get('Phí cố định', '0')),
-            'service_fee': self._parse_float(row_data.get('Phí Dịch Vụ', '0')),
-            'payment_fee': self._parse_float(row_data.get('Phí thanh toán', '0')),
-            'deposit_amount': self._parse_float(row_data.get('Tiền ký quỹ', '0')),
-            'buyer': row_data.get('Người Mua', ''),
-            'recipient_name': row_data.get('Tên Người nhận', ''),
-            'phone_number': row_data.get('Số điện thoại', ''),
-            'province_city': row_data.get('Tỉnh/Thành phố', ''),
-            'city_district': row_data.get('TP / Quận / Huyện', ''),
-            'district': row_data.get('Quận', ''),
-            'delivery_address': row_data.get('Địa chỉ nhận hàng', ''),
-            'country': row_data.get('Quốc gia', ''),
-            'notes': row_data.get('Ghi chú', ''),
-        }
-
-        return self._upsert(
-            [
-                ('shop_id', '=', shop_id),
-                ('order_id', '=', vals['order_id']),
-                ('product_sku', '=', vals['product_sku']),
-            ],
-            vals
-        )
+    # ==================== IMPORT MAPPING ====================
+    _import_key_fields = ['shop_id', 'order_id', 'product_sku']
+    _import_column_map = {
+        'order_id': ('Mã đơn hàng', 'char'),
+        'package_id': ('Mã Kiện Hàng', 'char'),
+        'order_date': ('Ngày đặt hàng', 'datetime', '%Y-%m-%d %H:%M'),
+        'order_status': ('Trạng Thái Đơn Hàng', 'char'),
+        'hot_product': ('Sản phẩm Bán Chạy', 'bool'),
+        'cancel_reason': ('Lý do hủy', 'char'),
+        'customer_review': ('Nhận xét từ Người mua', 'char'),
+        'tracking_number': ('Mã vận đơn', 'char'),
+        'shipping_carrier': ('Đơn Vị Vận Chuyển', 'char'),
+        'delivery_method': ('Phương thức giao hàng', 'char'),
+        'order_type': ('Loại đơn hàng', 'char'),
+        'ship_date': ('Ngày xuất hàng', 'datetime', '%Y-%m-%d %H:%M'),
+        'expected_delivery_date': ('Ngày giao hàng dự kiến', 'datetime', '%Y-%m-%d %H:%M'),
+        'domestic_delivery_date': ('Ngày giao hàng nội địa', 'date', '%Y-%m-%d'),
+        'delivery_date': ('Thời gian giao hàng', 'datetime', '%Y-%m-%d %H:%M'),
+        'order_completion_date': ('Thời gian hoàn thành đơn hàng', 'datetime', '%Y-%m-%d %H:%M'),
+        'return_refund_status': ('Trạng thái Trả hàng/Hoàn tiền', 'char'),
+        'cancel_success_date': ('Ngày hủy thành công', 'date', '%Y-%m-%d'),
+        'processed_by_shopee': ('Đơn hàng được xử lý bởi Shopee', 'bool'),
+        'product_sku': ('SKU sản phẩm', 'char'),
+        'product_name': ('Tên sản phẩm', 'char'),
+        'product_weight': ('Cân nặng sản phẩm', 'float'),
+        'total_weight': ('Tổng cân nặng', 'float'),
+        'warehouse_name': ('Tên kho hàng', 'char'),
+        'category_sku': ('SKU phân loại hàng', 'char'),
+        'category_name': ('Tên phân loại hàng', 'char'),
+        'owned_by_shopee': ('Sở hữu bởi Shopee', 'bool'),
+        'original_price': ('Giá gốc', 'float'),
+        'seller_discount': ('Người bán trợ giá', 'float'),
+        'shopee_discount': ('Được Shopee trợ giá', 'float'),
+        'total_seller_discount': ('Tổng số tiền được người bán trợ giá', 'float'),
+        'discounted_price': ('Giá ưu đãi', 'float'),
+        'quantity': ('Số lượng', 'int'),
+        'returned_quantity': ('Số lượng sản phẩm được hoàn trả', 'int'),
+        'total_product_price': ('Tổng giá bán (sản phẩm)', 'float'),
+        'total_order_value': ('Tổng giá trị đơn hàng (VND)', 'float'),
+        'shop_discount_code': ('Mã giảm giá của Shop', 'char'),
+        'cashback': ('Hoàn Xu', 'float'),
+        'shopee_discount_code': ('Mã giảm giá của Shopee', 'char'),
+        'combo_promotion_target': ('Chỉ tiêu Combo Khuyến Mãi', 'char'),
+        'shopee_combo_discount': ('Giảm giá từ combo Shopee', 'float'),
+        'shop_combo_discount': ('Giảm giá từ Combo của Shop', 'float'),
+        'shopee_coin_refund': ('Shopee Xu được hoàn', 'float'),
+        'debit_card_discount': ('Số tiền được giảm khi thanh toán bằng thẻ Ghi nợ', 'float'),
+        'trade_in_discount': ('Trade-in Discount', 'float'),
+        'trade_in_bonus': ('Trade-in Bonus', 'float'),
+        'expected_shipping_fee': ('Phí vận chuyển (dự kiến)', 'float'),
+        'seller_trade_in_bonus': ('Trade-in Bonus by Seller', 'float'),
+        'customer_shipping_fee': ('Phí vận chuyển mà người mua trả', 'float'),
+        'return_fee': ('Phí trả hàng', 'float'),
+        'total_customer_payment': ('Tổng số tiền người mua thanh toán', 'float'),
+        'payment_date': ('Thời gian đơn hàng được thanh toán', 'datetime', '%Y-%m-%d %H:%M'),
+        'deposit_verification_date': ('Ngày xác minh ký quỹ', 'date', '%Y-%m-%d'),
+        'payment_method': ('Phương thức thanh toán', 'char'),
+        'fixed_fee': ('Phí cố định', 'float'),
+        'service_fee': ('Phí Dịch Vụ', 'float'),
+        'payment_fee': ('Phí thanh toán', 'float'),
+        'deposit_amount': ('Tiền ký quỹ', 'float'),
+        'buyer': ('Người Mua', 'char'),
+        'recipient_name': ('Tên Người nhận', 'char'),
+        'phone_number': ('Số điện thoại', 'char'),
+        'province_city': ('Tỉnh/Thành phố', 'char'),
+        'city_district': ('TP / Quận / Huyện', 'char'),
+        'district': ('Quận', 'char'),
+        'delivery_address': ('Địa chỉ nhận hàng', 'char'),
+        'country': ('Quốc gia', 'char'),
+        'notes': ('Ghi chú', 'char'),
+    }
@@ -1,14 +1,64 @@
 # -*- coding: utf-8 -*-
 
 import os
+import json
+import time
 import logging
-import pytz
 import pandas as pd
 import re
-from datetime import datetime, date, timezone
+import itertools
+import traceback
+import openpyxl
+import psycopg2
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, date
 from odoo import models, fields, api
+from odoo.exceptions import UserError
 from odoo.tools import config
 
+IMPORT_BATCH_SIZE = 1000
+TRUE_VALUES = ['y', 'yes', '1', 'true', 't', 'on']
+MAX_CONCURRENT_THREADS = 4
+# Số dòng đầu file dùng để dò header
+HEADER_SCAN_ROWS = 50
+# Thư mục con (trong download_dir) chứa các file import lỗi, để cron không thử lại mãi
+FAILED_DIR_NAME = 'failed'
+# Lỗi do nội dung file (thử lại cũng lỗi): chuyển file vào FAILED_DIR_NAME.
+# Lỗi khác (serialization, lock, mất kết nối, ...) giữ file lại để lần chạy sau import lại.
+REPORT_DATA_ERRORS = (ValueError, TypeError, KeyError, UserError, psycopg2.DataError, psycopg2.IntegrityError)
+
+# Report mappings: loại báo cáo -> model và thư mục download trong workspace
+REPORT_MAPPINGS = {
+    'ads_cpc': {
+        'model': 'shopee.ads.cpc.report',
+        'download_dir': 'downloads/ads_cpc'
+    },
+    'ads_live': {
+        'model': 'shopee.ads.live.report',
+        'download_dir': 'downloads/ads_live'
+    },
+    'booking': {
+        'model': 'shopee.booking.report',
+        'download_dir': 'downloads/booking'
+    },
+    'laban': {
+        'model': 'shopee.laban.report',
+        'download_dir': 'downloads/laban'
+    },
+    'live_product': {
+        'model': 'shopee.live.product.report',
+        'download_dir': 'downloads/live_product'
+    },
+    'order': {
+        'model': 'shopee.order.report',
+        'download_dir': 'downloads/order'
+    },
+    'video_product': {
+        'model': 'shopee.video.product.report',
+        'download_dir': 'downloads/video_product'
+    }
+}
+
 _logger = logging.getLogger(__name__)
 
 
@@ -16,26 +66,14 @@ class ShopeeReportMixin(models.AbstractModel):
     _name = 'shopee.report.mixin'
     _description = 'Shopee Report Mixin'
 
-    # ==================== HELPER METHODS ====================
-    def _parse_percentage(self, percent_str):
-        """Parse percentage string to float"""
-        if not percent_str or percent_str == '-':
-            return 0.0
-        try:
-            # Remove % and convert to float
-            return float(percent_str.replace('%', '').replace(',', '.'))
-        except:
-            return 0.0
-
-    def _parse_float(self, float_str):
-        """Parse float string to float"""
-        if not float_str or float_str == '-':
-            return 0.0
-        try:
-            return float(float_str.replace(',', ''))
-        except:
-            return 0.0
+    # Khai báo ở từng report model:
+    #   _import_key_fields: các field tạo nên natural key của 1 dòng báo cáo
+    #   _import_column_map: {field: (cột trong file, kiểu[, format])}
+    #       kiểu: char, int, float, percentage, bool, date, datetime
+    _import_key_fields = []
+    _import_column_map = {}
 
+    # ==================== HELPER METHODS ====================
     def _parse_date(self, date_str, format='%Y-%m-%d'):
         """Parse date string to date object"""
         if not date_str or date_str in ['-', 'Không giới hạn']:
@@ -46,60 +84,169 @@ class ShopeeReportMixin(models.AbstractModel):
         except:
             return False
 
-    def _parse_datetime(self, dt_str, format='%Y-%m-%d %H:%M:%S'):
-        """Parse datetime and convert to UTC"""
-        if not dt_str or dt_str == '-':
-            return False
-        try:
-            # Parse as datetime in local timezone
-            dt = datetime.strptime(dt_str, format)
+    # ==================== COLUMNAR IMPORT ====================
+    @api.model
+    def _vectorize_column(self, series, kind, format=None):
+        """Chuẩn hóa 1 cột của DataFrame theo kiểu field (vectorized)"""
+        if kind == 'char':
+            return series.astype(object).where(series.notna(), None).map(
+                lambda value: value if value is None or isinstance(value, str) else str(value)
+            )
+
+        if kind in ('int', 'float', 'percentage'):
+            if pd.api.types.is_numeric_dtype(series):
+                numbers = pd.to_numeric(series, errors='coerce')
+            else:
+                text = series.astype(str).str.strip().str.replace('%', '', regex=False)
+                # Percentage dùng dấu phẩy thập phân, còn lại dấu phẩy là phân cách hàng nghìn
+                text = text.str.replace(',', '.' if kind == 'percentage' else '', regex=False)
+                numbers = pd.to_numeric(text, errors='coerce')
+            numbers = numbers.fillna(0)
+            return numbers.astype('int64') if kind == 'int' else numbers.astype(float)
+
+        if kind == 'bool':
+            return series.astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+
+        if kind in ('date', 'datetime'):
+            if pd.api.types.is_datetime64_any_dtype(series):
+                parsed = series
+            else:
+                parsed = pd.to_datetime(series.astype(str).str.strip(), format=format, errors='coerce')
+            if kind == 'date':
+                return parsed.dt.date.astype(object).where(parsed.notna(), None)
+            # Datetime trong file là giờ local, lưu về UTC
             tz = self.env.user.tz or 'Asia/Ho_Chi_Minh'
-            # Convert to UTC
-            tz_obj = pytz.timezone(tz)
-            dt_with_tz = tz_obj.localize(dt)
-            return dt_with_tz.astimezone(timezone.utc).replace(tzinfo=None)
-        except ValueError:
-            return False
+            parsed = parsed.dt.tz_localize(tz, ambiguous='NaT', nonexistent='NaT').dt.tz_convert('UTC').dt.tz_localize(None)
+            return pd.Series(list(parsed.dt.to_pydatetime()), index=series.index, dtype=object).where(parsed.notna(), None)
 
-    def _parse_hour_to_float(self, hour_str):
-        """Parse hour string 'HH:MM' to float"""
-        if not hour_str or hour_str == '-':
-            return 0.0
-        try:
-            if ':' in hour_str:
-                hours, minutes = hour_str.split(':')
-                return float(hours) + float(minutes) / 60.0
+        raise ValueError(f"Unsupported import column kind: {kind}")
+
+    @api.model
+    def _prepare_import_frame(self, df, shop_id, report_date):
+        """Chuyển DataFrame của file báo cáo thành DataFrame theo field của model"""
+        frame = pd.DataFrame(index=df.index)
+        frame['shop_id'] = shop_id
+        if 'report_date' in self._fields and 'report_date' not in self._import_column_map:
+            frame['report_date'] = report_date
+
+        for field_name, spec in self._import_column_map.items():
+            column, kind = spec[0], spec[1]
+            format = spec[2] if len(spec) > 2 else None
+            if column in df.columns:
+                frame[field_name] = self._vectorize_column(df[column], kind, format)
+            elif kind == 'char':
+                frame[field_name] = ''
+            elif kind in ('int', 'float', 'percentage'):
+                frame[field_name] = 0
             else:
-                return float(hour_str)
-        except:
-            return 0.0
+                frame[field_name] = False
+        return frame
 
     @api.model
-    def _upsert(self, domain, values):
+    def _import_key_value(self, value):
+        """Chuẩn hóa giá trị để so sánh key / phát hiện thay đổi"""
+        if isinstance(value, tuple):  # many2one từ search_read
+            return value[0]
+        if isinstance(value, float):
+            return round(value, 2)
+        return value or False
+
+    @api.model
+    def _import_dataframe(self, df, shop_id, report_date):
         """
-        Helper method để upsert (update hoặc create) records.
+        Import DataFrame của 1 file báo cáo theo lô.
 
         Args:
-            domain (list): Domain để search existing record
-            values (dict): Values để write/create
+            df (DataFrame): Dữ liệu file đã đọc
+            shop_id (int): ID shop
+            report_date (date): Ngày báo cáo lấy từ tên file
+
+        Returns:
+            int: Số dòng đã import
+        """
+        if df.empty:
+            return 0
+
+        frame = self._prepare_import_frame(df, shop_id, report_date)
+        frame = frame.astype(object).where(frame.notna(), None)
+        vals_list = frame.to_dict('records')
+
+        # Bỏ các dòng thiếu field bắt buộc (trước đây create sẽ lỗi từng dòng)
+        required_fields = [
+            name for name in frame.columns
+            if self._fields[name].required and self._fields[name].type not in ('integer', 'float')
+        ]
+        valid_vals_list = [
+            vals for vals in vals_list
+            if all(vals.get(name) is not None and vals.get(name) is not False for name in required_fields)
+        ]
+        if len(valid_vals_list) < len(vals_list):
+            _logger.warning(f"{self._name}: skipped {len(vals_list) - len(valid_vals_list)} rows missing required fields")
+
+        created, updated = self._bulk_upsert_import_vals(valid_vals_list)
+        _logger.info(f"{self._name}: {created} created, {updated} updated, {len(valid_vals_list) - created - updated} unchanged")
+        return len(valid_vals_list)
+
+    @api.model
+    def _bulk_upsert_import_vals(self, vals_list):
+        """
+        Upsert theo natural key (_import_key_fields):
+            - 1 query đọc các record đã có của cả file
+            - create theo lô, write gom nhóm theo values giống nhau
+            - bỏ qua record không thay đổi
 
         Returns:
-            recordset: Record được update hoặc create
+            tuple: (số record tạo mới, số record cập nhật)
         """
-        existing_record = self.search(domain, limit=1)
+        key_fields = self._import_key_fields
+
+        def make_key(vals):
+            return tuple(self._import_key_value(vals.get(name)) for name in key_fields)
+
+        # Trùng key trong file thì dòng sau ghi đè dòng trước (như upsert tuần tự)
+        vals_by_key = {}
+        for vals in vals_list:
+            vals_by_key[make_key(vals)] = vals
+        if not vals_by_key:
+            return 0, 0
+
+        domain = []
+        for name in key_fields:
+            values = {vals.get(name) for vals in vals_by_key.values()}
+            domain.append((name, 'in', [False if value is None else value for value in values]))
+        import_fields = list(next(iter(vals_by_key.values())))
+        existing_map = {}
+        for record in self.search_read(domain, ['id'] + import_fields, order='id'):
+            existing_map.setdefault(make_key(record), record)
+
+        create_vals_list = []
+        write_groups = {}
+        for key, vals in vals_by_key.items():
+            existing = existing_map.get(key)
+            if not existing:
+                create_vals_list.append(vals)
+                continue
+            if all(self._import_key_value(existing[name]) == self._import_key_value(value) for name, value in vals.items()):
+                continue
+            group_key = json.dumps(vals, sort_keys=True, default=str)
+            write_groups.setdefault(group_key, (vals, []))[1].append(existing['id'])
 
-        if existing_record:
-            existing_record.write(values)
-        else:
-            existing_record = self.create(values)
+        for start in range(0, len(create_vals_list), IMPORT_BATCH_SIZE):
+            self.create(create_vals_list[start:start + IMPORT_BATCH_SIZE])
 
-        return existing_record
+        updated = 0
+        for vals, record_ids in write_groups.values():
+            self.browse(record_ids).write(vals)
+            updated += len(record_ids)
+
+        return len(create_vals_list), updated
 
     # ==================== CRON METHODS ====================
     @api.model
     def _cron_import_downloaded_data(self):
         """New cron method - import data from downloaded files"""
         _logger.info("Start importing downloaded data...")
+        start_time = time.time()
 
         # Get filestore path
         filestore_path = config.filestore(self.env.cr.dbname)
@@ -126,18 +273,96 @@ class ShopeeReportMixin(models.AbstractModel):
 
         _logger.info(f"Found {len(workspaces)} workspaces")
 
-        # Process each workspace
-        total_imported = 0
+        existing_shop_ids = set(self.env['shopee.shop'].browse([w['shop_id'] for w in workspaces]).exists().ids)
         for workspace in workspaces:
+            if workspace['shop_id'] not in existing_shop_ids:
+                _logger.error(f"Shop {workspace['shop_id']} not found in database")
+
+        # Mỗi cặp (shop, loại báo cáo) là 1 task độc lập
+        tasks = [
+            (workspace['shop_id'], workspace['workspace_path'], report_type)
+            for workspace in workspaces if workspace['shop_id'] in existing_shop_ids
+            for report_type in REPORT_MAPPINGS
+        ]
+        results = self._run_import_tasks(tasks)
+
+        # Update shop sync date
+        synced_shop_ids = {r['shop_id'] for r in results if r['status'] == 'success'}
+        if synced_shop_ids:
+            self.env['shopee.shop'].browse(list(synced_shop_ids)).write({'last_sync_date': fields.Datetime.now()})
+
+        # Summary
+        imported_by_shop = {}
+        for result in results:
+            imported_by_shop[result['shop_id']] = imported_by_shop.get(result['shop_id'], 0) + result.get('imported', 0)
+        failed = [r for r in results if r['status'] == 'error']
+        for shop_id, imported in imported_by_shop.items():
+            _logger.info(f"Shop {shop_id}: {imported} records imported")
+        if failed:
+            _logger.error("Failed imports: %s", [f"shop_{r['shop_id']}/{r['report_type']}: {r['error']}" for r in failed])
+        _logger.info(
+            f"Imported {sum(imported_by_shop.values())} records for {len(imported_by_shop)} shops "
+            f"({len(results) - len(failed)}/{len(results)} tasks succeeded) in {time.time() - start_time:.2f}s."
+        )
+
+    @api.model
+    def _run_import_tasks(self, tasks, max_workers=None):
+        """
+        Chạy các task import (shop_id, workspace_path, report_type) song song,
+        mỗi task 1 cursor riêng
+        """
+        if not tasks:
+            return []
+
+        if max_workers is None:
+            max_workers = min(len(tasks), MAX_CONCURRENT_THREADS)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_task = {
+                executor.submit(self._execute_import_task, *task): task
+                for task in tasks
+            }
+            for future in as_completed(future_to_task):
+                shop_id, workspace_path, report_type = future_to_task[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    _logger.error(f"✗ Thread for shop {shop_id} ({report_type}) failed: {str(e)}")
+                    results.append({
+                        'shop_id': shop_id,
+                        'report_type': report_type,
+                        'status': 'error',
+                        'error': str(e),
+                    })
+        return results
+
+    def _execute_import_task(self, shop_id, workspace_path, report_type):
+        """Import 1 loại báo cáo của 1 shop trong cursor riêng"""
+        with self.pool.cursor() as new_cr:
+            new_env = api.Environment(new_cr, self.env.uid, dict(self.env.context))
+            shop = new_env['shopee.shop'].browse(shop_id)
             try:
-                imported = self._import_workspace_downloaded_data(workspace)
-                total_imported += imported
-                _logger.info(f"Shop {workspace['shop_id']}: {imported} records imported")
+                imported = self.with_env(new_env)._import_report_files_from_workspace(
+                    shop, workspace_path, report_type, REPORT_MAPPINGS[report_type], commit=True
+                )
+                new_cr.commit()
+                return {
+                    'shop_id': shop_id,
+                    'report_type': report_type,
+                    'status': 'success',
+                    'imported': imported,
+                }
             except Exception as e:
-                _logger.error(f"Error importing workspace {workspace['workspace_path']}: {str(e)}")
-                continue
-
-        _logger.info(f"Imported {total_imported} records for {len(workspaces)} shops.")
+                _logger.error(f"✗ Error importing {report_type} for shop {shop_id}: {str(e)}")
+                _logger.error("Traceback: %s", traceback.format_exc())
+                new_cr.rollback()
+                return {
+                    'shop_id': shop_id,
+                    'report_type': report_type,
+                    'status': 'error',
+                    'error': str(e),
+                }
 
     def _import_workspace_downloaded_data(self, workspace):
         """Import data from a single workspace"""
@@ -152,42 +377,10 @@ class ShopeeReportMixin(models.AbstractModel):
             _logger.error(f"Shop {shop_id} not found in database")
             return 0
 
-        # Define report mappings
-        report_mappings = {
-            'ads_cpc': {
-                'model': 'shopee.ads.cpc.report',
-                'download_dir': 'downloads/ads_cpc'
-            },
-            'ads_live': {
-                'model': 'shopee.ads.live.report',
-                'download_dir': 'downloads/ads_live'
-            },
-            'booking': {
-                'model': 'shopee.booking.report',
-                'download_dir': 'downloads/booking'
-            },
-            'laban': {
-                'model': 'shopee.laban.report',
-                'download_dir': 'downloads/laban'
-            },
-            'live_product': {
-                'model': 'shopee.live.product.report',
-                'download_dir': 'downloads/live_product'
-            },
-            'order': {
-                'model': 'shopee.order.report',
-                'download_dir': 'downloads/order'
-            },
-            'video_product': {
-                'model': 'shopee.video.product.report',
-                'download_dir': 'downloads/video_product'
-            }
-        }
-
         total_imported = 0
-        for report_type, config in report_mappings.items():
+        for report_type, mapping in REPORT_MAPPINGS.items():
             try:
-                imported = self._import_report_files_from_workspace(shop, workspace_path, report_type, config)
+                imported = self._import_report_files_from_workspace(shop, workspace_path, report_type, mapping)
                 total_imported += imported
             except Exception as e:
                 _logger.error(f"Error importing {report_type} for shop {shop_id}: {str(e)}")
@@ -197,9 +390,12 @@ class ShopeeReportMixin(models.AbstractModel):
 
         return total_imported
 
-    def _import_report_files_from_workspace(self, shop, workspace_path, report_type, config):
-        """Import files for specific report type from workspace"""
-        download_dir = os.path.join(workspace_path, config['download_dir'])
+    def _import_report_files_from_workspace(self, shop, workspace_path, report_type, mapping, commit=False):
+        """
+        Import files for specific report type from workspace
+        commit=True: commit sau mỗi file, trước khi xóa file (dùng trong cursor riêng của cron)
+        """
+        download_dir = os.path.join(workspace_path, mapping['download_dir'])
 
         if not os.path.exists(download_dir):
             _logger.info(f"No download directory found: {download_dir}")
@@ -218,12 +414,16 @@ class ShopeeReportMixin(models.AbstractModel):
         _logger.info(f"Found {len(files)} files for {report_type}")
 
         # Get model
-        model = self.env[config['model']]
+        model = self.env[mapping['model']]
+        if not model._import_column_map:
+            _logger.error(f"Import column map not defined in {mapping['model']}")
+            return 0
         imported_count = 0
 
         for file_path in files:
             try:
                 _logger.info(f"Processing file: {file_path}")
+                start_time = time.time()
 
                 file_name = os.path.basename(file_path)
                 parent_dir = os.path.basename(os.path.dirname(file_path))
@@ -234,73 +434,133 @@ class ShopeeReportMixin(models.AbstractModel):
                     report_date = date.today()  # Fallback to today
 
                 # Read file using pandas with proper header detection
-                df = self._read_report_file(file_path)
+                try:
+                    df = self._read_report_file(file_path, usecols=model._get_import_columns())
+                except Exception as e:
+                    _logger.error(f"Cannot parse file {file_path}: {str(e)}")
+                    self._quarantine_report_file(file_path)
+                    continue
 
                 _logger.info(f"Loaded {len(df)} rows from {os.path.basename(file_path)}")
 
-                # Process each row
-                for _, row in df.iterrows():
-                    try:
-                        row_data = row.to_dict()
-                        # Convert pandas NaN to None for Odoo
-                        row_data = {k: (None if pd.isna(v) else v) for k, v in row_data.items()}
-
-                        # Call the model method dynamically
-                        if hasattr(model, '_import_row'):
-                            model._import_row(shop.id, report_date, row_data)
-                        else:
-                            _logger.error(f"Method _import_row not found in {config['model']}")
-                            break
-                        imported_count += 1
-                    except Exception as e:
-                        _logger.warning(f"Error processing row in {file_path}: {str(e)}")
-                        continue
-
-                _logger.info(f"Imported {imported_count} records from {os.path.basename(file_path)}")
+                # Import cả file theo cột, lỗi thì rollback riêng file này
+                with self.env.cr.savepoint():
+                    imported = model._import_dataframe(df, shop.id, report_date)
+                imported_count += imported
+                if commit:
+                    self.env.cr.commit()
+
+                elapsed = time.time() - start_time
+                _logger.info(
+                    f"Imported {imported} records from {os.path.basename(file_path)} "
+                    f"in {elapsed:.2f}s ({imported / elapsed if elapsed else 0:.0f} rows/s)"
+                )
 
                 # Delete file after successful import
                 os.remove(file_path)
                 _logger.info(f"Deleted file: {file_path}")
 
+            except REPORT_DATA_ERRORS as e:
+                _logger.error(f"Invalid data in file {file_path}: {str(e)}")
+                self._quarantine_report_file(file_path)
+                continue
             except Exception as e:
-                _logger.error(f"Error processing file {file_path}: {str(e)}")
+                _logger.error(f"Error processing file {file_path}, will retry next run: {str(e)}")
                 continue
 
         return imported_count
 
-    def _read_report_file(self, file_path):
-        """Read Shopee report file (CSV/XLSX) with proper header detection"""
+    def _quarantine_report_file(self, file_path):
+        """Chuyển file có nội dung lỗi vào thư mục failed/ để lần chạy sau không import lại"""
+        failed_dir = os.path.join(os.path.dirname(file_path), FAILED_DIR_NAME)
+        try:
+            os.makedirs(failed_dir, exist_ok=True)
+            target_path = os.path.join(failed_dir, f"{int(time.time())}_{os.path.basename(file_path)}")
+            os.replace(file_path, target_path)
+            _logger.warning(f"Moved failed file to: {target_path}")
+        except OSError as e:
+            _logger.error(f"Cannot move failed file {file_path}: {str(e)}")
+
+    def _read_report_file(self, file_path, usecols=None):
+        """
+        Read Shopee report file (CSV/XLSX) with proper header detection
+
+        File chỉ được parse 1 lần; với XLSX, header được dò trong HEADER_SCAN_ROWS dòng đầu.
+        usecols: tập tên cột cần đọc (None = tất cả)
+        """
         file_name = os.path.basename(file_path)
-        
+
         def is_header_line(line):
             """Check if a CSV line is a header line"""
             # Count non-empty cells (split by comma and filter empty)
             cells = [cell.strip() for cell in line.split(',') if cell.strip()]
             return len(cells) > 5
-        
+
         def is_header_row(row):
             """Check if a row is a header row"""
             # Count non-empty cells
             cells = [str(cell).strip() for cell in row if pd.notna(cell) and str(cell).strip()]
             return len(cells) > 5
-        
-        def find_header_row():
-            """Find the header row in the file"""
-            if file_name.endswith('.csv'):
-                # Read file line by line to find header (streaming)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    for i, line in enumerate(f):
-                        if is_header_line(line):
-                            return i
-            else:  # .xlsx
-                # Read XLSX to find header row
-                df_temp = pd.read_excel(file_path, header=None)
-                for i, row in df_temp.iterrows():
-                    if is_header_row(row):
+
+        def find_header_line():
+            """Find the header line in the CSV file (streaming)"""
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for i, line in enumerate(f):
+                    if is_header_line(line):
                         return i
-            
             return None
-        
+
+        def dedupe_columns(columns):
+            """Đổi tên cột trùng thành 'X.1', 'X.2', ... giống pd.read_excel"""
+            seen = set(columns)
+            counts = {}
+            result = []
+            for column in columns:
+                if column in counts:
+                    new_column = column
+                    while new_column in seen:
+                        counts[column] += 1
+                        new_column = f'{column}.{counts[column]}'
+                    seen.add(new_column)
+                    result.append(new_column)
+                else:
+                    counts[column] = 0
+                    result.append(column)
+            return result
+
+        def read_xlsx():
+            """Stream XLSX ở chế độ read-only: dò header rồi đọc tiếp phần data trong cùng 1 lượt"""
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                scanned_rows = []
+                header = None
+                for row in rows:
+                    if is_header_row(row):
+                        header = row
+                        break
+                    scanned_rows.append(row)
+                    if len(scanned_rows) >= HEADER_SCAN_ROWS:
+                        break
+
+                if header is None:
+                    # Không tìm thấy header: dùng dòng đầu tiên như pd.read_excel mặc định
+                    if not scanned_rows:
+                        return pd.DataFrame()
+                    header, scanned_rows = scanned_rows[0], scanned_rows[1:]
+                else:
+                    scanned_rows = []
+
+                columns = dedupe_columns([cell if cell is not None else f'Unnamed: {i}' for i, cell in enumerate(header)])
+                indexes = [i for i, column in enumerate(columns) if usecols is None or column in usecols]
+                data = [
+                    tuple(row[i] if i < len(row) else None for i in indexes)
+                    for row in itertools.chain(scanned_rows, rows)
+                ]
+                return pd.DataFrame(data, columns=[columns[i] for i in indexes])
+            finally:
+                workbook.close()
+
         def clean_dataframe(df):
             """Clean up the dataframe"""
             # Remove any completely empty rows
@@ -308,25 +568,26 @@ class ShopeeReportMixin(models.AbstractModel):
             # Remove rows that are all NaN or empty strings
             df = df[df.notna().any(axis=1)]
             return df
-        
-        # Find header row
-        header_row = find_header_row()
-        
-        # Read file with proper header
+
         if file_name.endswith('.csv'):
-            if header_row is not None:
-                df = pd.read_csv(file_path, encoding='utf-8', skiprows=header_row)
-            else:
-                df = pd.read_csv(file_path, encoding='utf-8')
+            header_row = find_header_line()
+            df = pd.read_csv(
+                file_path,
+                encoding='utf-8',
+                skiprows=header_row or 0,
+                usecols=(lambda column: column in usecols) if usecols is not None else None,
+            )
         else:  # .xlsx
-            if header_row is not None:
-                df = pd.read_excel(file_path, header=header_row)
-            else:
-                df = pd.read_excel(file_path)
-        
+            df = read_xlsx()
+
         # Clean up and return dataframe
         return clean_dataframe(df)
 
+    @api.model
+    def _get_import_columns(self):
+        """Tên các cột trong file mà model cần đọc"""
+        return {spec[0] for spec in self._import_column_map.values()}
+
     def _extract_report_date(self, file_name, parent_dir):
         """Extract report date from file name and parent directory"""
         if parent_dir == 'order':
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields
 
 class ShopeeVideoProductReport(models.Model):
     _name = 'shopee.video.product.report'
@@ -78,29 +78,17 @@ class ShopeeVideoProductReport(models.Model):
         help='Người mua (Đơn hàng được xác nhận)'
     )
 
-    # ==================== HELPER METHODS ====================
-    @api.model
-    def _import_row(self, shop_id, report_date, row_data):
-        """Create Video Product report record from CSV row data"""
-        vals = {
-            'shop_id': shop_id,
-            'report_date': self._parse_date(row_data.get('Khung Thời Gian', ''), '%d-%m-%Y'),
-            'streamer_id': row_data.get('Streamer ID', ''),
-            'product_name': row_data.get('Các sản phẩm', ''),
-            'ranking': int(self._parse_float(row_data.get('Xếp hạng', '0'))),
-            'orders_placed': int(self._parse_float(row_data.get('Đơn hàng(Đơn đã đặt)', '0'))),
-            'orders_confirmed': int(self._parse_float(row_data.get('Đơn hàng(Đơn hàng được xác nhận)', '0'))),
-            'revenue_placed': self._parse_float(row_data.get('Doanh số(Đơn đã đặt)', '0')),
-            'revenue_confirmed': self._parse_float(row_data.get('Doanh số(Đơn hàng được xác nhận)', '0')),
-            'buyers_placed': int(self._parse_float(row_data.get('Người mua(Đơn đã đặt)', '0'))),
-            'buyers_confirmed': int(self._parse_float(row_data.get('Người mua(Đơn hàng được xác nhận)', '0'))),
-        }
-        return self._upsert(
-            [
-                ('shop_id', '=', shop_id),
-                ('report_date', '=', report_date),
-                ('streamer_id', '=', vals['streamer_id']),
-                ('product_name', '=', vals['product_name']),
-            ],
-            vals
-        )
+    # ==================== IMPORT MAPPING ====================
+    _import_key_fields = ['shop_id', 'report_date', 'streamer_id', 'product_name']
+    _import_column_map = {
+        'report_date': ('Khung Thời Gian', 'date', '%d-%m-%Y'),
+        'streamer_id': ('Streamer ID', 'char'),
+        'product_name': ('Các sản phẩm', 'char'),
+        'ranking': ('Xếp hạng', 'int'),
+        'orders_placed': ('Đơn hàng(Đơn đã đặt)', 'int'),
+        'orders_confirmed': ('Đơn hàng(Đơn hàng được xác nhận)', 'int'),
+        'revenue_placed': ('Doanh số(Đơn đã đặt)', 'float'),
+        'revenue_confirmed': ('Doanh số(Đơn hàng được xác nhận)', 'float'),
+        'buyers_placed': ('Người mua(Đơn đã đặt)', 'int'),
+        'buyers_confirmed': ('Người mua(Đơn hàng được xác nhận)', 'int'),
+    }
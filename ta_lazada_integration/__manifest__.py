@@ -37,6 +37,7 @@
     'data': [
         'security/ir.model.access.csv',
         'security/ta_lazada_security.xml',
+        'data/ta_lazada_cron.xml',
         # Load Authorized Shop action before it's referenced in config views
         'views/ta_lazada_authorized_shop_views.xml',
         'views/ta_lazada_config_views.xml',
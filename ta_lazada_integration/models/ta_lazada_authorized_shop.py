@@ -8,6 +8,8 @@ import hashlib
 import hmac
 from datetime import datetime, timedelta
 
+from .http_session import http_request
+
 
 class TaLazadaAuthorizedShop(models.Model):
     _name = 'ta.lazada.authorized.shop'
@@ -72,6 +74,12 @@ class TaLazadaAuthorizedShop(models.Model):
     order_sync_created_after = fields.Datetime('Sync Orders Created After', required=True,
                                               default=lambda self: fields.Datetime.now() - timedelta(days=30),
                                               help='Only sync orders created after this date')
+    order_sync_updated_after = fields.Datetime('Order Sync Checkpoint', copy=False,
+                                               help='Updated time of the last synced order. Next sync only fetches orders '
+                                                    'updated after this time. Clear it to re-import from "Sync Orders Created After".')
+    order_sync_failed_ids = fields.Char('Failed Order IDs', copy=False,
+                                        help='Lazada order IDs that failed to import in the last syncs (comma separated). '
+                                             'An order failing again does not hold back the checkpoint.')
     # Campaign Sync Configuration (for searchCampaignList)
     campaign_biz_code = fields.Char('Campaign Biz Code', default='sponsoredSearch',
                                     help="Which advertisement solution to query. Example: sponsoredSearch")
@@ -364,6 +372,7 @@ class TaLazadaAuthorizedShop(models.Model):
             self.refresh_access_token()
         
         try:
+            # Mỗi page được commit trong _sync_orders, lỗi chỉ bỏ page đang dở
             self._sync_orders()
             self.last_sync_date = fields.Datetime.now()
             return {
@@ -376,6 +385,7 @@ class TaLazadaAuthorizedShop(models.Model):
                 }
             }
         except Exception as e:
+            self.env.cr.rollback()
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
@@ -414,6 +424,32 @@ class TaLazadaAuthorizedShop(models.Model):
         except Exception as e:
             raise
     
+    @api.model
+    def _cron_sync_orders(self):
+        """Cron: sync orders incremental cho các shop bật Auto Sync, đến hạn theo Sync Interval
+
+        Mỗi page orders được commit trong _sync_orders; shop lỗi chỉ rollback page đang dở
+        và không chặn các shop khác.
+        """
+        now = fields.Datetime.now()
+        shops = self.search([('authorization_status', '=', 'authorized'), ('auto_sync', '=', True)])
+        for shop in shops:
+            if shop.last_sync_date and shop.last_sync_date + timedelta(minutes=shop.sync_interval or 0) > now:
+                continue
+            try:
+                if shop.token_expires_at and shop.token_expires_at < fields.Datetime.now():
+                    shop.refresh_access_token()
+                shop._sync_orders()
+                shop.last_sync_date = fields.Datetime.now()
+                self.env.cr.commit()
+            except Exception as e:
+                self.env.cr.rollback()
+                try:
+                    shop.message_post(body=_('Failed to sync orders: %s') % str(e))
+                    self.env.cr.commit()
+                except:
+                    pass
+
     def _make_api_request(self, endpoint, params=None, method='GET', files=None):
         """Make API request using shop's access token"""
         self.ensure_one()
@@ -484,9 +520,9 @@ class TaLazadaAuthorizedShop(models.Model):
         try:
             # Use the pattern you suggested: direct parameter passing
             if method.upper() == 'POST' or files is not None:
-                r = requests.post(url, params, files=files, timeout=timeout)
+                r = http_request('POST', url, data=params, files=files, timeout=timeout)
             else:
-                r = requests.get(url, params, timeout=timeout)
+                r = http_request('GET', url, params=params, timeout=timeout)
             
             r.raise_for_status()
             return r.json()
@@ -4,6 +4,9 @@ from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 from datetime import datetime, timedelta
 
+ORDER_PAGE_LIMIT = 50  # Lazada API limit: 1-50 for orders/get
+ORDER_SYNC_OVERLAP = timedelta(minutes=5)
+
 
 class TaLazadaOrder(models.Model):
     _name = 'ta.lazada.order'
@@ -145,22 +148,40 @@ class TaLazadaOrder(models.Model):
     
     def import_from_lazada_for_shop(self, authorized_shop, created_after=None):
         """Import orders from Lazada for specific authorized shop with pagination support
-        
+
+        - Không truyền created_after: incremental theo update_after từ checkpoint của shop
+          (order_sync_updated_after). Lần đầu chưa có checkpoint thì import từ order_sync_created_after.
+        - Truyền created_after: import lại toàn bộ orders tạo sau created_after.
+
+        Orders được lấy theo updated_at tăng dần; mỗi page (orders, order lines, checkpoint và
+        order_sync_failed_ids) được commit cùng nhau nên lần chạy bị dừng giữa chừng tiếp tục từ page
+        cuối đã commit. Order lỗi lần đầu giữ checkpoint lại để lần sau lấy lại; order đã lỗi ở lần
+        trước mà vẫn lỗi thì không giữ checkpoint nữa, các orders này được lấy lại riêng theo order_id
+        (_retry_failed_orders) ở cuối mỗi lần chạy.
+
         Args:
             authorized_shop: The authorized shop to import orders for
-            created_after: ISO 8601 date string to filter orders created after this date (if None, uses shop configuration)
+            created_after: ISO 8601 date string to filter orders created after this date
+
+        Returns:
+            dict: {'success': số orders thành công, 'errors': số lỗi, 'total': tổng orders theo API}
         """
         if not authorized_shop.access_token:
             raise ValidationError(_('No access token available for shop %s') % authorized_shop.shop_name)
-        
-        try:
-            endpoint = '/orders/get'
-            success_count = 0
-            error_count = 0
-            offset = 0
-            limit = 50  # Lazada API limit: 1-50 for orders/get
-            total_orders = 0
-            
+
+        endpoint = '/orders/get'
+        params = {
+            'limit': ORDER_PAGE_LIMIT,
+            'offset': 0,
+            'sort_by': 'updated_at',
+            'sort_direction': 'ASC',
+        }
+
+        checkpoint = authorized_shop.order_sync_updated_after
+        if created_after is None and checkpoint:
+            # Lùi lại 1 khoảng nhỏ để không bỏ sót orders cập nhật cùng thời điểm với checkpoint
+            params['update_after'] = (checkpoint - ORDER_SYNC_OVERLAP).strftime('%Y-%m-%dT%H:%M:%SZ')
+        else:
             # Use shop configuration for created_after if not provided
             if created_after is None:
                 created_after_datetime = authorized_shop.order_sync_created_after
@@ -169,98 +190,85 @@ class TaLazadaOrder(models.Model):
                     created_after = created_after_datetime.strftime('%Y-%m-%dT%H:%M:%SZ')
                 else:
                     created_after = '2024-01-01T00:00:00Z'  # Default fallback
-            
-            # Sync all orders without status filter (API will return all statuses)
-            offset = 0
-            params = {
-                'limit': limit,
-                'offset': offset,
-                'created_after': created_after  # Required parameter - ISO 8601 format with Z suffix
-            }
-            
-            response = authorized_shop._make_api_request(endpoint, params, 'GET')
-            
-            if response.get('code') == '0' and response.get('data'):
+            params['created_after'] = created_after
+
+        success_count = 0
+        error_count = 0
+        total_orders = 0
+        known_failed_ids = set(filter(None, (authorized_shop.order_sync_failed_ids or '').split(',')))
+        failed_ids = set()
+        succeeded_ids = set()
+        # Page có order lỗi mới thì không tiến checkpoint nữa để lần sau lấy lại các orders đó
+        checkpoint_frozen = False
+
+        try:
+            while True:
+                try:
+                    response = authorized_shop._make_api_request(endpoint, params, 'GET')
+                except Exception as page_error:
+                    # Dừng tại đây, lần chạy sau tiếp tục từ checkpoint
+                    error_count += 1
+                    try:
+                        authorized_shop.message_post(
+                            body=_('Error in pagination request: %s') % str(page_error)
+                        )
+                    except:
+                        pass
+                    break
+
+                if response.get('code') != '0' or not response.get('data'):
+                    break
+
                 data = response['data']
                 total_orders = int(data.get('countTotal', 0))
-                
-                # Process first batch
                 orders_data = data.get('orders', [])
-                for order_data in orders_data:
-                    try:
-                        self._create_or_update_order_from_lazada(order_data, authorized_shop)
-                        success_count += 1
-                    except Exception as order_error:
-                        error_count += 1
-                        try:
-                            authorized_shop.message_post(
-                                body=_('Error creating/updating order: %s') % str(order_error)
-                            )
-                        except:
-                            pass
-                
-                # Update order lines for all orders in this batch
-                if orders_data:
-                    self._update_order_lines_batch(orders_data, authorized_shop)
-                
-                # Continue with pagination if there are more orders
-                while offset + limit < total_orders:
-                    offset += limit
-                    params['offset'] = offset
-                    
-                    try:
-                        response = authorized_shop._make_api_request(endpoint, params, 'GET')
-                        
-                        if response.get('code') == '0' and response.get('data'):
-                            data = response['data']
-                            orders_data = data.get('orders', [])
-                            
-                            for order_data in orders_data:
-                                try:
-                                    self._create_or_update_order_from_lazada(order_data, authorized_shop)
-                                    success_count += 1
-                                except Exception as order_error:
-                                    error_count += 1
-                                    try:
-                                        authorized_shop.message_post(
-                                            body=_('Error creating/updating order in pagination: %s') % str(order_error)
-                                        )
-                                    except:
-                                        pass
-                            
-                            # Update order lines for all orders in this batch
-                            if orders_data:
-                                self._update_order_lines_batch(orders_data, authorized_shop)
-                        else:
-                            # If API returns error, break the loop
-                            break
-                            
-                    except Exception as page_error:
-                        # If pagination request fails, continue with next page
-                        error_count += 1
-                        try:
-                            authorized_shop.message_post(
-                                body=_('Error in pagination request: %s') % str(page_error)
-                            )
-                        except:
-                            pass
-                        continue
-            
+                if not orders_data:
+                    break
+
+                page_succeeded_ids, page_failed_ids, page_updated_at = self._import_orders_page(orders_data, authorized_shop)
+                success_count += len(page_succeeded_ids)
+                error_count += len(page_failed_ids)
+                succeeded_ids |= page_succeeded_ids
+                failed_ids |= page_failed_ids
+
+                checkpoint_frozen = checkpoint_frozen or bool(page_failed_ids - known_failed_ids)
+                if not checkpoint_frozen and page_updated_at and (not checkpoint or page_updated_at > checkpoint):
+                    checkpoint = page_updated_at
+                    authorized_shop.order_sync_updated_after = checkpoint
+                self._set_failed_order_ids(authorized_shop, (known_failed_ids - succeeded_ids) | failed_ids)
+                # Commit page cùng checkpoint: lỗi ở page sau không làm mất các page đã import
+                self.env.cr.commit()
+
+                params['offset'] += ORDER_PAGE_LIMIT
+                if params['offset'] >= total_orders:
+                    break
+
+            # Orders lỗi ở các lần trước chỉ được lấy lại qua update_after khi Lazada cập nhật chúng,
+            # nên lấy lại trực tiếp theo order_id
+            retry_ids = sorted(known_failed_ids - succeeded_ids - failed_ids)[:ORDER_PAGE_LIMIT]
+            if retry_ids:
+                retry_succeeded_ids, retry_failed_ids = self._retry_failed_orders(retry_ids, authorized_shop)
+                success_count += len(retry_succeeded_ids)
+                succeeded_ids |= retry_succeeded_ids
+                failed_ids |= retry_failed_ids
+                self._set_failed_order_ids(authorized_shop, (known_failed_ids - succeeded_ids) | failed_ids)
+                self.env.cr.commit()
+
             # Post summary message after syncing all orders
-                try:
-                    if success_count > 0:
-                        authorized_shop.message_post(
-                        body=_('Successfully imported %d orders from Lazada (Total available: %d). %d errors occurred.') % 
-                                (success_count, total_orders, error_count)
-                        )
-                    else:
-                        authorized_shop.message_post(
-                            body=_('Failed to import any orders. %d errors occurred.') % error_count
-                        )
-                except:
-                    # If message_post fails, just continue
-                    pass
-                
+            try:
+                if success_count > 0 or not error_count:
+                    authorized_shop.message_post(
+                        body=_('Successfully imported %d orders from Lazada (Total available: %d). %d errors occurred.') %
+                            (success_count, total_orders, error_count)
+                    )
+                else:
+                    authorized_shop.message_post(
+                        body=_('Failed to import any orders. %d errors occurred.') % error_count
+                    )
+            except:
+                # If message_post fails, just continue
+                pass
+
         except Exception as e:
             try:
                 authorized_shop.message_post(
@@ -270,62 +278,105 @@ class TaLazadaOrder(models.Model):
                 # If message_post fails, just continue
                 pass
             raise
-    
+
+        return {
+            'success': success_count,
+            'errors': error_count,
+            'total': total_orders,
+        }
+
+    def _import_orders_page(self, orders_data, authorized_shop):
+        """Upsert 1 page orders và order lines
+
+        Returns:
+            tuple: (set order_id thành công, set order_id lỗi, updated_at lớn nhất của page)
+        """
+        succeeded_ids = set()
+        failed_ids = set()
+        max_updated_at = False
+        for order_data in orders_data:
+            order_id = str(order_data.get('order_id'))
+            try:
+                with self.env.cr.savepoint():
+                    self._create_or_update_order_from_lazada(order_data, authorized_shop)
+                succeeded_ids.add(order_id)
+            except Exception as order_error:
+                failed_ids.add(order_id)
+                try:
+                    authorized_shop.message_post(
+                        body=_('Error creating/updating order %s: %s') % (order_id, str(order_error))
+                    )
+                except:
+                    pass
+
+            # Tính cả order lỗi: checkpoint chỉ bị giữ lại bởi order lỗi lần đầu (xem import_from_lazada_for_shop)
+            updated_at = self._parse_datetime_safely(order_data.get('updated_at'))
+            if updated_at and (not max_updated_at or updated_at > max_updated_at):
+                max_updated_at = updated_at
+
+        # Update order lines for all orders in this batch
+        self._update_order_lines_batch(orders_data, authorized_shop)
+        return succeeded_ids, failed_ids, max_updated_at
+
+    @api.model
+    def _set_failed_order_ids(self, authorized_shop, failed_ids):
+        value = ','.join(sorted(failed_ids)) or False
+        if value != (authorized_shop.order_sync_failed_ids or False):
+            authorized_shop.order_sync_failed_ids = value
+
+    def _retry_failed_orders(self, order_ids, authorized_shop):
+        """Lấy lại từng order lỗi qua /order/get rồi import như 1 page
+
+        Returns:
+            tuple: (set order_id thành công, set order_id vẫn lỗi)
+        """
+        orders_data = []
+        failed_ids = set()
+        for order_id in order_ids:
+            try:
+                response = authorized_shop._make_api_request('/order/get', {'order_id': order_id}, 'GET')
+            except Exception as order_error:
+                response = {'message': str(order_error)}
+            if response.get('code') == '0' and response.get('data'):
+                orders_data.append(response['data'])
+            else:
+                failed_ids.add(order_id)
+                try:
+                    authorized_shop.message_post(
+                        body=_('Error fetching failed order %s: %s') % (order_id, response.get('message', ''))
+                    )
+                except:
+                    pass
+
+        succeeded_ids = set()
+        if orders_data:
+            succeeded_ids, page_failed_ids, __ = self._import_orders_page(orders_data, authorized_shop)
+            failed_ids |= page_failed_ids
+        return succeeded_ids, failed_ids
+
     def import_all_orders_from_lazada_for_shop(self, authorized_shop, created_after='2024-01-01T00:00:00Z'):
-        """Import all orders with different statuses from Lazada for specific authorized shop
-        
+        """Import lại toàn bộ orders (mọi trạng thái) tạo sau created_after
+
+        /orders/get không truyền status đã trả về orders ở mọi trạng thái nên chỉ cần 1 lượt full import.
+
         Args:
             authorized_shop: The authorized shop to import orders for
             created_after: ISO 8601 date string to filter orders created after this date
         """
         if not authorized_shop.access_token:
             raise ValidationError(_('No access token available for shop %s') % authorized_shop.shop_name)
-        
-        # List of statuses to import
-        statuses = [
-            'pending',
-            'shipped', 
-            'delivered',
-            'completed',
-            'cancelled',
-            'returned'
-        ]
-        
-        total_success = 0
-        total_errors = 0
-        
+
+        result = self.import_from_lazada_for_shop(authorized_shop, created_after)
+
+        # Post final summary
         try:
-            for status in statuses:
-                try:
-                    self.import_from_lazada_for_shop(authorized_shop, created_after)
-                    # Note: The import method doesn't return counts, so we can't track individual status results
-                except Exception as status_error:
-                    total_errors += 1
-                    # Log error but continue with next status
-                    try:
-                        authorized_shop.message_post(
-                            body=_('Error importing orders with status %s: %s') % (status, str(status_error))
-                        )
-                    except:
-                        pass
-            
-            # Post final summary
-            try:
-                authorized_shop.message_post(
-                    body=_('Bulk import completed for all order statuses. Check individual status messages for details.')
-                )
-            except:
-                pass
-                
-        except Exception as e:
-            try:
-                authorized_shop.message_post(
-                    body=_('Error in bulk import: %s') % str(e)
-                )
-            except:
-                pass
-            raise
-    
+            authorized_shop.message_post(
+                body=_('Bulk import completed: %d orders imported, %d errors.') % (result['success'], result['errors'])
+            )
+        except:
+            pass
+        return result
+
     def _create_or_update_order_from_lazada(self, order_data, authorized_shop):
         """Create or update order from Lazada data"""
         # Check if order already exists
@@ -428,11 +479,17 @@ class TaLazadaOrder(models.Model):
             existing_order.write(vals)
         else:
             vals['sync_status'] = 'synced'
-            order = self.create(vals)
+            self.create(vals)
     
     @api.model
     def _update_order_lines_batch(self, orders_data, authorized_shop):
-        """Update order lines for multiple orders in one API call"""
+        """Update order lines for multiple orders (set-based)
+
+        - Lấy items theo chunk 10 orders/API call
+        - Resolve orders và Lazada products của cả page bằng 2 query
+        - Diff theo order_item_id: tạo mới theo lô, chỉ write line có updated_at hoặc
+          product liên kết thay đổi, xóa line không còn trong order
+        """
         if not orders_data or not authorized_shop.access_token:
             return
         
@@ -447,78 +504,83 @@ class TaLazadaOrder(models.Model):
             if not order_ids:
                 return
             
-            # Call API in chunks of 10 orders each (to reduce API load)
-            endpoint = '/orders/items/get'
-            
-            # Process orders in chunks of 10
-            chunk_size = 10
-            total_chunks = (len(order_ids) + chunk_size - 1) // chunk_size  # Ceiling division
-            
-            
-            for chunk_index in range(0, len(order_ids), chunk_size):
-                chunk_order_ids = order_ids[chunk_index:chunk_index + chunk_size]
-                chunk_number = (chunk_index // chunk_size) + 1
-                
-                # Format: Comma-separated list in square brackets
-                order_ids_param = '[' + ','.join(chunk_order_ids) + ']'
-                
-                params = {
-                    'order_ids': order_ids_param
-                }
-                
-                
-                try:
-                    response = authorized_shop._make_api_request(endpoint, params, 'GET')
-                    
-                    
-                    if response.get('code') == '0' and response.get('data'):
-                        orders_items_data = response.get('data', [])
-                        
-                        
-                        # Process each order's items in this chunk
-                        for order_items_data in orders_items_data:
-                            order_id_from_api = order_items_data.get('order_id') or order_items_data.get('order_number')
-                            order_items = order_items_data.get('order_items', [])
-                            
-                            # Find the corresponding Odoo order
-                            odoo_order = self.search([
-                                ('order_id', '=', order_id_from_api),
-                                ('authorized_shop_id', '=', authorized_shop.id)
-                            ], limit=1)
-                            
-                            if odoo_order and order_items:
-                                # Clear existing order lines
-                                odoo_order.order_line_ids.unlink()
-                                
-                                # Create new order lines
-                                for item_data in order_items:
-                                    try:
-                                        odoo_order._create_order_line_from_item_data(item_data)
-                                    except Exception as line_error:
-                                        # Log error but continue with other lines
-                                        try:
-                                            authorized_shop.message_post(
-                                                body=_('Error creating order line for order %s: %s') % 
-                                                        (order_id_from_api, str(line_error))
-                                            )
-                                        except:
-                                            pass
-                                
-                    else:
-                        # API returned error for this chunk
-                        pass
-                        
-                except Exception as chunk_error:
-                    # Log error for this chunk but continue with other chunks
+            items_by_order = self._fetch_order_items(order_ids, authorized_shop)
+            if not items_by_order:
+                return
+
+            # Resolve Odoo orders của cả page
+            odoo_order_map = {
+                order['order_id']: order['id']
+                for order in self.search_read([
+                    ('order_id', 'in', list(items_by_order)),
+                    ('authorized_shop_id', '=', authorized_shop.id)
+                ], ['order_id'])
+            }
+
+            # Resolve linked Lazada products qua (lazada_sku_id, seller_sku)
+            sku_ids = list({
+                str(item['sku_id']) for items in items_by_order.values() for item in items
+                if item.get('sku') and item.get('sku_id')
+            })
+            product_map = {}
+            if sku_ids:
+                for product in self.env['ta.lazada.product'].search_read([
+                    ('lazada_sku_id', 'in', sku_ids),
+                    ('authorized_shop_id', '=', authorized_shop.id)
+                ], ['lazada_sku_id', 'seller_sku'], order='id'):
+                    product_map.setdefault((product['lazada_sku_id'], product['seller_sku']), product['id'])
+
+            # Lines hiện có
+            OrderLine = self.env['ta.lazada.order.line']
+            existing_lines = {}
+            for line in OrderLine.search_read(
+                [('order_id', 'in', list(odoo_order_map.values()))],
+                ['order_id', 'order_item_id', 'updated_at', 'lazada_product_id'],
+                order='id',
+                load=None,
+            ):
+                existing_lines.setdefault((line['order_id'], line['order_item_id']), line)
+
+            create_vals_list = []
+            write_list = []
+            for order_id_from_api, order_items in items_by_order.items():
+                odoo_order_id = odoo_order_map.get(order_id_from_api)
+                if not odoo_order_id:
+                    continue
+                for item_data in order_items:
                     try:
-                        authorized_shop.message_post(
-                            body=_('Error processing chunk %d/%d: %s') % 
-                                    (chunk_number, total_chunks, str(chunk_error))
-                        )
-                    except:
-                        pass
-            
-                        
+                        vals = self._prepare_order_line_vals(item_data, odoo_order_id, product_map)
+                    except Exception as line_error:
+                        # Log error but continue with other lines
+                        try:
+                            authorized_shop.message_post(
+                                body=_('Error creating order line for order %s: %s') %
+                                        (order_id_from_api, str(line_error))
+                            )
+                        except:
+                            pass
+                        continue
+                    existing = existing_lines.pop((odoo_order_id, vals['order_item_id']), None)
+                    if not existing:
+                        create_vals_list.append(vals)
+                    elif (not existing['updated_at'] or existing['updated_at'] != vals['updated_at']
+                          or existing['lazada_product_id'] != vals['lazada_product_id']):
+                        # Line đổi trên Lazada, hoặc product mới resolve được (sản phẩm được sync sau order)
+                        write_list.append((existing['id'], vals))
+
+            # Lines không còn trong order (chỉ xét các orders đã lấy được items)
+            unlink_ids = [line['id'] for line in existing_lines.values()]
+            try:
+                with self.env.cr.savepoint():
+                    OrderLine.browse(unlink_ids).unlink()
+                    for line_id, vals in write_list:
+                        OrderLine.browse(line_id).write(vals)
+                    if create_vals_list:
+                        OrderLine.create(create_vals_list)
+            except Exception:
+                # 1 line lỗi không làm mất cả page: làm lại từng line trong savepoint riêng
+                self._apply_order_line_changes_per_line(unlink_ids, write_list, create_vals_list, authorized_shop)
+
         except Exception as e:
             # Log error but don't fail the batch
             try:
@@ -527,9 +589,77 @@ class TaLazadaOrder(models.Model):
                 )
             except:
                 pass
-    
-    def _create_order_line_from_item_data(self, item_data):
-        """Create order line from item data"""
+
+    @api.model
+    def _apply_order_line_changes_per_line(self, unlink_ids, write_list, create_vals_list, authorized_shop):
+        """Fallback của _update_order_lines_batch: áp dụng từng thay đổi, line lỗi chỉ bỏ qua line đó"""
+        OrderLine = self.env['ta.lazada.order.line']
+        operations = [(line_id, 'unlink', None) for line_id in unlink_ids]
+        operations += [(line_id, 'write', vals) for line_id, vals in write_list]
+        operations += [(vals['order_item_id'], 'create', vals) for vals in create_vals_list]
+        for line_key, operation, vals in operations:
+            try:
+                with self.env.cr.savepoint():
+                    if operation == 'unlink':
+                        OrderLine.browse(line_key).unlink()
+                    elif operation == 'write':
+                        OrderLine.browse(line_key).write(vals)
+                    else:
+                        OrderLine.create(vals)
+            except Exception as line_error:
+                try:
+                    authorized_shop.message_post(
+                        body=_('Error updating order line %s: %s') % (line_key, str(line_error))
+                    )
+                except:
+                    pass
+
+    @api.model
+    def _fetch_order_items(self, order_ids, authorized_shop):
+        """Gọi /orders/items/get theo chunk 10 orders, trả về {order_id: [item_data]}"""
+        endpoint = '/orders/items/get'
+        chunk_size = 10
+        total_chunks = (len(order_ids) + chunk_size - 1) // chunk_size  # Ceiling division
+        items_by_order = {}
+
+        for chunk_index in range(0, len(order_ids), chunk_size):
+            chunk_order_ids = order_ids[chunk_index:chunk_index + chunk_size]
+            chunk_number = (chunk_index // chunk_size) + 1
+
+            # Format: Comma-separated list in square brackets
+            params = {
+                'order_ids': '[' + ','.join(chunk_order_ids) + ']'
+            }
+
+            try:
+                response = authorized_shop._make_api_request(endpoint, params, 'GET')
+                if response.get('code') == '0' and response.get('data'):
+                    for order_items_data in response.get('data', []):
+                        order_id_from_api = order_items_data.get('order_id') or order_items_data.get('order_number')
+                        order_items = order_items_data.get('order_items', [])
+                        if order_id_from_api and order_items:
+                            items_by_order[str(order_id_from_api)] = order_items
+            except Exception as chunk_error:
+                # Log error for this chunk but continue with other chunks
+                try:
+                    authorized_shop.message_post(
+                        body=_('Error processing chunk %d/%d: %s') %
+                                (chunk_number, total_chunks, str(chunk_error))
+                    )
+                except:
+                    pass
+
+        return items_by_order
+
+    @api.model
+    def _prepare_order_line_vals(self, item_data, order_id, product_map):
+        """Prepare order line values from item data
+
+        Args:
+            item_data: item từ /orders/items/get
+            order_id: ID của ta.lazada.order
+            product_map: {(lazada_sku_id, seller_sku): ta.lazada.product ID}
+        """
         # Parse datetime fields
         item_created_at = self._parse_datetime_safely(item_data.get('created_at'))
         item_updated_at = self._parse_datetime_safely(item_data.get('updated_at'))
@@ -548,22 +678,15 @@ class TaLazadaOrder(models.Model):
         if item_status not in valid_statuses:
             item_status = 'pending'  # Fallback to pending for invalid status
         
-        # Try to find linked Lazada product via lazada_sku_id
-        lazada_product = None
+        # Linked Lazada product via lazada_sku_id + seller_sku
+        lazada_product_id = False
         sku = item_data.get('sku')
         sku_id = item_data.get('sku_id')
         if sku and sku_id:
-            # Find via product SKU table using lazada_sku_id only
-            product_sku = self.env['ta.lazada.product'].search([
-                ('lazada_sku_id', '=', sku_id),
-                ('seller_sku', '=', sku),
-                ('authorized_shop_id', '=', self.authorized_shop_id.id)
-            ], limit=1)
-            if product_sku:
-                lazada_product = product_sku
+            lazada_product_id = product_map.get((str(sku_id), sku), False)
         
-        self.env['ta.lazada.order.line'].create({
-            'order_id': self.id,
+        return {
+            'order_id': order_id,
             'order_item_id': str(item_data.get('order_item_id', '')),
             'sku': item_data.get('sku'),
             'shop_sku': item_data.get('shop_sku'),
@@ -652,8 +775,8 @@ class TaLazadaOrder(models.Model):
             'pick_up_store_open_hour': str(pick_up_store_info.get('pick_up_store_open_hour', [])),
             
             # Link to Lazada product
-            'lazada_product_id': lazada_product.id if lazada_product else False,
-        })
+            'lazada_product_id': lazada_product_id,
+        }
 
 
 
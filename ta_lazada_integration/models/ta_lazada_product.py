@@ -2,10 +2,35 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
-import requests
 import json
 import base64
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from .http_session import http_request
+
+IMAGE_DOWNLOAD_WORKERS = 8
+
+
+def _download_image(image_url):
+    """Tải 1 ảnh, trả về base64 hoặc None. Không dùng env nên chạy được trong thread."""
+    try:
+        response = http_request('GET', image_url, timeout=30)
+        if response.status_code == 200:
+            return base64.b64encode(response.content)
+    except Exception:
+        # Log error but continue with other images
+        pass
+    return None
+
+
+def _download_images(image_urls):
+    """Tải nhiều ảnh song song, trả về {url: base64}"""
+    if not image_urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(IMAGE_DOWNLOAD_WORKERS, len(image_urls))) as executor:
+        binaries = executor.map(_download_image, image_urls)
+        return {url: binary for url, binary in zip(image_urls, binaries) if binary}
 
 
 class TaLazadaProduct(models.Model):
@@ -579,24 +604,25 @@ class TaLazadaProduct(models.Model):
         self._import_product_images(existing_main_product, product_data)
     
     def _import_product_images(self, lazada_product, product_data):
-        """Import product images from Lazada data"""
+        """Import product images from Lazada data
+
+        Ảnh được cache theo hash_code/URL: ảnh đã có của product được giữ lại, ảnh đã tải
+        cho product khác được dùng lại, chỉ ảnh mới mới được tải (song song).
+        """
         try:
-            # Clear existing images
-            lazada_product.env['ta.lazada.product.image'].search([
-                ('product_id', '=', lazada_product.id)
-            ]).unlink()
-            
+            ProductImage = lazada_product.env['ta.lazada.product.image']
+
             # Get images from product data
             images_data = product_data.get('images', [])
             if not images_data:
                 # Try alternative image fields
                 images_data = product_data.get('image_urls', [])
-            
+
             # If images_data is a string (single URL), convert to list
             if isinstance(images_data, str):
                 images_data = [images_data]
-            
-            # Import each image
+
+            wanted_images = []
             for index, image_data in enumerate(images_data):
                 if isinstance(image_data, dict):
                     image_url = image_data.get('url') or image_data.get('image_url')
@@ -609,27 +635,49 @@ class TaLazadaProduct(models.Model):
                     image_name = f"Image {index + 1}"
                     hash_code = None
                     sort_order = index
-                
+
                 if image_url:
-                    # Download and store image
-                    try:
-                        response = requests.get(image_url, timeout=30)
-                        if response.status_code == 200:
-                            image_binary = base64.b64encode(response.content)
-                            
-                            # Create image record
-                            lazada_product.env['ta.lazada.product.image'].create({
-                                'product_id': lazada_product.id,
-                                'name': image_name,
-                                'image': image_binary,
-                                'image_url': image_url,
-                                'hash_code': hash_code,
-                                'sort_order': sort_order,
-                            })
-                    except Exception as e:
-                        # Log error but continue with other images
-                        continue
-                        
+                    wanted_images.append({
+                        'name': image_name,
+                        'image_url': image_url,
+                        'hash_code': hash_code,
+                        'sort_order': sort_order,
+                    })
+
+            # Ảnh hiện có của product: giữ ảnh còn dùng, xóa ảnh không còn
+            existing_images = ProductImage.search([('product_id', '=', lazada_product.id)])
+            existing_by_key = {image._get_cache_key(): image for image in existing_images}
+            kept_images = ProductImage.browse()
+            new_images = []
+            for values in wanted_images:
+                image = existing_by_key.get(ProductImage._get_cache_key(values))
+                if image and image not in kept_images:
+                    kept_images |= image
+                    if image.name != values['name'] or image.sort_order != values['sort_order']:
+                        image.write({'name': values['name'], 'sort_order': values['sort_order']})
+                else:
+                    new_images.append(values)
+            (existing_images - kept_images).unlink()
+
+            if not new_images:
+                return
+
+            # Dùng lại ảnh đã tải cho product khác, chỉ tải các ảnh chưa có
+            cached_binaries = ProductImage._get_cached_image_binaries(new_images)
+            urls_to_download = list({
+                values['image_url'] for values in new_images
+                if ProductImage._get_cache_key(values) not in cached_binaries
+            })
+            downloaded = _download_images(urls_to_download)
+
+            create_vals_list = []
+            for values in new_images:
+                image_binary = cached_binaries.get(ProductImage._get_cache_key(values)) or downloaded.get(values['image_url'])
+                if image_binary:
+                    create_vals_list.append(dict(values, product_id=lazada_product.id, image=image_binary))
+            if create_vals_list:
+                ProductImage.create(create_vals_list)
+
         except Exception as e:
             # Log error but don't stop product creation
             pass
@@ -642,10 +690,41 @@ class TaLazadaProductImage(models.Model):
     product_id = fields.Many2one('ta.lazada.product', 'Product', required=True, ondelete='cascade')
     name = fields.Char('Image Name')
     image = fields.Binary('Image')
-    image_url = fields.Char('Image URL')
-    hash_code = fields.Char('Hash Code')
+    image_url = fields.Char('Image URL', index=True)
+    hash_code = fields.Char('Hash Code', index=True)
     sort_order = fields.Integer('Sort Order', default=0)
 
+    def _get_cache_key(self, values=None):
+        """Key cache của ảnh: hash_code nếu có, không thì URL"""
+        if values is None:
+            values = {'hash_code': self.hash_code, 'image_url': self.image_url}
+        if values.get('hash_code'):
+            return ('hash_code', values['hash_code'])
+        return ('image_url', values.get('image_url'))
+
+    @api.model
+    def _get_cached_image_binaries(self, images_values):
+        """Tìm ảnh đã tải trước đó (ở product bất kỳ) theo hash_code/URL, trả về {cache key: base64}"""
+        hash_codes = [values['hash_code'] for values in images_values if values.get('hash_code')]
+        image_urls = [values['image_url'] for values in images_values if not values.get('hash_code')]
+        domain = []
+        if hash_codes:
+            domain = [('hash_code', 'in', hash_codes)]
+        if image_urls:
+            url_domain = [('hash_code', 'in', [False, '']), ('image_url', 'in', image_urls)]
+            domain = ['|'] + domain + ['&'] + url_domain if domain else url_domain
+        if not domain:
+            return {}
+
+        # Chọn 1 ảnh cho mỗi key trước, chỉ đọc binary của các ảnh đã chọn
+        image_ids = {}
+        for image in self.search_read(domain + [('image', '!=', False)], ['hash_code', 'image_url'], order='id desc'):
+            image_ids.setdefault(self._get_cache_key(image), image['id'])
+        if not image_ids:
+            return {}
+        binaries = {image['id']: image['image'] for image in self.browse(list(image_ids.values())).read(['image'])}
+        return {key: binaries[image_id] for key, image_id in image_ids.items()}
+
 
 class TaLazadaProductAttribute(models.Model):
     _name = 'ta.lazada.product.attribute'
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import test_order_lines
+from . import test_order_sync
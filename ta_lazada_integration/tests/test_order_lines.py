@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestOrderLines(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        config = cls.env['ta.lazada.config'].create({
+            'name': 'Test ISV',
+            'app_key': 'key',
+            'app_secret': 'secret',
+        })
+        cls.shop = cls.env['ta.lazada.authorized.shop'].create({
+            'shop_name': 'Test Shop',
+            'seller_id': 'SELLER1',
+            'isv_config_id': config.id,
+            'access_token': 'token',
+        })
+        cls.order = cls.env['ta.lazada.order'].create({
+            'order_id': '1001',
+            'order_number': '1001',
+            'authorized_shop_id': cls.shop.id,
+            'created_at': datetime(2025, 1, 1),
+        })
+
+    def _item(self, order_item_id, updated_at, **extra):
+        item = {
+            'order_item_id': order_item_id,
+            'name': 'Item %s' % order_item_id,
+            'sku': 'SKU-%s' % order_item_id,
+            'sku_id': 'SKUID-%s' % order_item_id,
+            'item_price': '10000',
+            'paid_price': '10000',
+            'updated_at': updated_at,
+        }
+        item.update(extra)
+        return item
+
+    def _sync_lines(self, items):
+        def fake_request(shop, endpoint, params=None, method='GET', files=None):
+            return {'code': '0', 'data': [{'order_id': '1001', 'order_items': items}]}
+
+        with patch.object(type(self.shop), '_make_api_request', fake_request):
+            self.env['ta.lazada.order']._update_order_lines_batch([{'order_id': '1001'}], self.shop)
+        return {line.order_item_id: line for line in self.env['ta.lazada.order.line'].search([
+            ('order_id', '=', self.order.id)])}
+
+    def test_lines_diffed_by_order_item_id(self):
+        lines = self._sync_lines([
+            self._item('A', '2025-01-01T08:00:00'),
+            self._item('B', '2025-01-01T08:00:00'),
+            self._item('C', '2025-01-01T08:00:00'),
+        ])
+        self.assertEqual(set(lines), {'A', 'B', 'C'})
+        line_a, line_b = lines['A'], lines['B']
+        line_a.tracking_number = 'LOCAL'
+
+        lines = self._sync_lines([
+            self._item('A', '2025-01-01T08:00:00', paid_price='1'),
+            self._item('B', '2025-01-02T08:00:00', paid_price='9000'),
+            self._item('D', '2025-01-02T08:00:00'),
+        ])
+        self.assertEqual(set(lines), {'A', 'B', 'D'}, "Line không còn trong order bị xóa")
+        self.assertEqual(lines['A'], line_a)
+        self.assertEqual(line_a.tracking_number, 'LOCAL', "Line có updated_at không đổi không bị ghi lại")
+        self.assertEqual(line_a.paid_price, 10000)
+        self.assertEqual(lines['B'], line_b)
+        self.assertEqual(line_b.paid_price, 9000)
+
+    def test_unchanged_line_picks_up_late_product(self):
+        lines = self._sync_lines([self._item('A', '2025-01-01T08:00:00')])
+        self.assertFalse(lines['A'].lazada_product_id)
+
+        product = self.env['ta.lazada.product'].create({
+            'name': 'Product A',
+            'sku': 'SKU-A',
+            'seller_sku': 'SKU-A',
+            'lazada_sku_id': 'SKUID-A',
+            'price': 10000,
+            'authorized_shop_id': self.shop.id,
+        })
+        lines = self._sync_lines([self._item('A', '2025-01-01T08:00:00')])
+        self.assertEqual(lines['A'].lazada_product_id, product)
+
+    def test_invalid_line_does_not_drop_page(self):
+        lines = self._sync_lines([
+            self._item('A', '2025-01-01T08:00:00'),
+            self._item('B', '2025-01-01T08:00:00', name=False),
+        ])
+        self.assertEqual(set(lines), {'A'}, "Line lỗi chỉ bỏ qua line đó")
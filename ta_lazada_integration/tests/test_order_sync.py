@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestOrderSync(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        config = cls.env['ta.lazada.config'].create({
+            'name': 'Test ISV',
+            'app_key': 'key',
+            'app_secret': 'secret',
+        })
+        cls.shop = cls.env['ta.lazada.authorized.shop'].create({
+            'shop_name': 'Test Shop',
+            'seller_id': 'SELLER1',
+            'isv_config_id': config.id,
+            'access_token': 'token',
+        })
+        cls.Order = cls.env['ta.lazada.order']
+
+    def setUp(self):
+        super().setUp()
+        # Mỗi page được commit trong import_from_lazada_for_shop
+        self.patch(type(self.env.cr), 'commit', lambda cr: None)
+        self.requests = []
+
+    def _order_data(self, order_id, updated_at, **extra):
+        data = {
+            'order_id': order_id,
+            'order_number': order_id,
+            'created_at': '2025-01-01T00:00:00',
+            'updated_at': updated_at,
+            'statuses': ['pending'],
+            'price': '100000',
+        }
+        data.update(extra)
+        return data
+
+    def _run_import(self, pages, orders_by_id=None):
+        """Chạy import với API giả: pages là list các page /orders/get, orders_by_id cho /order/get"""
+        orders_by_id = orders_by_id or {}
+        total = sum(len(page) for page in pages)
+
+        def fake_request(shop, endpoint, params=None, method='GET', files=None):
+            self.requests.append((endpoint, dict(params or {})))
+            if endpoint == '/orders/get':
+                page = params['offset'] // 50
+                orders = pages[page] if page < len(pages) else []
+                return {'code': '0', 'data': {'countTotal': total, 'orders': orders}}
+            if endpoint == '/order/get':
+                order = orders_by_id.get(params['order_id'])
+                return {'code': '0', 'data': order} if order else {'code': '1', 'message': 'not found'}
+            return {'code': '0', 'data': []}
+
+        with patch.object(type(self.shop), '_make_api_request', fake_request):
+            return self.Order.import_from_lazada_for_shop(self.shop)
+
+    def _orders_get_params(self):
+        return [params for endpoint, params in self.requests if endpoint == '/orders/get']
+
+    def test_checkpoint_advances_and_drives_next_run(self):
+        page_1 = [self._order_data(str(1000 + i), '2025-01-02T08:00:00') for i in range(50)]
+        page_2 = [self._order_data('2000', '2025-01-03T09:30:00')]
+        result = self._run_import([page_1, page_2])
+
+        self.assertEqual(result['success'], 51)
+        self.assertEqual(self.shop.order_sync_updated_after, datetime(2025, 1, 3, 9, 30))
+        self.assertIn('created_after', self._orders_get_params()[0])
+
+        self.requests = []
+        self._run_import([[self._order_data('2000', '2025-01-03T09:30:00')]])
+        params = self._orders_get_params()[0]
+        self.assertNotIn('created_after', params)
+        self.assertEqual(params['update_after'], '2025-01-03T09:25:00Z',
+                         "Lần sau lấy theo checkpoint, lùi lại ORDER_SYNC_OVERLAP")
+        self.assertEqual(self.Order.search_count([('authorized_shop_id', '=', self.shop.id)]), 51)
+
+    def test_new_failure_freezes_checkpoint(self):
+        self.shop.order_sync_updated_after = datetime(2025, 1, 1)
+        result = self._run_import([[
+            self._order_data('1', '2025-01-02T08:00:00', price='not a number'),
+            self._order_data('2', '2025-01-03T08:00:00'),
+        ]])
+
+        self.assertEqual(result['errors'], 1)
+        self.assertEqual(self.shop.order_sync_failed_ids, '1')
+        self.assertEqual(self.shop.order_sync_updated_after, datetime(2025, 1, 1),
+                         "Order lỗi lần đầu giữ checkpoint lại để lần sau lấy lại")
+        self.assertTrue(self.Order.search([('order_id', '=', '2')]))
+
+    def test_repeated_failure_does_not_pin_checkpoint(self):
+        self.shop.write({
+            'order_sync_updated_after': datetime(2025, 1, 1),
+            'order_sync_failed_ids': '1',
+        })
+        self._run_import([[
+            self._order_data('1', '2025-01-02T08:00:00', price='not a number'),
+            self._order_data('2', '2025-01-03T08:00:00'),
+        ]])
+
+        self.assertEqual(self.shop.order_sync_updated_after, datetime(2025, 1, 3, 8, 0))
+        self.assertEqual(self.shop.order_sync_failed_ids, '1')
+
+    def test_failed_orders_retried_by_order_id(self):
+        self.shop.write({
+            'order_sync_updated_after': datetime(2025, 1, 1),
+            'order_sync_failed_ids': '1,9',
+        })
+        result = self._run_import(
+            [[self._order_data('2', '2025-01-03T08:00:00')]],
+            orders_by_id={'1': self._order_data('1', '2024-12-30T08:00:00')},
+        )
+
+        retried = sorted(params['order_id'] for endpoint, params in self.requests if endpoint == '/order/get')
+        self.assertEqual(retried, ['1', '9'])
+        self.assertEqual(result['success'], 2)
+        self.assertTrue(self.Order.search([('order_id', '=', '1')]))
+        self.assertEqual(self.shop.order_sync_failed_ids, '9', "Order lấy lại được thì bỏ khỏi danh sách lỗi")
@@ -22,6 +22,7 @@
     'depends': ['base_setup'],
     'data': [
         'security/ir.model.access.csv',
+        'data/tiktok_bc_report_cron.xml',
         'views/res_config_settings_views.xml',
         'views/tiktok_business_account_views.xml',
         'views/tiktok_advertiser_views.xml',
@@ -6,6 +6,8 @@ from odoo import http, fields
 from odoo.http import request
 from odoo.exceptions import UserError
 
+from ..models.http_session import http_request
+
 _logger = logging.getLogger(__name__)
 
 
@@ -81,7 +83,7 @@ class TiktokBusinessController(http.Controller):
             }
             
             _logger.info(f"Tiktok Marketing API: Exchanging code for token: {url}")
-            response = requests.post(url, json=data, headers=headers, timeout=30)
+            response = http_request('POST', url, json=data, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
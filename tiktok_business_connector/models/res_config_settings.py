@@ -23,3 +23,17 @@ class ResConfigSettings(models.TransientModel):
         config_parameter='tiktok_business.client_secret',
         help='Client Secret từ TikTok for Developers'
     )
+
+    tiktok_report_restate_days = fields.Integer(
+        string='Report Restate Days',
+        config_parameter='tiktok_business.report_restate_days',
+        default=3,
+        help='Số ngày gần nhất được lấy lại khi refresh report (TikTok có thể cập nhật lại số liệu các ngày này)'
+    )
+
+    tiktok_api_qps = fields.Integer(
+        string='API Requests per Second',
+        config_parameter='tiktok_business.api_qps',
+        default=10,
+        help='Số request/giây tối đa gửi tới TikTok Business API (dùng chung cho các advertiser chạy song song)'
+    )
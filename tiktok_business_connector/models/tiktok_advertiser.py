@@ -82,16 +82,34 @@ class TiktokAdvertiser(models.Model):
             _logger.error(f"Tiktok Marketing API: Error syncing advertisers: {str(e)}")
             raise UserError(_('Tiktok Marketing API: Lỗi khi đồng bộ advertisers: %s') % str(e))
 
-    def _sync_campaigns(self):
+    def _run_advertiser_tasks(self, task_name, task_func, *args, **kwargs):
+        """
+        Chạy task cho từng advertiser: 1 advertiser chạy trực tiếp,
+        nhiều advertisers chạy song song (mỗi advertiser 1 cursor, chung rate limiter theo app)
+        """
+        if len(self) == 1:
+            return task_func(self, *args, **kwargs)
+        return self._run_multi_thread_tasks(self, task_name, task_func, None, True, *args, **kwargs)
+
+    @api.model
+    def _sync_advertiser_entities(self, advertiser, model_name, sync_method, filtering=None):
+        """
+        Task function: đồng bộ campaigns / ad groups / ads (model_name, sync_method) của 1 advertiser
+        """
+        dict_params = {'advertiser_id': advertiser.advertiser_id}
+        if filtering:
+            dict_params['filtering'] = json.dumps(filtering)
+        # lấy access token từ business account của advertiser, có thể có nhiều access token trong nhiều business accounts
+        access_token_list = advertiser.business_account_ids.sudo().mapped('access_token')
+        for access_token in access_token_list:
+            if not access_token:
+                continue
+            getattr(advertiser.env[model_name], sync_method)(dict_params=dict_params, access_token=access_token)
+
+    def _sync_campaigns(self, filtering=None):
         """Đồng bộ campaigns cho các advertisers được chọn"""
-        for advertiser in self:
-            dict_params = {'advertiser_id': advertiser.advertiser_id}
-            # lấy access token từ business account của advertiser, có thể có nhiều access token trong nhiều business accounts
-            access_token_list = advertiser.business_account_ids.sudo().mapped('access_token')
-            for access_token in access_token_list:
-                if not access_token:
-                    continue
-                self.env['tiktok.campaign']._sync_campaigns(dict_params=dict_params, access_token=access_token)
+        return self._run_advertiser_tasks("Sync Campaigns", self._sync_advertiser_entities,
+                                         'tiktok.campaign', '_sync_campaigns', filtering)
 
     def action_sync_campaigns(self):
         """Đồng bộ campaigns cho các advertisers được chọn"""
@@ -113,21 +131,13 @@ class TiktokAdvertiser(models.Model):
         Returns:
             None
         """
-        for advertiser in self:
-            dict_params = { 'advertiser_id': advertiser.advertiser_id}
-            filtering = filtering or {}
-            if campaign_ids:
-                filtering['campaign_ids'] = campaign_ids
-            if adgroup_ids:
-                filtering['adgroup_ids'] = adgroup_ids
-            if filtering:
-                dict_params['filtering'] = json.dumps(filtering)
-            # lấy access token từ business account của advertiser, có thể có nhiều access token trong nhiều business accounts
-            access_token_list = advertiser.business_account_ids.sudo().mapped('access_token')
-            for access_token in access_token_list:
-                if not access_token:
-                    continue
-                self.env['tiktok.ad_group']._sync_ad_groups(dict_params=dict_params, access_token=access_token)
+        filtering = dict(filtering or {})
+        if campaign_ids:
+            filtering['campaign_ids'] = campaign_ids
+        if adgroup_ids:
+            filtering['adgroup_ids'] = adgroup_ids
+        return self._run_advertiser_tasks("Sync Ad Groups", self._sync_advertiser_entities,
+                                         'tiktok.ad_group', '_sync_ad_groups', filtering)
 
     def action_sync_ad_groups(self):
         """Đồng bộ ad groups cho các advertisers được chọn"""
@@ -152,23 +162,15 @@ class TiktokAdvertiser(models.Model):
         Returns:
             None
         """
-        for advertiser in self:
-            dict_params = { 'advertiser_id': advertiser.advertiser_id}
-            filtering = filtering or {}
-            if ad_ids:
-                filtering['ad_ids'] = ad_ids
-            if adgroup_ids:
-                filtering['adgroup_ids'] = adgroup_ids
-            if campaign_ids:
-                filtering['campaign_ids'] = campaign_ids
-            if filtering:
-                dict_params['filtering'] = json.dumps(filtering)
-            # lấy access token từ business account của advertiser, có thể có nhiều access token trong nhiều business accounts
-            access_token_list = advertiser.business_account_ids.sudo().mapped('access_token')
-            for access_token in access_token_list:
-                if not access_token:
-                    continue
-                self.env['tiktok.ad']._sync_ads(dict_params=dict_params, access_token=access_token)
+        filtering = dict(filtering or {})
+        if ad_ids:
+            filtering['ad_ids'] = ad_ids
+        if adgroup_ids:
+            filtering['adgroup_ids'] = adgroup_ids
+        if campaign_ids:
+            filtering['campaign_ids'] = campaign_ids
+        return self._run_advertiser_tasks("Sync Ads", self._sync_advertiser_entities,
+                                         'tiktok.ad', '_sync_ads', filtering)
 
     def action_sync_ads(self):
         """Đồng bộ ads cho các advertisers được chọn"""
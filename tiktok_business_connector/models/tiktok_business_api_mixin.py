@@ -1,12 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import requests
 import json
 import logging
+import threading
+import time
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 
+from .http_session import configure_host, http_request
+
 _logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_THREADS = 8
+# Số request/giây tối đa gửi tới TikTok Business API cho mỗi app (mặc định khi chưa cấu hình)
+DEFAULT_API_QPS = 10
+API_TIMEOUT = 60
+MAX_RATE_LIMIT_RETRIES = 3
+# Code lỗi TikTok Business API khi vượt rate limit
+RATE_LIMIT_ERROR_CODE = 40100
+API_BASE_URL = 'https://business-api.tiktok.com/open_api/v1.3'
+
+# Report API chậm hơn mặc định; mỗi thread advertiser giữ 1 connection
+configure_host(API_BASE_URL, timeout=API_TIMEOUT, pool_maxsize=MAX_CONCURRENT_THREADS)
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe để giới hạn số request/giây gửi tới TikTok Business API
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1, rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Chờ cho tới khi có token rồi lấy 1 token
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+# Rate limiter dùng chung trong process, key theo (database, app_id)
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limiter(key, rate):
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if not limiter or limiter.rate != float(rate):
+            limiter = _rate_limiters[key] = TokenBucket(rate)
+        return limiter
+
+
 class TiktokBusinessApiMixin(models.AbstractModel):
     """
     Abstract model chứa các method chung để tương tác với TikTok Business API
@@ -27,24 +86,34 @@ class TiktokBusinessApiMixin(models.AbstractModel):
         Returns:
             dict: Dữ liệu trả về từ API
         """
-        base_url = 'https://business-api.tiktok.com/open_api/v1.3'
-        url = f"{base_url}/{endpoint}"
+        url = f"{API_BASE_URL}/{endpoint}"
         headers = {
             'Content-Type': 'application/json',
             'Access-Token': access_token
         }
+        limiter = self._get_api_rate_limiter()
         
         try:
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method.upper() == 'POST':
-                response = requests.post(url, headers=headers, json=data)
-            elif method.upper() == 'PUT':
-                response = requests.put(url, headers=headers, json=data)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, headers=headers, params=params)
-            else:
-                raise UserError(_('Tiktok Marketing API: Method không được hỗ trợ: %s') % method)
+            attempt = 0
+            while True:
+                limiter.acquire()
+                if method.upper() in ('GET', 'DELETE'):
+                    response = http_request(method.upper(), url, headers=headers, params=params)
+                elif method.upper() in ('POST', 'PUT'):
+                    response = http_request(method.upper(), url, headers=headers, json=data)
+                else:
+                    raise UserError(_('Tiktok Marketing API: Method không được hỗ trợ: %s') % method)
+
+                # Vượt rate limit (HTTP 429 hoặc code 40100) thì chờ rồi thử lại
+                rate_limited = response.status_code == 429
+                if not rate_limited and response.ok:
+                    result = response.json()
+                    rate_limited = result.get('code') == RATE_LIMIT_ERROR_CODE
+                if rate_limited and attempt < MAX_RATE_LIMIT_RETRIES:
+                    attempt += 1
+                    time.sleep(2 ** attempt)
+                    continue
+                break
             
             response.raise_for_status()
             result = response.json()
@@ -64,6 +133,119 @@ class TiktokBusinessApiMixin(models.AbstractModel):
             _logger.error(f"Tiktok Marketing API {url}: Unexpected error calling TikTok API: {str(e)}")
             raise UserError(_('Tiktok Marketing API %s: Lỗi không mong muốn: %s') % (url, str(e)))
 
+    def _get_api_rate_limiter(self):
+        """Rate limiter dùng chung cho mọi thread gọi API bằng cùng 1 app"""
+        Config = self.env['ir.config_parameter'].sudo()
+        qps = float(Config.get_param('tiktok_business.api_qps', DEFAULT_API_QPS) or DEFAULT_API_QPS)
+        app_id = Config.get_param('tiktok_business.app_id') or ''
+        return _get_rate_limiter((self.env.cr.dbname, app_id), qps)
+
+    # ===== Multi-threading Framework =====
+    @api.model
+    def _execute_thread_task(self, record_id, task_name, task_func, *args, **kwargs):
+        """
+        Execute a task for a single record (advertiser, report...) in a separate thread
+        """
+        # Create new environment for this thread
+        with self.pool.cursor() as new_cr:
+            _self = task_func.__self__
+            context = dict(_self.env.context)
+            new_env = api.Environment(new_cr, self.env.uid, context)
+            record = new_env[self._name].browse(record_id)
+
+            # Get the task function with the new environment
+            _self = _self.with_env(new_env)
+            task_func = task_func.__func__.__get__(_self, _self.__class__)
+
+            try:
+                _logger.info("Starting %s for %s: %s", task_name, self._name, record.display_name)
+
+                # Execute the task
+                result = task_func(record, *args, **kwargs)
+                new_cr.commit()
+
+                _logger.info("%s completed for %s", task_name, record.display_name)
+                return {
+                    'record_id': record_id,
+                    'record_name': record.display_name,
+                    'status': 'success',
+                    'task': task_name,
+                    'result': result
+                }
+
+            except Exception as e:
+                _logger.error("Failed %s for %s: %s", task_name, record.display_name, str(e))
+                new_cr.rollback()
+                return {
+                    'record_id': record_id,
+                    'record_name': record.display_name,
+                    'status': 'error',
+                    'task': task_name,
+                    'error': str(e)
+                }
+
+    @api.model
+    def _run_multi_thread_tasks(self, records, task_name, task_func, max_workers=None, raise_error=True, *args, **kwargs):
+        """
+        Run tasks for multiple records using multi-threading: mỗi record 1 cursor riêng,
+        số thread tối đa MAX_CONCURRENT_THREADS, request API chung rate limiter theo app.
+        Records phải đã được commit để thread khác đọc được.
+        """
+        if not records:
+            _logger.warning("No records provided for %s", task_name)
+            return []
+
+        _logger.info("Starting %s for %s %s", task_name, len(records), records._name)
+
+        # Set default max_workers
+        if max_workers is None:
+            max_workers = min(len(records), MAX_CONCURRENT_THREADS)
+
+        results = []
+        records = records.with_env(self.env)
+        runner = self.env[records._name]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit tasks for each record
+            future_to_record = {
+                executor.submit(runner._execute_thread_task, record.id, task_name, task_func, *args, **kwargs): record
+                for record in records
+            }
+
+            # Collect results
+            for future in as_completed(future_to_record):
+                record = future_to_record[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    _logger.error("Thread for %s failed: %s", record.display_name, str(e))
+                    results.append({
+                        'record_id': record.id,
+                        'record_name': record.display_name,
+                        'status': 'error',
+                        'task': task_name,
+                        'error': str(e)
+                    })
+
+        # Summary results
+        successful = [r for r in results if r['status'] == 'success']
+        failed = [r for r in results if r['status'] == 'error']
+
+        _logger.info("%s completed: %s successful, %s failed", task_name, len(successful), len(failed))
+
+        if failed:
+            _logger.error("Failed: %s", [r['record_name'] for r in failed])
+            if raise_error:
+                raise UserError(_(
+                    "Failed to %s for some records:\n"
+                    "%s"
+                ) % (
+                    task_name,
+                    "\n".join([f"- {r['record_name']}: {r['error']}" for r in failed])
+                ))
+
+        return results
+
     def _get_tiktok_config(self):
         """Lấy cấu hình TikTok từ settings"""
         Config = self.env['ir.config_parameter'].sudo()
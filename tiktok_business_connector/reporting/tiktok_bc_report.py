@@ -3,11 +3,17 @@ from odoo.exceptions import UserError
 import logging
 from odoo.tools import format_date
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
+from collections import defaultdict
 
 _logger = logging.getLogger(__name__)
 
+# Số ngày gần nhất TikTok có thể còn cập nhật lại số liệu (mặc định khi chưa cấu hình)
+DEFAULT_RESTATE_DAYS = 3
+# Các dimension (ngoài ngày / giờ) được lưu trên report line, dùng làm khóa partition
+PARTITION_DIMENSION_FIELDS = ('advertiser_id', 'campaign_id', 'adgroup_id', 'ad_id')
+
 
 class TiktokBcReport(models.Model):
     _name = 'tiktok.bc.report'
@@ -63,6 +69,10 @@ class TiktokBcReport(models.Model):
     final_params = fields.Text(string='Final Params', compute='_compute_final_params', store=True, readonly=False)
 
     no_data = fields.Boolean(string='No Data', default=False, help='Report này không có thông tin từ TikTok!')
+    auto_refresh = fields.Boolean(
+        string='Auto Refresh', default=False,
+        help='Cron hằng ngày kéo end date tới hôm nay và chỉ lấy lại N ngày gần nhất (TikTok còn có thể cập nhật số liệu)')
+    last_refresh_date = fields.Datetime(string='Last Refresh', readonly=True, copy=False)
 
     raw_payload = fields.Json(string='Raw Payload')
     raw_data = fields.Json(string='Raw Data')
@@ -100,61 +110,203 @@ class TiktokBcReport(models.Model):
             vals["filters"] = json.dumps(self.filters)
         return vals
 
+    def _check_generate_data(self):
+        """Validate report trước khi gọi API, trả về access token của BC"""
+        self.ensure_one()
+        if self.report_type == 'AUDIENCE':
+            raise UserError(_("Audience report is not supported yet."))
+
+        # Validate required fields
+        if not self.odoo_advertiser_id:
+            raise UserError(_("Please select an advertiser first."))
+
+        if not self.start_date or not self.end_date:
+            raise UserError(_("Please set start date and end date."))
+
+        # Get access token from business account
+        if not self.odoo_bc_id:
+            raise UserError(_("Business account (BC) not found. Please choose the business account first."))
+        access_token = self.odoo_bc_id.sudo().access_token
+        if not access_token:
+            raise UserError(_("Access token (BC) not found. Please authorize the business account first."))
+        return access_token
+
+    def _fetch_report_pages(self, access_token, start_date=None, end_date=None):
+        """
+        Generator: gọi report/integrated/get/ lần lượt từng page, yield response data của mỗi page.
+        start_date/end_date để giới hạn khoảng ngày (mặc định theo report).
+        """
+        self.ensure_one()
+        # Prepare API payload
+        api_payload = self._get_final_params()
+        if start_date:
+            api_payload['start_date'] = start_date.strftime('%Y-%m-%d')
+        if end_date:
+            api_payload['end_date'] = end_date.strftime('%Y-%m-%d')
+
+        page_index = 1
+        while True:
+            api_payload['page'] = page_index
+            # Call TikTok Business API
+            try:
+                endpoint = "report/integrated/get/"
+                response_data = self._call_tiktok_api(
+                    endpoint=endpoint,
+                    access_token=access_token,
+                    method='GET',
+                    params=api_payload
+                )
+            except Exception as e:
+                _logger.error(f"Tiktok Marketing API: Error generating TikTok report data: {str(e)}")
+                raise UserError(_("Tiktok Marketing API: Error generating report data: %s") % str(e))
+
+            # Store raw payload for debugging
+            self.write({
+                'raw_payload': api_payload,
+                'raw_data': response_data,
+            })
+            yield response_data
+
+            # Check page_info: Nếu page_index < total_page, tăng page_index để lấy phần tiếp theo
+            page_info = (response_data or {}).get('page_info', {})
+            if page_index < page_info.get('total_page', page_index):
+                page_index += 1
+            else:
+                break
+
     def _action_generate_data(self):
+        """
+        Tạo lại toàn bộ report lines trong khoảng start_date -> end_date
+        """
         for record in self:
-            if record.report_type == 'AUDIENCE':
-                raise UserError(_("Audience report is not supported yet."))
-            
-            # Validate required fields
-            if not record.odoo_advertiser_id:
-                raise UserError(_("Please select an advertiser first."))
-            
-            if not record.start_date or not record.end_date:
-                raise UserError(_("Please set start date and end date."))
-            
-            # Get access token from business account
-            if not record.odoo_bc_id:
-                raise UserError(_("Business account (BC) not found. Please choose the business account first."))
-            access_token = record.odoo_bc_id.sudo().access_token
-            if not access_token:
-                raise UserError(_("Access token (BC) not found. Please authorize the business account first."))
-            
-            # Prepare API payload
-            api_payload = record._get_final_params()
-            
-            page_index = 1
-            while True:
-                api_payload['page'] = page_index
-                # Call TikTok Business API
-                try:
-                    endpoint = "report/integrated/get/"
-                    response_data = record._call_tiktok_api(
-                        endpoint=endpoint,
-                        access_token=access_token,
-                        method='GET',
-                        params=api_payload
-                    )
-                    
-                    # Store raw payload for debugging
-                    record.write({
-                        'raw_payload': api_payload,
-                        'raw_data': response_data,
-                    })
-                    
-                    # Process response and create report lines
-                    record._process_api_response(response_data)
-
-                    # Check page_info: Nếu page_index < total_page, tăng page_index để lấy phần tiếp theo
-                    page_info = response_data.get('page_info', {})
-                    if page_index < page_info.get('total_page', page_index):
-                        page_index += 1
-                    else:
-                        break
-                    
-                except Exception as e:
-                    _logger.error(f"Tiktok Marketing API: Error generating TikTok report data: {str(e)}")
-                    raise UserError(_("Tiktok Marketing API: Error generating report data: %s") % str(e))
+            access_token = record._check_generate_data()
+
+            # Clear existing report lines (1 lần cho cả report, không xóa theo từng page)
+            record.report_line_ids.unlink()
+            has_data = False
+            for response_data in record._fetch_report_pages(access_token):
+                has_data = record._process_api_response(response_data) or has_data
+            record.no_data = not has_data
+
+    @api.model
+    def _get_restate_days(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'tiktok_business.report_restate_days', DEFAULT_RESTATE_DAYS))
+
+    def _action_refresh_data(self, restate_days=None, refresh_from=None):
+        """
+        Refresh theo partition (ngày, giờ, entity): chỉ lấy lại restate_days ngày gần nhất
+        trong khoảng của report rồi upsert, các ngày cũ hơn giữ nguyên.
+        refresh_from: ngày đầu tiên chưa từng được lấy (end_date cũ + 1 khi end_date vừa được kéo tới
+        hôm nay); nếu sớm hơn cửa sổ restate_days thì refresh từ ngày này để không bỏ sót ngày nào.
+        Report chưa có line nào thì tạo đầy đủ như _action_generate_data.
+        """
+        if restate_days is None:
+            restate_days = self._get_restate_days()
+        today = fields.Date.context_today(self)
+        for record in self:
+            if not record.report_line_ids:
+                record._action_generate_data()
+                record.last_refresh_date = fields.Datetime.now()
+                continue
+
+            access_token = record._check_generate_data()
+            date_from = today - timedelta(days=restate_days)
+            if refresh_from:
+                date_from = min(date_from, refresh_from)
+            date_from = max(record.start_date, date_from)
+            date_to = min(record.end_date, today)
+            if date_from > date_to:
+                _logger.info(f"Tiktok Marketing API: Report {record.name}: nothing to refresh")
+                continue
+
+            line_vals = []
+            for response_data in record._fetch_report_pages(access_token, date_from, date_to):
+                line_vals.extend(record._prepare_report_lines((response_data or {}).get('list', [])))
+            created, updated, deleted = record._upsert_report_partitions(line_vals, date_from, date_to)
+            record.write({
+                'no_data': not record.report_line_ids,
+                'last_refresh_date': fields.Datetime.now(),
+            })
+            _logger.info(
+                f"Tiktok Marketing API: Report {record.name}: refreshed {date_from} -> {date_to}: "
+                f"+{created} ~{updated} -{deleted}"
+            )
+
+    def _get_partition_key(self, vals):
+        """Khóa partition của 1 report line: (ngày, giờ, các dimension id được lưu trên line)"""
+        return (
+            fields.Date.to_date(vals.get('stat_time_day')) if vals.get('stat_time_day') else False,
+            fields.Datetime.to_datetime(vals.get('stat_time_hour')) if vals.get('stat_time_hour') else False,
+        ) + tuple(vals.get(field) or False for field in PARTITION_DIMENSION_FIELDS)
+
+    def _upsert_report_partitions(self, line_vals, date_from, date_to):
+        """
+        Ghi đè các partition trong khoảng date_from -> date_to:
+        line đã có thì write, chưa có thì create, line không còn trong dữ liệu TikTok thì xóa.
+        Dimension không lưu trên line (vd: country_code) cho nhiều line trùng khóa: các line này
+        không phân biệt được trong DB nên được ghép lần lượt theo thứ tự, thừa thì xóa, thiếu thì tạo.
+        """
+        self.ensure_one()
+        Line = self.env['tiktok.bc.report.line']
+        # Report theo giờ không có stat_time_day nên lọc thêm theo stat_time_hour
+        hour_from = datetime.combine(date_from, datetime.min.time())
+        hour_to = datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+        existing_lines = Line.search_read([
+            ('bc_report_id', '=', self.id),
+            '|',
+            '&', ('stat_time_day', '>=', date_from), ('stat_time_day', '<=', date_to),
+            '&', '&', ('stat_time_day', '=', False),
+            ('stat_time_hour', '>=', hour_from), ('stat_time_hour', '<', hour_to),
+        ], ['stat_time_day', 'stat_time_hour', *PARTITION_DIMENSION_FIELDS], order='id')
+        existing_map = defaultdict(list)
+        for line in existing_lines:
+            existing_map[self._get_partition_key(line)].append(line['id'])
+
+        create_vals = []
+        updated = 0
+        for vals in line_vals:
+            line_ids = existing_map.get(self._get_partition_key(vals))
+            if line_ids:
+                Line.browse(line_ids.pop(0)).write(vals)
+                updated += 1
+            else:
+                create_vals.append(vals)
+        if create_vals:
+            Line.create(create_vals)
+        stale_ids = [line_id for line_ids in existing_map.values() for line_id in line_ids]
+        if stale_ids:
+            Line.browse(stale_ids).unlink()
+        return len(create_vals), updated, len(stale_ids)
+
+    @api.model
+    def _refresh_report_task(self, report):
+        """
+        Task function: kéo end_date tới hôm nay và refresh N ngày gần nhất của 1 report,
+        cộng các ngày sau end_date cũ (cron lỡ nhiều ngày hoặc report mới bật auto_refresh)
+        """
+        today = fields.Date.context_today(report)
+        refresh_from = None
+        if report.end_date and report.end_date < today:
+            refresh_from = report.end_date + timedelta(days=1)
+            report.end_date = today
+        report._action_refresh_data(refresh_from=refresh_from)
+
+    @api.model
+    def _cron_refresh_reports(self):
+        """
+        Cron: refresh các report bật auto_refresh, mỗi report 1 thread / cursor riêng
+        nên report lỗi không ảnh hưởng các report khác.
+        """
+        reports = self.search([('auto_refresh', '=', True), ('is_template', '=', False)])
+        self._run_multi_thread_tasks(reports, "Refresh Reports", self._refresh_report_task, raise_error=False)
 
+    @api.model
+    def _generate_report_data_task(self, report):
+        """
+        Task function: tạo report lines cho 1 report (chạy trong thread riêng)
+        """
+        report._action_generate_data()
 
     def action_generate_data(self):
         """
@@ -206,7 +358,9 @@ class TiktokBcReport(models.Model):
                 vals['name'] = self.name
             report_vals.append(vals)
         reports = self.env['tiktok.bc.report'].create(report_vals)
-        reports._action_generate_data()
+        # Commit để các thread (mỗi report 1 cursor) đọc được reports vừa tạo
+        self.env.cr.commit()
+        self._run_multi_thread_tasks(reports, "Generate Report Data", self._generate_report_data_task)
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -218,7 +372,7 @@ class TiktokBcReport(models.Model):
         }
     
     def _process_api_response(self, response_data):
-        """Process API response and create report lines"""
+        """Process API response of 1 page and create report lines, return True if the page has data"""
         if not response_data:
             raise UserError(_("No data received from TikTok API"))
         
@@ -226,14 +380,18 @@ class TiktokBcReport(models.Model):
         report_list = response_data.get('list', [])
         if not report_list:
             _logger.info(f"Tiktok Marketing API: Report {self.name}: No report data found in API response")
-            self.write({'no_data': True})
-            return
-        else:
-            self.write({'no_data': False})
-        
-        # Clear existing report lines
-        self.report_line_ids.unlink()
-        
+            return False
+
+        # Create all report lines at once
+        report_line_vals = self._prepare_report_lines(report_list)
+        if report_line_vals:
+            self.env['tiktok.bc.report.line'].create(report_line_vals)
+        return True
+
+    def _prepare_report_lines(self, report_list):
+        """Prepare values of report lines for 1 page of API data"""
+        if not report_list:
+            return []
 
         # read all odoo records
         campaign_ids = [item.get('dimensions', {}).get('campaign_id') for item in report_list if item.get('dimensions', {}).get('campaign_id')]
@@ -250,15 +408,10 @@ class TiktokBcReport(models.Model):
         odoo_adgroups_map = {r['adgroup_id']: r['id'] for r in existing_ad_groups}
         odoo_ads_map = {r['ad_id']: r['id'] for r in existing_ads}
 
-        # Create new report lines
-        report_line_vals = []
-        for item in report_list:
-            line_vals = self._prepare_report_line_vals(item, odoo_campaigns_map, odoo_adgroups_map, odoo_ads_map)
-            report_line_vals.append(line_vals)
-        
-        # Create all report lines at once
-        if report_line_vals:
-            self.env['tiktok.bc.report.line'].create(report_line_vals)
+        return [
+            self._prepare_report_line_vals(item, odoo_campaigns_map, odoo_adgroups_map, odoo_ads_map)
+            for item in report_list
+        ]
 
     def _prepare_report_line_vals(self, item, odoo_campaigns_map, odoo_adgroups_map, odoo_ads_map):
         """Prepare values for creating a report line"""
@@ -292,6 +445,21 @@ class TiktokBcReport(models.Model):
                 vals[field_key] = self._convert_string_to_float(value)
         return vals
 
+    def action_refresh_data(self):
+        """
+        Chỉ lấy lại N ngày gần nhất và upsert report lines theo partition
+        """
+        self._action_refresh_data()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Success'),
+                'message': _('Report data refreshed successfully!'),
+                'type': 'success',
+            }
+        }
+
     def action_view_report_lines(self):
         """Action to view report lines"""
         self.ensure_one()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestBcReportRefresh(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.today = fields.Date.context_today(cls.env['tiktok.bc.report'])
+        cls.bc = cls.env['tiktok.bussiness.account'].create({
+            'name': 'Test BC',
+            'access_token': 'token',
+        })
+        cls.advertiser = cls.env['tiktok.advertiser'].create({
+            'name': 'Test Advertiser',
+            'advertiser_id': 'ADV1',
+        })
+
+    def setUp(self):
+        super().setUp()
+        # Số liệu phía TikTok: {ngày: spend}
+        self.tiktok_data = {}
+        self.requested_ranges = []
+
+    def _create_report(self, days_back, end_days_back=0):
+        return self.env['tiktok.bc.report'].create({
+            'name': 'Test Report',
+            'odoo_bc_id': self.bc.id,
+            'odoo_advertiser_id': self.advertiser.id,
+            'start_date': self.today - timedelta(days=days_back),
+            'end_date': self.today - timedelta(days=end_days_back),
+        })
+
+    def _fake_api(self, report, endpoint, access_token, method='GET', data=None, params=None):
+        start = fields.Date.to_date(params['start_date'])
+        end = fields.Date.to_date(params['end_date'])
+        self.requested_ranges.append((start, end))
+        rows = [
+            {
+                'dimensions': {'advertiser_id': 'ADV1', 'stat_time_day': day.strftime('%Y-%m-%d 00:00:00')},
+                'metrics': {'spend': str(spend)},
+            }
+            for day, spend in sorted(self.tiktok_data.items()) if start <= day <= end
+        ]
+        return {'list': rows, 'page_info': {'total_page': 1}}
+
+    def _refresh(self, report, **kwargs):
+        with patch.object(type(report), '_call_tiktok_api', self._fake_api):
+            report._action_refresh_data(**kwargs)
+
+    def _lines_by_day(self, report):
+        return {line.stat_time_day: line for line in report.report_line_ids}
+
+    def test_refresh_upserts_only_restate_window(self):
+        report = self._create_report(days_back=10)
+        self.tiktok_data = {self.today - timedelta(days=n): 100.0 for n in range(11)}
+        self._refresh(report)
+        lines = self._lines_by_day(report)
+        self.assertEqual(len(lines), 11, "Report chưa có line thì tạo đầy đủ")
+
+        yesterday = self.today - timedelta(days=1)
+        old_day = self.today - timedelta(days=9)
+        dropped_day = self.today - timedelta(days=2)
+        self.tiktok_data[yesterday] = 250.0
+        self.tiktok_data[old_day] = 999.0
+        del self.tiktok_data[dropped_day]
+        self.requested_ranges = []
+        self._refresh(report, restate_days=3)
+
+        self.assertEqual(self.requested_ranges, [(self.today - timedelta(days=3), self.today)])
+        refreshed = self._lines_by_day(report)
+        self.assertEqual(refreshed[yesterday], lines[yesterday], "Partition đã có được write, không tạo lại")
+        self.assertEqual(refreshed[yesterday].spend, 250.0)
+        self.assertEqual(refreshed[old_day].spend, 100.0, "Ngày ngoài cửa sổ restate giữ nguyên")
+        self.assertNotIn(dropped_day, refreshed, "Partition không còn trong dữ liệu TikTok bị xóa")
+        self.assertEqual(len(refreshed), 10)
+
+    def test_upsert_keeps_duplicate_keys(self):
+        report = self._create_report(days_back=1)
+        day = self.today - timedelta(days=1)
+        line_vals = [
+            {'bc_report_id': report.id, 'advertiser_id': 'ADV1', 'stat_time_day': day, 'spend': 1.0},
+            {'bc_report_id': report.id, 'advertiser_id': 'ADV1', 'stat_time_day': day, 'spend': 2.0},
+        ]
+        self.assertEqual(report._upsert_report_partitions(line_vals, day, day), (2, 0, 0))
+        line_vals[1]['spend'] = 3.0
+        self.assertEqual(report._upsert_report_partitions(line_vals, day, day), (0, 2, 0))
+        self.assertEqual(sorted(report.report_line_ids.mapped('spend')), [1.0, 3.0])
+        self.assertEqual(report._upsert_report_partitions(line_vals[:1], day, day), (0, 1, 1))
+        self.assertEqual(len(report.report_line_ids), 1)
+
+    def test_refresh_task_covers_days_after_previous_end_date(self):
+        report = self._create_report(days_back=10, end_days_back=6)
+        self.tiktok_data = {self.today - timedelta(days=n): 100.0 for n in range(11)}
+        self._refresh(report)
+        self.assertEqual(len(report.report_line_ids), 5)
+
+        self.requested_ranges = []
+        with patch.object(type(report), '_call_tiktok_api', self._fake_api):
+            report._refresh_report_task(report)
+
+        self.assertEqual(report.end_date, self.today)
+        self.assertEqual(self.requested_ranges[0][0], self.today - timedelta(days=5),
+                         "Refresh từ ngày sau end_date cũ dù sớm hơn cửa sổ restate")
+        self.assertEqual(len(report.report_line_ids), 11)
@@ -1,5 +1,4 @@
 from odoo import models, fields
-import json
 
 
 class WizardSyncTiktokCampaign(models.TransientModel):
@@ -26,14 +25,5 @@ class WizardSyncTiktokCampaign(models.TransientModel):
             date_end_str = self.date_to.strftime('%Y-%m-%d %H:%M:%S')
             dict_filtering['creation_filter_end_time'] = date_end_str
 
-        for odoo_advertiser in self.odoo_advertiser_ids:
-            dict_params_advertiser = {'advertiser_id': odoo_advertiser.advertiser_id}
-            if dict_filtering:
-                dict_params_advertiser['filtering'] = json.dumps(dict_filtering)
-
-            # lấy access token từ business account của advertiser, có thể có nhiều access token trong nhiều business accounts
-            access_token_list = odoo_advertiser.business_account_ids.sudo().mapped('access_token')
-            for access_token in access_token_list:
-                if not access_token:
-                    continue
-                self.env['tiktok.campaign']._sync_campaigns(dict_params=dict_params_advertiser, access_token=access_token)
+        # Mỗi advertiser chạy 1 thread riêng (xem tiktok.advertiser._run_advertiser_tasks)
+        self.odoo_advertiser_ids._sync_campaigns(filtering=dict_filtering)
@@ -18,7 +18,7 @@ class TiktokCancelLine(models.Model):
     product_id = fields.Many2one("tiktok.product", string="Product", related="sku_id.product_id", store=True, index=True)
     sku_id = fields.Many2one("tiktok.sku", string="SKU", index=True)
     order_line_item_id = fields.Char(string="Order Line Item ID")
-    tiktok_sku_id = fields.Char(string="TikTok SKU ID")
+    tiktok_sku_id = fields.Char(string="TikTok SKU ID", index=True)
     seller_sku = fields.Char(string="Seller SKU")
 
     # ===== Product Information =====
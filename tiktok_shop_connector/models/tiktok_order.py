@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import datetime
 from odoo import api, models, fields, _
 from .tiktok_shop import MAX_CONCURRENT_THREADS
@@ -276,7 +277,9 @@ class TiktokOrder(models.Model):
             # Process orders trong page này theo batch (max 50 orders per call)
             order_ids = [order['id'] for order in orders if order.get('id')]
             batch_size = 50
-            page_synced = 0
+            page_started = time.monotonic()
+            page_order_values = []
+            page_line_items = {}
 
             for i in range(0, len(order_ids), batch_size):
                 batch_ids = order_ids[i:i + batch_size]
@@ -440,22 +443,31 @@ class TiktokOrder(models.Model):
                         'raw_payload': order_data,  # Store complete order data
                     }
 
-                    # Upsert order using helper method
-                    order = self.env['tiktok.shop']._upsert(
-                        'tiktok.order',
-                        [('tiktok_id', '=', order_id), ('shop_id', '=', shop.id)],
-                        values
-                    )
-
-                    # Sync order lines for this order
-                    line_items_data = order_data.get('line_items', [])
-                    if line_items_data:
-                        line_model = self.env['tiktok.order.line']
-                        for line_data in line_items_data:
-                            line_model._upsert_line_item(line_data, order.id)
-
-                    page_synced += 1
-                    total_synced += 1
+                    page_order_values.append(values)
+                    page_line_items[order_id] = order_data.get('line_items', [])
+
+            # Upsert cả page: 1 query tìm orders đã có, 1 create cho orders mới
+            order_id_map, changed_order_ids = self.env['tiktok.shop']._bulk_upsert(
+                'tiktok.order',
+                'tiktok_id',
+                page_order_values,
+                domain=[('shop_id', '=', shop.id)],
+                skip_unchanged_field='update_time',
+            )
+
+            # Chỉ sync lines cho orders thực sự được tạo mới/thay đổi
+            self.env['tiktok.order.line']._bulk_upsert_line_items({
+                order_id_map[order_id]: line_items
+                for order_id, line_items in page_line_items.items()
+                if line_items and order_id in changed_order_ids
+            })
+
+            page_synced = len(order_id_map)
+            total_synced += page_synced
+            elapsed = time.monotonic() - page_started
+            _logger.info(f"Shop {shop.name}: Page {page_number} upserted {page_synced} orders "
+                         f"({len(changed_order_ids)} changed) in {elapsed:.2f}s "
+                         f"({page_synced / elapsed if elapsed else 0:.1f} orders/s)")
 
             # Check pagination
             page_token = data.get("next_page_token")
@@ -18,7 +18,7 @@ class TiktokOrderLine(models.Model):
     product_id = fields.Many2one("tiktok.product", string="Product", related="sku_id.product_id", store=True, index=True)
     sku_id = fields.Many2one("tiktok.sku", string="SKU", index=True)
     tiktok_product_id = fields.Char(string="TikTok Product ID")
-    tiktok_sku_id = fields.Char(string="TikTok SKU ID")
+    tiktok_sku_id = fields.Char(string="TikTok SKU ID", index=True)
     seller_sku = fields.Char(string="Seller SKU")
 
     # ===== Product Information =====
@@ -203,3 +203,42 @@ class TiktokOrderLine(models.Model):
             parsed_data
         )
         return order_line
+
+    @api.model
+    def _bulk_upsert_line_items(self, lines_by_order):
+        """
+        Upsert line items của nhiều orders cùng lúc.
+        SKU được prefetch 1 lần cho cả page thay vì search theo từng line.
+
+        Args:
+            lines_by_order (dict): {order_id: [line_data, ...]}
+
+        Returns:
+            dict: {tiktok_line_id: line_id}
+        """
+        line_values = []
+        for order_id, lines_data in lines_by_order.items():
+            for line_data in lines_data or []:
+                parsed_data = self._parse_line_item_data(line_data, order_id)
+                if not parsed_data.get('tiktok_id'):
+                    _logger.warning("Line item data missing tiktok_id: %s", line_data)
+                    continue
+                line_values.append(parsed_data)
+
+        if not line_values:
+            return {}
+
+        # Prefetch SKU map cho toàn bộ page
+        sku_tiktok_ids = list({values['tiktok_sku_id'] for values in line_values if values.get('tiktok_sku_id')})
+        sku_map = {}
+        if sku_tiktok_ids:
+            for sku in self.env['tiktok.sku'].search_read([('tiktok_id', 'in', sku_tiktok_ids)], ['tiktok_id']):
+                sku_map.setdefault(sku['tiktok_id'], sku['id'])
+
+        for values in line_values:
+            sku_id = sku_map.get(values.get('tiktok_sku_id'))
+            if sku_id:
+                values['sku_id'] = sku_id
+
+        id_map, _changed_keys = self.env['tiktok.shop']._bulk_upsert('tiktok.order.line', 'tiktok_id', line_values)
+        return id_map
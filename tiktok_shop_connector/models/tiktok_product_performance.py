@@ -213,12 +213,11 @@ class TiktokProductPerformance(models.Model):
 
             _logger.info(f"Shop {shop.name}: Processing page {page_number}, got {len(products_data)} product performances")
 
-            # Xử lý ngay page này với date range
-            page_synced = 0
-            for product_data in products_data:
-                self._get_product_performance_detail(shop, product_data['id'], start_date, end_date)
-                page_synced += 1
-                total_synced += 1
+            # Xử lý ngay page này với date range: fetch detail song song, lưu theo batch
+            self._get_product_performance_details(
+                shop, [product_data['id'] for product_data in products_data], start_date, end_date
+            )
+            total_synced += len(products_data)
 
             # Check pagination
             page_token = next_page_token
@@ -293,8 +292,8 @@ class TiktokProductPerformance(models.Model):
 
         return products, next_page_token, latest_available_date
 
-    def _get_product_performance_detail(self, shop, product_id, start_date, end_date):
-        """Gọi API Get Product Performance Detail với date range"""
+    def _get_product_performance_details(self, shop, product_ids, start_date, end_date):
+        """Gọi API Get Product Performance Detail song song cho 1 page products rồi lưu theo batch"""
         start_date_str = start_date.strftime('%Y-%m-%d')
         end_date_str = end_date.strftime('%Y-%m-%d')
 
@@ -306,33 +305,49 @@ class TiktokProductPerformance(models.Model):
             'currency': 'LOCAL'
         }
 
-        try:
-            data = shop._request("GET", f"/analytics/202405/shop_products/{product_id}/performance", params=params)
-        except Exception as e:
-            _logger.error(f"Shop {shop.name}: Error getting performance for product {product_id}: {e}")
-            return
+        results = shop._request_concurrently({
+            product_id: ("GET", f"/analytics/202405/shop_products/{product_id}/performance", params)
+            for product_id in product_ids
+        })
 
-        # Parse và lưu vào model với date range
-        self._parse_and_save_product_performance(shop, product_id, data)
+        # Tìm products trong hệ thống (không bắt buộc) - 1 query cho cả page
+        product_map = {
+            product['tiktok_id']: product['id']
+            for product in self.env['tiktok.product'].search_read([
+                ('tiktok_id', 'in', [str(product_id) for product_id in product_ids]),
+                ('shop_id', '=', shop.id)
+            ], ['tiktok_id'])
+        }
 
-    def _parse_and_save_product_performance(self, shop, product_id, data):
-        """Parse và lưu product performance data với date range"""
+        values_list = []
+        for product_id in product_ids:
+            data = results.get(product_id)
+            if isinstance(data, Exception):
+                _logger.error(f"Shop {shop.name}: Error getting performance for product {product_id}: {data}")
+                continue
+            values_list.extend(self._parse_product_performance(shop, product_id, data, product_map))
+
+        # Upsert 1 lần cho cả page
+        shop._bulk_upsert(
+            'tiktok.product.performance',
+            ('tiktok_product_id', 'report_date'),
+            values_list,
+            domain=[('shop_id', '=', shop.id)]
+        )
+
+    def _parse_product_performance(self, shop, product_id, data, product_map):
+        """Parse product performance data thành danh sách values theo ngày"""
         performance_data = data.get('performance', {})
         intervals = performance_data.get('intervals', [])
 
-        # Tìm product trong hệ thống (không bắt buộc)
-        product = self.env['tiktok.product'].search([
-            ('tiktok_id', '=', str(product_id)),
-            ('shop_id', '=', shop.id)
-        ], limit=1)
-
+        values_list = []
         for interval in intervals:
             # Parse breakdown data
             breakdowns = self._parse_breakdowns(shop, interval)
 
             # Prepare values
-            values = {
-                'product_id': product.id if product else False,
+            values_list.append({
+                'product_id': product_map.get(str(product_id), False),
                 'tiktok_product_id': str(product_id),
                 'shop_id': shop.id,
                 'report_date': interval.get('start_date'),  # Sử dụng start_date từ interval
@@ -348,15 +363,8 @@ class TiktokProductPerformance(models.Model):
                 'avg_page_visitors': interval.get('avg_page_visitors', 0),
                 'raw_payload': interval,
                 **breakdowns
-            }
-
-            # Upsert performance record using shop's _upsert method
-            domain = [
-                ('tiktok_product_id', '=', values['tiktok_product_id']),
-                ('shop_id', '=', values['shop_id']),
-                ('report_date', '=', values['report_date'])
-            ]
-            shop._upsert('tiktok.product.performance', domain, values)
+            })
+        return values_list
 
 
 class TiktokShop(models.Model):
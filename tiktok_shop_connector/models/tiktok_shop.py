@@ -1,4 +1,3 @@
-import requests
 import time
 import hmac
 import hashlib
@@ -6,6 +5,7 @@ import json
 import logging
 import traceback
 import gc
+import threading
 from urllib.parse import urlencode
 from secrets import token_urlsafe
 from datetime import timedelta, datetime
@@ -13,9 +13,85 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from odoo import api, models, fields, _
 from odoo.exceptions import UserError
 
+from .http_session import http_request
+
 _logger = logging.getLogger(__name__)
 
 MAX_CONCURRENT_THREADS = 8
+# Fetch song song trong 1 shop (performance detail...)
+DETAIL_FETCH_WORKERS = 8
+DEFAULT_API_QPS = 10
+MAX_RATE_LIMIT_RETRIES = 3
+# Số record mỗi chunk khi fill lại relation product/sku
+RELINK_CHUNK_SIZE = 5000
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe để giới hạn số request/giây gửi tới TikTok Shop API
+    yonsuite_integration có TokenBucket riêng với cùng logic (2 module không phụ thuộc nhau).
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1, rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Chờ cho tới khi có token rồi lấy 1 token
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+# Rate limiter dùng chung trong process, key theo (database, shop)
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limiter(key, rate):
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if not limiter or limiter.rate != float(rate):
+            limiter = _rate_limiters[key] = TokenBucket(rate)
+        return limiter
+
+
+def _send_prepared_request(prepared, limiter=None):
+    """
+    Gửi request đã được chuẩn bị bởi tiktok.shop._prepare_request().
+    Không dùng env nên an toàn khi gọi từ thread khác.
+    """
+    attempt = 0
+    while True:
+        if limiter:
+            limiter.acquire()
+        r = http_request(
+            prepared['method'], prepared['url'],
+            params=prepared['params'], json=prepared['json'], headers=prepared['headers'], timeout=60
+        )
+        # Vượt rate limit thì chờ rồi thử lại
+        if r.status_code == 429 and attempt < MAX_RATE_LIMIT_RETRIES:
+            attempt += 1
+            time.sleep(2 ** attempt)
+            continue
+        r.raise_for_status()
+        response = r.json()
+        if response.get("code") != 0:
+            raise UserError(_("TikTok API error: %s") % response.get("message", "Unknown error"))
+        return response.get("data", {})
+
 
 class TiktokShop(models.Model):
     _name = "tiktok.shop"
@@ -128,6 +204,91 @@ class TiktokShop(models.Model):
 
         return existing_record
 
+    @api.model
+    def _bulk_upsert(self, model_name, key_field, values_list, domain=None, skip_unchanged_field=None):
+        """
+        Upsert nhiều records cùng lúc theo key_field (set-based).
+        - 1 query `key_field IN (...)` để tìm records đã tồn tại
+        - 1 lệnh `create` cho tất cả records mới
+        - `write` gom nhóm theo values giống nhau cho records đã thay đổi
+
+        Args:
+            model_name (str): Tên model (e.g., 'tiktok.order')
+            key_field (str|tuple): Field khóa tự nhiên (e.g., 'tiktok_id'),
+                hoặc tuple field cho khóa ghép (e.g., ('tiktok_sku_id', 'report_date'))
+            values_list (list): Danh sách dict values, mỗi dict phải có key_field
+            domain (list): Domain bổ sung để giới hạn phạm vi tìm kiếm (e.g., shop_id)
+            skip_unchanged_field (str): Nếu giá trị field này không đổi thì bỏ qua write
+
+        Returns:
+            tuple: ({key: record_id}, set các key đã được create/write)
+                key là tuple giá trị khi key_field là tuple
+        """
+        model = self.env[model_name]
+        key_fields = [key_field] if isinstance(key_field, str) else list(key_field)
+
+        def normalize(field_name, value):
+            field = model._fields[field_name]
+            if field.type == 'date' and value:
+                return fields.Date.to_date(value)
+            if field.type == 'datetime' and value:
+                return fields.Datetime.to_datetime(value)
+            return value
+
+        def make_key(values):
+            if isinstance(key_field, str):
+                return values.get(key_field)
+            return tuple(normalize(name, values.get(name)) for name in key_fields)
+
+        # Gộp trùng theo key, bản ghi sau cùng thắng
+        values_by_key = {}
+        for values in values_list:
+            key = make_key(values)
+            key_parts = key if isinstance(key, tuple) else (key,)
+            if all(key_parts):
+                values_by_key[key] = values
+
+        if not values_by_key:
+            return {}, set()
+
+        read_fields = list(key_fields)
+        if skip_unchanged_field:
+            read_fields.append(skip_unchanged_field)
+        key_domain = [
+            (name, 'in', list({normalize(name, values.get(name)) for values in values_by_key.values()}))
+            for name in key_fields
+        ]
+        existing = model.search_read(list(domain or []) + key_domain, read_fields)
+
+        id_map = {}
+        changed_keys = set()
+        write_groups = {}
+        for row in existing:
+            key = make_key(row)
+            if key in id_map or key not in values_by_key:
+                continue
+            id_map[key] = row['id']
+            values = values_by_key[key]
+            if skip_unchanged_field and row[skip_unchanged_field] \
+                    and row[skip_unchanged_field] == values.get(skip_unchanged_field):
+                continue
+            write_values = {k: v for k, v in values.items() if k not in key_fields}
+            group_key = json.dumps(write_values, sort_keys=True, default=str)
+            write_groups.setdefault(group_key, (write_values, []))[1].append(row['id'])
+            changed_keys.add(key)
+
+        for write_values, record_ids in write_groups.values():
+            model.browse(record_ids).write(write_values)
+
+        new_keys = [key for key in values_by_key if key not in id_map]
+        if new_keys:
+            new_records = model.create([values_by_key[key] for key in new_keys])
+            for key, record in zip(new_keys, new_records):
+                id_map[key] = record.id
+            changed_keys.update(new_keys)
+
+        return id_map, changed_keys
+
     # ===== Multi-threading Framework =====
     @api.model
     def _execute_thread_task(self, shop_id, task_name, task_func, *args, **kwargs):
@@ -253,7 +414,7 @@ class TiktokShop(models.Model):
             "auth_code": auth_code,
             "grant_type": "authorized_code",
         }
-        r = requests.get(url, params=payload, timeout=30)
+        r = http_request('GET', url, params=payload, timeout=30)
         if r.status_code != 200:
             raise UserError(_("Exchange code failed: %s") % r.text)
 
@@ -296,7 +457,7 @@ class TiktokShop(models.Model):
             "refresh_token": self.refresh_token,
             "grant_type": "refresh_token",
         }
-        r = requests.get(url, params=payload, timeout=30)
+        r = http_request('GET', url, params=payload, timeout=30)
         if r.status_code != 200:
             raise UserError(_("Refresh failed: %s") % r.text)
 
@@ -365,6 +526,10 @@ class TiktokShop(models.Model):
         - params: dict -> sẽ gộp thêm _auth_params() nếu need_sign
         - json_body: dict -> sẽ dùng để tính chữ ký (nếu spec yêu cầu)
         """
+        return _send_prepared_request(self._prepare_request(method, path, params, json_body, base_url, need_sign))
+
+    def _prepare_request(self, method, path, params=None, json_body=None, base_url=None, need_sign=True):
+        """Refresh token nếu cần, ký request và trả về dict để _send_prepared_request gửi."""
         self.ensure_one()
         if not self._token_valid():
             self._refresh_access_token()
@@ -383,12 +548,54 @@ class TiktokShop(models.Model):
                 params.setdefault(k, v)
             params["sign"] = self._sign(path, params, json_body)
 
-        r = requests.request(method=method, url=url, params=params, json=json_body, headers=headers, timeout=60)
-        r.raise_for_status()
-        response = r.json()
-        if response.get("code") != 0:
-            raise UserError(_("TikTok API error: %s") % response.get("message", "Unknown error"))
-        return response.get("data", {})
+        return {
+            'method': method,
+            'url': url,
+            'params': params,
+            'json': json_body,
+            'headers': headers,
+        }
+
+    def _request_concurrently(self, jobs, max_workers=None):
+        """
+        Gọi nhiều request của shop song song, giới hạn số worker và QPS.
+        Request được ký trên main thread; thread chỉ gửi HTTP, không đụng env/cursor.
+
+        Args:
+            jobs (dict): {key: (method, path, params)}
+
+        Returns:
+            dict: {key: data} hoặc {key: Exception} nếu request lỗi
+        """
+        self.ensure_one()
+        if not jobs:
+            return {}
+
+        qps = float(self.env['ir.config_parameter'].sudo().get_param('tiktok_shop_connector.api_qps', DEFAULT_API_QPS))
+        limiter = _get_rate_limiter((self.env.cr.dbname, self.id), qps)
+        prepared_requests = {
+            key: self._prepare_request(method, path, params=params)
+            for key, (method, path, params) in jobs.items()
+        }
+
+        results = {}
+        max_workers = min(max_workers or DETAIL_FETCH_WORKERS, len(jobs))
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_key = {
+                executor.submit(_send_prepared_request, prepared, limiter): key
+                for key, prepared in prepared_requests.items()
+            }
+            for future in as_completed(future_to_key):
+                key = future_to_key[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    results[key] = e
+
+        _logger.info("Shop %s: %d concurrent requests in %.1fs (%d workers, %.1f QPS limit)",
+                     self.name, len(jobs), time.monotonic() - start_time, max_workers, qps)
+        return results
 
     # ===== Actions =====
     def action_start_authorize(self):
@@ -740,38 +947,61 @@ class TiktokShop(models.Model):
         return total_filled
 
     def _fill_model_relations(self, config):
-        """Fill missing product_id/sku_id for a specific model configuration."""
-        model_name = config['model']
-        filled = self.env[model_name].browse()
+        """
+        Fill missing product_id/sku_id for a specific model configuration.
 
+        Set-based theo chunk: tra target theo các tiktok_id của chunk (1 query dùng index tiktok_id),
+        write gom nhóm theo target id và commit sau mỗi chunk.
+        """
+        model_name = config['model']
         if config['fill_sku']:
-            domain = [
-                ('sku_id', '=', False),
-                (config['sku_field'], '!=', False)
-            ]
-            records = self.env[model_name].search(domain)
-            for record in records:
-                sku = self.env['tiktok.sku'].search([
-                    ('tiktok_id', '=', record[config['sku_field']]),
-                    ('shop_id', '=', record.shop_id.id)
-                ], limit=1)
-                if sku:
-                    record.sku_id = sku.id
-                    filled |= record
-
+            target_model, target_field, source_field = 'tiktok.sku', 'sku_id', config['sku_field']
         elif config['fill_product']:
-            domain = [
-                ('product_id', '=', False),
-                (config['product_field'], '!=', False)
-            ]
-            records = self.env[model_name].search(domain)
+            target_model, target_field, source_field = 'tiktok.product', 'product_id', config['product_field']
+        else:
+            return 0
+
+        Model = self.env[model_name]
+        record_ids = Model.search([
+            (target_field, '=', False),
+            (source_field, '!=', False)
+        ], order='id').ids
+        if not record_ids:
+            return 0
+
+        start_time = time.time()
+        filled = 0
+        for start in range(0, len(record_ids), RELINK_CHUNK_SIZE):
+            chunk_ids = record_ids[start:start + RELINK_CHUNK_SIZE]
+            records = Model.browse(chunk_ids).read([source_field, 'shop_id'], load=None)
+
+            # Map (shop_id, tiktok_id) -> target id, chỉ cho các tiktok_id của chunk
+            target_map = {}
+            for target in self.env[target_model].search_read(
+                [('tiktok_id', 'in', list({record[source_field] for record in records}))],
+                ['tiktok_id', 'shop_id'], order='id', load=None,
+            ):
+                target_map.setdefault((target['shop_id'], target['tiktok_id']), target['id'])
+
+            ids_by_target = {}
             for record in records:
-                product = self.env['tiktok.product'].search([
-                    ('tiktok_id', '=', record[config['product_field']]),
-                    ('shop_id', '=', record.shop_id.id)
-                ], limit=1)
-                if product:
-                    record.product_id = product.id
-                    filled |= record
-
-        return len(filled)
+                shop_id = record['shop_id']
+                target_id = target_map.get((shop_id, record[source_field]))
+                if target_id:
+                    ids_by_target.setdefault(target_id, []).append(record['id'])
+
+            for target_id, ids in ids_by_target.items():
+                Model.browse(ids).write({target_field: target_id})
+                filled += len(ids)
+
+            self.env.cr.commit()
+            self.env.invalidate_all()
+
+            processed = min(start + RELINK_CHUNK_SIZE, len(record_ids))
+            elapsed = time.time() - start_time
+            _logger.info(
+                "%s: %s/%s records processed, %s linked (%.0f records/s)",
+                model_name, processed, len(record_ids), filled, processed / elapsed if elapsed else 0
+            )
+
+        return filled
@@ -165,12 +165,11 @@ class TiktokSkuPerformance(models.Model):
 
             _logger.info(f"Shop {shop.name}: Processing page {page_number}, got {len(skus_data)} SKU performances")
 
-            # Xử lý ngay page này với date range
-            page_synced = 0
-            for sku_data in skus_data:
-                self._get_sku_performance_detail(shop, sku_data['id'], start_date, end_date)
-                page_synced += 1
-                total_synced += 1
+            # Xử lý ngay page này với date range: fetch detail song song, lưu theo batch
+            self._get_sku_performance_details(
+                shop, [sku_data['id'] for sku_data in skus_data], start_date, end_date
+            )
+            total_synced += len(skus_data)
 
             # Check pagination
             page_token = next_page_token
@@ -245,8 +244,8 @@ class TiktokSkuPerformance(models.Model):
 
         return skus, next_page_token, latest_available_date
 
-    def _get_sku_performance_detail(self, shop, sku_id, start_date, end_date):
-        """Gọi API Get SKU Performance Detail với date range"""
+    def _get_sku_performance_details(self, shop, sku_ids, start_date, end_date):
+        """Gọi API Get SKU Performance Detail song song cho 1 page SKUs rồi lưu theo batch"""
         start_date_str = start_date.strftime('%Y-%m-%d')
         end_date_str = end_date.strftime('%Y-%m-%d')
 
@@ -258,26 +257,42 @@ class TiktokSkuPerformance(models.Model):
             'currency': 'LOCAL'
         }
 
-        try:
-            data = shop._request("GET", f"/analytics/202406/shop_skus/{sku_id}/performance", params=params)
-        except Exception as e:
-            _logger.error(f"Shop {shop.name}: Error getting performance for SKU {sku_id}: {e}")
-            return
+        results = shop._request_concurrently({
+            sku_id: ("GET", f"/analytics/202406/shop_skus/{sku_id}/performance", params)
+            for sku_id in sku_ids
+        })
 
-        # Parse và lưu vào model với date range
-        self._parse_and_save_sku_performance(shop, sku_id, data)
+        # Tìm SKUs trong hệ thống - 1 query cho cả page
+        sku_map = {
+            sku['tiktok_id']: sku['id']
+            for sku in self.env['tiktok.sku'].search_read([
+                ('shop_id', '=', shop.id),
+                ('tiktok_id', 'in', [str(sku_id) for sku_id in sku_ids])
+            ], ['tiktok_id'])
+        }
 
-    def _parse_and_save_sku_performance(self, shop, sku_id, data):
-        """Parse và lưu SKU performance data với date range"""
+        values_list = []
+        for sku_id in sku_ids:
+            data = results.get(sku_id)
+            if isinstance(data, Exception):
+                _logger.error(f"Shop {shop.name}: Error getting performance for SKU {sku_id}: {data}")
+                continue
+            values_list.extend(self._parse_sku_performance(shop, sku_id, data, sku_map))
+
+        # Upsert 1 lần cho cả page
+        shop._bulk_upsert(
+            'tiktok.sku.performance',
+            ('tiktok_sku_id', 'report_date'),
+            values_list,
+            domain=[('shop_id', '=', shop.id)]
+        )
+
+    def _parse_sku_performance(self, shop, sku_id, data, sku_map):
+        """Parse SKU performance data thành danh sách values theo ngày"""
         performance_data = data.get('performance', {})
         intervals = performance_data.get('intervals', [])
 
-        # Tìm product trong hệ thống (không bắt buộc)
-        product = self.env['tiktok.product'].search([
-            ('shop_id', '=', shop.id),
-            ('tiktok_id', '=', performance_data.get('product_id'))
-        ], limit=1)
-
+        values_list = []
         for interval in intervals:
             report_date = fields.Date.from_string(interval.get('start_date'))
 
@@ -298,16 +313,10 @@ class TiktokSkuPerformance(models.Model):
                 interval.get('units_sold_breakdown', [])
             )
 
-            # Tìm SKU trong hệ thống
-            sku = self.env['tiktok.sku'].search([
-                ('shop_id', '=', shop.id),
-                ('tiktok_id', '=', str(sku_id))
-            ], limit=1)
-
             # Tạo values cho upsert
-            values = {
+            values_list.append({
                 'tiktok_sku_id': str(sku_id),
-                'sku_id': sku.id if sku else False,
+                'sku_id': sku_map.get(str(sku_id), False),
                 'shop_id': shop.id,
                 'report_date': report_date,
                 'gmv_amount': gmv_amount,
@@ -321,15 +330,8 @@ class TiktokSkuPerformance(models.Model):
                 'units_sold_video': units_sold_breakdowns['video'],
                 'units_sold_product_card': units_sold_breakdowns['product_card'],
                 'raw_payload': interval
-            }
-
-            # Upsert record
-            domain = [
-                ('tiktok_sku_id', '=', str(sku_id)),
-                ('shop_id', '=', shop.id),
-                ('report_date', '=', report_date)
-            ]
-            shop._upsert('tiktok.sku.performance', domain, values)
+            })
+        return values_list
 
 
 class TiktokShop(models.Model):
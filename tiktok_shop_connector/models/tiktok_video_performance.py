@@ -209,12 +209,11 @@ class TiktokVideoPerformance(models.Model):
 
             _logger.info(f"Shop {shop.name}: Processing page {page_number}, got {len(videos_data)} video performances")
 
-            # Xử lý ngay page này với date range
-            page_synced = 0
-            for video_data in videos_data:
-                self._get_video_performance_detail(shop, video_data['id'], start_date, end_date)
-                page_synced += 1
-                total_synced += 1
+            # Xử lý ngay page này với date range: fetch detail song song, lưu theo batch
+            self._get_video_performance_details(
+                shop, [video_data['id'] for video_data in videos_data], start_date, end_date
+            )
+            total_synced += len(videos_data)
 
             # Check pagination
             page_token = next_page_token
@@ -290,8 +289,8 @@ class TiktokVideoPerformance(models.Model):
 
         return videos, next_page_token, latest_available_date
 
-    def _get_video_performance_detail(self, shop, video_id, start_date, end_date):
-        """Gọi API Get Video Performance Detail với date range"""
+    def _get_video_performance_details(self, shop, video_ids, start_date, end_date):
+        """Gọi API Get Video Performance Detail song song cho 1 page videos rồi lưu theo batch"""
         start_date_str = start_date.strftime('%Y-%m-%d')
         end_date_str = end_date.strftime('%Y-%m-%d')
 
@@ -304,17 +303,29 @@ class TiktokVideoPerformance(models.Model):
             'with_comparison': False
         }
 
-        try:
-            data = shop._request("GET", f"/analytics/202409/shop_videos/{video_id}/performance", params=params)
-        except Exception as e:
-            _logger.error(f"Shop {shop.name}: Error getting performance for video {video_id}: {e}")
-            return
-
-        # Parse và lưu vào model với date range
-        self._parse_and_save_video_performance(shop, video_id, data)
-
-    def _parse_and_save_video_performance(self, shop, video_id, data):
-        """Parse và lưu video performance data với date range"""
+        results = shop._request_concurrently({
+            video_id: ("GET", f"/analytics/202409/shop_videos/{video_id}/performance", params)
+            for video_id in video_ids
+        })
+
+        values_list = []
+        for video_id in video_ids:
+            data = results.get(video_id)
+            if isinstance(data, Exception):
+                _logger.error(f"Shop {shop.name}: Error getting performance for video {video_id}: {data}")
+                continue
+            values_list.extend(self._parse_video_performance(shop, video_id, data))
+
+        # Upsert 1 lần cho cả page
+        shop._bulk_upsert(
+            'tiktok.video.performance',
+            ('video_id', 'report_date'),
+            values_list,
+            domain=[('shop_id', '=', shop.id)]
+        )
+
+    def _parse_video_performance(self, shop, video_id, data):
+        """Parse video performance data thành danh sách values theo ngày"""
         performance_data = data.get('performance', {})
         intervals = performance_data.get('intervals', [])
 
@@ -323,12 +334,13 @@ class TiktokVideoPerformance(models.Model):
         engagement_data = performance_data.get('engagement_data', {})
         latest_available_date = performance_data.get('latest_available_date')
 
+        values_list = []
         for interval in intervals:
             # Parse breakdown data
             breakdowns = self._parse_breakdowns(shop, interval)
 
             # Prepare values
-            values = {
+            values_list.append({
                 'video_id': str(video_id),
                 'shop_id': shop.id,
                 'report_date': interval.get('start_date'),
@@ -350,15 +362,9 @@ class TiktokVideoPerformance(models.Model):
                 # Breakdown metrics
                 **breakdowns,
                 'raw_payload': interval
-            }
+            })
 
-            # Upsert performance record using shop's _upsert method
-            domain = [
-                ('video_id', '=', str(video_id)),
-                ('shop_id', '=', shop.id),
-                ('report_date', '=', values['report_date'])
-            ]
-            shop._upsert('tiktok.video.performance', domain, values)
+        return values_list
 
 
 class TiktokShop(models.Model):
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import test_bulk_upsert
+from . import test_relink
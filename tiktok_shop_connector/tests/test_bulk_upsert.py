@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date, datetime
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestBulkUpsert(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.TiktokShop = cls.env['tiktok.shop']
+        cls.shop = cls.TiktokShop.create({
+            'name': 'Test Shop',
+            'service_id': 'service',
+            'app_key': 'key',
+            'app_secret': 'secret',
+            'redirect_uri': 'https://example.com/callback',
+        })
+        cls.other_shop = cls.shop.copy({'name': 'Other Shop'})
+
+    def _product_vals(self, tiktok_id, title, update_time=None, shop=None):
+        return {
+            'tiktok_id': tiktok_id,
+            'title': title,
+            'update_time': update_time,
+            'shop_id': (shop or self.shop).id,
+        }
+
+    def test_create_then_update(self):
+        id_map, changed = self.TiktokShop._bulk_upsert('tiktok.product', 'tiktok_id', [
+            self._product_vals('P1', 'First'),
+            self._product_vals('P2', 'Second'),
+        ], domain=[('shop_id', '=', self.shop.id)])
+        self.assertEqual(set(id_map), {'P1', 'P2'})
+        self.assertEqual(changed, {'P1', 'P2'})
+
+        id_map_2, changed_2 = self.TiktokShop._bulk_upsert('tiktok.product', 'tiktok_id', [
+            self._product_vals('P1', 'First renamed'),
+        ], domain=[('shop_id', '=', self.shop.id)])
+        self.assertEqual(id_map_2['P1'], id_map['P1'], "Existing record must be updated, not duplicated")
+        self.assertEqual(changed_2, {'P1'})
+        self.assertEqual(self.env['tiktok.product'].browse(id_map['P1']).title, 'First renamed')
+
+    def test_last_duplicate_wins(self):
+        id_map, changed = self.TiktokShop._bulk_upsert('tiktok.product', 'tiktok_id', [
+            self._product_vals('P1', 'Old'),
+            self._product_vals('P1', 'New'),
+        ])
+        self.assertEqual(len(id_map), 1)
+        self.assertEqual(self.env['tiktok.product'].browse(id_map['P1']).title, 'New')
+
+    def test_skip_unchanged_field(self):
+        update_time = datetime(2025, 1, 1, 10, 0, 0)
+        id_map, __ = self.TiktokShop._bulk_upsert('tiktok.product', 'tiktok_id', [
+            self._product_vals('P1', 'First', update_time),
+        ], skip_unchanged_field='update_time')
+
+        id_map_2, changed = self.TiktokShop._bulk_upsert('tiktok.product', 'tiktok_id', [
+            self._product_vals('P1', 'Ignored', update_time),
+        ], skip_unchanged_field='update_time')
+        self.assertEqual(id_map_2, id_map)
+        self.assertFalse(changed, "Record with the same update_time must not be written")
+        self.assertEqual(self.env['tiktok.product'].browse(id_map['P1']).title, 'First')
+
+    def test_domain_scopes_matching(self):
+        id_map, __ = self.TiktokShop._bulk_upsert('tiktok.product', 'tiktok_id', [
+            self._product_vals('P1', 'Shop 1'),
+        ], domain=[('shop_id', '=', self.shop.id)])
+        id_map_other, changed = self.TiktokShop._bulk_upsert('tiktok.product', 'tiktok_id', [
+            self._product_vals('P1', 'Shop 2', shop=self.other_shop),
+        ], domain=[('shop_id', '=', self.other_shop.id)])
+        self.assertNotEqual(id_map_other['P1'], id_map['P1'])
+        self.assertEqual(changed, {'P1'})
+
+    def test_composite_key(self):
+        values = {
+            'tiktok_sku_id': 'S1',
+            'shop_id': self.shop.id,
+            'report_date': '2025-01-02',
+        }
+        id_map, changed = self.TiktokShop._bulk_upsert(
+            'tiktok.sku.performance', ('tiktok_sku_id', 'report_date'), [values],
+            domain=[('shop_id', '=', self.shop.id)])
+        self.assertEqual(list(id_map), [('S1', date(2025, 1, 2))])
+
+        id_map_2, __ = self.TiktokShop._bulk_upsert(
+            'tiktok.sku.performance', ('tiktok_sku_id', 'report_date'), [values],
+            domain=[('shop_id', '=', self.shop.id)])
+        self.assertEqual(id_map_2, id_map)
+        self.assertEqual(self.env['tiktok.sku.performance'].search_count([('tiktok_sku_id', '=', 'S1')]), 1)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.tiktok_shop_connector.models import tiktok_shop
+
+
+@tagged('post_install', '-at_install')
+class TestRelink(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.TiktokShop = cls.env['tiktok.shop']
+        cls.shop = cls.TiktokShop.create({
+            'name': 'Test Shop',
+            'service_id': 'service',
+            'app_key': 'key',
+            'app_secret': 'secret',
+            'redirect_uri': 'https://example.com/callback',
+        })
+        cls.other_shop = cls.shop.copy({'name': 'Other Shop'})
+        product = cls.env['tiktok.product'].create({'tiktok_id': 'P1', 'title': 'Product', 'shop_id': cls.shop.id})
+        cls.sku_1 = cls.env['tiktok.sku'].create({'tiktok_id': 'S1', 'product_id': product.id})
+        cls.sku_2 = cls.env['tiktok.sku'].create({'tiktok_id': 'S2', 'product_id': product.id})
+
+    def setUp(self):
+        super().setUp()
+        # _fill_model_relations commit sau mỗi chunk
+        self.patch(type(self.env.cr), 'commit', lambda cr: None)
+        self.patch(tiktok_shop, 'RELINK_CHUNK_SIZE', 2)
+
+    def _performance(self, tiktok_sku_id, report_date, shop=None):
+        return self.env['tiktok.sku.performance'].create({
+            'tiktok_sku_id': tiktok_sku_id,
+            'shop_id': (shop or self.shop).id,
+            'report_date': report_date,
+        })
+
+    def test_fill_sku_relations_per_chunk_and_shop(self):
+        performances = [
+            self._performance('S1', '2025-01-01'),
+            self._performance('S2', '2025-01-01'),
+            self._performance('S1', '2025-01-02'),
+            self._performance('S9', '2025-01-01'),
+            self._performance('S2', '2025-01-01', shop=self.other_shop),
+        ]
+        filled = self.TiktokShop._fill_model_relations({
+            'model': 'tiktok.sku.performance',
+            'fill_product': False,
+            'fill_sku': True,
+            'sku_field': 'tiktok_sku_id',
+        })
+
+        self.assertEqual(filled, 3)
+        self.assertEqual([performance.sku_id for performance in performances], [
+            self.sku_1, self.sku_2, self.sku_1, self.env['tiktok.sku'], self.env['tiktok.sku'],
+        ], "SKU chưa sync hoặc khác shop thì không được link")
+        self.assertEqual(performances[0].product_id, self.sku_1.product_id)
+        self.assertEqual(self.TiktokShop._fill_model_relations({
+            'model': 'tiktok.sku.performance',
+            'fill_product': False,
+            'fill_sku': True,
+            'sku_field': 'tiktok_sku_id',
+        }), 0)
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
 from . import yonsuite_api
+from . import yonsuite_fingerprint_mixin
+from . import yonsuite_sync_mixin
+from . import yonsuite_reference_mixin
+from . import yonsuite_hierarchy_mixin
 from . import yonsuite_product
 from . import yonsuite_product_orges
 from . import yonsuite_partner
@@ -65,6 +65,36 @@ class ResConfigSettings(models.TransientModel):
         help='Root organization code for querying level 0 orgunits'
     )
 
+    # Concurrent API fetcher
+    yonsuite_concurrent_workers = fields.Integer(
+        string='Concurrent Workers',
+        config_parameter='yonsuite_integration.concurrent_workers',
+        default=8,
+        help='Maximum number of parallel detail requests sent to YonSuite'
+    )
+
+    yonsuite_api_rate_limit = fields.Integer(
+        string='API Rate Limit (requests/second)',
+        config_parameter='yonsuite_integration.api_rate_limit',
+        default=10,
+        help='Maximum number of requests per second sent to YonSuite'
+    )
+
+    yonsuite_api_max_retries = fields.Integer(
+        string='API Max Retries',
+        config_parameter='yonsuite_integration.api_max_retries',
+        default=3,
+        help='Number of retries with exponential backoff for failed requests'
+    )
+
+    # Incremental sync
+    yonsuite_sync_time_budget = fields.Integer(
+        string='Sync Time Budget (seconds)',
+        config_parameter='yonsuite_integration.sync_time_budget',
+        default=600,
+        help='Maximum time each sync cron keeps pulling changed pages from YonSuite before resuming on the next run'
+    )
+
     # Partners sync statistics
     yonsuite_partners_current_page = fields.Integer(
         string='Partners Current Page',
@@ -11,7 +11,7 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteAdmindept(models.Model):
     _name = 'yonsuite.admindept'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.hierarchy.mixin']
     _description = 'YonSuite Admin Department'
     _order = 'create_date desc'
     _parent_name = 'parent_id'
@@ -530,6 +530,8 @@ class YonsuiteAdmindept(models.Model):
         """
         Sync departments từ YonSuite API và lưu vào database
         """
+        # Quan hệ cha con được dựng lại 1 lần sau khi lưu hết dữ liệu
+        self = self.with_context(yonsuite_defer_hierarchy=True)
         config_parameter = self.env['ir.config_parameter'].sudo()
 
         # Gọi API để lấy dữ liệu departments
@@ -596,10 +598,7 @@ class YonsuiteAdmindept(models.Model):
 
             # Cập nhật quan hệ cha con cho tất cả departments
             try:
-                all_departments = self.search([])
-                all_departments._update_parent_relationship()
-                # Tính toán lại parent store
-                self._compute_parent_store()
+                self._rebuild_hierarchy()
                 _logger.info("Parent relationships updated successfully")
             except Exception as e:
                 _logger.error("Failed to update parent relationships: %s", str(e))
@@ -731,25 +730,6 @@ class YonsuiteAdmindept(models.Model):
 
         return vals
 
-    def _update_parent_relationship(self):
-        """
-        Cập nhật quan hệ cha con dựa trên parentorgid
-        """
-        for record in self:
-            try:
-                if record.parentorgid:
-                    # Tìm parent department dựa trên parentorgid
-                    parent_dept = self.search([('orgid', '=', record.parentorgid)], limit=1)
-                    if parent_dept and parent_dept.id != record.id:
-                        record.with_context(parent_store_compute=False).write({'parent_id': parent_dept.id})
-                    else:
-                        record.with_context(parent_store_compute=False).write({'parent_id': False})
-                else:
-                    record.with_context(parent_store_compute=False).write({'parent_id': False})
-            except Exception as e:
-                _logger.warning("Failed to update parent relationship for department %s: %s", record.name, str(e))
-                continue
-
     def _compute_parent_store(self):
         """
         Tính toán lại parent store fields một cách an toàn
@@ -7,14 +7,98 @@ import hashlib
 import base64
 import urllib.parse
 import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dateutil.relativedelta import relativedelta
 
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 
+from .http_session import configure_host, http_request
+
 _logger = logging.getLogger(__name__)
 
+# Giá trị mặc định cho fetcher đồng thời (có thể cấu hình trong Settings)
+DEFAULT_CONCURRENT_WORKERS = 8
+DEFAULT_RATE_LIMIT = 10
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1.0
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe để giới hạn số request/giây gửi tới YonSuite
+    Giống TokenBucket của tiktok_shop_connector; không import chéo vì 2 module độc lập.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1, rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Chờ cho tới khi có token rồi lấy 1 token
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+# Rate limiter dùng chung trong process, key theo base_url
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limiter(base_url, rate):
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(base_url)
+        if not limiter or limiter.rate != float(rate):
+            limiter = _rate_limiters[base_url] = TokenBucket(rate)
+        return limiter
+
+
+def _request_with_retry(limiter, method, url, max_retries, idempotent=True, **kwargs):
+    """
+    Gửi request qua rate limiter, retry với exponential backoff khi lỗi mạng
+    hoặc HTTP 429/5xx. Không dùng env nên an toàn khi gọi từ thread khác.
+
+    Request không idempotent (vd. POST tạo mới) chỉ retry khi chắc chắn server chưa xử lý:
+    HTTP 429 hoặc timeout lúc kết nối (request chưa được gửi đi).
+    """
+    retry_status_codes = RETRY_STATUS_CODES if idempotent else (429,)
+    retry_exceptions = (
+        (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        if idempotent else requests.exceptions.ConnectTimeout
+    )
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            response = http_request(method, url, **kwargs)
+            if response.status_code not in retry_status_codes or attempt >= max_retries:
+                response.raise_for_status()
+                return response.json()
+        except retry_exceptions:
+            if attempt >= max_retries:
+                raise
+        attempt += 1
+        backoff = RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1)) + random.uniform(0, RETRY_BACKOFF_SECONDS)
+        _logger.info("Retrying %s %s in %.1fs (attempt %d/%d)", method, url, backoff, attempt, max_retries)
+        time.sleep(backoff)
+
 
 class YonsuiteApi(models.TransientModel):
     _name = 'yonsuite.api'
@@ -84,7 +168,7 @@ class YonsuiteApi(models.TransientModel):
             query_string = "&".join([f"{key}={value}" for key, value in params.items()])
             full_url = f"{request_url}?{query_string}"
 
-            response = requests.get(full_url, timeout=30)
+            response = http_request('GET', full_url, timeout=30)
             response.raise_for_status()
 
             result = response.json()
@@ -116,7 +200,7 @@ class YonsuiteApi(models.TransientModel):
             _logger.error("YonSuite API error: %s", str(e))
             raise UserError(_('Error: %s') % str(e))
 
-    def get_partners_from_api(self, page_index=1, page_size=50):
+    def get_partners_from_api(self, page_index=1, page_size=50, filters=None):
         """
         Lấy danh sách partners từ YonSuite API với phân trang
         """
@@ -147,9 +231,12 @@ class YonsuiteApi(models.TransientModel):
                 'pageIndex': page_index,
                 'pageSize': page_size
             }
+            # Điều kiện lọc incremental (vd: pubts >= watermark)
+            if filters:
+                data.update(filters)
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Partners Request URL: %s", response.url)
@@ -195,7 +282,7 @@ class YonsuiteApi(models.TransientModel):
             _logger.warning("Failed to convert datetime string '%s': %s", datetime_str, str(e))
             return None
 
-    def get_products_from_api(self, page_index=1, page_size=50):
+    def get_products_from_api(self, page_index=1, page_size=50, filters=None):
         """
         Get products from YonSuite API
         """
@@ -222,8 +309,11 @@ class YonsuiteApi(models.TransientModel):
                 'pageIndex': page_index,
                 'pageSize': page_size
             }
+            # Điều kiện lọc incremental (vd: pubts >= watermark)
+            if filters:
+                data.update(filters)
 
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             _logger.info("Products Request URL: %s", response.url)
             _logger.info("Products Request params: %s", params)
@@ -245,7 +335,7 @@ class YonsuiteApi(models.TransientModel):
             _logger.error("YonSuite Products API error: %s", str(e))
             raise UserError(_('Products API error: %s') % str(e))
 
-    def get_orders_from_api(self, page_index=1, page_size=50):
+    def get_orders_from_api(self, page_index=1, page_size=50, filters=None):
         """
         Get orders from YonSuite API
         """
@@ -272,8 +362,11 @@ class YonsuiteApi(models.TransientModel):
                 'pageIndex': page_index,
                 'pageSize': page_size
             }
+            # Điều kiện lọc incremental (vd: pubts >= watermark)
+            if filters:
+                data.update(filters)
 
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             _logger.info("Orders Request URL: %s", response.url)
             _logger.info("Orders Request params: %s", params)
@@ -319,7 +412,7 @@ class YonsuiteApi(models.TransientModel):
                 'id': order_id
             }
 
-            response = requests.get(request_url, headers=headers, params=params, timeout=30)
+            response = http_request('GET', request_url, headers=headers, params=params, timeout=30)
 
             response.raise_for_status()
 
@@ -342,7 +435,7 @@ class YonsuiteApi(models.TransientModel):
         Sync orders from YonSuite API with pagination
         """
 
-    def get_vendors_from_api(self, page_index=1, page_size=50):
+    def get_vendors_from_api(self, page_index=1, page_size=50, filters=None):
         """
         Lấy danh sách vendors từ YonSuite API với phân trang
         """
@@ -373,9 +466,12 @@ class YonsuiteApi(models.TransientModel):
                 'pageIndex': page_index,
                 'pageSize': page_size
             }
+            # Điều kiện lọc incremental (vd: pubts >= watermark)
+            if filters:
+                data.update(filters)
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Vendors Request URL: %s", response.url)
@@ -432,7 +528,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Brands Request URL: %s", response.url)
@@ -489,7 +585,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Units Request URL: %s", response.url)
@@ -546,7 +642,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Warehouses Request URL: %s", response.url)
@@ -603,7 +699,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Warehouse Detail Request URL: %s", response.url)
@@ -660,7 +756,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Carriers Request URL: %s", response.url)
@@ -716,7 +812,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Carrier Detail Request URL: %s", response.url)
@@ -773,7 +869,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Staff Request URL: %s", response.url)
@@ -830,7 +926,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Countries Request URL: %s", response.url)
@@ -887,7 +983,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Currencies Request URL: %s", response.url)
@@ -944,7 +1040,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi GET request (API này không yêu cầu data)
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("AdminDepts Request URL: %s", response.url)
@@ -995,7 +1091,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi GET request
-            response = requests.get(request_url, headers=headers, params=params, timeout=30)
+            response = http_request('GET', request_url, headers=headers, params=params, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("AdminDept Detail Request URL: %s", response.url)
@@ -1044,7 +1140,7 @@ class YonsuiteApi(models.TransientModel):
                 'access_token': access_token
             }
 
-            response = requests.post(request_url, headers=headers, params=params, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
 
             result = response.json()
@@ -1087,7 +1183,7 @@ class YonsuiteApi(models.TransientModel):
                 'id': orgunit_id
             }
 
-            response = requests.get(request_url, headers=headers, params=params, timeout=30)
+            response = http_request('GET', request_url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
 
             result = response.json()
@@ -1137,7 +1233,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Root OrgUnit Request URL: %s", response.url)
@@ -1197,7 +1293,7 @@ class YonsuiteApi(models.TransientModel):
                 "pageIndex": "1"
             }
 
-            response = requests.post(request_url, headers=headers, params=params, json=body_data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=body_data, timeout=30)
             response.raise_for_status()
 
             result = response.json()
@@ -1239,7 +1335,7 @@ class YonsuiteApi(models.TransientModel):
                 'access_token': access_token
             }
 
-            response = requests.post(request_url, headers=headers, params=params, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
 
             result = response.json()
@@ -1282,7 +1378,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=salearea_data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=salearea_data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Push SaleArea Request URL: %s", response.url)
@@ -1307,7 +1403,7 @@ class YonsuiteApi(models.TransientModel):
             _logger.error("YonSuite Push SaleArea API error: %s", str(e))
             raise UserError(_('Push SaleArea API error: %s') % str(e))
 
-    def get_stores_from_api(self, page_index=1, page_size=50):
+    def get_stores_from_api(self, page_index=1, page_size=50, filters=None):
         """
         Lấy danh sách stores từ YonSuite API với phân trang
         """
@@ -1338,9 +1434,12 @@ class YonsuiteApi(models.TransientModel):
                 'pageIndex': page_index,
                 'pageSize': page_size
             }
+            # Điều kiện lọc incremental (vd: pubts >= watermark)
+            if filters:
+                data.update(filters)
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Stores Request URL: %s", response.url)
@@ -1391,7 +1490,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Push Store Request URL: %s", response.url)
@@ -1439,7 +1538,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi GET request
-            response = requests.get(request_url, params=params, timeout=30)
+            response = http_request('GET', request_url, params=params, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Store Detail Request URL: %s", response.url)
@@ -1489,7 +1588,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Push Product Request URL: %s", response.url)
@@ -1547,7 +1646,7 @@ class YonsuiteApi(models.TransientModel):
             }]
 
             # Gửi POST request với data trong body
-            response = requests.post(request_url, headers=headers, params=params, json=body_data, timeout=30)
+            response = http_request('POST', request_url, headers=headers, params=params, json=body_data, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Product Detail Request URL: %s", response.url)
@@ -1571,6 +1670,146 @@ class YonsuiteApi(models.TransientModel):
             _logger.error("YonSuite Product Detail API error: %s", str(e))
             raise UserError(_('Product Detail API error: %s') % str(e))
 
+    def _get_concurrent_fetch_settings(self):
+        """
+        Lấy cấu hình fetcher đồng thời: số worker, rate limit (request/giây), số lần retry
+        """
+        config_parameter = self.env['ir.config_parameter'].sudo()
+        return {
+            'max_workers': max(1, int(config_parameter.get_param(
+                'yonsuite_integration.concurrent_workers', DEFAULT_CONCURRENT_WORKERS))),
+            'rate_limit': max(1, float(config_parameter.get_param(
+                'yonsuite_integration.api_rate_limit', DEFAULT_RATE_LIMIT))),
+            'max_retries': max(0, int(config_parameter.get_param(
+                'yonsuite_integration.api_max_retries', DEFAULT_MAX_RETRIES))),
+        }
+
+    def _fetch_concurrently(self, jobs):
+        """
+        Gọi nhiều request YonSuite song song với số worker giới hạn, rate limit
+        dạng token bucket và retry với backoff.
+
+        Args:
+            jobs (dict): {key: {'method': 'GET'/'POST', 'endpoint': str,
+                                'params': dict, 'json': dict/list,
+                                'idempotent': bool (mặc định True)}}
+
+        Returns:
+            dict: {key: response json} hoặc {key: Exception} nếu request lỗi
+        """
+        if not jobs:
+            return {}
+
+        config_parameter = self.env['ir.config_parameter'].sudo()
+        base_url = config_parameter.get_param('yonsuite_integration.base_url')
+        access_token = config_parameter.get_param('yonsuite_integration.access_token')
+
+        if not base_url or not access_token:
+            raise UserError(_('Please configure YonSuite API and get access token first.'))
+
+        settings = self._get_concurrent_fetch_settings()
+        limiter = _get_rate_limiter(base_url, settings['rate_limit'])
+        # Pool đủ connection cho số worker đã cấu hình
+        configure_host(base_url, pool_maxsize=settings['max_workers'])
+        headers = {
+            'Content-Type': 'application/json'
+        }
+
+        results = {}
+        max_workers = min(settings['max_workers'], len(jobs))
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_key = {
+                executor.submit(
+                    _request_with_retry,
+                    limiter,
+                    job.get('method', 'POST'),
+                    base_url + job['endpoint'],
+                    settings['max_retries'],
+                    idempotent=job.get('idempotent', True),
+                    headers=headers,
+                    params=dict(job.get('params') or {}, access_token=access_token),
+                    json=job.get('json'),
+                    timeout=30,
+                ): key
+                for key, job in jobs.items()
+            }
+            for future in as_completed(future_to_key):
+                key = future_to_key[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    results[key] = e
+
+        _logger.info("YonSuite concurrent fetch: %d requests in %.1fs (%d workers, %.1f req/s limit)",
+                     len(jobs), time.monotonic() - started, max_workers, settings['rate_limit'])
+        return results
+
+    def get_product_details_concurrently(self, products):
+        """
+        Lấy chi tiết nhiều products song song
+
+        Args:
+            products (list): [(product_id, org_id), ...]
+
+        Returns:
+            dict: {product_id: response json hoặc Exception}
+        """
+        jobs = {
+            product_id: {
+                'method': 'POST',
+                'endpoint': '/yonbip/digitalModel/product/batchdetailnew',
+                'json': [{
+                    "id": int(product_id),
+                    "orgId": org_id
+                }],
+            }
+            for product_id, org_id in products
+        }
+        return self._fetch_concurrently(jobs)
+
+    def get_order_details_concurrently(self, order_ids):
+        """
+        Lấy chi tiết nhiều orders song song
+
+        Args:
+            order_ids (list): [order_id, ...]
+
+        Returns:
+            dict: {order_id: response json hoặc Exception}
+        """
+        jobs = {
+            order_id: {
+                'method': 'GET',
+                'endpoint': '/yonbip/sd/quote/salesquotation/detail',
+                'params': {'id': order_id},
+            }
+            for order_id in order_ids
+        }
+        return self._fetch_concurrently(jobs)
+
+    def push_products_concurrently(self, payloads):
+        """
+        Push nhiều products song song, mỗi request 1 product để có kết quả riêng cho từng record
+
+        Args:
+            payloads (dict): {product_id: {"data": [product_data], "matchRule": "id"}}
+
+        Returns:
+            dict: {product_id: response json hoặc Exception}
+        """
+        jobs = {
+            product_id: {
+                'method': 'POST',
+                'endpoint': '/yonbip/digitalModel/product/batch/save',
+                'json': payload,
+                # Không retry khi request đã gửi: product chưa có yonsuite_id sẽ bị tạo 2 lần
+                'idempotent': False,
+            }
+            for product_id, payload in payloads.items()
+        }
+        return self._fetch_concurrently(jobs)
+
     def get_management_classes_from_api(self, page_index=1, page_size=50):
         """
         Lấy danh sách management classes từ YonSuite API với phân trang
@@ -1595,7 +1834,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi GET request
-            response = requests.post(request_url, params=params, timeout=30)
+            response = http_request('POST', request_url, params=params, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Management Classes Request URL: %s", response.url)
@@ -1641,7 +1880,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi GET request
-            response = requests.post(request_url, params=params, timeout=30)
+            response = http_request('POST', request_url, params=params, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Purchase Classes Request URL: %s", response.url)
@@ -1687,7 +1926,7 @@ class YonsuiteApi(models.TransientModel):
             }
 
             # Gửi POST request
-            response = requests.post(request_url, params=params, timeout=30)
+            response = http_request('POST', request_url, params=params, timeout=30)
 
             # Debug: Log URL và request details
             _logger.info("Sale Classes Request URL: %s", response.url)
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+
+from odoo import models, fields, api
+
+
+class YonsuiteFingerprintMixin(models.AbstractModel):
+    """
+    Fingerprint (sync_hash) của payload YonSuite lần đồng bộ gần nhất,
+    dùng để bỏ qua record không thay đổi
+    """
+    _name = 'yonsuite.fingerprint.mixin'
+    _description = 'YonSuite Payload Fingerprint'
+
+    sync_hash = fields.Char("Sync Hash", copy=False, readonly=True)
+
+    @api.model
+    def _yonsuite_payload_hash(self, payload):
+        """
+        Hash ổn định của payload API
+        """
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
@@ -11,12 +11,16 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteGetallorgdept(models.Model):
     _name = 'yonsuite.getallorgdept'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.reference.mixin', 'yonsuite.hierarchy.mixin']
     _description = 'YonSuite Get All Org Dept'
     _order = 'create_date desc'
     _parent_name = 'parent_id'
     _parent_store = True
 
+    # Cây dựng theo code: parentorgid_code của record con là code của record cha
+    _yonsuite_node_key_field = 'code'
+    _yonsuite_parent_key_field = 'parentorgid_code'
+
     # Thông tin cơ bản
     yonsuite_id = fields.Char(
         string='YonSuite ID',
@@ -408,6 +412,8 @@ class YonsuiteGetallorgdept(models.Model):
         """
         Sync organizations/departments từ YonSuite API và lưu vào database
         """
+        # Quan hệ cha con được dựng lại 1 lần sau khi lưu hết dữ liệu
+        self = self.with_context(yonsuite_defer_hierarchy=True)
         config_parameter = self.env['ir.config_parameter'].sudo()
 
         # Gọi API để lấy dữ liệu organizations/departments
@@ -469,10 +475,7 @@ class YonsuiteGetallorgdept(models.Model):
 
             # Cập nhật quan hệ cha con cho tất cả records
             try:
-                all_records = self.search([])
-                all_records._update_parent_relationship()
-                # Tính toán lại parent store
-                self._compute_parent_store()
+                self._rebuild_hierarchy()
                 _logger.info("Parent relationships updated successfully")
             except Exception as e:
                 _logger.error("Failed to update parent relationships: %s", str(e))
@@ -566,63 +569,43 @@ class YonsuiteGetallorgdept(models.Model):
 
         return vals
 
-    def _update_parent_relationship(self):
+    def _yonsuite_hierarchy_fields(self):
+        return ['parent_orgunit_id', 'parent_getallorgdept_id', 'parent_id']
+
+    def _yonsuite_hierarchy_read_fields(self):
+        return ['level']
+
+    def _yonsuite_hierarchy_lookups(self, rows):
+        lookups = super()._yonsuite_hierarchy_lookups(rows)
+        # Level 2 liên kết với yonsuite_orgunit theo code (cache danh mục, không query)
+        lookups['orgunits'] = self.env['yonsuite.orgunit']._get_yonsuite_reference_maps()['code']
+        return lookups
+
+    def _yonsuite_resolve_parent_vals(self, row, lookups):
         """
-        Cập nhật quan hệ cha con dựa trên parentorgid_code và level
-        Logic:
+        Quan hệ cha con dựa trên parentorgid_code và level:
         - Level 2: liên kết với yonsuite_orgunit
         - Level 3+: chọn từ chính model yonsuite_getallorgdept
+        - Level 1 hoặc không có parentorgid_code: không có parent
         """
-        for record in self:
-            try:
-                if record.parentorgid_code:
-                    if record.level == 2:
-                        # Level 2: tìm trong yonsuite_orgunit
-                        parent_orgunit = self.env['yonsuite.orgunit'].search([('code', '=', record.parentorgid_code)], limit=1)
-                        if parent_orgunit:
-                            record.with_context(parent_store_compute=False).write({
-                                'parent_orgunit_id': parent_orgunit.id,
-                                'parent_getallorgdept_id': False,
-                                'parent_id': False
-                            })
-                        else:
-                            record.with_context(parent_store_compute=False).write({
-                                'parent_orgunit_id': False,
-                                'parent_getallorgdept_id': False,
-                                'parent_id': False
-                            })
-                    elif record.level >= 3:
-                        # Level 3+: tìm trong chính model yonsuite_getallorgdept
-                        parent_record = self.search([('code', '=', record.parentorgid_code)], limit=1)
-                        if parent_record and parent_record.id != record.id:
-                            record.with_context(parent_store_compute=False).write({
-                                'parent_orgunit_id': False,
-                                'parent_getallorgdept_id': parent_record.id,
-                                'parent_id': parent_record.id
-                            })
-                        else:
-                            record.with_context(parent_store_compute=False).write({
-                                'parent_orgunit_id': False,
-                                'parent_getallorgdept_id': False,
-                                'parent_id': False
-                            })
-                    else:
-                        # Level 1: không có parent
-                        record.with_context(parent_store_compute=False).write({
-                            'parent_orgunit_id': False,
-                            'parent_getallorgdept_id': False,
-                            'parent_id': False
-                        })
-                else:
-                    # Không có parentorgid_code
-                    record.with_context(parent_store_compute=False).write({
-                        'parent_orgunit_id': False,
-                        'parent_getallorgdept_id': False,
-                        'parent_id': False
-                    })
-            except Exception as e:
-                _logger.warning("Failed to update parent relationship for record %s: %s", record.name, str(e))
-                continue
+        vals = {
+            'parent_orgunit_id': False,
+            'parent_getallorgdept_id': False,
+            'parent_id': False,
+        }
+        parent_code = row['parentorgid_code']
+        if not parent_code:
+            return vals
+        if row['level'] == 2:
+            parent_orgunit = lookups['orgunits'].get(parent_code)
+            if parent_orgunit:
+                vals['parent_orgunit_id'] = parent_orgunit[0]
+        elif row['level'] and row['level'] >= 3:
+            parent_id = lookups['nodes'].get(parent_code)
+            if parent_id and parent_id != row['id']:
+                vals['parent_getallorgdept_id'] = parent_id
+                vals['parent_id'] = parent_id
+        return vals
 
     def _compute_parent_store(self):
         """
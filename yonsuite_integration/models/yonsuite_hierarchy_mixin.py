@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+from collections import defaultdict
+
+from odoo import models, api
+
+_logger = logging.getLogger(__name__)
+
+
+class YonsuiteHierarchyMixin(models.AbstractModel):
+    """
+    Dựng cây tổ chức (parent_id / parent_path) cho các model yonsuite có _parent_store
+    trong 1 lượt tuyến tính:
+        - đọc (id, mã node, mã node cha, cha hiện tại) của cả bảng bằng 1 query
+        - resolve cha trong bộ nhớ, cắt các vòng lặp
+        - chỉ ghi record đổi cha, gom theo giá trị để mỗi giá trị cha là 1 lệnh write;
+          write của _parent_store chỉ tính lại parent_path cho các cây con bị ảnh hưởng
+    """
+    _name = 'yonsuite.hierarchy.mixin'
+    _description = 'YonSuite Hierarchy Builder'
+
+    # Mã của node và field lưu mã node cha trên record con
+    _yonsuite_node_key_field = 'orgid'
+    _yonsuite_parent_key_field = 'parentorgid'
+
+    def _yonsuite_hierarchy_fields(self):
+        """
+        Các field quan hệ cha con được ghi bởi builder
+        """
+        return [self._parent_name]
+
+    def _yonsuite_hierarchy_read_fields(self):
+        """
+        Field bổ sung cần đọc để resolve cha
+        """
+        return []
+
+    def _yonsuite_hierarchy_lookups(self, rows):
+        """
+        Map tra cứu dùng khi resolve cha; mặc định mã node -> id.
+        Giữ thứ tự mặc định của model để trùng kết quả với search(limit=1).
+        """
+        node_map = {}
+        for row in rows:
+            if row[self._yonsuite_node_key_field]:
+                node_map.setdefault(row[self._yonsuite_node_key_field], row['id'])
+        return {'nodes': node_map}
+
+    def _yonsuite_resolve_parent_vals(self, row, lookups):
+        """
+        Giá trị quan hệ cha mong muốn cho 1 record
+        """
+        parent_key = row[self._yonsuite_parent_key_field]
+        parent_id = lookups['nodes'].get(parent_key) if parent_key else False
+        if parent_id == row['id']:
+            parent_id = False
+        return {self._parent_name: parent_id or False}
+
+    def _update_parent_relationship(self):
+        """
+        Cập nhật quan hệ cha con cho các record trong self.
+        Bỏ qua khi đang import (context yonsuite_defer_hierarchy), import sẽ gọi
+        _rebuild_hierarchy() 1 lần ở cuối.
+        """
+        if self.env.context.get('yonsuite_defer_hierarchy') or not self:
+            return 0
+        return self._yonsuite_build_hierarchy(set(self.ids))
+
+    @api.model
+    def _rebuild_hierarchy(self):
+        """
+        Dựng lại quan hệ cha con cho toàn bộ bảng
+        """
+        return self.with_context(yonsuite_defer_hierarchy=False)._yonsuite_build_hierarchy()
+
+    @api.model
+    def _yonsuite_build_hierarchy(self, scope_ids=None):
+        """
+        Args:
+            scope_ids (set): chỉ cập nhật các record này; None = toàn bộ bảng
+
+        Returns:
+            int: số record đổi cha
+        """
+        hierarchy_fields = self._yonsuite_hierarchy_fields()
+        read_fields = list({
+            self._yonsuite_node_key_field, self._yonsuite_parent_key_field, 'parent_path',
+        } | set(self._yonsuite_hierarchy_read_fields()) | set(hierarchy_fields))
+        rows = self.search_read([], read_fields, load=None)
+        rows_by_id = {row['id']: row for row in rows}
+        lookups = self._yonsuite_hierarchy_lookups(rows)
+
+        desired = {}
+        for row in rows:
+            if scope_ids is None or row['id'] in scope_ids:
+                desired[row['id']] = self._yonsuite_resolve_parent_vals(row, lookups)
+
+        # Cắt vòng lặp (A -> B -> A) trước khi ghi, nếu không write sẽ báo Recursion Detected
+        parent_of = {row['id']: row[self._parent_name] for row in rows}
+        parent_of.update({record_id: vals[self._parent_name] for record_id, vals in desired.items()})
+        for record_id in self._yonsuite_find_cycle_nodes(parent_of):
+            vals = desired.setdefault(record_id, {field: rows_by_id[record_id][field] for field in hierarchy_fields})
+            vals[self._parent_name] = False
+            _logger.warning("%s %s: parent cycle detected, parent cleared", self._name, record_id)
+
+        groups = defaultdict(list)
+        for record_id, vals in desired.items():
+            row = rows_by_id[record_id]
+            if any(row[field] != value for field, value in vals.items()):
+                groups[json.dumps(vals, sort_keys=True)].append(record_id)
+
+        # Ghi theo nhóm; nhóm lỗi (vd: đảo cha con giữa 2 nhóm) được thử lại sau khi các nhóm khác đã ghi
+        pending = list(groups.items())
+        changed_count = 0
+        while pending:
+            failed = []
+            for vals_key, record_ids in pending:
+                try:
+                    with self.env.cr.savepoint():
+                        self.browse(record_ids).write(json.loads(vals_key))
+                    changed_count += len(record_ids)
+                except Exception as e:
+                    failed.append((vals_key, record_ids))
+                    last_error = e
+            if len(failed) == len(pending):
+                _logger.warning("%s: failed to update parent of %d records: %s",
+                                self._name, sum(len(ids) for _key, ids in failed), str(last_error))
+                break
+            pending = failed
+
+        # Dữ liệu cũ chưa có parent_path thì tính lại toàn bộ 1 lần
+        if any(not row['parent_path'] for row in rows):
+            self._compute_parent_store()
+
+        _logger.info("%s hierarchy: %d records loaded, %d parent changes in %d writes",
+                     self._name, len(rows), changed_count, len(groups))
+        return changed_count
+
+    @api.model
+    def _yonsuite_find_cycle_nodes(self, parent_of):
+        """
+        Tìm trong đồ thị {id: parent_id} 1 node trên mỗi vòng lặp (duyệt tuyến tính)
+        """
+        state = {}
+        cycle_nodes = []
+        for start in parent_of:
+            path = []
+            node = start
+            while node and node in parent_of and node not in state:
+                state[node] = 'visiting'
+                path.append(node)
+                node = parent_of[node]
+            if node and state.get(node) == 'visiting':
+                cycle_nodes.append(node)
+                parent_of[node] = False
+            for visited in path:
+                state[visited] = 'done'
+        return cycle_nodes
@@ -9,7 +9,7 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteManagementClass(models.Model):
     _name = 'yonsuite.management.class'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.reference.mixin']
     _description = 'YonSuite Management Class'
     _order = 'create_date desc'
 
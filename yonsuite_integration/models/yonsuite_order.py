@@ -6,14 +6,20 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+# Số order xử lý (gọi detail + lưu) trước mỗi lần commit
+ORDER_IMPORT_CHUNK_SIZE = 200
+
 
 class YonsuiteOrder(models.Model):
     _name = 'yonsuite.order'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.sync.mixin']
     _description = 'YonSuite Order'
     _order = 'create_date desc'
     _rec_name = 'code'
 
+    _yonsuite_sync_entity = 'orders'
+    _yonsuite_sync_api_method = 'get_orders_from_api'
+
     name = fields.Char(
         string='Order Name',
         help='Name of the order'
@@ -23,6 +29,7 @@ class YonsuiteOrder(models.Model):
         string='YonSuite Order ID',
         readonly=True,
         copy=False,
+        index=True,
         help='Order ID from YonSuite API'
     )
 
@@ -528,128 +535,159 @@ class YonsuiteOrder(models.Model):
 
     @api.model
     def action_import_orders_pagination(self):
-        config_parameter = self.env['ir.config_parameter'].sudo()
-
-        # Lấy pageIndex hiện tại từ config
-        current_page = int(config_parameter.get_param('yonsuite_integration.orders_current_page', '1'))
-        page_size = 5000
-
-        # Gọi API để lấy dữ liệu orders
-        result = self.env['yonsuite.api'].get_orders_from_api(current_page, page_size)
-
-        if result.get("code") == "200":
-            data = result.get("data", {})
-            orders_data = data.get("recordList", [])
-
-            if not orders_data:
-                # Không có dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.orders_current_page', '1')
-                _logger.info("No more orders data, reset to page 1")
-                return 0
-
-            # Kiểm tra nếu số lượng records ít hơn page_size thì đã hết dữ liệu
-            if len(orders_data) < page_size:
-                _logger.info("Received %d records (less than page_size %d), this is the last page", len(orders_data), page_size)
-                # Đánh dấu để reset sau khi xử lý xong
-                should_reset = True
-            else:
-                should_reset = False
-
-            # Lấy tất cả yonsuite_id từ API response
-            api_yonsuite_ids = [str(order_data.get("id")) for order_data in orders_data]
-
-            # Search một lần duy nhất tất cả orders đã tồn tại
-            existing_orders = self.env['yonsuite.order'].search([('yonsuite_id', 'in', api_yonsuite_ids)])
-            existing_orders_dict = {o.yonsuite_id: o for o in existing_orders}
-
-            # Lưu orders vào database
-            synced_count = 0
-            created_count = 0
-            updated_count = 0
-            skipped_count = 0
-
-            for order_data in orders_data:
-                yonsuite_id = str(order_data.get("id"))
-                order = existing_orders_dict.get(yonsuite_id)
-                order_detail = self.env['yonsuite.api'].get_order_detail_from_api(yonsuite_id)
-                detail_payload = {}
-                if order_detail and order_detail.get('code') == '200':
-                    detail_payload = order_detail.get('data', {}) or {}
-                if not order:
-                    # Tạo mới order
-                    vals = {
-                        'yonsuite_id': yonsuite_id,
-                        'name': order_data.get("name"),
-                    }
-
-                    # Thêm dữ liệu từ API
-                    # Ưu tiên detail payload nếu có, fallback list record
-                    vals.update(self._prepare_order_data_from_api(detail_payload or order_data))
-
-                    order = self.env['yonsuite.order'].create(vals)
-
-                    # Tạo order lines
-                    # Nếu có childs trong detail, tạo từ childs, ngược lại từ record list
-                    if detail_payload.get('childs'):
-                        for child in detail_payload.get('childs'):
-                            self._create_order_lines(order, child)
-                    else:
-                        self._create_order_lines(order, order_data)
-
-                    created_count += 1
-                else:
-                    # Order đã tồn tại, kiểm tra có cần cập nhật không
-                    # Vì API không trả về modify_time, ta sẽ cập nhật luôn
-                    order._update_order_from_api_data(detail_payload or order_data)
+        """
+        Sync orders thay đổi từ YonSuite API: kéo nhiều page trong giới hạn thời gian,
+        commit sau mỗi page (xem yonsuite.sync.mixin)
+        """
+        synced_count = self._yonsuite_run_incremental_sync()
+        self._retry_failed_order_details()
+        return synced_count
 
-                    # Cập nhật order lines
-                    if detail_payload.get('childs'):
-                        for child in detail_payload.get('childs'):
-                            self._update_order_lines(order, child)
-                    else:
-                        self._update_order_lines(order, order_data)
+    @api.model
+    def _retry_failed_order_details(self):
+        """
+        Lấy lại detail cho các order lần trước lỗi detail (state error, chưa có sync_hash).
+        Order cũ không còn trong cửa sổ pubts của lần đồng bộ incremental nên phải thử lại riêng;
+        mỗi lần tối đa ORDER_IMPORT_CHUNK_SIZE order, order lỗi lâu nhất được thử trước.
 
-                    updated_count += 1
+        Returns:
+            int: số order lấy lại detail thành công
+        """
+        orders = self.search([
+            ('state', '=', 'error'),
+            ('sync_hash', '=', False),
+            ('yonsuite_id', '!=', False),
+        ], order='last_sync_date, id', limit=ORDER_IMPORT_CHUNK_SIZE)
+        if not orders:
+            return 0
+
+        detail_results = self.env['yonsuite.api'].get_order_details_concurrently(orders.mapped('yonsuite_id'))
+        now = fields.Datetime.now()
+        lines_by_order = {}
+        recovered_count = 0
+        for order in orders:
+            order_detail = detail_results.get(order.yonsuite_id)
+            if isinstance(order_detail, Exception) or not order_detail or order_detail.get('code') != '200' \
+                    or not order_detail.get('data'):
+                error_message = str(order_detail) if isinstance(order_detail, Exception) \
+                    else (order_detail or {}).get('message') or 'Empty order detail response'
+                order.write({'last_sync_date': now, 'sync_error_message': error_message})
+                continue
+            detail_payload = order_detail['data']
+            vals = self._prepare_order_data_from_api(detail_payload)
+            vals.update({
+                'state': 'synced',
+                'last_sync_date': now,
+                'sync_error_message': False,
+            })
+            order.write(vals)
+            recovered_count += 1
+            if detail_payload.get('childs'):
+                lines_by_order[order.id] = detail_payload['childs']
+
+        self._reconcile_order_lines(lines_by_order)
+        _logger.info("YonSuite orders: retried detail for %d orders, %d recovered", len(orders), recovered_count)
+        return recovered_count
+
+    @api.model
+    def _yonsuite_import_page(self, orders_data):
+        """
+        Lưu 1 page orders vào database. List API trả về 1 dòng cho mỗi order line nên
+        gom theo order id, fingerprint tính trên toàn bộ các dòng của order;
+        order không thay đổi sẽ không gọi API detail.
+        """
+        rows_by_order = {}
+        for order_data in orders_data:
+            rows_by_order.setdefault(str(order_data.get("id")), []).append(order_data)
+        changed, skipped_count = self._yonsuite_split_changed([
+            {'id': yonsuite_id, 'rows': rows} for yonsuite_id, rows in rows_by_order.items()
+        ])
+
+        created_count = 0
+        for start in range(0, len(changed), ORDER_IMPORT_CHUNK_SIZE):
+            created_count += self._import_orders_chunk(changed[start:start + ORDER_IMPORT_CHUNK_SIZE])
+            # Commit theo chunk để page lớn không giữ 1 transaction dài;
+            # order đã lưu đủ detail có sync_hash mới nên nếu lỗi giữa page, lần chạy sau sẽ bỏ qua;
+            # order lỗi detail không có sync_hash nên sẽ được lấy lại
+            self.env.cr.commit()
 
-                synced_count += 1
+        return {
+            'created': created_count,
+            'updated': len(changed) - created_count,
+            'skipped': skipped_count,
+        }
+
+    @api.model
+    def _import_orders_chunk(self, changed):
+        """
+        Lấy detail song song (có rate limit) rồi tạo / cập nhật orders và lines của 1 chunk
 
-            # Cập nhật pageIndex cho lần tiếp theo
-            if should_reset:
-                # Đã hết dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.orders_current_page', '1')
-                _logger.info("Page %d (last page): Created %d, Updated %d, Skipped %d, Total %d - Reset to page 1",
-                             current_page, created_count, updated_count, skipped_count, synced_count)
+        Args:
+            changed (list): [({'id': yonsuite_id, 'rows': [...]}, payload_hash, existing_id), ...]
+
+        Returns:
+            int: số order tạo mới
+        """
+        detail_results = self.env['yonsuite.api'].get_order_details_concurrently([
+            grouped_data['id'] for grouped_data, payload_hash, order_id in changed
+        ])
+
+        now = fields.Datetime.now()
+        create_vals_list = []
+        create_lines_data = []
+        lines_by_order = {}
+        for grouped_data, payload_hash, order_id in changed:
+            yonsuite_id = grouped_data['id']
+            rows = grouped_data['rows']
+            detail_payload = {}
+            detail_error = False
+            order_detail = detail_results.get(yonsuite_id)
+            if isinstance(order_detail, Exception):
+                detail_error = str(order_detail)
+            elif order_detail and order_detail.get('code') == '200':
+                detail_payload = order_detail.get('data', {}) or {}
+            else:
+                detail_error = (order_detail or {}).get('message') or 'Empty order detail response'
+
+            # Ưu tiên detail payload nếu có, fallback list record
+            vals = self._prepare_order_data_from_api(detail_payload or rows[0])
+            if detail_error:
+                # Không lưu sync_hash để lần chạy sau lấy lại detail cho order này
+                _logger.warning("Error getting order detail for ID %s: %s", yonsuite_id, detail_error)
+                vals.update({
+                    'state': 'error',
+                    'last_sync_date': now,
+                    'sync_error_message': detail_error,
+                    'sync_hash': False,
+                })
             else:
-                # Còn dữ liệu, tăng pageIndex
-                next_page = current_page + 1
-                config_parameter.set_param('yonsuite_integration.orders_current_page', str(next_page))
-                _logger.info("Page %d: Created %d, Updated %d, Skipped %d, Total %d - Next page: %d",
-                             current_page, created_count, updated_count, skipped_count, synced_count, next_page)
-
-            # Cập nhật thống kê
-            total_synced = int(config_parameter.get_param('yonsuite_integration.orders_total_synced', '0'))
-            config_parameter.set_param('yonsuite_integration.orders_total_synced', str(total_synced + synced_count))
-            config_parameter.set_param('yonsuite_integration.orders_last_sync', fields.Datetime.now())
-
-            return synced_count
-        else:
-            # Kiểm tra message để xác định có phải là "rỗng" không
-            message = result.get("message", "")
-            message_lower = message.lower()
-            # Check for various empty result indicators
-            empty_indicators = ["rỗng", "empty", "không có", "khong co"]
-            is_empty = any(indicator in message or indicator in message_lower for indicator in empty_indicators)
-
-            if is_empty:
-                # Kết quả truy vấn rỗng, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.orders_current_page', '1')
-                _logger.info("Query result is empty (message: '%s'), reset to page 1", message)
-                return 0
+                vals.update({
+                    'state': 'synced',
+                    'last_sync_date': now,
+                    'sync_error_message': False,
+                    'sync_hash': payload_hash,
+                })
+            # Nếu có childs trong detail, lines lấy từ childs, ngược lại từ các dòng của record list
+            lines_data = detail_payload.get('childs') or rows
+
+            if order_id:
+                self.browse(order_id).write(vals)
+                lines_by_order[order_id] = lines_data
             else:
-                # Lỗi khác
-                error_msg = result.get("message", "Unknown error")
-                _logger.error("Failed to sync orders from YonSuite: %s", error_msg)
-                return 0
+                vals.update({
+                    'yonsuite_id': yonsuite_id,
+                    'name': vals.get('name') or rows[0].get("name"),
+                })
+                create_vals_list.append(vals)
+                create_lines_data.append(lines_data)
+
+        if create_vals_list:
+            orders = self.create(create_vals_list)
+            for order, lines_data in zip(orders, create_lines_data):
+                lines_by_order[order.id] = lines_data
+
+        self._reconcile_order_lines(lines_by_order)
+        return len(create_vals_list)
 
     def _prepare_order_data_from_api(self, api_data):
         """
@@ -918,48 +956,66 @@ class YonsuiteOrder(models.Model):
 
         return vals
 
-    def _create_order_lines(self, order, order_data):
-        """
-        Create order lines from API data
+    @api.model
+    def _reconcile_order_lines(self, lines_by_order):
         """
-        # Tạo order line từ dữ liệu (có thể là phần tử trong 'childs')
-        line_vals = self._prepare_order_line_data_from_api(order_data)
-        line_vals['order_id'] = order.id
+        Tạo / cập nhật order lines của nhiều orders cùng lúc:
+            - product được resolve bằng 1 query cho tất cả lines
+            - lines hiện có được đọc bằng 1 query, line có payload không đổi được bỏ qua
+            - lines mới được tạo bằng 1 lệnh create
 
-        # Tìm product relation: link bằng productId
-        if line_vals.get('childs_product_id'):
-            product = self.env['yonsuite.product'].search([
-                ('yonsuite_id', '=', line_vals['childs_product_id'])
-            ], limit=1)
-            if product:
-                line_vals['product_id'] = product.id
+        Args:
+            lines_by_order (dict): {order_id: [line_data, ...]}
+        """
+        if not lines_by_order:
+            return
+        OrderLine = self.env['yonsuite.order.line']
 
-        self.env['yonsuite.order.line'].create(line_vals)
+        line_vals_by_order = {
+            order_id: [self._prepare_order_line_data_from_api(line_data) for line_data in lines_data]
+            for order_id, lines_data in lines_by_order.items()
+        }
 
-    def _update_order_lines(self, order, order_data):
-        """
-        Update order lines from API data
-        """
-        # Xác định id line theo childs_id hoặc id
-        target_line_id = str(order_data.get("childs_id") or order_data.get("id") or '')
-        existing_line = order.order_line_ids.filtered(lambda l: l.yonsuite_id == target_line_id)
-
-        if existing_line:
-            # Cập nhật line hiện tại
-            line_vals = self._prepare_order_line_data_from_api(order_data)
-
-            # Tìm product relation qua productId
-            if line_vals.get('childs_product_id'):
-                product = self.env['yonsuite.product'].search([
-                    ('yonsuite_id', '=', line_vals['childs_product_id'])
-                ], limit=1)
-                if product:
-                    line_vals['product_id'] = product.id
+        # Tìm product relation: link bằng productId
+        product_yonsuite_ids = list({
+            vals['childs_product_id']
+            for vals_list in line_vals_by_order.values() for vals in vals_list
+            if vals.get('childs_product_id')
+        })
+        product_map = {}
+        if product_yonsuite_ids:
+            for product in self.env['yonsuite.product'].search_read(
+                    [('yonsuite_id', 'in', product_yonsuite_ids)], ['yonsuite_id'], order='id'):
+                product_map.setdefault(product['yonsuite_id'], product['id'])
+
+        existing_map = {}
+        for line in OrderLine.search_read(
+                [('order_id', 'in', list(line_vals_by_order))], ['order_id', 'yonsuite_id', 'sync_hash'], order='id'):
+            existing_map.setdefault((line['order_id'][0], line['yonsuite_id']), line)
+
+        create_vals_list = []
+        updated_count = 0
+        for order_id, vals_list in line_vals_by_order.items():
+            for vals in vals_list:
+                product_id = product_map.get(vals.get('childs_product_id'))
+                if product_id:
+                    vals['product_id'] = product_id
+                payload_hash = OrderLine._yonsuite_payload_hash(vals)
+                existing = existing_map.get((order_id, vals['yonsuite_id']))
+                if existing and existing['sync_hash'] == payload_hash:
+                    continue
+                vals['sync_hash'] = payload_hash
+                if existing:
+                    OrderLine.browse(existing['id']).write(vals)
+                    updated_count += 1
+                else:
+                    vals['order_id'] = order_id
+                    create_vals_list.append(vals)
 
-            existing_line.write(line_vals)
-        else:
-            # Tạo line mới
-            self._create_order_lines(order, order_data)
+        if create_vals_list:
+            OrderLine.create(create_vals_list)
+        _logger.info("Order lines of %d orders: Created %d, Updated %d",
+                     len(line_vals_by_order), len(create_vals_list), updated_count)
 
     def _update_order_from_api_data(self, api_data):
         """
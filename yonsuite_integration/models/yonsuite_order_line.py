@@ -9,7 +9,7 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteOrderLine(models.Model):
     _name = 'yonsuite.order.line'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.fingerprint.mixin']
     _description = 'YonSuite Order Line'
     _order = 'id'
 
@@ -25,6 +25,7 @@ class YonsuiteOrderLine(models.Model):
         string='Order',
         required=True,
         ondelete='cascade',
+        index=True,
         help='Related YonSuite Order'
     )
     
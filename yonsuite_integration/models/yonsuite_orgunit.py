@@ -11,7 +11,7 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteOrgunit(models.Model):
     _name = 'yonsuite.orgunit'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.reference.mixin', 'yonsuite.hierarchy.mixin']
     _description = 'YonSuite Organization Unit'
     _order = 'create_date desc'
     _parent_name = 'parent_id'
@@ -726,6 +726,8 @@ class YonsuiteOrgunit(models.Model):
         Sync organizations từ YonSuite API và lưu vào database
         Bao gồm cả root organization (cấp 0) và các organization cấp 1
         """
+        # Quan hệ cha con được dựng lại 1 lần sau khi lưu hết dữ liệu
+        self = self.with_context(yonsuite_defer_hierarchy=True)
         config_parameter = self.env['ir.config_parameter'].sudo()
 
         # Gọi API để lấy dữ liệu organizations
@@ -815,10 +817,7 @@ class YonsuiteOrgunit(models.Model):
 
         # Cập nhật quan hệ cha con cho tất cả organizations
         try:
-            all_organizations = self.search([])
-            all_organizations._update_parent_relationship()
-            # Tính toán lại parent store
-            self._compute_parent_store()
+            self._rebuild_hierarchy()
             _logger.info("Parent relationships updated successfully")
         except Exception as e:
             _logger.error("Failed to update parent relationships: %s", str(e))
@@ -1015,25 +1014,6 @@ class YonsuiteOrgunit(models.Model):
 
         return vals
 
-    def _update_parent_relationship(self):
-        """
-        Cập nhật quan hệ cha con dựa trên parentorgid
-        """
-        for record in self:
-            try:
-                if record.parentorgid:
-                    # Tìm parent organization dựa trên parentorgid
-                    parent_org = self.search([('orgid', '=', record.parentorgid)], limit=1)
-                    if parent_org and parent_org.id != record.id:
-                        record.with_context(parent_store_compute=False).write({'parent_id': parent_org.id})
-                    else:
-                        record.with_context(parent_store_compute=False).write({'parent_id': False})
-                else:
-                    record.with_context(parent_store_compute=False).write({'parent_id': False})
-            except Exception as e:
-                _logger.warning("Failed to update parent relationship for organization %s: %s", record.name, str(e))
-                continue
-
     def _compute_parent_store(self):
         """
         Tính toán lại parent store fields một cách an toàn
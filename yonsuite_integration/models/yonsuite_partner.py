@@ -11,10 +11,13 @@ _logger = logging.getLogger(__name__)
 
 class YonsuitePartner(models.Model):
     _name = 'yonsuite.partner'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.sync.mixin', 'yonsuite.reference.mixin']
     _description = 'YonSuite Partner'
     _order = 'create_date desc'
 
+    _yonsuite_sync_entity = 'partners'
+    _yonsuite_sync_api_method = 'get_partners_from_api'
+
     # Thông tin cơ bản
     yonsuite_id = fields.Char(
         string='YonSuite ID',
@@ -249,117 +252,42 @@ class YonsuitePartner(models.Model):
     @api.model
     def action_import_partners_pagination(self):
         """
-        Sync partners từ YonSuite API với phân trang và lưu vào database
+        Sync partners thay đổi từ YonSuite API: kéo nhiều page trong giới hạn thời gian,
+        commit sau mỗi page (xem yonsuite.sync.mixin)
         """
-        config_parameter = self.env['ir.config_parameter'].sudo()
-
-        # Lấy pageIndex hiện tại từ config
-        current_page = int(config_parameter.get_param('yonsuite_integration.partners_current_page', '1'))
-        page_size = 5000
+        return self._yonsuite_run_incremental_sync()
 
-        # Gọi API để lấy dữ liệu partners
-        api_service = self.env['yonsuite.api']
-        result = api_service.get_partners_from_api(current_page, page_size)
-
-        if result.get("code") == "200":
-            partners_data = result.get("data", [])
-
-            if not partners_data:
-                # Không có dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.partners_current_page', '1')
-                _logger.info("No more partners data, reset to page 1")
-                return 0
-
-            # Kiểm tra nếu số lượng records ít hơn page_size thì đã hết dữ liệu
-            if len(partners_data) < page_size:
-                _logger.info("Received %d records (less than page_size %d), this is the last page", len(partners_data), page_size)
-                # Đánh dấu để reset sau khi xử lý xong
-                should_reset = True
+    @api.model
+    def _yonsuite_import_page(self, partners_data):
+        """
+        Lưu 1 page partners vào database, bỏ qua partner có payload không thay đổi
+        """
+        changed, skipped_count = self._yonsuite_split_changed(partners_data)
+
+        now = fields.Datetime.now()
+        create_vals_list = []
+        for partner_data, payload_hash, partner_id in changed:
+            vals = self._prepare_partner_data_from_api(partner_data)
+            vals.update({
+                'state': 'synced',
+                'last_sync_date': now,
+                'sync_error_message': False,
+                'sync_hash': payload_hash,
+            })
+            if partner_id:
+                self.browse(partner_id).write(vals)
             else:
-                should_reset = False
-            # Lấy tất cả yonsuite_id từ API response
-            api_yonsuite_ids = [str(partner_data.get("id")) for partner_data in partners_data]
-
-            # Search một lần duy nhất tất cả partners đã tồn tại
-            existing_partners = self.search([('yonsuite_id', 'in', api_yonsuite_ids)])
-            existing_partners_dict = {p.yonsuite_id: p for p in existing_partners}
-
-            # Lưu partners vào database
-            synced_count = 0
-            created_count = 0
-            updated_count = 0
-            skipped_count = 0
+                vals['yonsuite_id'] = str(partner_data.get("id"))
+                create_vals_list.append(vals)
 
-            for partner_data in partners_data:
-                yonsuite_id = str(partner_data.get("id"))
-                partner = existing_partners_dict.get(yonsuite_id)
-
-                if not partner:
-                    # Tạo partner mới với đầy đủ dữ liệu
-                    name_data = partner_data.get("name", {})
-                    vals = {
-                        'yonsuite_id': yonsuite_id,
-                        'name': name_data.get("simplifiedName") or partner_data.get("code"),
-                        'state': 'synced',
-                        'last_sync_date': fields.Datetime.now(),
-                        'sync_error_message': False
-                    }
+        if create_vals_list:
+            self.create(create_vals_list)
 
-                    # Thêm dữ liệu từ API
-                    vals.update(self._prepare_partner_data_from_api(partner_data))
-
-                    partner = self.create(vals)
-                    created_count += 1
-                else:
-                    # Kiểm tra modify_time có thay đổi không
-                    api_service = self.env['yonsuite.api']
-                    api_modify_time = api_service._convert_datetime_string(partner_data.get("modifyTime"))
-
-                    if api_modify_time and partner.modify_time != api_modify_time:
-                        partner._update_partner_from_api_data(partner_data)
-                        updated_count += 1
-                    else:
-                        skipped_count += 1
-
-                synced_count += 1
-
-            # Cập nhật pageIndex cho lần tiếp theo
-            if should_reset:
-                # Đã hết dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.partners_current_page', '1')
-                _logger.info("Page %d (last page): Created %d, Updated %d, Skipped %d, Total %d - Reset to page 1",
-                                current_page, created_count, updated_count, skipped_count, synced_count)
-            else:
-                # Còn dữ liệu, tăng pageIndex
-                next_page = current_page + 1
-                config_parameter.set_param('yonsuite_integration.partners_current_page', str(next_page))
-                _logger.info("Page %d: Created %d, Updated %d, Skipped %d, Total %d - Next page: %d",
-                                current_page, created_count, updated_count, skipped_count, synced_count, next_page)
-
-            # Cập nhật thống kê
-            total_synced = int(config_parameter.get_param('yonsuite_integration.partners_total_synced', '0'))
-            config_parameter.set_param('yonsuite_integration.partners_total_synced', str(total_synced + synced_count))
-            config_parameter.set_param('yonsuite_integration.partners_last_sync', fields.Datetime.now())
-
-            return synced_count
-        else:
-            # Kiểm tra message để xác định có phải là "rỗng" không
-            message = result.get("message", "")
-            message_lower = message.lower()
-            # Check for various empty result indicators
-            empty_indicators = ["rỗng", "empty", "không có", "khong co"]
-            is_empty = any(indicator in message or indicator in message_lower for indicator in empty_indicators)
-
-            if is_empty:
-                # Kết quả truy vấn rỗng, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.partners_current_page', '1')
-                _logger.info("Query result is empty (message: '%s'), reset to page 1", message)
-                return 0
-            else:
-                # Lỗi khác
-                error_msg = result.get("message", "Unknown error")
-                _logger.error("Failed to sync partners from YonSuite: %s", error_msg)
-                return 0
+        return {
+            'created': len(create_vals_list),
+            'updated': len(changed) - len(create_vals_list),
+            'skipped': skipped_count,
+        }
 
     def _prepare_partner_data_from_api(self, api_data):
         """
@@ -2,18 +2,28 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+import json
 import logging
 import time
+from collections import defaultdict
 
 _logger = logging.getLogger(__name__)
 
+# Số product build payload + push trước mỗi lần commit khi export hàng loạt
+PRODUCT_EXPORT_CHUNK_SIZE = 200
+# Số product lỗi detail được lấy lại sau mỗi lần import
+PRODUCT_DETAIL_RETRY_LIMIT = 100
+
 
 class YonsuiteProduct(models.Model):
     _name = 'yonsuite.product'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.sync.mixin']
     _description = 'YonSuite Product'
     _order = 'create_date desc'
 
+    _yonsuite_sync_entity = 'products'
+    _yonsuite_sync_api_method = 'get_products_from_api'
+
     name = fields.Char(
         string='Product Name',
         required=True,
@@ -238,6 +248,21 @@ class YonsuiteProduct(models.Model):
         help='Error message from last synchronization attempt'
     )
 
+    export_queued = fields.Boolean(
+        string='Queued for Export',
+        readonly=True,
+        copy=False,
+        index=True,
+        help='Product is waiting to be pushed to YonSuite by the background export job'
+    )
+
+    detail_sync_failed = fields.Boolean(
+        string='Detail Sync Failed',
+        readonly=True,
+        copy=False,
+        help='Product detail could not be fetched during the last import; it is fetched again on the next import'
+    )
+
     # Additional fields from product detail API
     url = fields.Char(
         string='Product URL',
@@ -399,6 +424,12 @@ class YonsuiteProduct(models.Model):
         help='Modify date from YonSuite'
     )
 
+    pubts = fields.Datetime(
+        string='Publish Time',
+        readonly=True,
+        help='Publish timestamp from YonSuite'
+    )
+
     customer_service_day = fields.Integer(
         string='Customer Service Day',
         help='Customer service day from YonSuite'
@@ -1309,6 +1340,8 @@ class YonsuiteProduct(models.Model):
         """
         Sync product to YonSuite
         """
+        if len(self) > 1:
+            return self.action_bulk_export_to_yonsuite()
         self.ensure_one()
 
         if not self.name:
@@ -1331,14 +1364,7 @@ class YonsuiteProduct(models.Model):
             # Check API response
             if result.get("code") == "00000" or result.get("code") == "200":
                 # Success - update product state
-                yonsuite_id = None
-                if result.get("data"):
-                    # Try to extract product ID from response
-                    data = result.get("data")
-                    if isinstance(data, list) and len(data) > 0:
-                        yonsuite_id = data[0].get("id")
-                    elif isinstance(data, dict):
-                        yonsuite_id = data.get("id")
+                yonsuite_id = self._extract_pushed_product_id(result)
                 
                 self.write({
                     'state': 'synced',
@@ -1380,6 +1406,141 @@ class YonsuiteProduct(models.Model):
             _logger.error("Error syncing product %s to YonSuite: %s", self.name, error_message)
             raise UserError(_('Error syncing product to YonSuite: %s') % error_message)
 
+    @api.model
+    def _extract_pushed_product_id(self, result):
+        """
+        Lấy id product YonSuite trả về từ response push
+        """
+        data = result.get("data")
+        if isinstance(data, list) and len(data) > 0:
+            return data[0].get("id")
+        if isinstance(data, dict):
+            return data.get("id")
+        return None
+
+    def action_bulk_export_to_yonsuite(self):
+        """
+        Đưa các product đã chọn vào hàng đợi export, cron chạy nền push lên YonSuite
+        (_cron_export_queued_products) nên request của nút bấm trả về ngay
+        """
+        products = self.filtered('name')
+        products.write({'export_queued': True})
+        self.env.ref('yonsuite_integration.ir_cron_yonsuite_export_products')._trigger()
+
+        message = _('%(queued)s products queued for export to YonSuite, %(skipped)s skipped (no name).') % {
+            'queued': len(products),
+            'skipped': len(self) - len(products),
+        }
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('YonSuite Product Export'),
+                'message': message,
+                'type': 'info',
+                'sticky': False,
+            }
+        }
+
+    @api.model
+    def _cron_export_queued_products(self):
+        """
+        Push các product trong hàng đợi export theo chunk (commit sau mỗi chunk) trong giới hạn
+        thời gian; còn product thì tự trigger lại cron để chạy tiếp.
+
+        Returns:
+            dict: {'success': int, 'error': int}
+        """
+        deadline = time.monotonic() + self._get_yonsuite_sync_time_budget()
+        counts = {'success': 0, 'error': 0}
+        while True:
+            products = self.search([('export_queued', '=', True)], order='id', limit=PRODUCT_EXPORT_CHUNK_SIZE)
+            if not products:
+                break
+            chunk_counts = products._export_products_to_yonsuite()
+            counts['success'] += chunk_counts['success']
+            counts['error'] += chunk_counts['error']
+            if time.monotonic() >= deadline:
+                remaining = self.search_count([('export_queued', '=', True)])
+                if remaining:
+                    _logger.info("YonSuite product export: time budget exhausted, %d products left", remaining)
+                    self.env.ref('yonsuite_integration.ir_cron_yonsuite_export_products')._trigger()
+                break
+
+        _logger.info("YonSuite product export: %(success)d synced, %(error)d failed", counts)
+        return counts
+
+    def _export_products_to_yonsuite(self):
+        """
+        Push nhiều product lên YonSuite theo từng chunk:
+            - đọc toàn bộ field của chunk bằng 1 query, build payload trong bộ nhớ
+            - gửi song song (mỗi product 1 request) trong giới hạn rate limit của yonsuite.api
+            - ghi trạng thái theo nhóm giá trị, commit sau mỗi chunk (chỉ gọi từ cron chạy nền,
+              không gọi trong request của giao diện)
+
+        Returns:
+            dict: {'success': int, 'error': int}
+        """
+        config_parameter = self.env['ir.config_parameter'].sudo()
+        org_code = config_parameter.get_param('yonsuite_integration.org_code', 'global00')
+        api_service = self.env['yonsuite.api']
+        stored_fields = [name for name, field in self._fields.items() if field.store and field.column_type]
+
+        counts = {'success': 0, 'error': 0}
+        for start in range(0, len(self), PRODUCT_EXPORT_CHUNK_SIZE):
+            chunk = self[start:start + PRODUCT_EXPORT_CHUNK_SIZE]
+            chunk.fetch(stored_fields)
+
+            status = {}
+            payloads = {}
+            for product in chunk:
+                try:
+                    payloads[product.id] = {
+                        "data": [product._prepare_product_data_push_to_yonsuite(org_code)],
+                        "matchRule": "id"
+                    }
+                except Exception as e:
+                    status[product.id] = {'state': 'error', 'sync_error_message': str(e)}
+
+            results = api_service.push_products_concurrently(payloads)
+            now = fields.Datetime.to_string(fields.Datetime.now())
+            for product in chunk:
+                if product.id not in results:
+                    continue
+                result = results[product.id]
+                if isinstance(result, Exception):
+                    status[product.id] = {'state': 'error', 'sync_error_message': str(result)}
+                elif str(result.get("code")) in ("00000", "200"):
+                    vals = {'state': 'synced', 'last_sync_date': now, 'sync_error_message': False}
+                    yonsuite_id = self._extract_pushed_product_id(result)
+                    if yonsuite_id:
+                        if str(yonsuite_id) != product.yonsuite_id:
+                            vals['yonsuite_id'] = str(yonsuite_id)
+                    elif not product.yonsuite_id:
+                        vals['yonsuite_id'] = f'YS_PRODUCT_{product.id}_{int(time.time())}'
+                    status[product.id] = vals
+                else:
+                    status[product.id] = {'state': 'error', 'sync_error_message': result.get("message", "Unknown error")}
+
+            # Product cùng kết quả được ghi bằng 1 lệnh write
+            groups = defaultdict(list)
+            for product_id, vals in status.items():
+                groups[json.dumps(vals, sort_keys=True)].append(product_id)
+            for vals_key, product_ids in groups.items():
+                self.browse(product_ids).write(json.loads(vals_key))
+            # Kết quả và việc rời hàng đợi được commit cùng nhau
+            chunk.filtered('export_queued').write({'export_queued': False})
+
+            chunk_success = sum(1 for vals in status.values() if vals['state'] == 'synced')
+            counts['success'] += chunk_success
+            counts['error'] += len(status) - chunk_success
+            self.env.cr.commit()
+            _logger.info("YonSuite product export: %d/%d processed, %d synced, %d failed (%d writes)",
+                         min(start + PRODUCT_EXPORT_CHUNK_SIZE, len(self)), len(self),
+                         chunk_success, len(status) - chunk_success, len(groups))
+
+        return counts
+
     def action_reset_to_draft(self):
         """
         Reset product to draft state
@@ -1419,49 +1580,29 @@ class YonsuiteProduct(models.Model):
     def _find_yonsuite_unit_from_api_data(self, api_data):
         """
         Find yonsuite_unit based on unit_id or unit_code from API data
+        (looked up in the registry reference cache, no query)
         """
         unit_id = api_data.get("unitId")
         unit_code = api_data.get("unitCode")
-        
+
         if not unit_id and not unit_code:
             return False
-        
-        # First try to find by yonsuite_id (unit_id from API)
-        if unit_id:
-            yonsuite_unit = self.env['yonsuite.unit'].search([
-                ('yonsuite_id', '=', str(unit_id)),
-                ('state', '=', 'synced')
-            ], limit=1)
-            if yonsuite_unit:
-                return yonsuite_unit
-        
-        # If not found by yonsuite_id, try to find by code
-        if unit_code:
-            yonsuite_unit = self.env['yonsuite.unit'].search([
-                ('code', '=', unit_code),
-                ('state', '=', 'synced')
-            ], limit=1)
-            if yonsuite_unit:
-                return yonsuite_unit
-        
-        return False
+
+        yonsuite_unit = self.env['yonsuite.unit']._yonsuite_reference_record(unit_id, unit_code, synced_only=True)
+        return yonsuite_unit or False
 
     def _find_yonsuite_getallorgdept_from_api_data(self, api_data):
         """
         Find yonsuite_getallorgdept based on create_org_id from API data
+        (looked up in the registry reference cache, no query)
         """
         create_org_id = api_data.get("createOrgId")
-        
+
         if not create_org_id:
             return False
-        
-        # Find by yonsuite_id (create_org_id from API)
-        yonsuite_getallorgdept = self.env['yonsuite.getallorgdept'].search([
-            ('yonsuite_id', '=', str(create_org_id)),
-            ('state', '=', 'synced')
-        ], limit=1)
-        
-        return yonsuite_getallorgdept if yonsuite_getallorgdept else False
+
+        yonsuite_getallorgdept = self.env['yonsuite.getallorgdept']._yonsuite_reference_record(create_org_id, synced_only=True)
+        return yonsuite_getallorgdept or False
 
     def _update_product_from_api_data(self, api_data):
         """
@@ -1497,153 +1638,145 @@ class YonsuiteProduct(models.Model):
     @api.model
     def action_import_products_pagination(self):
         """
-        Sync products from YonSuite API with pagination
+        Sync products thay đổi từ YonSuite API: kéo nhiều page trong giới hạn thời gian,
+        commit sau mỗi page (xem yonsuite.sync.mixin)
         """
-        config_parameter = self.env['ir.config_parameter'].sudo()
+        synced_count = self._yonsuite_run_incremental_sync()
+        self._retry_failed_product_details()
+        return synced_count
 
-        # Lấy pageIndex hiện tại từ config
-        current_page = int(config_parameter.get_param('yonsuite_integration.products_current_page', '1'))
-        page_size = 5000
+    @api.model
+    def _retry_failed_product_details(self):
+        """
+        Lấy lại detail cho các product lần trước lỗi detail (chưa có sync_hash).
+        Product cũ không còn trong cửa sổ pubts của lần đồng bộ incremental nên phải thử lại riêng;
+        mỗi lần tối đa PRODUCT_DETAIL_RETRY_LIMIT product, product lỗi lâu nhất được thử trước.
 
-        # Gọi API để lấy dữ liệu products
-        api_service = self.env['yonsuite.api']
-        result = api_service.get_products_from_api(current_page, page_size)
-
-        if result.get("code") == "200":
-            data = result.get("data", {})
-            products_data = data.get("recordList", [])
-
-            if not products_data:
-                # Không có dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.products_current_page', '1')
-                _logger.info("No more products data, reset to page 1")
-                return 0
-
-            # Kiểm tra nếu số lượng records ít hơn page_size thì đã hết dữ liệu
-            if len(products_data) < page_size:
-                _logger.info("Received %d records (less than page_size %d), this is the last page", len(products_data), page_size)
-                # Đánh dấu để reset sau khi xử lý xong
-                should_reset = True
-            else:
-                should_reset = False
+        Returns:
+            int: số product lấy lại detail thành công
+        """
+        products = self.search([
+            ('detail_sync_failed', '=', True),
+            ('sync_hash', '=', False),
+            ('yonsuite_id', '!=', False),
+        ], order='last_sync_date, id', limit=PRODUCT_DETAIL_RETRY_LIMIT)
+        if not products:
+            return 0
+
+        detail_results = self.env['yonsuite.api'].get_product_details_concurrently([
+            (product.yonsuite_id, product.create_org_id or '') for product in products
+        ])
+        now = fields.Datetime.now()
+        recovered_count = 0
+        for product in products:
+            detail_data, detail_error = self._extract_product_detail(detail_results.get(product.yonsuite_id))
+            if detail_error:
+                product.write({'last_sync_date': now, 'sync_error_message': detail_error})
+                continue
+            product._update_product_from_api_data(detail_data)
+            product.detail_sync_failed = False
+            recovered_count += 1
+
+        _logger.info("YonSuite products: retried detail for %d products, %d recovered", len(products), recovered_count)
+        return recovered_count
 
-            # Lấy tất cả yonsuite_id từ API response
-            api_yonsuite_ids = [str(product_data.get("id")) for product_data in products_data]
+    @api.model
+    def _extract_product_detail(self, detail_result):
+        """
+        Returns:
+            tuple: (detail data, False) hoặc ({}, thông báo lỗi)
+        """
+        if isinstance(detail_result, Exception):
+            return {}, str(detail_result)
+        if not detail_result:
+            return {}, 'Empty product detail response'
+        if detail_result.get("code") not in ("00000", "200"):
+            return {}, detail_result.get("message") or 'Unknown error'
+        detail_data_list = detail_result.get("data") or []
+        if not detail_data_list:
+            return {}, 'No detail data returned'
+        # Lấy item đầu tiên từ array
+        return detail_data_list[0], False
 
-            # Search một lần duy nhất tất cả products đã tồn tại
-            existing_products = self.search([('yonsuite_id', 'in', api_yonsuite_ids)])
-            existing_products_dict = {p.yonsuite_id: p for p in existing_products}
+    @api.model
+    def _yonsuite_import_page(self, products_data):
+        """
+        Lưu 1 page products vào database. Chỉ gọi API detail cho product có payload thay đổi.
+        """
+        changed, skipped_count = self._yonsuite_split_changed(products_data)
+        if not changed:
+            return {'created': 0, 'updated': 0, 'skipped': skipped_count}
+
+        # Gọi API lấy chi tiết các products thay đổi song song (có rate limit)
+        detail_results = self.env['yonsuite.api'].get_product_details_concurrently([
+            (str(product_data.get("id")), str(product_data.get("createOrgId")))
+            for product_data, payload_hash, product_id in changed
+        ])
+
+        now = fields.Datetime.now()
+        create_vals_list = []
+        create_orges_data = []
+        for product_data, payload_hash, product_id in changed:
+            yonsuite_id = str(product_data.get("id"))
+
+            # Merge chi tiết product đã lấy về
+            detail_data, detail_error = self._extract_product_detail(detail_results.get(yonsuite_id))
+            if detail_error:
+                _logger.warning("Error getting product detail for ID %s: %s", yonsuite_id, detail_error)
+            else:
+                product_data.update(detail_data)
 
-            # Lưu products vào database
-            synced_count = 0
-            created_count = 0
-            updated_count = 0
-            skipped_count = 0
+            vals = self._prepare_product_data_from_api(product_data)
 
-            for product_data in products_data:
-                yonsuite_id = str(product_data.get("id"))
-                create_org_id = str(product_data.get("createOrgId"))
-                product = existing_products_dict.get(yonsuite_id)
+            # Auto-link yonsuite_unit if available
+            yonsuite_unit = self._find_yonsuite_unit_from_api_data(product_data)
+            if yonsuite_unit:
+                vals['yonsuite_unit_id'] = yonsuite_unit.id
 
-                # Gọi API để lấy chi tiết product
-                try:
-                    detail_result = api_service.get_product_detail_from_api(yonsuite_id, create_org_id)
-                    if detail_result.get("code") == "00000" or detail_result.get("code") == "200":
-                        detail_data_list = detail_result.get("data", [])
-                        if detail_data_list and len(detail_data_list) > 0:
-                            detail_data = detail_data_list[0]  # Lấy item đầu tiên từ array
-                            # Merge detail data với product_data
-                            product_data.update(detail_data)
-                        else:
-                            _logger.warning("No detail data returned for product ID %s", yonsuite_id)
-                    else:
-                        _logger.warning("Failed to get product detail for ID %s: %s", yonsuite_id, detail_result.get("message", "Unknown error"))
-                except Exception as e:
-                    _logger.warning("Error getting product detail for ID %s: %s", yonsuite_id, str(e))
-
-                if not product:
-                    # Handle name from object
-                    name_obj = product_data.get("name", {})
-                    if isinstance(name_obj, dict):
-                        product_name = name_obj.get("simplifiedName") if name_obj else product_data.get("name")
-                    else:
-                        product_name = name_obj or product_data.get("name")
-                    
-                    # Tạo mới product
-                    vals = {
-                        'yonsuite_id': yonsuite_id,
-                        'name': product_name,
-                        'state': 'synced',
-                        'last_sync_date': fields.Datetime.now(),
-                        'sync_error_message': False
-                    }
+            # Auto-link yonsuite_getallorgdept if available
+            yonsuite_getallorgdept = self._find_yonsuite_getallorgdept_from_api_data(product_data)
+            if yonsuite_getallorgdept:
+                vals['yonsuite_getallorgdept_id'] = yonsuite_getallorgdept.id
 
-                    # Thêm dữ liệu từ API
-                    vals.update(self._prepare_product_data_from_api(product_data))
-                    
-                    # Auto-link yonsuite_unit if available
-                    yonsuite_unit = self._find_yonsuite_unit_from_api_data(product_data)
-                    if yonsuite_unit:
-                        vals['yonsuite_unit_id'] = yonsuite_unit.id
-                    
-                    # Auto-link yonsuite_getallorgdept if available
-                    yonsuite_getallorgdept = self._find_yonsuite_getallorgdept_from_api_data(product_data)
-                    if yonsuite_getallorgdept:
-                        vals['yonsuite_getallorgdept_id'] = yonsuite_getallorgdept.id
-
-                    product = self.create(vals)
-                    
-                    # Process productOrges data for new product
-                    product_orges_data = product_data.get("productOrges", [])
-                    if product_orges_data:
-                        product._process_product_orges_data(product.id, product_orges_data)
-                    
-                    created_count += 1
-                else:
-                    # Product đã tồn tại, kiểm tra có cần cập nhật không
-                    # Vì API không trả về modify_time, ta sẽ cập nhật luôn
-                    product._update_product_from_api_data(product_data)
-                    updated_count += 1
-
-                synced_count += 1
-
-            # Cập nhật pageIndex cho lần tiếp theo
-            if should_reset:
-                # Đã hết dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.products_current_page', '1')
-                _logger.info("Page %d (last page): Created %d, Updated %d, Skipped %d, Total %d - Reset to page 1",
-                             current_page, created_count, updated_count, skipped_count, synced_count)
+            if detail_error:
+                # Không lưu sync_hash để lần chạy sau lấy lại detail cho product này
+                vals.update({
+                    'state': 'error',
+                    'last_sync_date': now,
+                    'sync_error_message': detail_error,
+                    'sync_hash': False,
+                    'detail_sync_failed': True,
+                })
             else:
-                # Còn dữ liệu, tăng pageIndex
-                next_page = current_page + 1
-                config_parameter.set_param('yonsuite_integration.products_current_page', str(next_page))
-                _logger.info("Page %d: Created %d, Updated %d, Skipped %d, Total %d - Next page: %d",
-                             current_page, created_count, updated_count, skipped_count, synced_count, next_page)
-
-            # Cập nhật thống kê
-            total_synced = int(config_parameter.get_param('yonsuite_integration.products_total_synced', '0'))
-            config_parameter.set_param('yonsuite_integration.products_total_synced', str(total_synced + synced_count))
-            config_parameter.set_param('yonsuite_integration.products_last_sync', fields.Datetime.now())
-
-            return synced_count
-        else:
-            # Kiểm tra message để xác định có phải là "rỗng" không
-            message = result.get("message", "")
-            message_lower = message.lower()
-            # Check for various empty result indicators
-            empty_indicators = ["rỗng", "empty", "không có", "khong co"]
-            is_empty = any(indicator in message or indicator in message_lower for indicator in empty_indicators)
-
-            if is_empty:
-                # Kết quả truy vấn rỗng, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.products_current_page', '1')
-                _logger.info("Query result is empty (message: '%s'), reset to page 1", message)
-                return 0
+                vals.update({
+                    'state': 'synced',
+                    'last_sync_date': now,
+                    'sync_error_message': False,
+                    'sync_hash': payload_hash,
+                    'detail_sync_failed': False,
+                })
+
+            product_orges_data = product_data.get("productOrges", [])
+            if product_id:
+                self.browse(product_id).write(vals)
+                if product_orges_data:
+                    self._process_product_orges_data(product_id, product_orges_data)
             else:
-                # Lỗi khác
-                error_msg = result.get("message", "Unknown error")
-                _logger.error("Failed to sync products from YonSuite: %s", error_msg)
-                return 0
+                create_vals_list.append(vals)
+                create_orges_data.append(product_orges_data)
+
+        if create_vals_list:
+            products = self.create(create_vals_list)
+            # Process productOrges data for new products
+            for product, product_orges_data in zip(products, create_orges_data):
+                if product_orges_data:
+                    self._process_product_orges_data(product.id, product_orges_data)
+
+        return {
+            'created': len(create_vals_list),
+            'updated': len(changed) - len(create_vals_list),
+            'skipped': skipped_count,
+        }
 
     def _prepare_product_data_from_api(self, api_data):
         """
@@ -1988,6 +2121,11 @@ class YonsuiteProduct(models.Model):
                 'share_description_zh_tw': share_description.get("zh_TW"),
             })
 
+        if api_data.get("pubts"):
+            converted_datetime = self.env['yonsuite.api']._convert_datetime_string(api_data["pubts"])
+            if converted_datetime:
+                vals['pubts'] = converted_datetime
+
         return vals
 
     def _process_product_orges_data(self, product_id, product_orges_data):
@@ -2005,86 +2143,44 @@ class YonsuiteProduct(models.Model):
     def _find_management_class(self, api_data):
         """
         Find management class based on manage_class or manage_class_code
+        (looked up in the registry reference cache, no query)
         """
         manage_class_id = api_data.get("manageClass")
         manage_class_code = api_data.get("manageClassCode")
-        
+
         if not manage_class_id and not manage_class_code:
             return False
-            
-        # Search by yonsuite_id first (most reliable)
-        if manage_class_id:
-            management_class = self.env['yonsuite.management.class'].search([
-                ('yonsuite_id', '=', str(manage_class_id))
-            ], limit=1)
-            if management_class:
-                return management_class
-        
-        # Search by code as fallback
-        if manage_class_code:
-            management_class = self.env['yonsuite.management.class'].search([
-                ('code', '=', manage_class_code)
-            ], limit=1)
-            if management_class:
-                return management_class
-                
-        return False
+
+        # Search by yonsuite_id first (most reliable), fallback by code
+        return self.env['yonsuite.management.class']._yonsuite_reference_record(manage_class_id, manage_class_code) or False
 
     def _find_purchase_class(self, api_data):
         """
         Find purchase class based on purchase_class or purchase_class_code
+        (looked up in the registry reference cache, no query)
         """
         purchase_class_id = api_data.get("purchaseClass")
         purchase_class_code = api_data.get("purchaseClassCode")
-        
+
         if not purchase_class_id and not purchase_class_code:
             return False
-            
-        # Search by yonsuite_id first (most reliable)
-        if purchase_class_id:
-            purchase_class = self.env['yonsuite.purchase.class'].search([
-                ('yonsuite_id', '=', str(purchase_class_id))
-            ], limit=1)
-            if purchase_class:
-                return purchase_class
-        
-        # Search by code as fallback
-        if purchase_class_code:
-            purchase_class = self.env['yonsuite.purchase.class'].search([
-                ('code', '=', purchase_class_code)
-            ], limit=1)
-            if purchase_class:
-                return purchase_class
-                
-        return False
+
+        # Search by yonsuite_id first (most reliable), fallback by code
+        return self.env['yonsuite.purchase.class']._yonsuite_reference_record(purchase_class_id, purchase_class_code) or False
 
     def _find_sale_class(self, api_data):
         """
         Find sale class based on sale_product_class or sale_product_class_code
+        (looked up in the registry reference cache, no query)
         """
         sale_class_id = api_data.get("saleProductClass")
         sale_class_code = api_data.get("saleProductClassCode")
-        
+
         if not sale_class_id and not sale_class_code:
             return False
-            
-        # Search by yonsuite_id first (most reliable)
-        if sale_class_id:
-            sale_class = self.env['yonsuite.sale.class'].search([
-                ('yonsuite_id', '=', str(sale_class_id))
-            ], limit=1)
-            if sale_class:
-                return sale_class
-        
-        # Search by code as fallback
-        if sale_class_code:
-            sale_class = self.env['yonsuite.sale.class'].search([
-                ('code', '=', sale_class_code)
-            ], limit=1)
-            if sale_class:
-                return sale_class
-                
-        return False
+
+        # Search by yonsuite_id first (most reliable), fallback by code
+        return self.env['yonsuite.sale.class']._yonsuite_reference_record(sale_class_id, sale_class_code) or False
 
     @api.onchange('yonsuite_management_class_id')
     def _onchange_yonsuite_management_class_id(self):
@@ -2128,15 +2224,20 @@ class YonsuiteProduct(models.Model):
             self.sale_product_class_code = False
             self.sale_product_class_name = False
 
-    def _prepare_product_data_push_to_yonsuite(self):
+    def _prepare_product_data_push_to_yonsuite(self, org_code=None):
         """
         Prepare product data for pushing to YonSuite API (New Format)
+
+        Args:
+            org_code (str): organization code; read from config when not given
+                (bulk export reads it once for the whole recordset)
         """
         self.ensure_one()
         
         # Get organization info from config or default values
-        config_parameter = self.env['ir.config_parameter'].sudo()
-        org_code = config_parameter.get_param('yonsuite_integration.org_code', 'global00')
+        if org_code is None:
+            config_parameter = self.env['ir.config_parameter'].sudo()
+            org_code = config_parameter.get_param('yonsuite_integration.org_code', 'global00')
         
         # Prepare the product data structure according to new YonSuite API format
         # Only include fields that actually exist in the model
@@ -2222,22 +2323,24 @@ class YonsuiteProduct(models.Model):
             "weight": getattr(self, 'weight', 0) or 0,
             "weightUnit___code": getattr(self, 'weight_unit_code', "kg") or "kg",
             "width": getattr(self, 'width', 0) or 0,
-            "productOrgs": self._prepare_product_orgs_data(),
+            "productOrgs": self._prepare_product_orgs_data(org_code),
             "productAssistUnitExchanges": self._prepare_product_assist_unit_exchanges_data(),
             "productTags": self._prepare_product_tags_data(),
             "productAssistClasses": self._prepare_product_assist_classes_data(),
             "productBarCodes": self._prepare_product_bar_codes_data(),
-            "detail": self._prepare_product_detail_data()
+            "detail": self._prepare_product_detail_data(org_code)
         }
         
         return product_data
 
-    def _prepare_product_orgs_data(self):
+    def _prepare_product_orgs_data(self, org_code=None):
         """
         Prepare productOrgs data for API
         """
+        if org_code is None:
+            org_code = self.env['ir.config_parameter'].sudo().get_param('yonsuite_integration.org_code', 'global00')
         return [{
-            "orgId___code": self.env['ir.config_parameter'].sudo().get_param('yonsuite_integration.org_code', 'global00'),
+            "orgId___code": org_code,
             "rangeType": 1
         }]
 
@@ -2277,10 +2380,12 @@ class YonsuiteProduct(models.Model):
             "barCode": self.code or f"BC_{self.id}"
         }]
 
-    def _prepare_product_detail_data(self):
+    def _prepare_product_detail_data(self, org_code=None):
         """
         Prepare detail data for API
         """
+        if org_code is None:
+            org_code = self.env['ir.config_parameter'].sudo().get_param('yonsuite_integration.org_code', 'global00')
         return {
             "stopstatus": getattr(self, 'stop_status', False) or False,
             "accountingByItem": False,
@@ -2434,7 +2539,7 @@ class YonsuiteProduct(models.Model):
             "onlineUnit___code": self.unit_code or "KGM",
             "onlyOrder": True,
             "orderAdvanceTime": 0,
-            "orgId___code": self.env['ir.config_parameter'].sudo().get_param('yonsuite_integration.org_code', 'global00'),
+            "orgId___code": org_code,
             "outStoreExcessLimit": 1,
             "outStoreLessLimit": 1,
             "outTaxrate___code": getattr(self, 'out_taxrate_code', "VATR6") or "VATR6",
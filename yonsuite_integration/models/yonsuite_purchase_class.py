@@ -9,7 +9,7 @@ _logger = logging.getLogger(__name__)
 
 class YonsuitePurchaseClass(models.Model):
     _name = 'yonsuite.purchase.class'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.reference.mixin']
     _description = 'YonSuite Purchase Class'
     _order = 'create_date desc'
 
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import uuid
+
+from odoo import models, api, tools
+
+_logger = logging.getLogger(__name__)
+
+# Thay đổi các field này mới làm map tra cứu thay đổi
+REFERENCE_FIELDS = ('yonsuite_id', 'code', 'name', 'state')
+# Key trong cr.precommit.data (bị xóa khi commit / rollback):
+#   - model đã ghi danh mục trong transaction hiện tại
+#   - generation đã đọc trong transaction hiện tại
+REFERENCE_PENDING_KEY = 'yonsuite.reference.pending'
+REFERENCE_GENERATION_KEY = 'yonsuite.reference.generation'
+
+
+class YonsuiteReferenceMixin(models.AbstractModel):
+    """
+    Cache tra cứu danh mục YonSuite (unit, class, orgunit, partner, warehouse, ...)
+    trong registry: map yonsuite_id / code -> (id, name), load bằng 1 query cho mỗi model.
+
+    Key cache gồm generation của model thay vì xóa toàn bộ ormcache của registry:
+        - generation chung lưu trong ir_config_parameter, được đổi 1 lần ngay trước commit
+          của transaction có create / unlink / write field tra cứu (import commit theo page
+          nên mỗi page đổi 1 lần)
+        - generation được đọc 1 lần mỗi transaction, cùng snapshot với query load map, nên map
+          trong cache luôn khớp với generation của nó
+        - transaction đã ghi model thì không dùng cache của model đó tới khi commit: lookup query
+          trực tiếp theo yonsuite_id / code, không load lại cả map sau mỗi lần ghi
+    """
+    _name = 'yonsuite.reference.mixin'
+    _description = 'YonSuite Reference Lookup Cache'
+
+    @api.model
+    def _load_yonsuite_reference_maps(self, synced_only=False):
+        """
+        Returns:
+            dict: {'yonsuite_id': {yonsuite_id: (id, name)}, 'code': {code: (id, name)}}
+        """
+        domain = [('state', '=', 'synced')] if synced_only else []
+        # Giữ thứ tự mặc định của model để trùng kết quả với search(limit=1)
+        records = self.sudo().search_read(domain, ['yonsuite_id', 'code', 'name'])
+        maps = {'yonsuite_id': {}, 'code': {}}
+        for record in records:
+            if record['yonsuite_id']:
+                maps['yonsuite_id'].setdefault(record['yonsuite_id'], (record['id'], record['name']))
+            if record['code']:
+                maps['code'].setdefault(record['code'], (record['id'], record['name']))
+        _logger.info("Loaded %s reference map: %d records", self._name, len(records))
+        return maps
+
+    @tools.ormcache('self._get_yonsuite_reference_generation()', 'synced_only')
+    def _get_yonsuite_reference_maps_cached(self, synced_only=False):
+        return self._load_yonsuite_reference_maps(synced_only)
+
+    @api.model
+    def _get_yonsuite_reference_maps(self, synced_only=False):
+        """
+        Map tra cứu của model: từ cache, hoặc load mới (không cache) nếu transaction đã ghi model
+        """
+        if self._yonsuite_reference_pending():
+            return self._load_yonsuite_reference_maps(synced_only)
+        return self._get_yonsuite_reference_maps_cached(synced_only)
+
+    @api.model
+    def _yonsuite_reference_pending(self):
+        return self._name in self.env.cr.precommit.data.get(REFERENCE_PENDING_KEY, ())
+
+    @api.model
+    def _yonsuite_reference_generation_param(self):
+        return 'yonsuite_integration.reference_generation.%s' % self._name
+
+    @api.model
+    def _get_yonsuite_reference_generation(self):
+        """
+        Generation hiện tại của map tra cứu (nằm trong key ormcache), đọc 1 lần mỗi transaction
+        """
+        generations = self.env.cr.precommit.data.setdefault(REFERENCE_GENERATION_KEY, {})
+        if self._name not in generations:
+            self.env.cr.execute(
+                "SELECT value FROM ir_config_parameter WHERE key = %s",
+                [self._yonsuite_reference_generation_param()],
+            )
+            row = self.env.cr.fetchone()
+            generations[self._name] = row[0] if row else ''
+        return generations[self._name]
+
+    def _yonsuite_invalidate_reference_maps(self):
+        """
+        Đánh dấu map tra cứu của model đã thay đổi trong transaction hiện tại.
+        Generation chung chỉ được ghi 1 lần ngay trước commit cho tất cả model đã đánh dấu.
+        """
+        cr = self.env.cr
+        pending = cr.precommit.data.setdefault(REFERENCE_PENDING_KEY, set())
+        if self._name in pending:
+            return
+        if not pending:
+            uid = self.env.uid
+
+            @cr.precommit.add
+            def _publish_reference_generations():
+                for model_name in cr.precommit.data.get(REFERENCE_PENDING_KEY, ()):
+                    # Token ngẫu nhiên (không phải bộ đếm) để transaction bị rollback không tái sử dụng được
+                    cr.execute("""
+                        INSERT INTO ir_config_parameter (key, value, create_uid, create_date, write_uid, write_date)
+                        VALUES (%s, %s, %s, now() at time zone 'UTC', %s, now() at time zone 'UTC')
+                        ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, write_uid = EXCLUDED.write_uid,
+                            write_date = EXCLUDED.write_date
+                    """, ['yonsuite_integration.reference_generation.%s' % model_name, uuid.uuid4().hex, uid, uid])
+        pending.add(self._name)
+
+    @api.model
+    def _yonsuite_reference_lookup(self, yonsuite_id=None, code=None, synced_only=False):
+        """
+        Tìm record theo yonsuite_id, fallback theo code
+
+        Returns:
+            tuple: (id, name) hoặc False nếu không tìm thấy
+        """
+        if self._yonsuite_reference_pending():
+            return self._yonsuite_reference_search(yonsuite_id, code, synced_only)
+        maps = self._get_yonsuite_reference_maps_cached(synced_only)
+        if yonsuite_id:
+            reference = maps['yonsuite_id'].get(str(yonsuite_id))
+            if reference:
+                return reference
+        if code:
+            reference = maps['code'].get(code)
+            if reference:
+                return reference
+        return False
+
+    @api.model
+    def _yonsuite_reference_search(self, yonsuite_id=None, code=None, synced_only=False):
+        """
+        Như _yonsuite_reference_lookup nhưng query trực tiếp (dùng khi transaction đã ghi model)
+        """
+        domain = [('state', '=', 'synced')] if synced_only else []
+        for field_name, value in (('yonsuite_id', yonsuite_id and str(yonsuite_id)), ('code', code)):
+            if not value:
+                continue
+            records = self.sudo().search_read(domain + [(field_name, '=', value)], ['name'], limit=1)
+            if records:
+                return records[0]['id'], records[0]['name']
+        return False
+
+    @api.model
+    def _yonsuite_reference_record(self, yonsuite_id=None, code=None, synced_only=False):
+        """
+        Như _yonsuite_reference_lookup nhưng trả về recordset (rỗng nếu không tìm thấy)
+        """
+        reference = self._yonsuite_reference_lookup(yonsuite_id, code, synced_only)
+        return self.browse(reference[0]) if reference else self.browse()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self._yonsuite_invalidate_reference_maps()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(field in vals for field in REFERENCE_FIELDS):
+            self._yonsuite_invalidate_reference_maps()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self._yonsuite_invalidate_reference_maps()
+        return res
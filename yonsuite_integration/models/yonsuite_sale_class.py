@@ -9,7 +9,7 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteSaleClass(models.Model):
     _name = 'yonsuite.sale.class'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.reference.mixin']
     _description = 'YonSuite Sale Class'
     _order = 'create_date desc'
 
@@ -11,7 +11,7 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteSalearea(models.Model):
     _name = 'yonsuite.salearea'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.reference.mixin']
     _description = 'YonSuite Sale Area'
     _order = 'create_date desc'
 
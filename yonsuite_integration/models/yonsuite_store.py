@@ -11,10 +11,13 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteStore(models.Model):
     _name = 'yonsuite.store'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.sync.mixin']
     _description = 'YonSuite Store'
     _order = 'create_date desc'
 
+    _yonsuite_sync_entity = 'stores'
+    _yonsuite_sync_api_method = 'get_stores_from_api'
+
     # Thông tin cơ bản
     yonsuite_id = fields.Char(
         string='YonSuite ID',
@@ -451,121 +454,50 @@ class YonsuiteStore(models.Model):
     @api.model
     def action_import_stores_pagination(self):
         """
-        Sync stores từ YonSuite API với phân trang và lưu vào database
+        Sync stores thay đổi từ YonSuite API: kéo nhiều page trong giới hạn thời gian,
+        commit sau mỗi page (xem yonsuite.sync.mixin)
         """
-        config_parameter = self.env['ir.config_parameter'].sudo()
-
-        # Lấy pageIndex hiện tại từ config
-        current_page = int(config_parameter.get_param('yonsuite_integration.stores_current_page', '1'))
-        page_size = 5000
+        return self._yonsuite_run_incremental_sync()
 
-        # Gọi API để lấy dữ liệu stores
-        api_service = self.env['yonsuite.api']
-        result = api_service.get_stores_from_api(current_page, page_size)
+    @api.model
+    def _yonsuite_import_page(self, stores_data):
+        """
+        Lưu 1 page stores vào database, bỏ qua store có payload không thay đổi
+        """
+        changed, skipped_count = self._yonsuite_split_changed(stores_data)
 
-        if result.get("code") == 200:
-            stores_data = result.get("data", {}).get("recordList", [])
-
-            if not stores_data:
-                # Không có dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.stores_current_page', '1')
-                _logger.info("No more stores data, reset to page 1")
-                return 0
-
-            # Kiểm tra nếu số lượng records ít hơn page_size thì đã hết dữ liệu
-            if len(stores_data) < page_size:
-                _logger.info("Received %d records (less than page_size %d), this is the last page", len(stores_data), page_size)
-                # Đánh dấu để reset sau khi xử lý xong
-                should_reset = True
-            else:
-                should_reset = False
-            # Lấy tất cả yonsuite_id từ API response
-            api_yonsuite_ids = [str(store_data.get("id")) for store_data in stores_data]
-
-            # Search một lần duy nhất tất cả stores đã tồn tại
-            existing_stores = self.search([('yonsuite_id', 'in', api_yonsuite_ids)])
-            existing_stores_dict = {p.yonsuite_id: p for p in existing_stores}
-
-            # Lưu stores vào database
-            synced_count = 0
-            created_count = 0
-            updated_count = 0
-            skipped_count = 0
-
-            for store_data in stores_data:
-                yonsuite_id = str(store_data.get("id"))
-                store = existing_stores_dict.get(yonsuite_id)
-
-                if not store:
-                    # Tạo store mới với đầy đủ dữ liệu
-                    vals = {
-                        'yonsuite_id': yonsuite_id,
-                        'name': store_data.get("name") or store_data.get("code"),
-                        'state': 'synced',
-                        'last_sync_date': fields.Datetime.now(),
-                        'sync_error_message': False
-                    }
-
-                    # Thêm dữ liệu từ API list
-                    vals.update(self._prepare_store_data_from_api(store_data))
-
-                    # Gọi API detail để lấy thông tin đầy đủ
-                    detail_data = self._get_store_detail_from_api(yonsuite_id)
-                    if detail_data:
-                        vals.update(self._prepare_store_data_from_detail_api(detail_data))
-
-                    store = self.create(vals)
-                    created_count += 1
-                else:
-                    # Kiểm tra modify_time có thay đổi không
-                    api_service = self.env['yonsuite.api']
-                    api_modify_time = api_service._convert_datetime_string(store_data.get("modifyTime"))
-
-                    if api_modify_time and store.modify_time != api_modify_time:
-                        store._update_store_from_api_data(store_data)
-                        updated_count += 1
-                    else:
-                        skipped_count += 1
-
-                synced_count += 1
-
-            # Cập nhật pageIndex cho lần tiếp theo
-            if should_reset:
-                # Đã hết dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.stores_current_page', '1')
-                _logger.info("Page %d (last page): Created %d, Updated %d, Skipped %d, Total %d - Reset to page 1",
-                                current_page, created_count, updated_count, skipped_count, synced_count)
-            else:
-                # Còn dữ liệu, tăng pageIndex
-                next_page = current_page + 1
-                config_parameter.set_param('yonsuite_integration.stores_current_page', str(next_page))
-                _logger.info("Page %d: Created %d, Updated %d, Skipped %d, Total %d - Next page: %d",
-                                current_page, created_count, updated_count, skipped_count, synced_count, next_page)
-
-            # Cập nhật thống kê
-            total_synced = int(config_parameter.get_param('yonsuite_integration.stores_total_synced', '0'))
-            config_parameter.set_param('yonsuite_integration.stores_total_synced', str(total_synced + synced_count))
-            config_parameter.set_param('yonsuite_integration.stores_last_sync', fields.Datetime.now())
-
-            return synced_count
-        else:
-            # Kiểm tra message để xác định có phải là "rỗng" không
-            message = result.get("message", "")
-            message_lower = message.lower()
-            # Check for various empty result indicators
-            empty_indicators = ["rỗng", "empty", "không có", "khong co"]
-            is_empty = any(indicator in message or indicator in message_lower for indicator in empty_indicators)
-
-            if is_empty:
-                # Kết quả truy vấn rỗng, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.stores_current_page', '1')
-                _logger.info("Query result is empty (message: '%s'), reset to page 1", message)
-                return 0
+        now = fields.Datetime.now()
+        create_vals_list = []
+        for store_data, payload_hash, store_id in changed:
+            yonsuite_id = str(store_data.get("id"))
+            vals = {
+                'name': store_data.get("name") or store_data.get("code"),
+            }
+            vals.update(self._prepare_store_data_from_api(store_data))
+            vals.update({
+                'state': 'synced',
+                'last_sync_date': now,
+                'sync_error_message': False,
+                'sync_hash': payload_hash,
+            })
+            if store_id:
+                self.browse(store_id).write(vals)
             else:
-                # Lỗi khác
-                error_msg = result.get("message", "Unknown error")
-                _logger.error("Failed to sync stores from YonSuite: %s", error_msg)
-                return 0
+                vals['yonsuite_id'] = yonsuite_id
+                # Gọi API detail để lấy thông tin đầy đủ cho store mới
+                detail_data = self._get_store_detail_from_api(yonsuite_id)
+                if detail_data:
+                    vals.update(self._prepare_store_data_from_detail_api(detail_data))
+                create_vals_list.append(vals)
+
+        if create_vals_list:
+            self.create(create_vals_list)
+
+        return {
+            'created': len(create_vals_list),
+            'updated': len(changed) - len(create_vals_list),
+            'skipped': skipped_count,
+        }
 
     def _prepare_store_data_from_api(self, api_data):
         """
@@ -595,11 +527,11 @@ class YonsuiteStore(models.Model):
         # Tự động tìm org_id dựa vào org từ API
         org_from_api = api_data.get("org")
         if org_from_api:
-            # Tìm yonsuite.orgunit có yonsuite_id = org_from_api và đã synced
-            orgunit = self.env['yonsuite.orgunit'].search([('yonsuite_id', '=', org_from_api), ('state', '=', 'synced')], limit=1)
+            # Tìm yonsuite.orgunit có yonsuite_id = org_from_api và đã synced (cache danh mục, không query)
+            orgunit = self.env['yonsuite.orgunit']._yonsuite_reference_lookup(org_from_api, synced_only=True)
             if orgunit:
-                vals['org_id'] = orgunit.id
-                vals['org_name'] = orgunit.name  # Tự động điền org_name
+                vals['org_id'] = orgunit[0]
+                vals['org_name'] = orgunit[1]  # Tự động điền org_name
             else:
                 # Nếu không tìm thấy orgunit đã synced, để trống org_id
                 vals['org_id'] = False
@@ -609,11 +541,11 @@ class YonsuiteStore(models.Model):
         # Tự động tìm cust_id dựa vào cust từ API
         cust_from_api = api_data.get("cust")
         if cust_from_api:
-            # Tìm yonsuite.partner có yonsuite_id = cust_from_api và đã synced
-            partner = self.env['yonsuite.partner'].search([('yonsuite_id', '=', cust_from_api), ('state', '=', 'synced')], limit=1)
+            # Tìm yonsuite.partner có yonsuite_id = cust_from_api và đã synced (cache danh mục, không query)
+            partner = self.env['yonsuite.partner']._yonsuite_reference_lookup(cust_from_api, synced_only=True)
             if partner:
-                vals['cust_id'] = partner.id
-                vals['cust_name'] = partner.name  # Tự động điền cust_name
+                vals['cust_id'] = partner[0]
+                vals['cust_name'] = partner[1]  # Tự động điền cust_name
             else:
                 # Nếu không tìm thấy partner đã synced, để trống cust_id
                 vals['cust_id'] = False
@@ -623,11 +555,11 @@ class YonsuiteStore(models.Model):
         # Tự động tìm warehouse_id dựa vào warehouse từ API
         warehouse_from_api = api_data.get("warehouse")
         if warehouse_from_api:
-            # Tìm yonsuite.warehouse có yonsuite_id = warehouse_from_api và đã synced
-            warehouse = self.env['yonsuite.warehouse'].search([('yonsuite_id', '=', warehouse_from_api), ('state', '=', 'synced')], limit=1)
+            # Tìm yonsuite.warehouse có yonsuite_id = warehouse_from_api và đã synced (cache danh mục, không query)
+            warehouse = self.env['yonsuite.warehouse']._yonsuite_reference_lookup(warehouse_from_api, synced_only=True)
             if warehouse:
-                vals['warehouse_id'] = warehouse.id
-                vals['warehouse_name'] = warehouse.name  # Tự động điền warehouse_name
+                vals['warehouse_id'] = warehouse[0]
+                vals['warehouse_name'] = warehouse[1]  # Tự động điền warehouse_name
             else:
                 # Nếu không tìm thấy warehouse đã synced, để trống warehouse_id
                 vals['warehouse_id'] = False
@@ -637,11 +569,11 @@ class YonsuiteStore(models.Model):
         # Tự động tìm area_class_id dựa vào areaClass từ API
         area_class_from_api = api_data.get("areaClass")
         if area_class_from_api:
-            # Tìm yonsuite.salearea có yonsuite_id = area_class_from_api và đã synced
-            salearea = self.env['yonsuite.salearea'].search([('yonsuite_id', '=', area_class_from_api), ('state', '=', 'synced')], limit=1)
+            # Tìm yonsuite.salearea có yonsuite_id = area_class_from_api và đã synced (cache danh mục, không query)
+            salearea = self.env['yonsuite.salearea']._yonsuite_reference_lookup(area_class_from_api, synced_only=True)
             if salearea:
-                vals['area_class_id'] = salearea.id
-                vals['area_class_name'] = salearea.name  # Tự động điền area_class_name
+                vals['area_class_id'] = salearea[0]
+                vals['area_class_name'] = salearea[1]  # Tự động điền area_class_name
             else:
                 # Nếu không tìm thấy salearea đã synced, để trống area_class_id
                 vals['area_class_id'] = False
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Thời gian tối đa (giây) mỗi lần cron được kéo page liên tục
+DEFAULT_SYNC_TIME_BUDGET = 600
+# Lùi watermark 1 khoảng để không sót record sửa trong lúc đang đồng bộ / lệch giờ
+SYNC_WATERMARK_OVERLAP = timedelta(minutes=10)
+EMPTY_RESULT_INDICATORS = ["rỗng", "empty", "không có", "khong co"]
+
+
+class YonsuiteSyncMixin(models.AbstractModel):
+    """
+    Engine đồng bộ incremental cho các model yonsuite.*:
+        - Lọc list API theo pubts >= watermark (watermark riêng cho từng entity)
+        - Kéo liên tục nhiều page trong giới hạn thời gian, commit sau mỗi page
+        - Bỏ qua record không đổi nhờ fingerprint (sync_hash) của payload API
+
+    Model kế thừa cần khai báo _yonsuite_sync_entity, _yonsuite_sync_api_method
+    và cài đặt hook lưu 1 page dữ liệu API:
+
+        @api.model
+        def _yonsuite_import_page(self, records):
+            ...
+            return {'created': int, 'updated': int, 'skipped': int}
+    """
+    _name = 'yonsuite.sync.mixin'
+    _inherit = 'yonsuite.fingerprint.mixin'
+    _description = 'YonSuite Incremental Sync Mixin'
+
+    # Tiền tố config parameter: yonsuite_integration.<entity>_current_page, ...
+    _yonsuite_sync_entity = None
+    # Tên method list trên yonsuite.api, nhận (page_index, page_size, filters=None)
+    _yonsuite_sync_api_method = None
+    # Field pubts trên API dùng để lọc; None nếu endpoint không hỗ trợ
+    _yonsuite_sync_api_pubts_field = 'pubts'
+    _yonsuite_sync_page_size = 5000
+
+    @api.model
+    def _get_yonsuite_sync_time_budget(self):
+        config_parameter = self.env['ir.config_parameter'].sudo()
+        return max(0, int(config_parameter.get_param(
+            'yonsuite_integration.sync_time_budget', DEFAULT_SYNC_TIME_BUDGET)))
+
+    @api.model
+    def _yonsuite_extract_records(self, result):
+        """
+        Lấy danh sách record từ response list API
+        """
+        data = result.get("data") or {}
+        if isinstance(data, list):
+            return data
+        return data.get("recordList") or []
+
+    @api.model
+    def _yonsuite_is_success(self, result):
+        return str(result.get("code")) in ("200", "00000")
+
+    @api.model
+    def _yonsuite_is_empty_result(self, result):
+        message = result.get("message") or ""
+        message_lower = message.lower()
+        return any(indicator in message or indicator in message_lower for indicator in EMPTY_RESULT_INDICATORS)
+
+    @api.model
+    def _yonsuite_get_new_watermark(self):
+        """
+        Watermark cho chu kỳ mới: pubts lớn nhất đã lưu trừ đi khoảng overlap.
+        Lấy từ DB lúc bắt đầu chu kỳ nên record sửa trong lúc đang đồng bộ sẽ được kéo lại ở chu kỳ sau.
+        """
+        if not self._yonsuite_sync_api_pubts_field or 'pubts' not in self._fields:
+            return False
+        latest = self.search([('pubts', '!=', False)], order='pubts desc', limit=1)
+        if not latest:
+            return False
+        return fields.Datetime.to_string(latest.pubts - SYNC_WATERMARK_OVERLAP)
+
+    @api.model
+    def _yonsuite_sync_filters(self, watermark):
+        """
+        Điều kiện lọc thêm vào body của list API
+        """
+        if not watermark or not self._yonsuite_sync_api_pubts_field:
+            return {}
+        return {
+            'simpleVOs': [{
+                'field': self._yonsuite_sync_api_pubts_field,
+                'op': 'egt',
+                'value1': watermark,
+            }]
+        }
+
+    @api.model
+    def _yonsuite_split_changed(self, records):
+        """
+        Lọc các record của page có payload thay đổi so với lần đồng bộ trước.
+        Record trùng id trong cùng page chỉ giữ lần xuất hiện cuối.
+
+        Returns:
+            tuple: ([(api_data, payload_hash, existing_id hoặc False), ...], skipped_count)
+        """
+        records_by_id = {str(record.get("id")): record for record in records}
+        existing_map = {
+            row['yonsuite_id']: row
+            for row in self.search_read([('yonsuite_id', 'in', list(records_by_id))], ['yonsuite_id', 'sync_hash'])
+        }
+        changed = []
+        skipped_count = 0
+        for yonsuite_id, record in records_by_id.items():
+            payload_hash = self._yonsuite_payload_hash(record)
+            existing = existing_map.get(yonsuite_id)
+            if existing and existing['sync_hash'] == payload_hash:
+                skipped_count += 1
+                continue
+            changed.append((record, payload_hash, existing and existing['id']))
+        return changed, skipped_count
+
+    @api.model
+    def _yonsuite_run_incremental_sync(self):
+        """
+        Kéo liên tục các page thay đổi từ YonSuite cho tới khi hết dữ liệu
+        hoặc hết thời gian cho phép; commit sau mỗi page để lần chạy sau tiếp tục
+        từ page kế tiếp.
+
+        Returns:
+            int: số record đã xử lý
+        """
+        entity = self._yonsuite_sync_entity
+        config_parameter = self.env['ir.config_parameter'].sudo()
+        param_prefix = 'yonsuite_integration.%s' % entity
+        api_method = getattr(self.env['yonsuite.api'], self._yonsuite_sync_api_method)
+        page_size = self._yonsuite_sync_page_size
+        deadline = time.monotonic() + self._get_yonsuite_sync_time_budget()
+
+        current_page = int(config_parameter.get_param('%s_current_page' % param_prefix, '1'))
+        if current_page <= 1:
+            # Bắt đầu chu kỳ mới: chốt watermark cho toàn bộ các page của chu kỳ
+            current_page = 1
+            watermark = self._yonsuite_get_new_watermark()
+            config_parameter.set_param('%s_watermark' % param_prefix, watermark or '')
+        else:
+            watermark = config_parameter.get_param('%s_watermark' % param_prefix) or False
+        filters = self._yonsuite_sync_filters(watermark)
+
+        synced_count = 0
+        while True:
+            result = api_method(current_page, page_size, filters=filters)
+
+            if not self._yonsuite_is_success(result):
+                if self._yonsuite_is_empty_result(result):
+                    _logger.info("YonSuite %s: query result is empty (message: '%s'), cycle finished",
+                                 entity, result.get("message"))
+                    config_parameter.set_param('%s_current_page' % param_prefix, '1')
+                else:
+                    _logger.error("Failed to sync %s from YonSuite: %s", entity, result.get("message", "Unknown error"))
+                break
+
+            records = self._yonsuite_extract_records(result)
+            counts = self._yonsuite_import_page(records) if records else {}
+            page_count = len(records)
+            synced_count += page_count
+
+            is_last_page = page_count < page_size
+            next_page = 1 if is_last_page else current_page + 1
+            config_parameter.set_param('%s_current_page' % param_prefix, str(next_page))
+            total_synced = int(config_parameter.get_param('%s_total_synced' % param_prefix, '0'))
+            config_parameter.set_param('%s_total_synced' % param_prefix, str(total_synced + page_count))
+            config_parameter.set_param('%s_last_sync' % param_prefix, fields.Datetime.now())
+            self.env.cr.commit()
+
+            _logger.info("YonSuite %s page %d (since %s): Created %d, Updated %d, Skipped %d, Total %d%s",
+                         entity, current_page, watermark or '-', counts.get('created', 0), counts.get('updated', 0),
+                         counts.get('skipped', 0), page_count, " - cycle finished" if is_last_page else "")
+
+            if is_last_page:
+                break
+            current_page = next_page
+            if time.monotonic() >= deadline:
+                _logger.info("YonSuite %s: time budget exhausted, resume from page %d next run", entity, current_page)
+                break
+
+        return synced_count
@@ -11,7 +11,7 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteUnit(models.Model):
     _name = 'yonsuite.unit'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.reference.mixin']
     _description = 'YonSuite Unit'
     _order = 'create_date desc'
 
@@ -11,10 +11,13 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteVendor(models.Model):
     _name = 'yonsuite.vendor'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.sync.mixin']
     _description = 'YonSuite Vendor'
     _order = 'create_date desc'
 
+    _yonsuite_sync_entity = 'vendors'
+    _yonsuite_sync_api_method = 'get_vendors_from_api'
+
     # Thông tin cơ bản
     yonsuite_id = fields.Char(
         string='YonSuite ID',
@@ -332,119 +335,41 @@ class YonsuiteVendor(models.Model):
     @api.model
     def action_import_vendors_pagination(self):
         """
-        Sync vendors từ YonSuite API với phân trang và lưu vào database
+        Sync vendors thay đổi từ YonSuite API: kéo nhiều page trong giới hạn thời gian,
+        commit sau mỗi page (xem yonsuite.sync.mixin)
         """
-        config_parameter = self.env['ir.config_parameter'].sudo()
-
-        # Lấy pageIndex hiện tại từ config
-        current_page = int(config_parameter.get_param('yonsuite_integration.vendors_current_page', '1'))
-        page_size = 5000
-
-        # Gọi API để lấy dữ liệu vendors
-        api_service = self.env['yonsuite.api']
-        result = api_service.get_vendors_from_api(current_page, page_size)
+        return self._yonsuite_run_incremental_sync()
 
-        if result.get("code") == "200":
-            data = result.get("data", {})
-            vendors_data = data.get("recordList", [])
+    @api.model
+    def _yonsuite_import_page(self, vendors_data):
+        """
+        Lưu 1 page vendors vào database, bỏ qua vendor có payload không thay đổi
+        """
+        changed, skipped_count = self._yonsuite_split_changed(vendors_data)
 
-            if not vendors_data:
-                # Không có dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.vendors_current_page', '1')
-                _logger.info("No more vendors data, reset to page 1")
-                return 0
-
-            # Kiểm tra nếu số lượng records ít hơn page_size thì đã hết dữ liệu
-            if len(vendors_data) < page_size:
-                _logger.info("Received %d records (less than page_size %d), this is the last page", len(vendors_data), page_size)
-                # Đánh dấu để reset sau khi xử lý xong
-                should_reset = True
+        now = fields.Datetime.now()
+        create_vals_list = []
+        for vendor_data, payload_hash, vendor_id in changed:
+            vals = self._prepare_vendor_data_from_api(vendor_data)
+            vals.update({
+                'state': 'synced',
+                'last_sync_date': now,
+                'sync_error_message': False,
+                'sync_hash': payload_hash,
+            })
+            if vendor_id:
+                self.browse(vendor_id).write(vals)
             else:
-                should_reset = False
-
-            # Lấy tất cả yonsuite_id từ API response
-            api_yonsuite_ids = [str(vendor_data.get("id")) for vendor_data in vendors_data]
-
-            # Search một lần duy nhất tất cả vendors đã tồn tại
-            existing_vendors = self.search([('yonsuite_id', 'in', api_yonsuite_ids)])
-            existing_vendors_dict = {v.yonsuite_id: v for v in existing_vendors}
+                create_vals_list.append(vals)
 
-            # Lưu vendors vào database
-            synced_count = 0
-            created_count = 0
-            updated_count = 0
-            skipped_count = 0
-
-            for vendor_data in vendors_data:
-                yonsuite_id = str(vendor_data.get("id"))
-                vendor = existing_vendors_dict.get(yonsuite_id)
-
-                if not vendor:
-                    # Tạo vendor mới với đầy đủ dữ liệu
-                    vals = {
-                        'yonsuite_id': yonsuite_id,
-                        'name': vendor_data.get("name"),
-                        'state': 'synced',
-                        'last_sync_date': fields.Datetime.now(),
-                        'sync_error_message': False
-                    }
+        if create_vals_list:
+            self.create(create_vals_list)
 
-                    # Thêm dữ liệu từ API
-                    vals.update(self._prepare_vendor_data_from_api(vendor_data))
-
-                    vendor = self.create(vals)
-                    created_count += 1
-                else:
-                    # Kiểm tra modify_time có thay đổi không
-                    vendor_extends = vendor_data.get("vendorextends", {})
-                    api_service = self.env['yonsuite.api']
-                    api_modify_time = api_service._convert_datetime_string(vendor_extends.get("modifyTime"))
-
-                    if api_modify_time and vendor.vendor_extends_modify_time != api_modify_time:
-                        vendor._update_vendor_from_api_data(vendor_data)
-                        updated_count += 1
-                    else:
-                        skipped_count += 1
-
-                synced_count += 1
-
-            # Cập nhật pageIndex cho lần tiếp theo
-            if should_reset:
-                # Đã hết dữ liệu, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.vendors_current_page', '1')
-                _logger.info("Page %d (last page): Created %d, Updated %d, Skipped %d, Total %d - Reset to page 1",
-                             current_page, created_count, updated_count, skipped_count, synced_count)
-            else:
-                # Còn dữ liệu, tăng pageIndex
-                next_page = current_page + 1
-                config_parameter.set_param('yonsuite_integration.vendors_current_page', str(next_page))
-                _logger.info("Page %d: Created %d, Updated %d, Skipped %d, Total %d - Next page: %d",
-                             current_page, created_count, updated_count, skipped_count, synced_count, next_page)
-
-            # Cập nhật thống kê
-            total_synced = int(config_parameter.get_param('yonsuite_integration.vendors_total_synced', '0'))
-            config_parameter.set_param('yonsuite_integration.vendors_total_synced', str(total_synced + synced_count))
-            config_parameter.set_param('yonsuite_integration.vendors_last_sync', fields.Datetime.now())
-
-            return synced_count
-        else:
-            # Kiểm tra message để xác định có phải là "rỗng" không
-            message = result.get("message", "")
-            message_lower = message.lower()
-            # Check for various empty result indicators
-            empty_indicators = ["rỗng", "empty", "không có", "khong co"]
-            is_empty = any(indicator in message or indicator in message_lower for indicator in empty_indicators)
-
-            if is_empty:
-                # Kết quả truy vấn rỗng, reset về trang 1
-                config_parameter.set_param('yonsuite_integration.vendors_current_page', '1')
-                _logger.info("Query result is empty (message: '%s'), reset to page 1", message)
-                return 0
-            else:
-                # Lỗi khác
-                error_msg = result.get("message", "Unknown error")
-                _logger.error("Failed to sync vendors from YonSuite: %s", error_msg)
-                return 0
+        return {
+            'created': len(create_vals_list),
+            'updated': len(changed) - len(create_vals_list),
+            'skipped': skipped_count,
+        }
 
     def _prepare_vendor_data_from_api(self, api_data):
         """
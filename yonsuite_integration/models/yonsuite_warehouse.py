@@ -11,7 +11,7 @@ _logger = logging.getLogger(__name__)
 
 class YonsuiteWarehouse(models.Model):
     _name = 'yonsuite.warehouse'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'yonsuite.reference.mixin']
     _description = 'YonSuite Warehouse'
     _order = 'create_date desc'
 
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+from . import test_incremental_sync
+from . import test_orgunit_hierarchy
+from . import test_reference_cache
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestIncrementalSync(TransactionCase):
+
+    def setUp(self):
+        super().setUp()
+        # Mỗi page được commit trong _yonsuite_run_incremental_sync
+        self.patch(type(self.env.cr), 'commit', lambda cr: None)
+        self.Partner = self.env['yonsuite.partner']
+        self.config_parameter = self.env['ir.config_parameter'].sudo()
+
+    def _partner_data(self, yonsuite_id, name, pubts='2025-01-01 10:00:00'):
+        return {
+            'id': yonsuite_id,
+            'code': 'P%s' % yonsuite_id,
+            'name': {'simplifiedName': name},
+            'pubts': pubts,
+        }
+
+    def test_split_changed_skips_unchanged_payload(self):
+        page = [self._partner_data(1, 'A'), self._partner_data(2, 'B')]
+        self.assertEqual(self.Partner._yonsuite_import_page(page), {'created': 2, 'updated': 0, 'skipped': 0})
+
+        page = [self._partner_data(1, 'A'), self._partner_data(2, 'B renamed'), self._partner_data(2, 'B final')]
+        changed, skipped_count = self.Partner._yonsuite_split_changed(page)
+        self.assertEqual(skipped_count, 1)
+        self.assertEqual(len(changed), 1, "Record trùng id trong page chỉ giữ lần xuất hiện cuối")
+        api_data, payload_hash, partner_id = changed[0]
+        self.assertEqual(api_data['name']['simplifiedName'], 'B final')
+        self.assertEqual(payload_hash, self.Partner._yonsuite_payload_hash(api_data))
+        self.assertEqual(partner_id, self.Partner.search([('yonsuite_id', '=', '2')]).id)
+
+        self.assertEqual(self.Partner._yonsuite_import_page(page), {'created': 0, 'updated': 1, 'skipped': 1})
+        self.assertEqual(self.Partner.search([('yonsuite_id', '=', '2')]).name, 'B final')
+
+    def test_payload_hash_ignores_key_order(self):
+        self.assertEqual(
+            self.Partner._yonsuite_payload_hash({'a': 1, 'b': {'c': 2, 'd': 3}}),
+            self.Partner._yonsuite_payload_hash({'b': {'d': 3, 'c': 2}, 'a': 1}),
+        )
+
+    def test_run_resumes_from_saved_page_with_cycle_watermark(self):
+        self.Partner._yonsuite_import_page([self._partner_data(1, 'A', pubts='2025-01-01 10:00:00')])
+        self.patch(type(self.Partner), '_yonsuite_sync_page_size', 2)
+        self.config_parameter.set_param('yonsuite_integration.sync_time_budget', '0')
+        pages = {
+            1: [self._partner_data(2, 'B'), self._partner_data(3, 'C')],
+            2: [self._partner_data(4, 'D')],
+        }
+        calls = []
+
+        def fake_get_partners(api, page_index=1, page_size=50, filters=None):
+            calls.append((page_index, filters))
+            return {'code': '200', 'data': {'recordList': pages.get(page_index, [])}}
+
+        with patch.object(type(self.env['yonsuite.api']), 'get_partners_from_api', fake_get_partners):
+            # Hết thời gian sau page 1: lần sau tiếp tục từ page 2 với cùng watermark
+            self.assertEqual(self.Partner._yonsuite_run_incremental_sync(), 2)
+            self.assertEqual(self.config_parameter.get_param('yonsuite_integration.partners_current_page'), '2')
+            watermark = self.config_parameter.get_param('yonsuite_integration.partners_watermark')
+            self.assertEqual(watermark, '2025-01-01 09:50:00')
+
+            self.assertEqual(self.Partner._yonsuite_run_incremental_sync(), 1)
+            self.assertEqual(self.config_parameter.get_param('yonsuite_integration.partners_current_page'), '1')
+
+        self.assertEqual([page_index for page_index, filters in calls], [1, 2])
+        self.assertEqual(calls[0][1], calls[1][1])
+        self.assertEqual(calls[1][1]['simpleVOs'][0]['value1'], watermark)
+        self.assertEqual(self.Partner.search_count([('yonsuite_id', 'in', ['2', '3', '4'])]), 3)
+
+
+@tagged('post_install', '-at_install')
+class TestProductDetailRetry(TransactionCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Product = self.env['yonsuite.product']
+        self.detail_results = {}
+
+    def _product_data(self, yonsuite_id, name):
+        return {'id': yonsuite_id, 'code': 'SP%s' % yonsuite_id, 'name': {'simplifiedName': name}, 'createOrgId': 'ORG'}
+
+    def _fake_details(self, api, product_keys, *args, **kwargs):
+        return {yonsuite_id: self.detail_results.get(yonsuite_id) for yonsuite_id, org_id in product_keys}
+
+    def _import_page(self, page):
+        with patch.object(type(self.env['yonsuite.api']), 'get_product_details_concurrently', self._fake_details):
+            return self.Product._yonsuite_import_page(page)
+
+    def test_failed_detail_is_fetched_again(self):
+        self.detail_results = {
+            '1': {'code': '200', 'data': [{'id': 1, 'name': {'simplifiedName': 'One'}, 'unitName': 'Box'}]},
+            '2': {'code': '999', 'message': 'Rate limited'},
+        }
+        page = [self._product_data(1, 'One'), self._product_data(2, 'Two')]
+        self.assertEqual(self._import_page(page)['created'], 2)
+
+        product_1 = self.Product.search([('yonsuite_id', '=', '1')])
+        product_2 = self.Product.search([('yonsuite_id', '=', '2')])
+        self.assertEqual(product_1.state, 'synced')
+        self.assertEqual(product_1.unit_name, 'Box')
+        self.assertTrue(product_1.sync_hash)
+        self.assertEqual(product_2.state, 'error')
+        self.assertEqual(product_2.sync_error_message, 'Rate limited')
+        self.assertTrue(product_2.detail_sync_failed)
+        self.assertFalse(product_2.sync_hash, "Không lưu sync_hash để lần sau lấy lại detail")
+
+        # Payload không đổi: product 1 bị bỏ qua, product 2 vẫn được lấy lại
+        self.assertEqual(self._import_page(page), {'created': 0, 'updated': 1, 'skipped': 1})
+
+        self.detail_results['2'] = {'code': '200', 'data': [{'id': 2, 'name': {'simplifiedName': 'Two'}, 'unitName': 'Can'}]}
+        with patch.object(type(self.env['yonsuite.api']), 'get_product_details_concurrently', self._fake_details):
+            self.assertEqual(self.Product._retry_failed_product_details(), 1)
+        self.assertEqual(product_2.state, 'synced')
+        self.assertEqual(product_2.unit_name, 'Can')
+        self.assertFalse(product_2.detail_sync_failed)
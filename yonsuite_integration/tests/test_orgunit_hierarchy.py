@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestOrgunitHierarchy(TransactionCase):
+
+    def setUp(self):
+        super().setUp()
+        # Như lúc import: chỉ dựng cây 1 lần ở cuối
+        self.Orgunit = self.env['yonsuite.orgunit'].with_context(yonsuite_defer_hierarchy=True)
+
+    def _create(self, orgid, parentorgid=False):
+        return self.Orgunit.create({'name': 'Org %s' % orgid, 'orgid': orgid, 'parentorgid': parentorgid})
+
+    def test_rebuild_resolves_children_created_before_parents(self):
+        grandchild = self._create('B', 'A')
+        child = self._create('A', 'R')
+        root = self._create('R')
+        orphan = self._create('O', 'MISSING')
+        self.assertFalse(grandchild.parent_id)
+
+        self.assertEqual(self.Orgunit._rebuild_hierarchy(), 2)
+        self.assertEqual(grandchild.parent_id, child)
+        self.assertEqual(child.parent_id, root)
+        self.assertFalse(orphan.parent_id)
+        self.assertEqual(grandchild.parent_path, '%s/%s/%s/' % (root.id, child.id, grandchild.id))
+        self.assertEqual(self.Orgunit.search([('id', 'child_of', root.id)]), root | child | grandchild)
+
+        self.assertEqual(self.Orgunit._rebuild_hierarchy(), 0, "Cây không đổi thì không ghi lại")
+
+    def test_reparent_moves_subtree(self):
+        grandchild = self._create('B', 'A')
+        child = self._create('A', 'R1')
+        self._create('R1')
+        root_2 = self._create('R2')
+        self.Orgunit._rebuild_hierarchy()
+
+        child.parentorgid = 'R2'
+        self.assertEqual(self.Orgunit._rebuild_hierarchy(), 1)
+        self.assertEqual(child.parent_id, root_2)
+        self.assertEqual(grandchild.parent_path, '%s/%s/%s/' % (root_2.id, child.id, grandchild.id))
+
+    def test_cycle_is_cut(self):
+        org_x = self._create('X', 'Y')
+        org_y = self._create('Y', 'X')
+        org_z = self._create('Z', 'Z')
+        self.Orgunit._rebuild_hierarchy()
+
+        self.assertFalse(org_z.parent_id, "Node không được làm cha của chính nó")
+        self.assertEqual(len((org_x | org_y).filtered('parent_id')), 1, "Vòng lặp bị cắt tại đúng 1 node")
+
+    def test_update_parent_relationship_without_defer(self):
+        root = self._create('R')
+        child = self.env['yonsuite.orgunit'].create({'name': 'Org A', 'orgid': 'A', 'parentorgid': 'R'})
+        self.assertEqual(child.parent_id, root, "Ngoài import, record mới được gán cha ngay khi tạo")
+
+    def test_find_cycle_nodes(self):
+        parent_of = {1: 2, 2: 3, 3: 1, 4: 1, 5: False, 6: 7, 7: 6}
+        cycle_nodes = self.Orgunit._yonsuite_find_cycle_nodes(parent_of)
+        self.assertEqual(len(cycle_nodes), 2)
+        self.assertEqual(len(set(cycle_nodes) & {1, 2, 3}), 1)
+        self.assertEqual(len(set(cycle_nodes) & {6, 7}), 1)
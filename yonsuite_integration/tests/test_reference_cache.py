@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestReferenceCache(TransactionCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Unit = self.env['yonsuite.unit']
+        self.unit_box = self.Unit.create({'yonsuite_id': '101', 'code': 'BOX', 'name': 'Box', 'state': 'synced'})
+        self.unit_can = self.Unit.create({'yonsuite_id': '102', 'code': 'CAN', 'name': 'Can', 'state': 'draft'})
+        self._commit()
+
+    def _commit(self):
+        """Giả lập commit: chạy các hook precommit (publish generation) rồi xóa dữ liệu của transaction"""
+        self.env.flush_all()
+        self.env.cr.precommit.run()
+
+    def _generation(self, model_name='yonsuite.unit'):
+        # Đọc thẳng từ DB: generation được ghi bằng SQL, không qua cache của get_param
+        self.env.cr.execute(
+            "SELECT value FROM ir_config_parameter WHERE key = %s",
+            [self.env[model_name]._yonsuite_reference_generation_param()],
+        )
+        row = self.env.cr.fetchone()
+        return row and row[0]
+
+    def test_lookup_by_yonsuite_id_then_code(self):
+        self.assertFalse(self.Unit._yonsuite_reference_pending())
+        self.assertEqual(self.Unit._yonsuite_reference_lookup(yonsuite_id=101), (self.unit_box.id, 'Box'))
+        self.assertEqual(self.Unit._yonsuite_reference_lookup(yonsuite_id='999', code='CAN'), (self.unit_can.id, 'Can'))
+        self.assertFalse(self.Unit._yonsuite_reference_lookup(yonsuite_id='102', synced_only=True))
+        self.assertEqual(self.Unit._yonsuite_reference_record(code='BOX'), self.unit_box)
+        self.assertFalse(self.Unit._yonsuite_reference_record(code='NONE'))
+
+    def test_write_in_transaction_bypasses_cache_until_commit(self):
+        generation = self._generation()
+        self.assertEqual(self.Unit._get_yonsuite_reference_maps()['code']['BOX'], (self.unit_box.id, 'Box'))
+
+        self.unit_box.name = 'Carton'
+        unit_kg = self.Unit.create({'yonsuite_id': '103', 'code': 'KG', 'name': 'Kilogram'})
+        self.assertTrue(self.Unit._yonsuite_reference_pending())
+        self.assertEqual(self.Unit._yonsuite_reference_lookup(code='BOX'), (self.unit_box.id, 'Carton'))
+        self.assertEqual(self.Unit._yonsuite_reference_lookup(yonsuite_id='103'), (unit_kg.id, 'Kilogram'))
+        self.assertIn('KG', self.Unit._get_yonsuite_reference_maps()['code'])
+        self.assertEqual(self._generation(), generation, "Generation chỉ được đổi lúc commit")
+
+        self._commit()
+        self.assertNotEqual(self._generation(), generation)
+        self.assertFalse(self.Unit._yonsuite_reference_pending())
+        maps = self.Unit._get_yonsuite_reference_maps()
+        self.assertEqual(maps['code']['BOX'], (self.unit_box.id, 'Carton'))
+        self.assertEqual(maps['yonsuite_id']['103'], (unit_kg.id, 'Kilogram'))
+
+    def test_unrelated_write_keeps_cache(self):
+        generation = self._generation()
+        self.unit_box.precision = 2
+        self.assertFalse(self.Unit._yonsuite_reference_pending())
+        self._commit()
+        self.assertEqual(self._generation(), generation)
+
+    def test_unlink_invalidates_only_touched_model(self):
+        generation = self._generation()
+        orgunit_generation = self._generation('yonsuite.orgunit')
+        self.unit_can.unlink()
+        self.assertFalse(self.Unit._yonsuite_reference_lookup(code='CAN'))
+        self._commit()
+        self.assertFalse(self.Unit._yonsuite_reference_lookup(code='CAN'))
+        self.assertNotEqual(self._generation(), generation)
+        self.assertEqual(self._generation('yonsuite.orgunit'), orgunit_generation)